@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Tamanho de Lote Adaptativo para fixtures/multi
+==============================================
+
+Ajusta o número de IDs por requisição ao endpoint multi para cada
+combinação de includes, com base na latência, no tamanho da resposta e na
+taxa de erro observados. Includes pesados (statistics;events;lineups;...)
+convergem para lotes menores; includes leves crescem até o limite de 100.
+
+Os tamanhos aprendidos são persistidos em JSON (no máximo a cada
+ADAPTIVE_BATCH_SAVE_INTERVAL segundos e em close()) e reutilizados na
+próxima execução.
+
+Autor: ETL Engineer
+Task: Batch adaptativo por combinação de includes
+"""
+
+import os
+import json
+import time
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+from etl.config import ETLConfig
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BatchSizeState:
+    """Estado aprendido para uma combinação de includes"""
+    size: int
+    best_size: int
+    best_throughput: float = 0.0  # fixtures/s (média móvel no best_size)
+    latency: float = 0.0  # segundos (média móvel)
+    bytes_per_fixture: float = 0.0  # média móvel
+    error_rate: float = 0.0  # média móvel
+    observations: int = 0
+    ceiling: Optional[int] = None  # Abaixo do menor lote que falhou recentemente
+    successes_since_error: int = 0
+
+class AdaptiveBatchSizer:
+    """Busca o tamanho de lote de maior vazão por combinação de includes"""
+
+    ALPHA = 0.3  # Peso da observação mais recente nas médias móveis
+    GROWTH_FACTOR = 1.25
+    SLOWDOWN_FACTOR = 0.75
+    ERROR_FACTOR = 0.5
+    MAX_ERROR_RATE = 0.2
+    THROUGHPUT_TOLERANCE = 0.95
+    PROBE_AFTER_SUCCESSES = 20  # Sucessos seguidos antes de subir o teto em 1
+
+    def __init__(self, state_file: Optional[str] = None,
+                 initial_size: Optional[int] = None,
+                 min_size: Optional[int] = None,
+                 max_size: int = 100,
+                 target_latency: Optional[float] = None,
+                 max_payload_bytes: Optional[int] = None,
+                 save_interval: Optional[float] = None):
+        """
+        Args:
+            state_file: Arquivo JSON com os tamanhos aprendidos (None desativa persistência)
+            initial_size: Tamanho inicial para combinações desconhecidas
+            min_size: Menor lote permitido
+            max_size: Maior lote permitido (limite da API)
+            target_latency: Latência máxima desejada por requisição (segundos)
+            max_payload_bytes: Tamanho máximo desejado da resposta
+            save_interval: Intervalo mínimo entre gravações do arquivo (segundos)
+        """
+        self.state_file = state_file
+        self.max_size = max_size
+        self.min_size = min_size or ETLConfig.ADAPTIVE_BATCH_MIN_SIZE
+        self.initial_size = min(initial_size or ETLConfig.ADAPTIVE_BATCH_INITIAL_SIZE, max_size)
+        self.target_latency = target_latency or ETLConfig.ADAPTIVE_BATCH_TARGET_LATENCY
+        self.max_payload_bytes = max_payload_bytes or ETLConfig.ADAPTIVE_BATCH_MAX_PAYLOAD_BYTES
+        self.save_interval = (ETLConfig.ADAPTIVE_BATCH_SAVE_INTERVAL
+                              if save_interval is None else save_interval)
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+        self.states: Dict[str, BatchSizeState] = {}
+        self.load()
+
+    @staticmethod
+    def key(includes: Optional[List[str]]) -> str:
+        """Chave da combinação de includes (independe da ordem)"""
+        return ';'.join(sorted(set(includes or []))) or '-'
+
+    def _state(self, includes: Optional[List[str]]) -> BatchSizeState:
+        key = self.key(includes)
+        if key not in self.states:
+            self.states[key] = BatchSizeState(size=self.initial_size, best_size=self.initial_size)
+        return self.states[key]
+
+    def _ewma(self, current: float, value: float, first: bool) -> float:
+        return value if first else (1 - self.ALPHA) * current + self.ALPHA * value
+
+    def _clamp(self, size: int, cap: Optional[int] = None) -> int:
+        return max(self.min_size, min(int(size), cap or self.max_size, self.max_size))
+
+    def batch_size(self, includes: Optional[List[str]]) -> int:
+        """Tamanho de lote a usar na próxima requisição"""
+        return self._state(includes).size
+
+    def observe(self, includes: Optional[List[str]], fixtures: int, latency: float,
+                payload_bytes: int = 0, error: bool = False) -> int:
+        """
+        Registra o resultado de uma requisição e ajusta o tamanho do lote
+
+        Args:
+            includes: Includes usados na requisição
+            fixtures: Quantidade de IDs enviados
+            latency: Duração da requisição (segundos)
+            payload_bytes: Tamanho da resposta
+            error: Se a requisição falhou por timeout ou 5xx da API. Outras
+                falhas (4xx, rate limit, banco, transformação) não dependem
+                do tamanho do lote e não devem ser observadas como erro
+
+        Returns:
+            Novo tamanho de lote para a combinação
+        """
+        state = self._state(includes)
+        first = state.observations == 0
+        state.observations += 1
+        state.error_rate = self._ewma(state.error_rate, 1.0 if error else 0.0, first)
+
+        if error:
+            state.ceiling = max(self.min_size, fixtures - 1)
+            state.successes_since_error = 0
+            state.size = self._clamp(min(state.size, fixtures) * self.ERROR_FACTOR)
+            # O melhor tamanho conhecido não pode ser maior que um lote que falhou
+            if state.best_size >= fixtures:
+                state.best_size = state.size
+                state.best_throughput = 0.0
+            logger.warning(f"Lote de {fixtures} falhou para '{self.key(includes)}', reduzindo para {state.size}")
+            self._changed()
+            return state.size
+
+        state.successes_since_error += 1
+        if state.ceiling is not None and state.successes_since_error >= self.PROBE_AFTER_SUCCESSES:
+            # Testa um lote acima do teto de tempos em tempos (a falha pode ter sido transitória)
+            state.ceiling = state.ceiling + 1 if state.ceiling < self.max_size else None
+            state.successes_since_error = 0
+        
+        state.latency = self._ewma(state.latency, latency, first)
+        if fixtures > 0:
+            state.bytes_per_fixture = self._ewma(state.bytes_per_fixture, payload_bytes / fixtures, first)
+
+        # Lotes parciais (final de um chunk) não medem o tamanho atual
+        if fixtures < state.size:
+            self._changed()
+            return state.size
+
+        throughput = fixtures / latency if latency > 0 else 0.0
+        payload_cap = state.ceiling
+        if state.bytes_per_fixture > 0:
+            payload_cap = min(payload_cap or self.max_size,
+                              max(self.min_size, int(self.max_payload_bytes / state.bytes_per_fixture)))
+
+        if fixtures == state.best_size:
+            state.best_throughput = self._ewma(state.best_throughput, throughput, state.best_throughput == 0)
+
+        if latency > self.target_latency or (payload_cap and fixtures > payload_cap):
+            state.size = self._clamp(fixtures * self.SLOWDOWN_FACTOR, payload_cap)
+        elif state.error_rate > self.MAX_ERROR_RATE:
+            state.size = self._clamp(state.size, payload_cap)
+        elif throughput >= state.best_throughput * self.THROUGHPUT_TOLERANCE:
+            if throughput > state.best_throughput:
+                state.best_size, state.best_throughput = fixtures, throughput
+            state.size = self._clamp(max(fixtures + 1, fixtures * self.GROWTH_FACTOR), payload_cap)
+        else:
+            # Lote maior rendeu menos: volta para o melhor tamanho conhecido
+            state.size = self._clamp(state.best_size, payload_cap)
+
+        self._changed()
+        return state.size
+
+    def _changed(self):
+        """Marca o estado como alterado e grava se o intervalo já passou"""
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def close(self):
+        """Grava observações ainda não persistidas"""
+        if self._dirty:
+            self.save()
+
+    def load(self):
+        """Carrega os tamanhos aprendidos em execuções anteriores"""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+
+        try:
+            with open(self.state_file) as f:
+                data = json.load(f)
+            self.states = {key: BatchSizeState(**value) for key, value in data.items()}
+            logger.info(f"Tamanhos de lote carregados de {self.state_file}: "
+                       f"{ {key: state.size for key, state in self.states.items()} }")
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignorando estado de lote inválido em {self.state_file}: {e}")
+            self.states = {}
+
+    def save(self):
+        """Persiste os tamanhos aprendidos (escrita atômica)"""
+        self._last_save = time.monotonic()
+        if not self.state_file:
+            self._dirty = False
+            return
+
+        try:
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({key: asdict(state) for key, state in self.states.items()}, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar estado de lote em {self.state_file}: {e}")
+
+    def get_stats(self) -> Dict[str, Dict]:
+        return {key: asdict(state) for key, state in self.states.items()}
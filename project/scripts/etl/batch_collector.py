@@ -22,12 +22,20 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from dotenv import load_dotenv
 import json
+import queue
+import threading
+
+from etl.adaptive_batching import AdaptiveBatchSizer
+from etl.config import ETLConfig
+from etl.monitoring import ETLMonitor
 
 # Carregar variáveis de ambiente
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+_FETCH_DONE = object()  # Sentinela de fim da etapa de busca
+
 @dataclass
 class BatchRequest:
     """Dados de uma requisição em lote"""
@@ -46,6 +54,7 @@ class BatchResult:
     errors: List[str]
     duration_ms: int
     api_calls_made: int
+    payload_bytes: int = 0
 
 class SportmonksBatchAPI:
     """Cliente otimizado para requisições em lote da API Sportmonks"""
@@ -55,8 +64,13 @@ class SportmonksBatchAPI:
     MAX_RETRIES = 3
     RETRY_DELAY = 2  # seconds
     
+    # Falhas que indicam lote grande demais para a API (alimentam o batch adaptativo)
+    SIZE_RELATED_ERRORS = ('timeout', 'server_error')
+    
     def __init__(self, api_token: str):
         self.api_token = api_token
+        self.last_response_bytes = 0
+        self.last_error = None  # timeout, server_error, client_error, rate_limited, connection
         self.session = requests.Session()
         self.session.params = {'api_token': self.api_token}
         
@@ -71,12 +85,14 @@ class SportmonksBatchAPI:
         """Faz requisição com retry automático"""
         url = f"{self.BASE_URL}/{endpoint}"
         full_params = {**self.session.params, **(params if params else {})}
+        self.last_error = None
         
         for attempt in range(self.MAX_RETRIES):
             try:
                 logger.debug(f"Requesting: {url} with params {full_params}")
                 response = self.session.get(url, params=full_params, timeout=30)
                 response.raise_for_status()
+                self.last_response_bytes = len(response.content)
                 
                 # Log de rate limiting
                 remaining = int(response.headers.get('x-ratelimit-remaining', 3000))
@@ -87,13 +103,16 @@ class SportmonksBatchAPI:
                 
             except requests.exceptions.HTTPError as e:
                 if response.status_code == 429:
+                    self.last_error = 'rate_limited'
                     retry_after = int(response.headers.get('retry-after', 60))
                     logger.warning(f"Rate limit hit. Retrying in {retry_after} seconds...")
                     time.sleep(retry_after)
                 elif response.status_code == 400:
+                    self.last_error = 'client_error'
                     logger.error(f"Bad Request (400) for {url}: {e}")
                     return None
                 else:
+                    self.last_error = 'server_error' if response.status_code >= 500 else 'client_error'
                     logger.error(f"HTTP error {response.status_code} for {url}: {e}")
                     if attempt < self.MAX_RETRIES - 1:
                         time.sleep(self.RETRY_DELAY * (2 ** attempt))  # Backoff exponencial
@@ -102,6 +121,7 @@ class SportmonksBatchAPI:
                         return None
                         
             except requests.exceptions.RequestException as e:
+                self.last_error = 'timeout' if isinstance(e, requests.exceptions.Timeout) else 'connection'
                 logger.error(f"Request error for {url}: {e}")
                 if attempt < self.MAX_RETRIES - 1:
                     time.sleep(self.RETRY_DELAY * (2 ** attempt))
@@ -171,10 +191,21 @@ class SportmonksBatchAPI:
 class BatchCollector:
     """Coletor otimizado para processamento em lote"""
     
-    def __init__(self, api_token: str, db_connection_string: str):
+    def __init__(self, api_token: str, db_connection_string: str,
+                 batch_sizer: Optional[AdaptiveBatchSizer] = None,
+                 monitor: Optional[ETLMonitor] = None,
+                 execution_id: Optional[str] = None,
+                 queue_size: int = None):
         self.api = SportmonksBatchAPI(api_token)
         self.db_connection_string = db_connection_string
         self.connection = None
+        self.monitor = monitor
+        self.execution_id = execution_id
+        self.queue_size = queue_size or ETLConfig.PIPELINE_QUEUE_SIZE
+        self._stop_event = threading.Event()
+        self.batch_sizer = batch_sizer or AdaptiveBatchSizer(
+            ETLConfig.ADAPTIVE_BATCH_STATE_FILE, max_size=SportmonksBatchAPI.MAX_BATCH_SIZE
+        )
     
     def connect(self):
         """Conecta ao banco de dados"""
@@ -238,6 +269,28 @@ class BatchCollector:
             logger.error(f"Erro ao obter fixtures para lote: {e}")
             return []
     
+    def adaptive_batches(self, fixture_ids: List[int], includes: List[str] = None,
+                         max_size: int = None):
+        """
+        Divide fixture IDs em lotes com o tamanho aprendido para os includes
+        
+        O tamanho é consultado a cada lote, refletindo as observações feitas
+        por process_batch nos lotes anteriores.
+        
+        Args:
+            fixture_ids: Lista de fixture IDs
+            includes: Includes usados nas requisições
+            max_size: Limite superior do lote
+        """
+        start = 0
+        while start < len(fixture_ids):
+            size = self.batch_sizer.batch_size(includes)
+            if max_size:
+                size = min(size, max_size)
+            batch = fixture_ids[start:start + size]
+            start += len(batch)
+            yield batch
+    
     def process_batch(self, fixture_ids: List[int], 
                      includes: List[str] = None) -> BatchResult:
         """
@@ -263,19 +316,33 @@ class BatchCollector:
         
         logger.info(f"Processando lote de {len(fixture_ids)} fixtures")
         
+        payload_bytes = 0
+        
         try:
             # Faz requisição em lote
             api_calls_made += 1
+            self.api.last_response_bytes = 0
             data = self.api.get_fixtures_multi(fixture_ids, includes)
+            api_seconds = time.time() - start_time
+            payload_bytes = self.api.last_response_bytes
             
             if data is None:
-                logger.error("Falha na requisição em lote")
+                logger.error(f"Falha na requisição em lote ({self.api.last_error})")
+                duration_ms = int((time.time() - start_time) * 1000)
+                # Só timeout/5xx dependem do tamanho do lote; 4xx e rate limit não
+                if self.api.last_error in SportmonksBatchAPI.SIZE_RELATED_ERRORS:
+                    self.batch_sizer.observe(includes, len(fixture_ids), api_seconds, error=True)
                 return BatchResult(
                     fixture_ids, [], fixture_ids, 
                     ["Falha na requisição em lote"], 
-                    int((time.time() - start_time) * 1000), api_calls_made
+                    duration_ms, api_calls_made
                 )
             
+            # Ajusta o tamanho dos próximos lotes para esta combinação de includes
+            # (medido só na API: erros de processamento abaixo não dependem do lote)
+            self.batch_sizer.observe(includes, len(fixture_ids), api_seconds,
+                                     payload_bytes=payload_bytes)
+            
             # Processa resposta
             fixtures_data = data.get('data', [])
             
@@ -315,11 +382,12 @@ class BatchCollector:
         duration_ms = int((time.time() - start_time) * 1000)
         
         logger.info(f"Lote processado: {len(successful_fixtures)} sucessos, "
-                   f"{len(failed_fixtures)} falhas, {duration_ms}ms, {api_calls_made} chamadas API")
+                   f"{len(failed_fixtures)} falhas, {duration_ms}ms, {payload_bytes} bytes, "
+                   f"{api_calls_made} chamadas API")
         
         return BatchResult(
             fixture_ids, successful_fixtures, failed_fixtures, 
-            errors, duration_ms, api_calls_made
+            errors, duration_ms, api_calls_made, payload_bytes
         )
     
     def save_batch_results(self, result: BatchResult):
@@ -429,49 +497,137 @@ class BatchCollector:
                 'duration': 0
             }
         
-        # Processa em lotes
-        total_processed = 0
-        total_successful = 0
-        total_failed = 0
-        total_api_calls = 0
+        stats = {
+            'processed': 0,
+            'successful': 0,
+            'failed': 0,
+            'api_calls': 0
+        }
         
-        # Divide em lotes menores se necessário
-        for i in range(0, len(fixture_ids), batch_size):
-            batch_fixture_ids = fixture_ids[i:i + batch_size]
-            
-            # Processa lote
-            result = self.process_batch(
-                batch_fixture_ids, 
-                includes=['statistics', 'events', 'lineups']
-            )
-            
-            # Salva resultados
-            if result.successful_fixtures:
-                self.save_batch_results(result)
-            
-            # Acumula estatísticas
-            total_processed += len(result.fixture_ids)
-            total_successful += len(result.successful_fixtures)
-            total_failed += len(result.failed_fixtures)
-            total_api_calls += result.api_calls_made
-            
-            # Log de progresso
-            logger.info(f"Lote {i//batch_size + 1}: {len(result.successful_fixtures)} sucessos, "
-                       f"{len(result.failed_fixtures)} falhas")
+        includes = ['statistics', 'events', 'lineups']
+        chunk_id = f"{league_id}_{season_id}"
+        
+        # Pipeline: busca na API (thread produtora) em paralelo com a gravação no banco.
+        # A fila limitada aplica backpressure: a API não se adianta mais que queue_size lotes.
+        self._stop_event.clear()
+        results = queue.Queue(maxsize=self.queue_size)
+        producer = threading.Thread(
+            target=self._fetch_batches,
+            args=(self.adaptive_batches(fixture_ids, includes, batch_size), includes, results),
+            name=f"batch-fetch-{chunk_id}",
+            daemon=True
+        )
+        producer.start()
+        
+        batch_number = 0
+        try:
+            while True:
+                result = results.get()
+                if result is _FETCH_DONE:
+                    break
+                if isinstance(result, Exception):
+                    raise result
+                
+                batch_number += 1
+                self._save_and_report(result, batch_number, chunk_id, stats, results.qsize())
+        except KeyboardInterrupt:
+            # Parada graciosa: não busca novos lotes, mas grava os que já foram buscados
+            logger.warning(f"Interrupção recebida: gravando lotes pendentes do chunk {chunk_id}")
+            self.request_stop()
+            while True:
+                result = results.get()
+                if result is _FETCH_DONE:
+                    break
+                if isinstance(result, BatchResult):
+                    batch_number += 1
+                    self._save_and_report(result, batch_number, chunk_id, stats, results.qsize())
+            raise
+        except Exception:
+            # Erro na gravação: para a busca e esvazia a fila para liberar a thread produtora
+            self.request_stop()
+            while results.get() is not _FETCH_DONE:
+                pass
+            raise
+        finally:
+            producer.join()
+            self.batch_sizer.close()
         
         duration = time.time() - start_time
+        stats['duration'] = duration
         
         logger.info(f"Chunk {league_id}/{season_id} concluído: "
-                   f"{total_processed} processadas, {total_successful} sucessos, "
-                   f"{total_failed} falhas, {total_api_calls} chamadas API, {duration:.2f}s")
-        
-        return {
-            'processed': total_processed,
-            'successful': total_successful,
-            'failed': total_failed,
-            'api_calls': total_api_calls,
-            'duration': duration
-        }
+                   f"{stats['processed']} processadas, {stats['successful']} sucessos, "
+                   f"{stats['failed']} falhas, {stats['api_calls']} chamadas API, {duration:.2f}s")
+        
+        if self.monitor:
+            self.monitor.record_metric(self.execution_id, 'chunk_batch_duration', duration, 'seconds',
+                                       {'chunk_id': chunk_id})
+        
+        return stats
+    
+    def request_stop(self):
+        """
+        Solicita parada graciosa do pipeline
+        
+        Nenhum novo lote é buscado na API; os lotes já buscados continuam
+        sendo gravados antes de process_chunk_batch retornar.
+        """
+        self._stop_event.set()
+    
+    def _fetch_batches(self, batches, includes: List[str], results: queue.Queue):
+        """Etapa produtora: busca lotes na API e os entrega à fila de gravação"""
+        try:
+            for batch_fixture_ids in batches:
+                if self._stop_event.is_set():
+                    logger.info("Parada solicitada: interrompendo busca de novos lotes")
+                    break
+                results.put(self.process_batch(batch_fixture_ids, includes=includes))
+        except Exception as e:
+            logger.error(f"Erro na busca de lotes: {e}")
+            results.put(e)
+        finally:
+            results.put(_FETCH_DONE)
+    
+    def _save_and_report(self, result: BatchResult, batch_number: int, chunk_id: str,
+                         stats: Dict, queue_depth: int):
+        """Etapa consumidora: grava o lote e reporta o progresso"""
+        save_start = time.time()
+        if result.successful_fixtures:
+            self.save_batch_results(result)
+        save_ms = int((time.time() - save_start) * 1000)
+        
+        # Acumula estatísticas
+        stats['processed'] += len(result.fixture_ids)
+        stats['successful'] += len(result.successful_fixtures)
+        stats['failed'] += len(result.failed_fixtures)
+        stats['api_calls'] += result.api_calls_made
+        
+        # Log de progresso
+        logger.info(f"Lote {batch_number} ({len(result.fixture_ids)} fixtures): {len(result.successful_fixtures)} sucessos, "
+                   f"{len(result.failed_fixtures)} falhas, API {result.duration_ms}ms, banco {save_ms}ms, "
+                   f"{queue_depth} lotes na fila")
+        
+        if self.monitor:
+            self.monitor.log_event(
+                'INFO', 'batch_collector',
+                f"Lote {batch_number} gravado: {len(result.successful_fixtures)} sucessos, "
+                f"{len(result.failed_fixtures)} falhas",
+                details={
+                    'batch_size': len(result.fixture_ids),
+                    'api_duration_ms': result.duration_ms,
+                    'save_duration_ms': save_ms,
+                    'payload_bytes': result.payload_bytes,
+                    'queue_depth': queue_depth,
+                    'processed_so_far': stats['processed']
+                },
+                execution_id=self.execution_id,
+                chunk_id=chunk_id,
+                duration_ms=result.duration_ms + save_ms
+            )
+            tags = {'chunk_id': chunk_id}
+            self.monitor.record_metric(self.execution_id, 'batch_api_duration', result.duration_ms, 'ms', tags)
+            self.monitor.record_metric(self.execution_id, 'batch_save_duration', save_ms, 'ms', tags)
+            self.monitor.record_metric(self.execution_id, 'batch_queue_depth', queue_depth, 'count', tags)
 
 def create_batch_collector(api_token: str, db_connection_string: str) -> BatchCollector:
     """Cria instância do coletor em lote"""
@@ -30,6 +30,20 @@ class ETLConfig:
     DEFAULT_BATCH_SIZE = 100
     MAX_FIXTURES_PER_RUN = 1000
     
+    # Batch adaptativo (fixtures/multi)
+    ADAPTIVE_BATCH_STATE_FILE = os.getenv(
+        'ETL_ADAPTIVE_BATCH_STATE',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'adaptive_batch_state.json')
+    )
+    ADAPTIVE_BATCH_INITIAL_SIZE = 25
+    ADAPTIVE_BATCH_MIN_SIZE = 1
+    ADAPTIVE_BATCH_TARGET_LATENCY = 15  # segundos (timeout da requisição é 30s)
+    ADAPTIVE_BATCH_MAX_PAYLOAD_BYTES = 20 * 1024 * 1024
+    ADAPTIVE_BATCH_SAVE_INTERVAL = 30  # segundos entre gravações do estado
+    
+    # Pipeline busca/gravação (lotes buscados aguardando gravação)
+    PIPELINE_QUEUE_SIZE = 2
+    
     # Logging
     LOG_LEVEL = os.getenv('ETL_LOG_LEVEL', 'INFO')
     LOG_FILE = 'etl_incremental.log'
@@ -15,6 +15,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from bdfut.core.etl_process import ETLProcess
+from bdfut.core.enrichment import EnrichmentEngine, ENRICHMENT_TARGETS
 from bdfut.config.config import Config
 
 # Configurar logging
@@ -124,6 +125,25 @@ def sync_fixture(fixture_id):
     else:
         click.echo(click.style("❌ Erro ao sincronizar detalhes da partida!", fg='red'))
 
+@main.command()
+@click.argument('fixture_ids', nargs=-1, type=int, required=True)
+@click.option('--target', '-t', 'targets', multiple=True, type=click.Choice(list(ENRICHMENT_TARGETS)),
+              help='Destinos a enriquecer (padrão: events, lineups, stats)')
+@click.option('--force', is_flag=True, help='Regravar mesmo partidas que já possuem dados')
+def enrich(fixture_ids, targets, force):
+    """Enriquece partidas (eventos, lineups, estatísticas, árbitros, períodos)"""
+    targets = list(targets) or ['events', 'lineups', 'stats']
+    click.echo(click.style(f"🔄 Enriquecendo {len(fixture_ids)} partidas ({', '.join(targets)})...", fg='yellow'))
+    
+    stats = EnrichmentEngine(targets=targets, skip_existing=not force).run(fixture_ids)
+    for name, stage in stats['stages'].items():
+        click.echo(f"  {name}: {stage['items']} itens, {stage['throughput']}/s, {stage['errors']} erros")
+    
+    if stats['success']:
+        click.echo(click.style(f"✅ {stats['rows_loaded']} registros gravados!", fg='green'))
+    else:
+        click.echo(click.style("❌ Enriquecimento concluído com erros!", fg='red'))
+
 @main.command()
 @click.confirmation_option(prompt='Isso pode demorar. Tem certeza que deseja continuar?')
 def full_sync():
@@ -185,6 +205,43 @@ def test_connection():
         else:
             click.echo(click.style(f"❌ Supabase: {str(e)}", fg='red'))
 
+@main.command()
+@click.argument('paths', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--repeat', '-r', default=5, type=int, help='Repetições por payload')
+def cache_benchmark(paths, repeat):
+    """Compara codecs do cache em respostas gravadas da API (arquivos .json ou diretórios)"""
+    import json
+    from pathlib import Path
+    from bdfut.core.cache_codec import benchmark_codecs
+    
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob('*.json')) if path.is_dir() else [path])
+    
+    payloads = [json.loads(file.read_text()) for file in files]
+    click.echo(click.style(f"📊 Benchmark de codecs com {len(payloads)} respostas gravadas", fg='cyan', bold=True))
+    
+    for row in benchmark_codecs(payloads, repeat=repeat):
+        latency = (f"encode {row['encode_ms']:.3f}ms, decode {row['decode_ms']:.3f}ms"
+                   if row['encode_ms'] is not None else '')
+        click.echo(f"  {row['codec']:<20} {row['bytes']:>12,} bytes  {row['ratio']:>7.2%}  {latency}")
+
+@main.command()
+@click.option('--hours', '-h', default=None, type=int, help='Janela de partidas a pré-carregar (horas)')
+def cache_warmup(hours):
+    """Aquece o cache com dados estáticos e as partidas das próximas horas"""
+    from bdfut.core.incremental_sync import IncrementalSyncManager
+    
+    click.echo(click.style("🔥 Aquecendo cache...", fg='yellow'))
+    stats = IncrementalSyncManager(use_redis=True).warm_up_cache(hours)
+    
+    if 'error' in stats:
+        click.echo(click.style(f"❌ {stats['error']}", fg='red'))
+        sys.exit(1)
+    for entity_type, count in stats.items():
+        click.echo(f"  {entity_type:<12} {count}")
+    click.echo(click.style("✅ Cache aquecido!", fg='green'))
+
 @main.command()
 def show_config():
     """Mostra a configuração atual (sem dados sensíveis)"""
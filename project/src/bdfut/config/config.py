@@ -20,11 +20,82 @@ class Config:
     SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
     SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")
     
+    # PostgreSQL direto (carga em massa via COPY)
+    DATABASE_URL = os.getenv("DATABASE_URL", "")
+    BULK_LOAD_CHUNK_SIZE = int(os.getenv("BULK_LOAD_CHUNK_SIZE", "5000"))
+    
+    # Buffer write-behind (participantes/eventos por partida)
+    WRITE_BUFFER_MAX_ROWS = int(os.getenv("WRITE_BUFFER_MAX_ROWS", "1000"))
+    WRITE_BUFFER_MAX_AGE_SECONDS = float(os.getenv("WRITE_BUFFER_MAX_AGE_SECONDS", "30"))
+    
+    # Motor de enriquecimento (fixtures/multi aceita até 100 IDs)
+    ENRICHMENT_BATCH_SIZE = int(os.getenv("ENRICHMENT_BATCH_SIZE", "100"))
+    ENRICHMENT_QUEUE_SIZE = int(os.getenv("ENRICHMENT_QUEUE_SIZE", "4"))
+    
+    # Cache local L1 (à frente do Redis)
+    LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", "1000"))
+    LOCAL_CACHE_MAX_BYTES = int(os.getenv("LOCAL_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    LOCAL_CACHE_TTL_SECONDS = int(os.getenv("LOCAL_CACHE_TTL_SECONDS", "300"))
+    
+    # Codec dos valores no Redis (auto = melhor biblioteca instalada)
+    CACHE_SERIALIZER = os.getenv("CACHE_SERIALIZER", "auto")
+    CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "auto")
+    CACHE_COMPRESS_MIN_BYTES = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024"))
+    
+    # Stale-while-revalidate: entradas vencidas continuam servíveis até TTL x fator
+    CACHE_STALE_TTL_FACTOR = float(os.getenv("CACHE_STALE_TTL_FACTOR", "2"))
+    CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", "2"))
+    # Cache negativo (404 e respostas vazias)
+    CACHE_NEGATIVE_TTL = int(os.getenv("CACHE_NEGATIVE_TTL", "300"))
+    # TTL de partidas pelo estado (encerradas, ao vivo, prestes a começar)
+    CACHE_FINISHED_FIXTURE_TTL = int(os.getenv("CACHE_FINISHED_FIXTURE_TTL", str(30 * 24 * 3600)))
+    CACHE_LIVE_FIXTURE_TTL = int(os.getenv("CACHE_LIVE_FIXTURE_TTL", "15"))
+    CACHE_UPCOMING_FIXTURE_TTL = int(os.getenv("CACHE_UPCOMING_FIXTURE_TTL", "300"))
+    CACHE_UPCOMING_FIXTURE_WINDOW = int(os.getenv("CACHE_UPCOMING_FIXTURE_WINDOW", "3600"))
+    
+    # Aquecimento do cache pelo calendário de partidas
+    CACHE_WARMUP_HOURS_AHEAD = int(os.getenv("CACHE_WARMUP_HOURS_AHEAD", "6"))
+    CACHE_WARMUP_INCLUDE = os.getenv("CACHE_WARMUP_INCLUDE", "participants;state;venue;lineups")
+    CACHE_WARMUP_MAX_REQUESTS = int(os.getenv("CACHE_WARMUP_MAX_REQUESTS", "10"))
+    CACHE_WARMUP_MIN_REMAINING = int(os.getenv("CACHE_WARMUP_MIN_REMAINING", "500"))
+    
+    # Hash de conteúdo por registro (sincronização grava apenas o que mudou)
+    CONTENT_HASH_TTL = int(os.getenv("CONTENT_HASH_TTL", str(30 * 24 * 3600)))
+    
+    # Armazém local de respostas brutas da API (reprocessamento de backfills)
+    RESPONSE_STORE_DIR = os.getenv("RESPONSE_STORE_DIR", "data/responses")
+    
+    # Logs e checkpoints de jobs ETL gravados em segundo plano
+    ETL_METADATA_QUEUE_SIZE = int(os.getenv("ETL_METADATA_QUEUE_SIZE", "10000"))
+    ETL_METADATA_BATCH_SIZE = int(os.getenv("ETL_METADATA_BATCH_SIZE", "500"))
+    ETL_METADATA_FLUSH_INTERVAL = float(os.getenv("ETL_METADATA_FLUSH_INTERVAL", "2"))
+    
+    # Verificações de qualidade incrementais: varredura completa a cada N dias
+    DATA_QUALITY_REBASELINE_DAYS = int(os.getenv("DATA_QUALITY_REBASELINE_DAYS", "7"))
+    
+    # Perfil por amostragem das tabelas grandes (TABLESAMPLE BERNOULLI; SYSTEM lê
+    # blocos inteiros, mais barato, mas linhas vizinhas são correlacionadas e os
+    # intervalos ficam estreitos demais; sem a RPC, reservatório sobre as primeiras
+    # DATA_QUALITY_PROFILE_SCAN_ROWS linhas, não representativo e fora da deriva)
+    DATA_QUALITY_PROFILE_SAMPLE_PERCENT = float(os.getenv("DATA_QUALITY_PROFILE_SAMPLE_PERCENT", "1"))
+    DATA_QUALITY_PROFILE_SAMPLING = os.getenv("DATA_QUALITY_PROFILE_SAMPLING", "BERNOULLI")
+    DATA_QUALITY_PROFILE_RESERVOIR_SIZE = int(os.getenv("DATA_QUALITY_PROFILE_RESERVOIR_SIZE", "10000"))
+    DATA_QUALITY_PROFILE_SCAN_ROWS = int(os.getenv("DATA_QUALITY_PROFILE_SCAN_ROWS", "100000"))
+    
+    # DatabaseValidator: verificações simultâneas e tempo limite de cada uma (segundos)
+    DATABASE_VALIDATOR_CONCURRENCY = int(os.getenv("DATABASE_VALIDATOR_CONCURRENCY", "4"))
+    DATABASE_VALIDATOR_CHECK_TIMEOUT = float(os.getenv("DATABASE_VALIDATOR_CHECK_TIMEOUT", "30"))
+    
+    # Coalescência de requisições idênticas (lock no Redis entre processos)
+    SINGLE_FLIGHT_LOCK_TTL = float(os.getenv("SINGLE_FLIGHT_LOCK_TTL", "30"))
+    SINGLE_FLIGHT_WAIT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_WAIT_TIMEOUT", "30"))
+    
     # Rate Limiting
     RATE_LIMIT_PER_HOUR = int(os.getenv("RATE_LIMIT_PER_HOUR", "3000"))
     BATCH_SIZE = int(os.getenv("BATCH_SIZE", "100"))
     MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
     RETRY_DELAY = int(os.getenv("RETRY_DELAY", "5"))
+    PAGINATION_WORKERS = int(os.getenv("PAGINATION_WORKERS", "1"))
     
     # Ligas principais para sincronização
     MAIN_LEAGUES = [
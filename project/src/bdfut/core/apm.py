@@ -4,6 +4,10 @@
 """
 Módulo de APM para monitoramento de performance da aplicação BDFut.
 Integra métricas de performance, profiling e análise de código.
+
+As requisições vão para uma RollingWindow (streaming_metrics) com
+contadores e DDSketch por balde de tempo: p95, throughput e taxa de erro
+de cada snapshot custam O(baldes), sem ordenar a janela.
 """
 
 import time
@@ -20,6 +24,8 @@ import gc
 import sys
 import tracemalloc
 
+from .streaming_metrics import RollingWindow
+
 try:
     from prometheus_client import Counter, Histogram, Gauge, Summary
     PROMETHEUS_AVAILABLE = True
@@ -64,11 +70,19 @@ class PerformanceAlert:
 class PerformanceProfiler:
     """Profiler de performance da aplicação."""
     
-    def __init__(self, window_size: int = 100):
+    def __init__(self, window_size: int = 100, window_seconds: float = 300.0,
+                 bucket_seconds: float = 10.0):
+        """
+        Args:
+            window_size: Snapshots de performance mantidos
+            window_seconds: Janela das métricas de requisições (p95, throughput, erro)
+            bucket_seconds: Resolução da janela
+        """
         self.window_size = window_size
-        self.response_times = deque(maxlen=window_size)
-        self.error_counts = deque(maxlen=window_size)
-        self.request_counts = deque(maxlen=window_size)
+        self.window_seconds = window_seconds
+        self.requests = RollingWindow(window_seconds, bucket_seconds)
+        self.total_requests = 0
+        self.total_errors = 0
         self.performance_snapshots = deque(maxlen=window_size)
         
         # Métricas Prometheus
@@ -209,32 +223,33 @@ class PerformanceProfiler:
     
     def _calculate_p95_response_time(self) -> float:
         """Calcula P95 do tempo de resposta."""
-        if not self.response_times:
-            return 0.0
-        
-        sorted_times = sorted(self.response_times)
-        index = int(0.95 * len(sorted_times))
-        return sorted_times[index] if index < len(sorted_times) else sorted_times[-1]
+        return self.requests.sketch().quantile(0.95)
+    
+    def get_response_time_quantiles(self) -> Dict[str, float]:
+        """p50/p95/p99 do tempo de resposta na janela."""
+        p50, p95, p99 = self.requests.sketch().quantiles([0.5, 0.95, 0.99])
+        return {'p50': p50, 'p95': p95, 'p99': p99}
     
     def _calculate_throughput(self) -> float:
         """Calcula throughput em requisições por segundo."""
-        if len(self.request_counts) < 2:
-            return 0.0
-        
-        # Calcula diferença entre primeiro e último
-        total_requests = sum(self.request_counts)
-        time_window = len(self.request_counts) * 5.0  # 5 segundos por snapshot
-        return total_requests / time_window if time_window > 0 else 0.0
+        now = time.time()
+        counts = self.requests.counts(now=now)
+        # Janela efetiva: menor entre a configurada e o tempo desde o início
+        time_window = min(self.window_seconds, now - self.start_time)
+        return counts.total / time_window if time_window > 0 else 0.0
     
     def _calculate_error_rate(self) -> float:
         """Calcula taxa de erro."""
-        if not self.error_counts or not self.request_counts:
-            return 0.0
-        
-        total_errors = sum(self.error_counts)
-        total_requests = sum(self.request_counts)
-        
-        return (total_errors / total_requests * 100) if total_requests > 0 else 0.0
+        counts = self.requests.counts()
+        return (counts.failures / counts.total * 100) if counts.total > 0 else 0.0
+    
+    def export_state(self) -> Dict[str, Any]:
+        """Janela de requisições em forma serializável (para unir em outro processo)."""
+        return self.requests.to_dict()
+    
+    def merge_state(self, state: Dict[str, Any]):
+        """Soma a janela de requisições exportada por outro processo."""
+        self.requests.merge(RollingWindow.from_dict(state))
     
     def _update_prometheus_metrics(self, snapshot: PerformanceSnapshot):
         """Atualiza métricas Prometheus."""
@@ -314,13 +329,10 @@ class PerformanceProfiler:
     def record_request(self, endpoint: str, method: str, response_time: float, 
                       status_code: int):
         """Registra requisição para análise de performance."""
-        self.response_times.append(response_time)
-        self.request_counts.append(1)
-        
+        self.requests.record(status_code < 400, response_time)
+        self.total_requests += 1
         if status_code >= 400:
-            self.error_counts.append(1)
-        else:
-            self.error_counts.append(0)
+            self.total_errors += 1
         
         # Atualiza métricas Prometheus
         if PROMETHEUS_AVAILABLE:
@@ -352,9 +364,10 @@ class PerformanceProfiler:
                 "throughput_rps": statistics.mean([s.throughput_rps for s in self.performance_snapshots]),
                 "error_rate": statistics.mean([s.error_rate for s in self.performance_snapshots])
             },
+            "response_time_quantiles": self.get_response_time_quantiles(),
             "uptime_seconds": time.time() - self.start_time,
-            "total_requests": sum(self.request_counts),
-            "total_errors": sum(self.error_counts)
+            "total_requests": self.total_requests,
+            "total_errors": self.total_errors
         }
 
 # ============================================
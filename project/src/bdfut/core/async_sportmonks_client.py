@@ -0,0 +1,602 @@
+"""
+Cliente assíncrono para API Sportmonks
+=====================================
+
+Executa requisições concorrentes (asyncio + httpx) com limite de
+concorrência, pool de conexões keep-alive compartilhado e a mesma
+integração de cache (Redis/Supabase) do SportmonksClient.
+
+Uso:
+    async with AsyncSportmonksClient(max_concurrency=10) as client:
+        fixtures = await asyncio.gather(*[
+            client.get_fixture_by_id(fixture_id) for fixture_id in fixture_ids
+        ])
+"""
+import asyncio
+import logging
+from typing import Dict, Any, Optional, List, AsyncIterator, Awaitable, Callable, Iterable
+
+import httpx
+from tenacity import (
+    retry, retry_if_exception_type, retry_if_not_exception_type, stop_after_attempt, wait_exponential
+)
+
+from .sportmonks_client import SportmonksClient, SportmonksNotFoundError
+from .redis_cache import CacheEntry
+from .rate_limiter import RateLimiter
+from ..config.config import Config
+
+logger = logging.getLogger(__name__)
+
+# httpx registra a URL completa (com api_token) em nível INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class AsyncSportmonksClient(SportmonksClient):
+    """Cliente assíncrono para interação com a API Sportmonks"""
+
+    def __init__(self,
+                 enable_cache: bool = True,
+                 cache_ttl_hours: int = 24,
+                 use_redis: bool = True,
+                 redis_url: Optional[str] = None,
+                 max_concurrency: int = 10,
+                 timeout: float = 30.0,
+                 rate_limiter: Optional[RateLimiter] = None):
+        """
+        Inicializa o cliente assíncrono
+
+        Args:
+            enable_cache: Habilitar cache de respostas
+            cache_ttl_hours: TTL do cache Supabase em horas
+            use_redis: Usar Redis como backend de cache
+            redis_url: URL de conexão Redis
+            max_concurrency: Número máximo de requisições simultâneas
+            timeout: Timeout por requisição em segundos
+            rate_limiter: Rate limiter (padrão: compartilhado via Redis se disponível)
+        """
+        super().__init__(
+            enable_cache=enable_cache,
+            cache_ttl_hours=cache_ttl_hours,
+            use_redis=use_redis,
+            redis_url=redis_url,
+            rate_limiter=rate_limiter
+        )
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+        # Criados sob demanda dentro do event loop em execução
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._refresh_tasks = set()
+
+    async def __aenter__(self):
+        self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    def _ensure_session(self) -> httpx.AsyncClient:
+        """Cria pool de conexões e primitivas de concorrência se necessário"""
+        if self._http_client is None:
+            limits = httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            )
+            self._http_client = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._http_client
+
+    async def aclose(self):
+        """Aguarda as atualizações de cache pendentes e fecha o pool de conexões"""
+        if self._refresh_tasks:
+            await asyncio.gather(*list(self._refresh_tasks), return_exceptions=True)
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+            self._semaphore = None
+
+    async def _acquire_rate_limit(self, bucket: str = 'default'):
+        """Aguarda sem bloquear o event loop para respeitar o rate limit"""
+        await self.rate_limiter.acquire_async(bucket)
+
+    async def _run_blocking(self, func, *args):
+        """Executa chamadas bloqueantes (cache Redis/Supabase) fora do event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=60),
+        # Cancelamento (BaseException) não é repetido
+        retry=retry_if_exception_type(Exception) & retry_if_not_exception_type(SportmonksNotFoundError)
+    )
+    async def _make_request(self, endpoint: str, params: Optional[Dict] = None,
+                            entity_type: str = None, base_url: Optional[str] = None,
+                            cache: bool = True) -> Dict[str, Any]:
+        """
+        Faz uma requisição assíncrona para a API com retry automático e cache
+
+        Mesmo comportamento de SportmonksClient._make_request: entradas
+        vencidas são servidas enquanto uma task atualiza o cache, requisições
+        idênticas simultâneas viram uma só e 404 vai para o cache negativo.
+
+        Args:
+            cache: Consultar e gravar o cache (False nas buscas em lote, que
+                gravam cada item com a chave do getter individual)
+
+        Raises:
+            SportmonksNotFoundError: 404 da API ou do cache negativo
+        """
+        # Cópia local: chamadas concorrentes podem compartilhar o mesmo dict
+        params = dict(params or {})
+
+        # Tentar buscar no cache primeiro
+        entry = await self._run_blocking(self._get_cache_entry, endpoint, params, entity_type) if cache else None
+        if entry is not None:
+            if not entry.fresh:
+                self.stale_served += 1
+                if not self.offline:
+                    self._schedule_refresh(endpoint, params, entity_type, entry, base_url)
+            return self._check_not_found(endpoint, entry.value)
+
+        # Se não encontrou no cache, fazer requisição à API (uma só entre chamadas idênticas)
+        shared_cache = cache and self.enable_cache and self.use_redis
+        flight_key = (self.redis_cache._generate_key(endpoint, params) if shared_cache
+                      else self._generate_cache_key(endpoint, params))
+
+        async def fetch_cached():
+            return await self._run_blocking(self._get_fresh, flight_key, entity_type)
+
+        result = await self.single_flight.do_async(
+            flight_key,
+            lambda: self._fetch(endpoint, params, entity_type, cache, base_url=base_url),
+            fetch_cached=fetch_cached if shared_cache else None
+        )
+        return self._check_not_found(endpoint, result)
+
+    def _schedule_refresh(self, endpoint: str, params: Dict, entity_type: str = None,
+                          entry: Optional[CacheEntry] = None, base_url: Optional[str] = None):
+        """Agenda a atualização de uma entrada vencida em uma task (uma por chave por vez)"""
+        key = self.redis_cache._generate_key(endpoint, params)
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.ensure_future(self._refresh(key, endpoint, dict(params), entity_type, entry, base_url))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, key: str, endpoint: str, params: Dict, entity_type: str = None,
+                       entry: Optional[CacheEntry] = None, base_url: Optional[str] = None):
+        async def fetch_cached():
+            return await self._run_blocking(self._get_fresh, key, entity_type)
+
+        try:
+            await self.single_flight.do_async(
+                key,
+                lambda: self._fetch(endpoint, params, entity_type, revalidate=entry, base_url=base_url),
+                fetch_cached=fetch_cached
+            )
+            self.background_refreshes += 1
+            logger.debug(f"🔄 Cache atualizado em segundo plano: {endpoint}")
+        except SportmonksNotFoundError:
+            self.background_refreshes += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao atualizar cache de {endpoint}: {e}")
+        finally:
+            self._refreshing.discard(key)
+
+    async def _fetch(self, endpoint: str, params: Dict, entity_type: str = None, cache: bool = True,
+                     revalidate: Optional[CacheEntry] = None,
+                     base_url: Optional[str] = None) -> Dict[str, Any]:
+        """Requisição à API (sem consulta ao cache), com os mesmos tratamentos de SportmonksClient._fetch"""
+        session = self._ensure_session()
+        url = f"{base_url or self.base_url}{endpoint}"
+        params = dict(params, api_token=self.api_key)
+        headers = self._conditional_headers(revalidate)
+        bucket = self._rate_limit_bucket(endpoint)
+
+        async with self._semaphore:
+            await self._acquire_rate_limit(bucket)
+
+            try:
+                response = await session.get(url, params=params, headers=headers or None)
+                self.requests_made += 1
+                self._update_rate_limit_from_headers(response.headers, bucket)
+
+                # Verifica status 429 (Too Many Requests)
+                if response.status_code == 429:
+                    retry_after = int(response.headers.get('Retry-After', 60))
+                    logger.warning(f"Rate limit excedido. Aguardando {retry_after} segundos...")
+                    await asyncio.sleep(retry_after)
+                    raise Exception("Rate limit exceeded")
+
+                if response.status_code == 404:
+                    if cache and self.enable_cache and self.use_redis:
+                        await self._run_blocking(self.smart_cache.cache_not_found, endpoint, params, entity_type)
+                    raise SportmonksNotFoundError(f"Recurso não encontrado: {endpoint}")
+
+                if response.status_code == 304 and headers:
+                    self.not_modified += 1
+                    logger.debug(f"♻️ 304 Not Modified: {endpoint}")
+                    if cache:
+                        validators = {**revalidate.validators, **(self._response_validators(response.headers) or {})}
+                        await self._run_blocking(self._save_to_cache, endpoint, params, revalidate.value,
+                                                 entity_type, validators)
+                    return revalidate.value
+
+                response.raise_for_status()
+                response_data = response.json()
+                self._update_rate_limit_from_body(response_data, bucket)
+
+            except httpx.HTTPError as e:
+                logger.error(f"Erro na requisição para {url}: {str(e)}")
+                if isinstance(e, httpx.HTTPStatusError):
+                    logger.error(f"Resposta: {e.response.text}")
+                raise
+
+        # Salvar no cache
+        if cache:
+            await self._run_blocking(self._save_to_cache, endpoint, params, response_data, entity_type,
+                                     self._response_validators(response.headers))
+
+        return response_data
+
+    async def warm_up_cache(self) -> Dict[str, int]:
+        """
+        Aquece o cache com dados frequentemente acessados
+
+        Os loaders assíncronos rodam concorrentemente; as estatísticas seguem
+        o formato de SmartCacheManager.warm_up_cache.
+        """
+        if not self.enable_cache or not self.use_redis:
+            return {"error": "Redis cache não disponível"}
+
+        loaders = {
+            'countries': self.get_countries,
+            'states': self.get_states,
+            'types': self.get_types
+        }
+        preload = [entity for entity, strategy in self.smart_cache.cache_strategies.items()
+                   if strategy.get('preload', False) and entity in loaders]
+        results = await asyncio.gather(*[loaders[entity]() for entity in preload], return_exceptions=True)
+
+        def loaded(result):
+            def loader():
+                if isinstance(result, Exception):
+                    raise result
+                return result
+            return loader
+
+        try:
+            return self.smart_cache.warm_up_cache(
+                preload, loaders={entity: loaded(result) for entity, result in zip(preload, results)}
+            )
+        except Exception as e:
+            logger.error(f"❌ Erro ao aquecer cache: {e}")
+            return {"error": str(e)}
+
+    async def iter_pages(self, endpoint: str, params: Optional[Dict] = None,
+                         max_pages: Optional[int] = None, entity_type: str = None,
+                         max_workers: Optional[int] = None,
+                         base_url: Optional[str] = None) -> AsyncIterator[List[Dict]]:
+        """
+        Itera sobre as páginas de um endpoint paginado, em ordem
+
+        Após a primeira página, até max_workers páginas seguintes são
+        buscadas concorrentemente (limitadas também por max_concurrency).
+        """
+        params = dict(params or {})
+        start_page = int(params.pop('page', 1))
+        if max_workers is None:
+            max_workers = max(1, Config.PAGINATION_WORKERS)
+
+        def fetch(page: int):
+            return asyncio.ensure_future(
+                self._make_request(endpoint, dict(params, page=page), entity_type, base_url)
+            )
+
+        response = await fetch(start_page)
+        yield response.get('data', [])
+
+        pagination = response.get('pagination', {})
+        if not pagination.get('has_more', False):
+            return
+
+        last_page = self._last_page(pagination, start_page, max_pages)
+        pending = {}
+        try:
+            next_page = start_page + 1
+            page = start_page + 1
+            while True:
+                while len(pending) < max_workers and (last_page is None or next_page <= last_page):
+                    pending[next_page] = fetch(next_page)
+                    next_page += 1
+
+                if page not in pending:
+                    break
+
+                response = await pending.pop(page)
+                yield response.get('data', [])
+
+                if not response.get('pagination', {}).get('has_more', False):
+                    break
+                page += 1
+        finally:
+            for task in pending.values():
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending.values(), return_exceptions=True)
+
+    async def iter_items(self, endpoint: str, params: Optional[Dict] = None,
+                         max_pages: Optional[int] = None, entity_type: str = None,
+                         max_workers: Optional[int] = None,
+                         base_url: Optional[str] = None) -> AsyncIterator[Dict]:
+        """
+        Itera item a item sobre um endpoint paginado
+
+        Os métodos iter_transfers/iter_rounds/iter_stages/iter_fixtures_by_date_range
+        herdados retornam este iterador assíncrono (usar com async for).
+        """
+        async for page_data in self.iter_pages(endpoint, params, max_pages, entity_type,
+                                               max_workers, base_url):
+            for item in page_data:
+                yield item
+
+    async def get_paginated_data(self, endpoint: str, params: Optional[Dict] = None,
+                                 max_pages: Optional[int] = None, entity_type: str = None,
+                                 base_url: Optional[str] = None,
+                                 max_workers: Optional[int] = None) -> List[Dict]:
+        """Obtém dados paginados da API"""
+        all_data = []
+        async for page_data in self.iter_pages(endpoint, params, max_pages, entity_type,
+                                               max_workers, base_url):
+            all_data.extend(page_data)
+
+        return all_data
+
+    # Métodos para endpoints específicos
+
+    @staticmethod
+    def _include_params(include: Optional[str] = None) -> Dict:
+        params = {}
+        if include:
+            params['include'] = include
+        return params
+
+    async def get_countries(self, include: Optional[str] = None) -> List[Dict]:
+        """Obtém lista de países"""
+        return await self.get_paginated_data('/countries', self._include_params(include),
+                                             base_url=self.CORE_BASE_URL)
+
+    async def get_leagues(self, include: Optional[str] = None) -> List[Dict]:
+        """Obtém lista de ligas"""
+        return await self.get_paginated_data('/leagues', self._include_params(include))
+
+    async def get_league_by_id(self, league_id: int, include: Optional[str] = None) -> Dict:
+        """Obtém detalhes de uma liga específica"""
+        response = await self._make_request(f'/leagues/{league_id}', self._include_params(include))
+        return response.get('data', {})
+
+    async def get_seasons(self, include: Optional[str] = None) -> List[Dict]:
+        """Obtém lista de temporadas"""
+        return await self.get_paginated_data('/seasons', self._include_params(include))
+
+    async def get_season_by_id(self, season_id: int, include: Optional[str] = None) -> Dict:
+        """Obtém detalhes de uma temporada específica"""
+        response = await self._make_request(f'/seasons/{season_id}', self._include_params(include))
+        return response.get('data', {})
+
+    async def get_teams_by_season(self, season_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Obtém times de uma temporada"""
+        return await self.get_paginated_data(f'/teams/seasons/{season_id}', self._include_params(include))
+
+    async def get_fixtures_by_date_range(self, start_date: str, end_date: str,
+                                         include: Optional[str] = None) -> List[Dict]:
+        """Obtém partidas em um intervalo de datas"""
+        return await self.get_paginated_data(f'/fixtures/between/{start_date}/{end_date}',
+                                             self._include_params(include), entity_type='Fixture')
+
+    async def get_fixture_by_id(self, fixture_id: int, include: Optional[str] = None) -> Dict:
+        """Obtém detalhes de uma partida específica"""
+        response = await self._make_request(f'/fixtures/{fixture_id}', self._include_params(include))
+        return response.get('data', {})
+
+    async def get_team_by_id(self, team_id: int, include: Optional[str] = None) -> Dict:
+        """Obtém detalhes de um time específico"""
+        response = await self._make_request(f'/teams/{team_id}', self._include_params(include), 'teams')
+        return response.get('data', {}) if response else {}
+
+    async def _get_many_by_id(self, resource: str, ids: Iterable[int], include: Optional[str],
+                              entity_type: str,
+                              fetch_missing: Callable[[List[int], Dict], Awaitable[List[Dict]]]) -> Dict[int, Dict]:
+        """Versão assíncrona de SportmonksClient._get_many_by_id (MGET/pipeline fora do event loop)"""
+        params, keys, result, missing = await self._run_blocking(
+            self._get_cached_by_id, resource, ids, include, entity_type
+        )
+        if missing:
+            fetched = await fetch_missing(missing, params)
+            await self._run_blocking(self._cache_fetched_by_id, resource, keys, result, missing,
+                                     fetched, entity_type)
+        return result
+
+    async def get_players_by_ids(self, player_ids: Iterable[int], include: Optional[str] = None) -> Dict[int, Dict]:
+        """
+        Obtém vários jogadores: os cacheados com um MGET, os demais da API
+        (concorrentemente, limitados por max_concurrency)
+
+        Returns:
+            Dicionário player_id -> dados (IDs com erro na API ficam de fora)
+        """
+        async def fetch_player(player_id: int, params: Dict) -> Optional[Dict]:
+            try:
+                response = await self._make_request(f'/players/{player_id}', params, 'players', cache=False)
+            except Exception as e:
+                logger.error(f"❌ Erro ao buscar jogador {player_id}: {e}")
+                return None
+            return response.get('data') if response else None
+
+        async def fetch_missing(ids: List[int], params: Dict) -> List[Dict]:
+            players = await asyncio.gather(*[fetch_player(player_id, params) for player_id in ids])
+            return [player for player in players if player]
+
+        return await self._get_many_by_id('players', player_ids, include, 'players', fetch_missing)
+
+    async def get_fixtures_by_ids(self, fixture_ids: Iterable[int], include: Optional[str] = None) -> Dict[int, Dict]:
+        """
+        Obtém várias partidas: as cacheadas com um MGET, as demais via fixtures/multi
+        (lotes de até MULTI_MAX_IDS buscados concorrentemente)
+
+        Returns:
+            Dicionário fixture_id -> dados (IDs com erro na API ficam de fora)
+        """
+        async def fetch_chunk(chunk: List[int], params: Dict) -> List[Dict]:
+            try:
+                response = await self._make_request(f"/fixtures/multi/{','.join(map(str, chunk))}",
+                                                    params, 'fixtures', cache=False)
+            except Exception as e:
+                logger.error(f"❌ Erro ao buscar lote de {len(chunk)} partidas: {e}")
+                return []
+            return (response or {}).get('data') or []
+
+        async def fetch_missing(ids: List[int], params: Dict) -> List[Dict]:
+            chunks = [ids[start:start + self.MULTI_MAX_IDS] for start in range(0, len(ids), self.MULTI_MAX_IDS)]
+            results = await asyncio.gather(*[fetch_chunk(chunk, params) for chunk in chunks])
+            return [fixture for fixtures in results for fixture in fixtures]
+
+        return await self._get_many_by_id('fixtures', fixture_ids, include, 'fixtures', fetch_missing)
+
+    async def get_venues(self, include: Optional[str] = None) -> List[Dict]:
+        """Obtém lista de estádios"""
+        return await self.get_paginated_data('/venues', self._include_params(include))
+
+    async def get_referees(self, include: Optional[str] = None) -> List[Dict]:
+        """Obtém lista de árbitros"""
+        return await self.get_paginated_data('/referees', self._include_params(include))
+
+    async def get_players_by_team(self, team_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Obtém jogadores de um time"""
+        return await self.get_paginated_data(f'/squads/teams/{team_id}', self._include_params(include))
+
+    async def get_states(self) -> List[Dict]:
+        """Obtém lista de estados (status de partidas)"""
+        response = await self._make_request('/states', base_url=self.CORE_BASE_URL)
+        return response.get('data', [])
+
+    async def get_types(self) -> List[Dict]:
+        """Obtém lista de tipos (tipos de eventos, estatísticas, etc)"""
+        response = await self._make_request('/types', base_url=self.CORE_BASE_URL)
+        return response.get('data', [])
+
+    async def get_player_by_id(self, player_id: int, include: Optional[str] = None) -> Dict:
+        """Obtém detalhes de um jogador específico"""
+        response = await self._make_request(f'/players/{player_id}', self._include_params(include))
+        return response.get('data', {})
+
+    async def _get_fixture_include(self, fixture_id: int, relation: str,
+                                   include: Optional[str] = None) -> List[Dict]:
+        params = {'include': f"{relation},{include}" if include else relation}
+        response = await self._make_request(f'/fixtures/{fixture_id}', params, relation)
+        if response and response.get('data'):
+            return response['data'].get(relation, [])
+        return []
+
+    async def get_events_by_fixture(self, fixture_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Busca events de uma fixture específica"""
+        return await self._get_fixture_include(fixture_id, 'events', include)
+
+    async def get_statistics_by_fixture(self, fixture_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Busca statistics de uma fixture específica"""
+        return await self._get_fixture_include(fixture_id, 'statistics', include)
+
+    async def get_lineups_by_fixture(self, fixture_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Busca lineups de uma fixture específica"""
+        return await self._get_fixture_include(fixture_id, 'lineups', include)
+
+    async def get_coaches_by_team(self, team_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Busca coaches de um team específico"""
+        params = {'include': f"coaches,{include}" if include else 'coaches'}
+        response = await self._make_request(f'/teams/{team_id}', params, 'coaches')
+        if response and response.get('data'):
+            return response['data'].get('coaches', [])
+        return []
+
+    async def get_coach_by_id(self, coach_id: int, include: Optional[str] = None) -> Dict:
+        """Busca um coach específico por ID"""
+        response = await self._make_request(f'/coaches/{coach_id}', self._include_params(include), 'coach')
+        return response.get('data', {}) if response else {}
+
+    async def get_standings(self, include: Optional[str] = None) -> List[Dict]:
+        """Busca todas as classificações (standings)"""
+        return await self.get_paginated_data('/standings', self._include_params(include))
+
+    async def get_standings_by_season(self, season_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Busca classificações de uma temporada específica"""
+        params = {'season_id': season_id, **self._include_params(include)}
+        response = await self._make_request('/standings', params, 'standings')
+        return response.get('data', []) if response else []
+
+    async def get_standings_by_league(self, league_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Busca classificações de uma liga específica"""
+        params = {'league_id': league_id, **self._include_params(include)}
+        response = await self._make_request('/standings', params, 'standings')
+        return response.get('data', []) if response else []
+
+    async def get_transfers(self, include: Optional[str] = None,
+                            per_page: int = 500,
+                            page: int = 1) -> List[Dict]:
+        """Obtém lista de transferências"""
+        params = {'per_page': per_page, 'page': page, **self._include_params(include)}
+        return await self.get_paginated_data('/transfers', params)
+
+    async def get_transfers_by_player(self, player_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Obtém transferências de um jogador específico"""
+        return await self.get_paginated_data(f'/transfers/players/{player_id}', self._include_params(include))
+
+    async def get_transfers_by_team(self, team_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Obtém transferências de um time específico"""
+        return await self.get_paginated_data(f'/transfers/teams/{team_id}', self._include_params(include))
+
+    async def get_rounds(self, include: Optional[str] = None,
+                         per_page: int = 500,
+                         page: int = 1) -> List[Dict]:
+        """Obtém lista de rounds/rodadas"""
+        params = {'per_page': per_page, 'page': page, **self._include_params(include)}
+        return await self.get_paginated_data('/rounds', params)
+
+    async def get_rounds_by_season(self, season_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Obtém rounds de uma temporada específica"""
+        return await self.get_paginated_data(f'/rounds/seasons/{season_id}', self._include_params(include))
+
+    async def get_round_by_id(self, round_id: int, include: Optional[str] = None) -> Dict:
+        """Obtém um round específico por ID"""
+        response = await self._make_request(f'/rounds/{round_id}', self._include_params(include), 'round')
+        return response.get('data', {}) if response else {}
+
+    async def get_stages(self, include: Optional[str] = None,
+                         per_page: int = 500,
+                         page: int = 1) -> List[Dict]:
+        """Obtém lista de stages/fases"""
+        params = {'per_page': per_page, 'page': page, **self._include_params(include)}
+        return await self.get_paginated_data('/stages', params)
+
+    async def get_stages_by_season(self, season_id: int, include: Optional[str] = None) -> List[Dict]:
+        """Obtém stages de uma temporada específica"""
+        return await self.get_paginated_data(f'/stages/seasons/{season_id}', self._include_params(include))
+
+    async def get_stage_by_id(self, stage_id: int, include: Optional[str] = None) -> Dict:
+        """Obtém um stage específico por ID"""
+        response = await self._make_request(f'/stages/{stage_id}', self._include_params(include), 'stage')
+        return response.get('data', {}) if response else {}
+
+    async def get_fixtures_multi(self, fixture_ids: str, include: Optional[str] = None) -> Dict:
+        """Obtém múltiplas fixtures usando endpoint multi"""
+        response = await self._make_request(f'/fixtures/multi/{fixture_ids}',
+                                            self._include_params(include), 'fixtures')
+        return response if response else {}
+
+    async def get_fixture_with_includes(self, fixture_id: int, include: Optional[str] = None) -> Dict:
+        """Obtém uma fixture específica com includes"""
+        response = await self._make_request(f'/fixtures/{fixture_id}', self._include_params(include), 'fixture')
+        return response if response else {}
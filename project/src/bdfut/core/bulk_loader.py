@@ -0,0 +1,199 @@
+"""
+Carga em massa via PostgreSQL direto
+===================================
+
+Caminho alternativo ao upsert JSON do PostgREST para volumes grandes:
+cada lote é enviado com COPY para uma tabela temporária de staging e
+mesclado na tabela final com INSERT ... ON CONFLICT DO UPDATE.
+
+Uso:
+    loader = PostgresBulkLoader(Config.DATABASE_URL)
+    loader.bulk_upsert('fixtures', rows, conflict_columns=['sportmonks_id'])
+"""
+import io
+import json
+import logging
+from datetime import date, datetime
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence
+
+import psycopg2
+from psycopg2 import sql
+
+from ..config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def chunked(items: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+    """Agrupa um iterável em listas de até chunk_size itens, sem materializá-lo"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_value(value: Any) -> str:
+    """Serializa um valor no formato texto do COPY"""
+    if value is None:
+        return r'\N'
+    value_type = type(value)
+    if value_type is int or value_type is float:
+        return str(value)
+    if value_type is bool:
+        return 't' if value else 'f'
+    if value_type is str:
+        return value.translate(_COPY_ESCAPES)
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False, default=str)
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    else:
+        value = str(value)
+
+    return value.translate(_COPY_ESCAPES)
+
+
+class PostgresBulkLoader:
+    """Upsert em massa via COPY + INSERT ... ON CONFLICT"""
+
+    def __init__(self, dsn: Optional[str] = None, chunk_size: Optional[int] = None,
+                 connection=None):
+        """
+        Args:
+            dsn: String de conexão PostgreSQL (padrão: Config.DATABASE_URL)
+            chunk_size: Linhas por lote/transação (padrão: Config.BULK_LOAD_CHUNK_SIZE)
+            connection: Conexão psycopg2 já aberta (opcional)
+        """
+        self.dsn = dsn or Config.DATABASE_URL
+        self.chunk_size = chunk_size or Config.BULK_LOAD_CHUNK_SIZE
+        self._connection = connection
+
+        if not self.dsn and connection is None:
+            raise ValueError("DATABASE_URL não configurada para carga em massa")
+
+    @property
+    def connection(self):
+        if self._connection is None or self._connection.closed:
+            self._connection = psycopg2.connect(self.dsn)
+            logger.info("✅ Conectado ao PostgreSQL para carga em massa")
+        return self._connection
+
+    def close(self):
+        if self._connection is not None and not self._connection.closed:
+            self._connection.close()
+        self._connection = None
+
+    @staticmethod
+    def _columns(rows: List[Dict]) -> List[str]:
+        """União das chaves das linhas, na ordem em que aparecem"""
+        columns = {}
+        for row in rows:
+            for key in row:
+                columns.setdefault(key, None)
+        return list(columns)
+
+    @staticmethod
+    def _dedupe(rows: List[Dict], conflict_columns: Sequence[str]) -> List[Dict]:
+        """
+        Mantém a última ocorrência de cada chave de conflito
+
+        ON CONFLICT DO UPDATE não aceita afetar a mesma linha duas vezes no
+        mesmo comando.
+        """
+        unique = {}
+        for row in rows:
+            unique[tuple(row.get(column) for column in conflict_columns)] = row
+        return list(unique.values())
+
+    def _copy_buffer(self, rows: List[Dict], columns: List[str]) -> io.StringIO:
+        lines = ['\t'.join([_copy_value(value) for value in map(row.get, columns)]) for row in rows]
+        lines.append('')
+        return io.StringIO('\n'.join(lines))
+
+    def _merge_statement(self, table: str, columns: List[str],
+                         conflict_columns: Sequence[str]) -> sql.Composed:
+        target = sql.Identifier(*table.split('.'))
+        column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+        update_columns = [c for c in columns if c not in conflict_columns]
+
+        if update_columns:
+            # Mesma semântica do upsert REST: NULL no lote (ou coluna ausente na
+            # linha) sobrescreve o valor existente
+            action = sql.SQL('DO UPDATE SET {}').format(sql.SQL(', ').join(
+                sql.SQL('{col} = EXCLUDED.{col}').format(col=sql.Identifier(column))
+                for column in update_columns
+            ))
+        else:
+            action = sql.SQL('DO NOTHING')
+
+        return sql.SQL(
+            'INSERT INTO {target} ({columns}) SELECT {columns} FROM bdfut_bulk_stage '
+            'ON CONFLICT ({conflict}) {action}'
+        ).format(
+            target=target,
+            columns=column_list,
+            conflict=sql.SQL(', ').join(map(sql.Identifier, conflict_columns)),
+            action=action
+        )
+
+    def _load_chunk(self, table: str, rows: List[Dict], conflict_columns: Sequence[str]) -> int:
+        rows = self._dedupe(rows, conflict_columns)
+        columns = self._columns(rows)
+        target = sql.Identifier(*table.split('.'))
+        column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+        conn = self.connection
+
+        try:
+            with conn.cursor() as cursor:
+                # Staging só com os tipos das colunas (sem NOT NULL/defaults da tabela final)
+                cursor.execute(sql.SQL(
+                    'CREATE TEMP TABLE bdfut_bulk_stage ON COMMIT DROP AS '
+                    'SELECT {columns} FROM {target} WITH NO DATA'
+                ).format(columns=column_list, target=target))
+
+                cursor.copy_expert(
+                    sql.SQL('COPY bdfut_bulk_stage ({columns}) FROM STDIN').format(
+                        columns=column_list
+                    ).as_string(conn),
+                    self._copy_buffer(rows, columns)
+                )
+
+                cursor.execute(self._merge_statement(table, columns, conflict_columns))
+                affected = cursor.rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        return affected
+
+    def bulk_upsert(self, table: str, rows: Iterable[Dict],
+                    conflict_columns: Sequence[str],
+                    chunk_size: Optional[int] = None) -> int:
+        """
+        Insere ou atualiza linhas em massa
+
+        Args:
+            table: Tabela de destino (aceita 'schema.tabela')
+            rows: Linhas já mapeadas para as colunas da tabela (lista ou gerador)
+            conflict_columns: Colunas da constraint única usada no ON CONFLICT
+            chunk_size: Linhas por lote/transação
+
+        Returns:
+            Número de linhas inseridas ou atualizadas
+        """
+        if isinstance(conflict_columns, str):
+            conflict_columns = [c.strip() for c in conflict_columns.split(',')]
+
+        total = 0
+        for chunk in chunked(rows, chunk_size or self.chunk_size):
+            total += self._load_chunk(table, chunk, conflict_columns)
+
+        logger.info(f"📦 Carga em massa: {total} registros em {table}")
+        return total
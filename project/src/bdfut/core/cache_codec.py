@@ -0,0 +1,217 @@
+"""
+Codec binário para valores do cache
+==================================
+
+Serializa e comprime as respostas da API antes de gravá-las no Redis.
+Cada valor começa com um cabeçalho de 2 bytes:
+
+    0xBD | (serializador << 4 | compressor)
+
+Valores sem o byte 0xBD são entradas antigas em texto JSON e continuam
+sendo lidas. Serializadores: json (stdlib), orjson, msgpack. Compressores:
+nenhum, zlib (stdlib), zstd, lz4. Bibliotecas opcionais ausentes são
+ignoradas no modo 'auto'.
+
+Uso:
+    codec = CacheCodec()                # melhor combinação disponível
+    data = codec.encode({'data': [...]})
+    value = codec.decode(data)
+"""
+import json
+import time
+import zlib
+import logging
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+HEADER_MAGIC = 0xBD  # Nunca é o primeiro byte de um texto JSON
+
+
+class _Method(NamedTuple):
+    id: int
+    available: bool
+    dump: Callable
+    load: Callable
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode()
+
+
+def _zstd_compress(data: bytes, level: Optional[int]) -> bytes:
+    return zstandard.ZstdCompressor(level=level or 3).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+# Os ids fazem parte do formato gravado: nunca reutilizar nem renumerar
+SERIALIZERS = {
+    'json': _Method(0, True, _json_dumps, json.loads),
+    'orjson': _Method(1, ORJSON_AVAILABLE,
+                      lambda value: orjson.dumps(value), lambda data: orjson.loads(data)),
+    'msgpack': _Method(2, MSGPACK_AVAILABLE,
+                       lambda value: msgpack.packb(value, use_bin_type=True),
+                       lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False)),
+}
+
+COMPRESSORS = {
+    'none': _Method(0, True, lambda data, level: data, lambda data: data),
+    'zlib': _Method(1, True, lambda data, level: zlib.compress(data, 6 if level is None else level),
+                    zlib.decompress),
+    'zstd': _Method(2, ZSTD_AVAILABLE, _zstd_compress, _zstd_decompress),
+    'lz4': _Method(3, LZ4_AVAILABLE,
+                   lambda data, level: lz4.frame.compress(data, compression_level=level or 0),
+                   lambda data: lz4.frame.decompress(data)),
+}
+
+_SERIALIZERS_BY_ID = {method.id: (name, method) for name, method in SERIALIZERS.items()}
+_COMPRESSORS_BY_ID = {method.id: (name, method) for name, method in COMPRESSORS.items()}
+
+
+def _resolve(methods: Dict[str, _Method], name: str, preference: List[str], kind: str) -> str:
+    if name == 'auto':
+        return next(candidate for candidate in preference if methods[candidate].available)
+    if name not in methods:
+        raise ValueError(f"{kind} desconhecido: {name} (opções: {', '.join(methods)})")
+    if not methods[name].available:
+        raise ValueError(f"{kind} '{name}' indisponível: biblioteca não instalada")
+    return name
+
+
+class CacheCodec:
+    """Serialização + compressão com cabeçalho de versão"""
+
+    def __init__(self, serializer: str = 'auto', compression: str = 'auto',
+                 level: Optional[int] = None, min_compress_bytes: int = 1024):
+        """
+        Args:
+            serializer: 'auto', 'json', 'orjson' ou 'msgpack'
+            compression: 'auto', 'none', 'zlib', 'zstd' ou 'lz4'
+            level: Nível de compressão (padrão de cada biblioteca)
+            min_compress_bytes: Valores menores são gravados sem compressão
+        """
+        self.serializer = _resolve(SERIALIZERS, serializer, ['orjson', 'msgpack', 'json'], 'Serializador')
+        self.compression = _resolve(COMPRESSORS, compression, ['zstd', 'lz4', 'zlib'], 'Compressor')
+        self.level = level
+        self.min_compress_bytes = min_compress_bytes
+
+    @property
+    def name(self) -> str:
+        return f"{self.serializer}+{self.compression}"
+
+    def encode(self, value: Any) -> bytes:
+        serializer = SERIALIZERS[self.serializer]
+        data = serializer.dump(value)
+
+        compression = COMPRESSORS[self.compression]
+        if compression.id and len(data) >= self.min_compress_bytes:
+            data = compression.dump(data, self.level)
+        else:
+            compression = COMPRESSORS['none']
+
+        return bytes((HEADER_MAGIC, serializer.id << 4 | compression.id)) + data
+
+    def decode(self, data: Union[bytes, str]) -> Any:
+        """Decodifica valores com cabeçalho ou entradas antigas em texto JSON"""
+        if isinstance(data, str):
+            return json.loads(data)
+        if not data or data[0] != HEADER_MAGIC:
+            return json.loads(data.decode())
+
+        try:
+            serializer_name, serializer = _SERIALIZERS_BY_ID[data[1] >> 4]
+            compressor_name, compressor = _COMPRESSORS_BY_ID[data[1] & 0x0F]
+        except (IndexError, KeyError):
+            raise ValueError(f"Cabeçalho de cache inválido: {data[:2]!r}")
+
+        for name, method in ((serializer_name, serializer), (compressor_name, compressor)):
+            if not method.available:
+                raise ValueError(f"Valor gravado com '{name}', que não está instalado")
+
+        return serializer.load(compressor.load(data[2:]))
+
+
+def available_codecs() -> List[CacheCodec]:
+    """Todas as combinações serializador/compressor instaladas"""
+    return [
+        CacheCodec(serializer, compression)
+        for serializer, serializer_method in SERIALIZERS.items() if serializer_method.available
+        for compression, compression_method in COMPRESSORS.items() if compression_method.available
+    ]
+
+
+def benchmark_codecs(payloads: Iterable[Any], codecs: Optional[List[CacheCodec]] = None,
+                     repeat: int = 5) -> List[Dict[str, Any]]:
+    """
+    Mede bytes gravados e latência de encode/decode por codec
+
+    Args:
+        payloads: Respostas da API (ex.: fixtures/multi gravadas em JSON)
+        codecs: Codecs a comparar (padrão: todos os disponíveis)
+        repeat: Repetições por payload (usa a menor latência)
+
+    Returns:
+        Uma linha por codec, ordenada por bytes, com o texto JSON atual como referência
+    """
+    payloads = list(payloads)
+    baseline = sum(len(json.dumps(payload).encode()) for payload in payloads)
+    results = []
+
+    for codec in codecs or available_codecs():
+        total_bytes = 0
+        encode_seconds = 0.0
+        decode_seconds = 0.0
+        for payload in payloads:
+            best_encode = best_decode = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                data = codec.encode(payload)
+                best_encode = min(best_encode, time.perf_counter() - start)
+
+                start = time.perf_counter()
+                codec.decode(data)
+                best_decode = min(best_decode, time.perf_counter() - start)
+
+            total_bytes += len(data)
+            encode_seconds += best_encode
+            decode_seconds += best_decode
+
+        count = max(len(payloads), 1)
+        results.append({
+            'codec': codec.name,
+            'bytes': total_bytes,
+            'ratio': round(total_bytes / baseline, 4) if baseline else 0,
+            'encode_ms': round(encode_seconds * 1000 / count, 3),
+            'decode_ms': round(decode_seconds * 1000 / count, 3)
+        })
+
+    results.sort(key=lambda row: row['bytes'])
+    return [{'codec': 'json (texto atual)', 'bytes': baseline, 'ratio': 1.0,
+             'encode_ms': None, 'decode_ms': None}] + results
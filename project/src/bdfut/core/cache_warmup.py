@@ -0,0 +1,146 @@
+"""
+Aquecimento preditivo do cache
+=============================
+
+Usa o calendário de partidas do banco para pré-carregar no cache o que as
+próximas execuções do ETL vão pedir:
+
+- Dados estáticos (types, states, countries) no início da execução
+- Partidas que começam nas próximas CACHE_WARMUP_HOURS_AHEAD horas, via
+  fixtures/multi (até 100 IDs por requisição) com participantes e escalações
+- Cada partida é gravada com a chave de get_fixture_by_id; os participantes
+  com a chave de get_team_by_id e as escalações com a de get_lineups_by_fixture
+
+O número de requisições é limitado por CACHE_WARMUP_MAX_REQUESTS e o
+aquecimento é pulado quando a API informa menos de CACHE_WARMUP_MIN_REMAINING
+requisições restantes, para não competir com a sincronização.
+
+Uso:
+    planner = CacheWarmupPlanner(SportmonksClient(), SupabaseClient())
+    stats = planner.run()
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from ..config.config import Config
+from .redis_cache import SmartCacheManager
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmupPlanner:
+    """Planeja e executa o aquecimento do cache a partir das próximas partidas"""
+
+    def __init__(self, client, supabase=None, hours_ahead: Optional[int] = None,
+                 include: Optional[str] = None, max_requests: Optional[int] = None):
+        """
+        Args:
+            client: SportmonksClient com cache Redis
+            supabase: SupabaseClient para ler o calendário (None = apenas dados estáticos)
+            hours_ahead: Janela de partidas a pré-carregar
+            include: Includes das partidas pré-carregadas
+            max_requests: Máximo de requisições fixtures/multi por execução
+        """
+        self.client = client
+        self.supabase = supabase
+        self.hours_ahead = hours_ahead or Config.CACHE_WARMUP_HOURS_AHEAD
+        self.include = include or Config.CACHE_WARMUP_INCLUDE
+        self.max_requests = max_requests or Config.CACHE_WARMUP_MAX_REQUESTS
+
+    @property
+    def cache_enabled(self) -> bool:
+        return bool(self.client.enable_cache and self.client.use_redis and hasattr(self.client, 'smart_cache'))
+
+    def upcoming_fixture_ids(self, now: Optional[datetime] = None) -> List[int]:
+        """IDs Sportmonks das partidas da janela, das mais próximas para as mais distantes"""
+        if self.supabase is None:
+            return []
+        now = now or datetime.now()
+        limit = self.max_requests * self.client.MULTI_MAX_IDS
+        rows = self.supabase.get_upcoming_fixtures(now, now + timedelta(hours=self.hours_ahead), limit)
+        return list(dict.fromkeys(row['sportmonks_id'] for row in rows if row.get('sportmonks_id')))
+
+    def within_budget(self) -> bool:
+        remaining = self.client.rate_limit_remaining
+        if remaining is not None and remaining < Config.CACHE_WARMUP_MIN_REMAINING:
+            logger.warning(f"⚠️ Aquecimento de partidas pulado: {remaining} requisições restantes")
+            return False
+        return True
+
+    def prefetch_fixtures(self, fixture_ids: List[int]) -> Dict[str, int]:
+        """
+        Pré-carrega partidas, times e escalações
+
+        Partidas já em cache não geram requisição (get_fixtures_by_ids lê com MGET
+        e busca apenas as ausentes).
+        """
+        stats = {'fixtures': 0, 'teams': 0, 'lineups': 0}
+        if not fixture_ids or not self.within_budget():
+            return stats
+
+        fixture_ids = fixture_ids[:self.max_requests * self.client.MULTI_MAX_IDS]
+        fixtures = self.client.get_fixtures_by_ids(fixture_ids, self.include)
+        stats['fixtures'] = len(fixtures)
+
+        teams, lineups = self._derived_entries(fixtures.values())
+        self._store(teams, 'teams')
+        self._store(lineups, 'lineups')
+        stats['teams'] = len(teams)
+        stats['lineups'] = len(lineups)
+        return stats
+
+    def _derived_entries(self, fixtures) -> tuple:
+        """Respostas de get_team_by_id e get_lineups_by_fixture montadas a partir das partidas"""
+        includes = {name.split('.')[0] for name in self.include.replace(',', ';').split(';') if name}
+        teams: Dict[str, Dict] = {}
+        lineups: Dict[str, Dict] = {}
+
+        for fixture in fixtures:
+            for participant in fixture.get('participants') or []:
+                if participant.get('id') is None:
+                    continue
+                team = {key: value for key, value in participant.items() if key != 'meta'}
+                key = self.client.redis_cache._generate_key(f"/teams/{team['id']}", {})
+                teams[key] = {'data': team}
+
+            if fixture.get('lineups'):
+                base = {key: value for key, value in fixture.items() if key not in includes}
+                key = self.client.redis_cache._generate_key(f"/fixtures/{fixture['id']}", {'include': 'lineups'})
+                lineups[key] = {'data': {**base, 'lineups': fixture['lineups']}}
+
+        return teams, lineups
+
+    def _store(self, items: Dict[str, Dict], entity_type: str):
+        if not items:
+            return
+        smart_cache = self.client.smart_cache
+        tags = {key: SmartCacheManager._item_tags(entity_type, value['data']) for key, value in items.items()}
+        ttls = {key: smart_cache.response_ttl(f'/{entity_type}', value, entity_type)
+                for key, value in items.items()}
+        self.client.redis_cache.set_many(items, entity_type, tags, ttls)
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Executa o aquecimento completo
+
+        Returns:
+            Itens pré-carregados por tipo (-1 para dados estáticos com erro)
+        """
+        if not self.cache_enabled:
+            logger.warning("⚠️ Aquecimento de cache requer o cache Redis habilitado")
+            return {'error': 'Redis cache não disponível'}
+
+        logger.info("🔥 Aquecendo cache...")
+        stats: Dict[str, Any] = dict(self.client.warm_up_cache())
+
+        try:
+            fixture_ids = self.upcoming_fixture_ids(now)
+            logger.info(f"📅 {len(fixture_ids)} partidas nas próximas {self.hours_ahead}h")
+            stats.update(self.prefetch_fixtures(fixture_ids))
+        except Exception as e:
+            logger.error(f"❌ Erro ao aquecer cache de partidas: {e}")
+            stats['fixtures'] = -1
+
+        logger.info(f"✅ Cache aquecido: {stats}")
+        return stats
@@ -0,0 +1,145 @@
+"""
+Hash de conteúdo por entidade
+============================
+
+Guarda, por entidade, o hash do payload normalizado de cada registro
+(ex.: fixture_id -> hash) para que a sincronização incremental grave apenas
+o que mudou desde a última execução.
+
+No Redis cada entidade é um hash bdfut:content:<entidade> (HMGET/HSET em
+pipeline, um round-trip por lote); sem Redis os hashes ficam em memória e
+valem apenas para o processo.
+
+Uso:
+    store = ContentHashStore(redis_cache)
+    diff = store.diff('fixtures', fixtures)
+    if supabase.upsert_fixtures(diff.changed):
+        store.commit('fixtures', diff.hashes)
+"""
+import json
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from ..config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ContentDiff(NamedTuple):
+    changed: List[Dict]
+    unchanged: List[Dict]
+    hashes: Dict[str, str]  # id -> hash dos registros alterados
+
+
+class ContentHashStore:
+    """Hashes de conteúdo por entidade no Redis (ou em memória)"""
+
+    KEY_PREFIX = 'bdfut:content:'
+
+    def __init__(self, redis_cache=None, ttl: Optional[int] = None):
+        """
+        Args:
+            redis_cache: RedisCache compartilhado entre execuções (None = apenas em memória)
+            ttl: Validade dos hashes de cada entidade (renovada a cada commit)
+        """
+        self.redis_cache = redis_cache
+        self.ttl = ttl or Config.CONTENT_HASH_TTL
+        self._local: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(payload: Any) -> str:
+        """Hash do payload normalizado (chaves ordenadas, sem espaços)"""
+        normalized = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+    def _redis(self):
+        cache = self.redis_cache
+        if cache is None or not cache.redis_available or cache.redis_client is None:
+            return None
+        return cache.redis_client
+
+    def _key(self, entity_type: str) -> str:
+        return f"{self.KEY_PREFIX}{entity_type}"
+
+    def get_many(self, entity_type: str, ids: List[str]) -> Dict[str, str]:
+        """Hashes gravados para os ids (ausentes ficam de fora)"""
+        if not ids:
+            return {}
+
+        client = self._redis()
+        if client is not None:
+            try:
+                values = client.hmget(self._key(entity_type), ids)
+                return {
+                    entity_id: value.decode() if isinstance(value, bytes) else value
+                    for entity_id, value in zip(ids, values) if value is not None
+                }
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao ler hashes de conteúdo: {e}")
+
+        with self._lock:
+            stored = self._local.get(entity_type, {})
+            return {entity_id: stored[entity_id] for entity_id in ids if entity_id in stored}
+
+    def diff(self, entity_type: str, items: Iterable[Dict], id_field: str = 'id',
+             force: bool = False) -> ContentDiff:
+        """
+        Separa registros alterados (ou novos) dos inalterados
+
+        Registros sem id são sempre considerados alterados.
+
+        Args:
+            force: Considerar todos alterados (os hashes são recalculados mesmo assim)
+        """
+        items = list(items)
+        hashes = {}
+        for item in items:
+            if item.get(id_field) is not None:
+                hashes[str(item[id_field])] = self.content_hash(item)
+
+        stored = {} if force else self.get_many(entity_type, list(hashes))
+        changed, unchanged, changed_hashes = [], [], {}
+        for item in items:
+            entity_id = str(item.get(id_field)) if item.get(id_field) is not None else None
+            if entity_id is not None and stored.get(entity_id) == hashes[entity_id]:
+                unchanged.append(item)
+            else:
+                changed.append(item)
+                if entity_id is not None:
+                    changed_hashes[entity_id] = hashes[entity_id]
+
+        return ContentDiff(changed, unchanged, changed_hashes)
+
+    def commit(self, entity_type: str, hashes: Dict[str, str]) -> bool:
+        """Grava os hashes (chamar somente após a gravação dos registros no banco)"""
+        if not hashes:
+            return True
+
+        client = self._redis()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                pipe.hset(self._key(entity_type), mapping=hashes)
+                pipe.expire(self._key(entity_type), self.ttl)
+                pipe.execute()
+                return True
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao gravar hashes de conteúdo: {e}")
+
+        with self._lock:
+            self._local.setdefault(entity_type, {}).update(hashes)
+        return True
+
+    def clear(self, entity_type: str):
+        """Esquece os hashes da entidade (próxima sincronização grava tudo)"""
+        client = self._redis()
+        if client is not None:
+            try:
+                client.delete(self._key(entity_type))
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao remover hashes de conteúdo: {e}")
+        with self._lock:
+            self._local.pop(entity_type, None)
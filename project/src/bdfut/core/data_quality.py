@@ -4,16 +4,46 @@ Framework de Data Quality Checks
 
 Sistema abrangente de validação de qualidade de dados
 com relatórios automáticos e alertas.
+
+Campos obrigatórios, unicidade e integridade referencial de todas as tabelas
+vêm de uma única chamada RPC (data_quality_stats, migração
+20261017120000_create_data_quality_stats.sql), que executa um SELECT por
+tabela: nulos de todos os campos em uma varredura, duplicatas via GROUP BY e
+órfãos via anti-join. Sem a função no banco, campos obrigatórios são contados
+pela API REST e unicidade/integridade ficam como não verificadas.
+
+Modo incremental (run_all_quality_checks(incremental=True)): cada tabela é
+avaliada apenas nas linhas com marca d'água (updated_at) posterior à da
+última execução, guardada em data_quality_state junto dos totais acumulados
+por regra e do job que a avançou. A marca d'água avança mesmo com falhas: as
+regras que falharam ficam marcadas em rule_totals e são reavaliadas à parte,
+desde a marca d'água em que falharam, até passarem. Tabelas sem estado, sem
+a coluna de marca d'água ou com a última varredura completa há mais de
+DATA_QUALITY_REBASELINE_DAYS dias são verificadas por inteiro (rebaseline).
+
+Perfil por amostragem (run_quality_profiling): nas tabelas grandes de
+PROFILE_RULES a taxa de nulos, os valores fora do intervalo, os valores mais
+frequentes e os distintos são estimados em uma amostra TABLESAMPLE BERNOULLI
+(RPC data_quality_profile, migração 20261017140000_create_data_quality_profiles.sql)
+com intervalos de confiança de 95%. Sem a função no banco, uma amostra por
+reservatório é tirada das primeiras DATA_QUALITY_PROFILE_SCAN_ROWS linhas lidas
+pela API, com HyperLogLog para os distintos; esse prefixo em ordem de id não é
+uma amostra uniforme, e o perfil é gravado como não representativo. Cada perfil
+é gravado em data_quality_profiles, de onde get_quality_trends calcula a deriva
+apenas entre perfis representativos.
 """
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple, Union
 import json
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
 
+from ..config.config import Config
 from .supabase_client import SupabaseClient
 from .etl_metadata import ETLMetadataManager, ETLJobContext
+from .quality_sampling import HyperLogLog, ReservoirSample, estimate_distinct, wilson_interval
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +79,48 @@ class QualityCheckResult:
 class DataQualityManager:
     """Gerenciador de verificações de qualidade de dados"""
     
+    QUALITY_STATS_RPC = 'data_quality_stats'
+    QUALITY_STATE_TABLE = 'data_quality_state'
+    DEFAULT_WATERMARK_COLUMN = 'updated_at'
+    PROFILE_RPC = 'data_quality_profile'
+    PROFILE_TABLE = 'data_quality_profiles'
+    PROFILE_PAGE_SIZE = 1000
+    # Regras calculadas por data_quality_stats (limitadas pela marca d'água);
+    # as customizadas olham a tabela inteira e ficam fora dos totais por regra
+    WATERMARK_SCOPED_CHECKS = ('required_field_', 'unique_field_', 'referential_integrity_')
+    # Métrica → (valor, limite inferior, limite superior) em data_quality_profiles
+    PROFILE_DRIFT_METRICS = {
+        'null_rate': ('null_rate', 'null_rate_low', 'null_rate_high'),
+        'out_of_range_rate': ('out_of_range_rate', 'out_of_range_low', 'out_of_range_high'),
+        'distinct': ('distinct_estimate', 'distinct_low', 'distinct_high')
+    }
+    
+    # Perfil por amostragem: coluna → intervalo válido (min/max) e valores mais frequentes (top)
+    PROFILE_RULES = {
+        'match_events': {
+            'fixture_id': {},
+            'type_id': {'top': 10},
+            'player_id': {},
+            'period_id': {'top': 5},
+            'minute': {'min': 0, 'max': 130},
+            'extra_minute': {'min': 0, 'max': 30}
+        },
+        'match_statistics': {
+            'fixture_id': {},
+            'team_id': {},
+            'type_id': {'top': 10},
+            'location': {'top': 3},
+            'ball_possession': {'min': 0, 'max': 100}
+        },
+        'match_lineups': {
+            'fixture_id': {},
+            'player_id': {},
+            'position_id': {'top': 10},
+            'jersey_number': {'min': 1, 'max': 99},
+            'minutes_played': {'min': 0, 'max': 130}
+        }
+    }
+    
     # Configurações de validação por tabela
     QUALITY_RULES = {
         'countries': {
@@ -117,22 +189,185 @@ class DataQualityManager:
         
         logger.info("✅ DataQualityManager inicializado")
     
-    def run_all_quality_checks(self, tables: Optional[List[str]] = None) -> Dict[str, Any]:
+    def _rules_payload(self, tables: List[str],
+                       since: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Regras de QUALITY_RULES no formato esperado por data_quality_stats"""
+        payload = {}
+        for table_name in tables:
+            rules = self.QUALITY_RULES.get(table_name)
+            if rules is None:
+                continue
+            payload[table_name] = {
+                'watermark_column': rules.get('watermark_column', self.DEFAULT_WATERMARK_COLUMN),
+                'since': (since or {}).get(table_name),
+                'required_fields': rules['required_fields'],
+                'unique_fields': rules['unique_fields'],
+                'referential_integrity': [
+                    {'column': column, 'table': ref_table, 'field': ref_field}
+                    for column, ref_table, ref_field in rules['referential_integrity']
+                ]
+            }
+        return payload
+    
+    def fetch_quality_stats(self, tables: List[str],
+                            since: Optional[Dict[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Nulos, duplicatas e órfãos de várias tabelas em uma chamada RPC
+        
+        Args:
+            tables: Tabelas a verificar
+            since: Marca d'água por tabela (ISO 8601); só linhas posteriores são avaliadas
+        
+        Returns:
+            Estatísticas por tabela ({} se a função não estiver disponível):
+            total, nulls/duplicates/orphans por campo, max_watermark, incremental,
+            missing_columns, missing_references ou error
+        """
+        payload = self._rules_payload(tables, since)
+        if not payload:
+            return {}
+        
+        try:
+            result = self.supabase.client.rpc(self.QUALITY_STATS_RPC, {'p_rules': payload}).execute()
+            return result.data or {}
+        except Exception as e:
+            logger.warning(f"⚠️ RPC {self.QUALITY_STATS_RPC} indisponível, usando verificações individuais: {e}")
+            return {}
+    
+    def load_quality_state(self, tables: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Marca d'água, totais por regra e última varredura completa de cada tabela"""
+        try:
+            result = self.supabase.client.table(self.QUALITY_STATE_TABLE).select('*').in_('table_name', tables).execute()
+            return {row['table_name']: row for row in result.data or []}
+        except Exception as e:
+            logger.warning(f"⚠️ Estado das verificações incrementais indisponível: {e}")
+            return {}
+    
+    def _incremental_since(self, state: Dict[str, Dict[str, Any]], now: datetime) -> Dict[str, str]:
+        """Marcas d'água das tabelas que não precisam de rebaseline"""
+        cutoff = now - timedelta(days=Config.DATA_QUALITY_REBASELINE_DAYS)
+        since = {}
+        for table_name, row in state.items():
+            last_full = row.get('last_full_run_at')
+            if not row.get('watermark') or not last_full:
+                continue
+            if datetime.fromisoformat(last_full.replace('Z', '+00:00')).replace(tzinfo=None) < cutoff:
+                continue
+            since[table_name] = row['watermark']
+        return since
+    
+    @classmethod
+    def _failing_rules(cls, row: Optional[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+        """Regras com falha em aberto → marca d'água a partir da qual reavaliar (None = tabela inteira)"""
+        totals = (row or {}).get('rule_totals') or {}
+        return {name: entry['failing_since'] for name, entry in totals.items() if 'failing_since' in entry}
+    
+    def _recheck_since(self, state: Dict[str, Dict[str, Any]], since: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """Início da reavaliação das regras com falha de cada tabela incremental"""
+        recheck = {}
+        for table_name in since:
+            failing = self._failing_rules(state.get(table_name))
+            if not failing:
+                continue
+            starts = list(failing.values())
+            recheck[table_name] = None if None in starts else min(starts)
+        return recheck
+    
+    def _recheck_failing(self, table_name: str, stats: Optional[Dict[str, Any]], since: Optional[str],
+                         previous: Optional[Dict[str, Any]]) -> Dict[str, QualityCheckResult]:
+        """Resultado atual das regras com falha em aberto, desde a marca d'água em que falharam"""
+        failing = self._failing_rules(previous)
+        if not failing or not stats or stats.get('error'):
+            return {}
+        rechecks = {}
+        for check in self._stats_checks(table_name, self.QUALITY_RULES[table_name], stats):
+            if check.check_name in failing:
+                check.details['recheck_since'] = since
+                rechecks[check.check_name] = check
+        return rechecks
+    
+    @classmethod
+    def _is_watermark_scoped(cls, check: QualityCheckResult) -> bool:
+        return check.check_name.startswith(cls.WATERMARK_SCOPED_CHECKS)
+    
+    def _next_quality_state(self, table_name: str, stats: Dict[str, Any], checks: List[QualityCheckResult],
+                            previous: Optional[Dict[str, Any]], job_id: Optional[str],
+                            now: datetime, since: Optional[str] = None,
+                            rechecks: Optional[Dict[str, QualityCheckResult]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Novo estado da tabela após a verificação (None = manter o anterior)
+        
+        Varredura completa: totais, falhas e marca d'água recomeçam a partir dela.
+        Incremental: a marca d'água avança e os totais são somados. Uma regra
+        que falha fica com failing_since (a marca d'água da execução, ou None
+        na varredura completa) até a reavaliação (rechecks) passar.
+        Só entram nos totais as regras limitadas pela marca d'água e executadas.
+        """
+        if not stats or stats.get('error'):
+            return None
+        
+        incremental = bool(stats.get('incremental'))
+        totals = dict((previous or {}).get('rule_totals') or {}) if incremental else {}
+        rechecks = rechecks or {}
+        for check in checks:
+            if (not self._is_watermark_scoped(check) or self._is_not_checked(check)
+                    or check.details.get('error')):
+                continue
+            current = totals.get(check.check_name) or {'rows_checked': 0, 'affected': 0}
+            entry = {
+                'rows_checked': current['rows_checked'] + check.total_records,
+                'affected': current['affected'] + check.affected_records
+            }
+            if 'failing_since' in current and check.check_name not in rechecks:
+                # Reavaliação indisponível nesta execução: mantém a falha em aberto
+                entry['failing_since'] = current['failing_since']
+            elif check.check_name in rechecks and not rechecks[check.check_name].passed:
+                entry['failing_since'] = current['failing_since']
+            elif not check.passed:
+                entry['failing_since'] = since if incremental else None
+            totals[check.check_name] = entry
+        
+        state = {
+            'table_name': table_name,
+            'watermark': stats.get('max_watermark') or (previous or {}).get('watermark'),
+            'rule_totals': totals,
+            'last_full_run_at': (previous or {}).get('last_full_run_at') if incremental else now.isoformat(),
+            'last_job_id': job_id,
+            'updated_at': now.isoformat()
+        }
+        return state
+    
+    def save_quality_state(self, rows: List[Dict[str, Any]]) -> bool:
+        """Grava o estado das tabelas verificadas com um único upsert"""
+        if not rows:
+            return True
+        try:
+            self.supabase.client.table(self.QUALITY_STATE_TABLE).upsert(rows, on_conflict='table_name').execute()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar estado das verificações incrementais: {e}")
+            return False
+    
+    def run_all_quality_checks(self, tables: Optional[List[str]] = None,
+                               incremental: bool = False) -> Dict[str, Any]:
         """
         Executa todas as verificações de qualidade
         
         Args:
             tables: Lista de tabelas para verificar (None = todas)
+            incremental: Avaliar apenas as linhas alteradas desde a última execução,
+                reavaliando à parte as regras com falha em aberto (False = varredura
+                completa, que refaz a linha de base)
             
         Returns:
             Relatório completo de qualidade
         """
         with ETLJobContext(
-            job_name="data_quality_checks_complete",
+            job_name="data_quality_checks_incremental" if incremental else "data_quality_checks_complete",
             job_type="quality_checks",
             metadata_manager=self.metadata_manager,
             script_path=__file__,
-            input_parameters={"tables": tables}
+            input_parameters={"tables": tables, "incremental": incremental}
         ) as job:
             
             logger.info("🔍 INICIANDO VERIFICAÇÕES DE QUALIDADE DE DADOS")
@@ -142,6 +377,16 @@ class DataQualityManager:
             if tables is None:
                 tables = list(self.QUALITY_RULES.keys())
             
+            # Uma chamada para as estatísticas de todas as tabelas
+            now = datetime.now()
+            quality_state = self.load_quality_state(tables)
+            since = self._incremental_since(quality_state, now) if incremental else {}
+            quality_stats = self.fetch_quality_stats(tables, since)
+            # Regras com falha em aberto: uma chamada à parte, desde quando falharam
+            recheck_since = self._recheck_since(quality_state, since)
+            recheck_stats = self.fetch_quality_stats(list(recheck_since), recheck_since) if recheck_since else {}
+            new_state = []
+            
             report = {
                 'start_time': datetime.now(),
                 'tables_checked': len(tables),
@@ -151,8 +396,10 @@ class DataQualityManager:
                 'warnings': 0,
                 'errors': 0,
                 'critical_issues': 0,
+                'not_checked': 0,
                 'table_results': {},
                 'overall_score': 0.0,
+                'incremental_tables': [],
                 'recommendations': []
             }
             
@@ -169,11 +416,35 @@ class DataQualityManager:
                         progress_percentage=(len(report['table_results']) / len(tables)) * 100
                     )
                     
-                    table_results = self.check_table_quality(table_name)
+                    table_stats = quality_stats.get(table_name, {})
+                    table_results = self.check_table_quality(table_name, table_stats)
                     report['table_results'][table_name] = table_results
                     
+                    if table_stats.get('incremental'):
+                        report['incremental_tables'].append(table_name)
+                    rechecks = self._recheck_failing(
+                        table_name, recheck_stats.get(table_name), recheck_since.get(table_name),
+                        quality_state.get(table_name)
+                    )
+                    state = self._next_quality_state(
+                        table_name, table_stats, table_results['checks'],
+                        quality_state.get(table_name), job.job_id, now, since.get(table_name), rechecks
+                    )
+                    if state is not None:
+                        new_state.append(state)
+                        table_results['running_totals'] = state['rule_totals']
+                    if rechecks:
+                        # A reavaliação cobre a janela atual e as linhas que falharam antes
+                        table_results['checks'] = [rechecks.get(check.check_name, check)
+                                                   for check in table_results['checks']]
+                        table_results.update(self._score(table_results['checks']))
+                    
                     # Atualizar contadores
                     for result in table_results['checks']:
+                        # Regras não executadas ficam fora do score
+                        if self._is_not_checked(result):
+                            report['not_checked'] += 1
+                            continue
                         report['total_checks'] += 1
                         
                         if result.passed:
@@ -190,6 +461,8 @@ class DataQualityManager:
                     
                     logger.info(f"✅ Tabela {table_name}: {table_results['score']:.1%} qualidade")
                 
+                self.save_quality_state(new_state)
+                
                 # Calcular score geral
                 if report['total_checks'] > 0:
                     report['overall_score'] = report['passed_checks'] / report['total_checks']
@@ -224,12 +497,13 @@ class DataQualityManager:
                 report['error'] = str(e)
                 return report
     
-    def check_table_quality(self, table_name: str) -> Dict[str, Any]:
+    def check_table_quality(self, table_name: str, stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Verifica qualidade de uma tabela específica
         
         Args:
             table_name: Nome da tabela
+            stats: Estatísticas da tabela já obtidas (None = buscar via RPC)
             
         Returns:
             Resultados das verificações da tabela
@@ -246,33 +520,23 @@ class DataQualityManager:
         checks = []
         
         try:
-            # 1. Verificar campos obrigatórios
-            required_checks = self._check_required_fields(table_name, rules['required_fields'])
-            checks.extend(required_checks)
-            
-            # 2. Verificar unicidade
-            unique_checks = self._check_unique_fields(table_name, rules['unique_fields'])
-            checks.extend(unique_checks)
+            if stats is None:
+                stats = self.fetch_quality_stats([table_name]).get(table_name, {})
+            if stats.get('error'):
+                logger.warning(f"⚠️ Estatísticas de qualidade de {table_name} indisponíveis: {stats['error']}")
+                stats = {}
             
-            # 3. Verificar integridade referencial
-            ref_checks = self._check_referential_integrity(table_name, rules['referential_integrity'])
-            checks.extend(ref_checks)
+            # 1-3. Campos obrigatórios, unicidade e integridade referencial
+            checks.extend(self._stats_checks(table_name, rules, stats))
             
             # 4. Verificações customizadas
             custom_checks = self._run_custom_checks(table_name, rules['custom_checks'])
             checks.extend(custom_checks)
             
-            # Calcular score da tabela
-            passed = sum(1 for check in checks if check.passed)
-            total = len(checks)
-            score = passed / total if total > 0 else 1.0
-            
             return {
                 'table_name': table_name,
                 'checks': checks,
-                'total_checks': total,
-                'passed_checks': passed,
-                'score': score,
+                **self._score(checks),
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -285,21 +549,78 @@ class DataQualityManager:
                 'score': 0.0
             }
     
-    def _check_required_fields(self, table_name: str, required_fields: List[str]) -> List[QualityCheckResult]:
+    @staticmethod
+    def _missing_column_check(check_name: str, table_name: str, column: str) -> QualityCheckResult:
+        return QualityCheckResult(
+            check_name=check_name,
+            table_name=table_name,
+            severity=QualityCheckSeverity.ERROR,
+            passed=False,
+            message=f"Coluna '{column}' não existe em {table_name}",
+            details={'field': column, 'error': 'missing_column'}
+        )
+    
+    def _stats_checks(self, table_name: str, rules: Dict[str, Any],
+                      stats: Dict[str, Any]) -> List[QualityCheckResult]:
+        """Verificações derivadas das estatísticas (obrigatórios, unicidade e integridade referencial)"""
+        return [
+            *self._check_required_fields(table_name, rules['required_fields'], stats),
+            *self._check_unique_fields(table_name, rules['unique_fields'], stats),
+            *self._check_referential_integrity(table_name, rules['referential_integrity'], stats)
+        ]
+    
+    @classmethod
+    def _score(cls, checks: List[QualityCheckResult]) -> Dict[str, Any]:
+        """Score da tabela, sem as regras não executadas"""
+        scored = [check for check in checks if not cls._is_not_checked(check)]
+        passed = sum(1 for check in scored if check.passed)
+        return {
+            'total_checks': len(scored),
+            'passed_checks': passed,
+            'not_checked': len(checks) - len(scored),
+            'score': passed / len(scored) if scored else 1.0
+        }
+    
+    @staticmethod
+    def _is_not_checked(check: QualityCheckResult) -> bool:
+        return check.details.get('status') == 'not_checked'
+    
+    @staticmethod
+    def _not_checked(check_name: str, table_name: str, details: Dict[str, Any]) -> QualityCheckResult:
+        return QualityCheckResult(
+            check_name=check_name,
+            table_name=table_name,
+            severity=QualityCheckSeverity.WARNING,
+            passed=True,
+            message=f"Verificação '{check_name}' não executada (função {DataQualityManager.QUALITY_STATS_RPC} indisponível)",
+            details={**details, 'status': 'not_checked'}
+        )
+    
+    def _check_required_fields(self, table_name: str, required_fields: List[str],
+                               stats: Optional[Dict[str, Any]] = None) -> List[QualityCheckResult]:
         """Verifica se campos obrigatórios estão preenchidos"""
         checks = []
         
         try:
-            # Executar query para verificar campos nulos
+            if stats:
+                null_counts = stats.get('nulls') or {}
+                total_count = stats.get('total') or 0
+            else:
+                # Sem RPC: um count de nulos por campo e o total uma única vez
+                null_counts = {}
+                total_result = self.supabase.client.table(table_name).select('id', count='exact').limit(1).execute()
+                total_count = total_result.count if total_result.count is not None else 0
+            
             for field in required_fields:
                 try:
-                    # Contar registros com campo nulo
-                    result = self.supabase.client.table(table_name).select('id', count='exact').is_('NULL', field).execute()
-                    null_count = result.count if result.count is not None else 0
-                    
-                    # Contar total de registros
-                    total_result = self.supabase.client.table(table_name).select('id', count='exact').execute()
-                    total_count = total_result.count if total_result.count is not None else 0
+                    if stats:
+                        if field not in null_counts:
+                            checks.append(self._missing_column_check(f"required_field_{field}", table_name, field))
+                            continue
+                        null_count = null_counts[field]
+                    else:
+                        result = self.supabase.client.table(table_name).select('id', count='exact').is_(field, 'null').limit(1).execute()
+                        null_count = result.count if result.count is not None else 0
                     
                     passed = null_count == 0
                     severity = QualityCheckSeverity.ERROR if not passed else QualityCheckSeverity.INFO
@@ -330,89 +651,79 @@ class DataQualityManager:
         
         return checks
     
-    def _check_unique_fields(self, table_name: str, unique_fields: List[str]) -> List[QualityCheckResult]:
-        """Verifica se campos únicos não têm duplicatas"""
+    def _check_unique_fields(self, table_name: str, unique_fields: List[str],
+                             stats: Optional[Dict[str, Any]] = None) -> List[QualityCheckResult]:
+        """Verifica se campos únicos não têm duplicatas (linhas além da primeira de cada valor)"""
         checks = []
+        duplicates = (stats or {}).get('duplicates') or {}
         
-        try:
-            for field in unique_fields:
-                try:
-                    # Query para encontrar duplicatas
-                    # Simulação da query (implementação real dependeria do schema específico)
-                    # SELECT field, COUNT(*) as count FROM table GROUP BY field HAVING COUNT(*) > 1
-                    
-                    # Por simplicidade, vou simular que não há duplicatas
-                    duplicates_count = 0  # Placeholder
-                    
-                    passed = duplicates_count == 0
-                    severity = QualityCheckSeverity.ERROR if not passed else QualityCheckSeverity.INFO
-                    
-                    checks.append(QualityCheckResult(
-                        check_name=f"unique_field_{field}",
-                        table_name=table_name,
-                        severity=severity,
-                        passed=passed,
-                        message=f"Campo único '{field}' {'✅ OK' if passed else f'❌ {duplicates_count} duplicatas'}",
-                        details={'field': field, 'duplicates_count': duplicates_count},
-                        affected_records=duplicates_count
-                    ))
-                    
-                except Exception as e:
-                    checks.append(QualityCheckResult(
-                        check_name=f"unique_field_{field}",
-                        table_name=table_name,
-                        severity=QualityCheckSeverity.ERROR,
-                        passed=False,
-                        message=f"Erro ao verificar unicidade de '{field}': {e}",
-                        details={'field': field, 'error': str(e)}
-                    ))
+        for field in unique_fields:
+            check_name = f"unique_field_{field}"
+            if not stats:
+                checks.append(self._not_checked(check_name, table_name, {'field': field}))
+                continue
+            if field not in duplicates:
+                checks.append(self._missing_column_check(check_name, table_name, field))
+                continue
             
-        except Exception as e:
-            logger.error(f"❌ Erro ao verificar campos únicos de {table_name}: {e}")
+            duplicates_count = duplicates[field]
+            passed = duplicates_count == 0
+            severity = QualityCheckSeverity.ERROR if not passed else QualityCheckSeverity.INFO
+            
+            checks.append(QualityCheckResult(
+                check_name=check_name,
+                table_name=table_name,
+                severity=severity,
+                passed=passed,
+                message=f"Campo único '{field}' {'✅ OK' if passed else f'❌ {duplicates_count} duplicatas'}",
+                details={'field': field, 'duplicates_count': duplicates_count},
+                affected_records=duplicates_count,
+                total_records=stats.get('total') or 0
+            ))
         
         return checks
     
-    def _check_referential_integrity(self, table_name: str, ref_rules: List[Tuple[str, str, str]]) -> List[QualityCheckResult]:
-        """Verifica integridade referencial"""
+    def _check_referential_integrity(self, table_name: str, ref_rules: List[Tuple[str, str, str]],
+                                     stats: Optional[Dict[str, Any]] = None) -> List[QualityCheckResult]:
+        """Verifica integridade referencial (valores não nulos sem registro na tabela referenciada)"""
         checks = []
+        orphans = (stats or {}).get('orphans') or {}
         
-        try:
-            for foreign_key, ref_table, ref_field in ref_rules:
-                try:
-                    # Query para encontrar referências órfãs
-                    # Simulação (implementação real seria mais complexa)
-                    orphans_count = 0  # Placeholder
-                    
-                    passed = orphans_count == 0
-                    severity = QualityCheckSeverity.ERROR if not passed else QualityCheckSeverity.INFO
-                    
-                    checks.append(QualityCheckResult(
-                        check_name=f"referential_integrity_{foreign_key}",
-                        table_name=table_name,
-                        severity=severity,
-                        passed=passed,
-                        message=f"Integridade referencial {foreign_key} -> {ref_table}.{ref_field} {'✅ OK' if passed else f'❌ {orphans_count} órfãos'}",
-                        details={
-                            'foreign_key': foreign_key,
-                            'reference_table': ref_table,
-                            'reference_field': ref_field,
-                            'orphans_count': orphans_count
-                        },
-                        affected_records=orphans_count
-                    ))
-                    
-                except Exception as e:
-                    checks.append(QualityCheckResult(
-                        check_name=f"referential_integrity_{foreign_key}",
-                        table_name=table_name,
-                        severity=QualityCheckSeverity.ERROR,
-                        passed=False,
-                        message=f"Erro ao verificar integridade referencial {foreign_key}: {e}",
-                        details={'foreign_key': foreign_key, 'error': str(e)}
-                    ))
+        for foreign_key, ref_table, ref_field in ref_rules:
+            check_name = f"referential_integrity_{foreign_key}"
+            details = {
+                'foreign_key': foreign_key,
+                'reference_table': ref_table,
+                'reference_field': ref_field
+            }
+            if not stats:
+                checks.append(self._not_checked(check_name, table_name, details))
+                continue
+            if foreign_key not in orphans:
+                checks.append(QualityCheckResult(
+                    check_name=check_name,
+                    table_name=table_name,
+                    severity=QualityCheckSeverity.ERROR,
+                    passed=False,
+                    message=f"Integridade referencial {foreign_key} -> {ref_table}.{ref_field}: coluna ou tabela inexistente",
+                    details={**details, 'error': 'missing_reference'}
+                ))
+                continue
             
-        except Exception as e:
-            logger.error(f"❌ Erro ao verificar integridade referencial de {table_name}: {e}")
+            orphans_count = orphans[foreign_key]
+            passed = orphans_count == 0
+            severity = QualityCheckSeverity.ERROR if not passed else QualityCheckSeverity.INFO
+            
+            checks.append(QualityCheckResult(
+                check_name=check_name,
+                table_name=table_name,
+                severity=severity,
+                passed=passed,
+                message=f"Integridade referencial {foreign_key} -> {ref_table}.{ref_field} {'✅ OK' if passed else f'❌ {orphans_count} órfãos'}",
+                details={**details, 'orphans_count': orphans_count},
+                affected_records=orphans_count,
+                total_records=stats.get('total') or 0
+            ))
         
         return checks
     
@@ -568,6 +879,7 @@ class DataQualityManager:
             f"  • Total de verificações: {results['total_checks']}",
             f"  • Verificações passaram: {results['passed_checks']}",
             f"  • Verificações falharam: {results['failed_checks']}",
+            f"  • Não executadas (fora do score): {results.get('not_checked', 0)}",
             "",
             "🚨 PROBLEMAS ENCONTRADOS:",
             f"  • Críticos: {results['critical_issues']}",
@@ -627,6 +939,304 @@ class DataQualityManager:
         
         return "\n".join(report_lines)
     
+    def profile_table(self, table_name: str, sample_percent: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Perfil estatístico de uma tabela a partir de uma amostra
+        
+        Args:
+            table_name: Tabela de PROFILE_RULES
+            sample_percent: Percentual amostrado pelo TABLESAMPLE
+                (padrão: DATA_QUALITY_PROFILE_SAMPLE_PERCENT)
+        
+        Returns:
+            method, sample_rows, estimated_total e, por coluna, taxa de nulos,
+            taxa e estimativa de fora do intervalo, distintos estimados e
+            valores mais frequentes, cada um com intervalo de 95%
+        """
+        rules = self.PROFILE_RULES.get(table_name)
+        if rules is None:
+            return {'table_name': table_name, 'error': f'Tabela {table_name} não tem regras de perfil definidas'}
+        
+        try:
+            result = self.supabase.client.rpc(self.PROFILE_RPC, {
+                'p_table': table_name,
+                'p_columns': [{'column': column, **options} for column, options in rules.items()],
+                'p_sample_percent': sample_percent or Config.DATA_QUALITY_PROFILE_SAMPLE_PERCENT,
+                'p_method': Config.DATA_QUALITY_PROFILE_SAMPLING
+            }).execute()
+            stats = result.data or {}
+        except Exception as e:
+            logger.warning(f"⚠️ RPC {self.PROFILE_RPC} indisponível, amostrando {table_name} pela API: {e}")
+            stats = self._reservoir_profile_stats(table_name, rules)
+        
+        if stats.get('error'):
+            logger.warning(f"⚠️ Perfil de {table_name} indisponível: {stats['error']}")
+            return {'table_name': table_name, 'error': stats['error']}
+        if stats.get('representative') is False:
+            logger.warning(f"⚠️ Perfil de {table_name} a partir das primeiras linhas por id: "
+                           f"não representativo, fora do cálculo de deriva")
+        return self._build_profile(table_name, rules, stats)
+    
+    def _reservoir_profile_stats(self, table_name: str, rules: Dict[str, Dict[str, Any]],
+                                 seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Contagens da amostra por reservatório, no formato da RPC data_quality_profile
+        
+        Lê no máximo DATA_QUALITY_PROFILE_SCAN_ROWS linhas (em ordem de id) e
+        mantém DATA_QUALITY_PROFILE_RESERVOIR_SIZE delas. Se a leitura chegou
+        ao fim da tabela, os distintos vêm do HyperLogLog de todas as linhas lidas.
+        Caso contrário o reservatório cobre só o prefixo da tabela (linhas mais
+        antigas) e o resultado é marcado como não representativo.
+        """
+        reservoir = ReservoirSample(Config.DATA_QUALITY_PROFILE_RESERVOIR_SIZE, seed)
+        sketches = {column: HyperLogLog() for column in rules}
+        columns = None
+        estimated_total = None
+        scanned = 0
+        complete = False
+        
+        while scanned < Config.DATA_QUALITY_PROFILE_SCAN_ROWS:
+            page_size = min(self.PROFILE_PAGE_SIZE, Config.DATA_QUALITY_PROFILE_SCAN_ROWS - scanned)
+            query = self.supabase.client.table(table_name).select(
+                '*', count='estimated' if estimated_total is None else None
+            )
+            result = query.order('id').range(scanned, scanned + page_size - 1).execute()
+            rows = result.data or []
+            if estimated_total is None:
+                estimated_total = result.count or 0
+            if columns is None:
+                columns = [column for column in rules if not rows or column in rows[0]]
+            
+            for row in rows:
+                reservoir.add(tuple(row.get(column) for column in columns))
+                for column in columns:
+                    if row.get(column) is not None:
+                        sketches[column].add(row[column])
+            scanned += len(rows)
+            if len(rows) < page_size:
+                complete = True
+                break
+        
+        columns = columns or []
+        column_stats = {}
+        for position, column in enumerate(columns):
+            values = [item[position] for item in reservoir.items]
+            counts = Counter(value for value in values if value is not None)
+            options = rules[column]
+            stats = {
+                'nulls': sum(1 for value in values if value is None),
+                'distinct': len(counts),
+                'singletons': sum(1 for count in counts.values() if count == 1),
+                'out_of_range': sum(
+                    1 for value in counts.elements()
+                    if (options.get('min') is not None and value < options['min']) or
+                       (options.get('max') is not None and value > options['max'])
+                ) if 'min' in options or 'max' in options else 0,
+                'top': [{'value': value, 'count': count} for value, count in counts.most_common(options.get('top', 0))]
+            }
+            if complete:
+                stats['distinct_estimate'] = sketches[column].count()
+                stats['distinct_interval'] = list(sketches[column].interval())
+            column_stats[column] = stats
+        
+        return {
+            'method': 'reservoir',
+            'representative': complete,
+            'sample_rows': len(reservoir.items),
+            'scanned_rows': scanned,
+            'estimated_total': scanned if complete else max(estimated_total or 0, scanned),
+            'columns': column_stats,
+            'missing_columns': [column for column in rules if column not in columns]
+        }
+    
+    def _build_profile(self, table_name: str, rules: Dict[str, Dict[str, Any]],
+                       stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Taxas, estimativas e intervalos de confiança a partir das contagens da amostra"""
+        sample_rows = stats.get('sample_rows') or 0
+        estimated_total = max(stats.get('estimated_total') or 0, sample_rows)
+        columns = {}
+        
+        for column, column_stats in (stats.get('columns') or {}).items():
+            nulls = column_stats.get('nulls') or 0
+            non_null = sample_rows - nulls
+            # Linhas não nulas estimadas na tabela
+            total_non_null = round(estimated_total * non_null / sample_rows) if sample_rows else 0
+            profile = {
+                'null_rate': nulls / sample_rows if sample_rows else 0.0,
+                'null_rate_interval': list(wilson_interval(nulls, sample_rows))
+            }
+            
+            options = rules.get(column, {})
+            if 'min' in options or 'max' in options:
+                out_of_range = column_stats.get('out_of_range') or 0
+                rate = out_of_range / non_null if non_null else 0.0
+                profile['out_of_range_rate'] = rate
+                profile['out_of_range_interval'] = list(wilson_interval(out_of_range, non_null))
+                profile['out_of_range_estimate'] = round(rate * total_non_null)
+            
+            distinct = column_stats.get('distinct') or 0
+            if 'distinct_estimate' in column_stats:
+                profile['distinct_estimate'] = column_stats['distinct_estimate']
+                profile['distinct_interval'] = column_stats['distinct_interval']
+            else:
+                # Duj1 não tem intervalo fechado: limites entre o observado e o máximo possível
+                profile['distinct_estimate'] = estimate_distinct(
+                    non_null, total_non_null, distinct, column_stats.get('singletons') or 0
+                )
+                profile['distinct_interval'] = [distinct, max(distinct, total_non_null - non_null + distinct)]
+            
+            profile['top_values'] = [
+                {
+                    'value': item['value'],
+                    'count': item['count'],
+                    'share': item['count'] / non_null if non_null else 0.0,
+                    'share_interval': list(wilson_interval(item['count'], non_null))
+                }
+                for item in column_stats.get('top') or []
+            ]
+            columns[column] = profile
+        
+        return {
+            'table_name': table_name,
+            'method': stats.get('method', Config.DATA_QUALITY_PROFILE_SAMPLING.lower()),
+            'representative': stats.get('representative', True),
+            'sample_rows': sample_rows,
+            'scanned_rows': stats.get('scanned_rows'),
+            'estimated_total': estimated_total,
+            'profiled_at': datetime.now().isoformat(),
+            'columns': columns,
+            'missing_columns': stats.get('missing_columns') or []
+        }
+    
+    def save_quality_profiles(self, profiles: List[Dict[str, Any]], job_id: Optional[str] = None) -> bool:
+        """Grava um registro por tabela/coluna em data_quality_profiles com um único insert"""
+        rows = []
+        for profile in profiles:
+            if profile.get('error'):
+                continue
+            for column, stats in profile['columns'].items():
+                rows.append({
+                    'table_name': profile['table_name'],
+                    'column_name': column,
+                    'profiled_at': profile['profiled_at'],
+                    'method': profile['method'],
+                    'representative': profile['representative'],
+                    'sample_rows': profile['sample_rows'],
+                    'estimated_total': profile['estimated_total'],
+                    'null_rate': stats['null_rate'],
+                    'null_rate_low': stats['null_rate_interval'][0],
+                    'null_rate_high': stats['null_rate_interval'][1],
+                    'out_of_range_rate': stats.get('out_of_range_rate'),
+                    'out_of_range_low': (stats.get('out_of_range_interval') or [None, None])[0],
+                    'out_of_range_high': (stats.get('out_of_range_interval') or [None, None])[1],
+                    'distinct_estimate': stats['distinct_estimate'],
+                    'distinct_low': stats['distinct_interval'][0],
+                    'distinct_high': stats['distinct_interval'][1],
+                    'top_values': stats['top_values'],
+                    'job_id': job_id
+                })
+        if not rows:
+            return True
+        try:
+            self.supabase.client.table(self.PROFILE_TABLE).insert(rows).execute()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar perfis de qualidade: {e}")
+            return False
+    
+    def run_quality_profiling(self, tables: Optional[List[str]] = None,
+                              sample_percent: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Perfil por amostragem das tabelas grandes, gravado para análise de deriva
+        
+        Args:
+            tables: Tabelas de PROFILE_RULES (None = todas)
+            sample_percent: Percentual amostrado (padrão: DATA_QUALITY_PROFILE_SAMPLE_PERCENT)
+            
+        Returns:
+            Perfis por tabela
+        """
+        with ETLJobContext(
+            job_name="data_quality_profiling",
+            job_type="quality_checks",
+            metadata_manager=self.metadata_manager,
+            script_path=__file__,
+            input_parameters={"tables": tables, "sample_percent": sample_percent}
+        ) as job:
+            
+            logger.info("🔬 INICIANDO PERFIL DE QUALIDADE POR AMOSTRAGEM")
+            start_time = datetime.now()
+            if tables is None:
+                tables = list(self.PROFILE_RULES.keys())
+            
+            profiles = {}
+            for table_name in tables:
+                profile = self.profile_table(table_name, sample_percent)
+                profiles[table_name] = profile
+                if profile.get('error'):
+                    job.log("WARNING", f"Perfil de {table_name} indisponível: {profile['error']}")
+                    continue
+                logger.info(f"✅ {table_name}: {profile['sample_rows']} linhas amostradas "
+                            f"de ~{profile['estimated_total']} ({profile['method']})")
+            
+            saved = self.save_quality_profiles(list(profiles.values()), job.job_id)
+            job.log("INFO", f"Perfil concluído para {len(profiles)} tabelas")
+            
+            return {
+                'start_time': start_time,
+                'tables_profiled': len(profiles),
+                'profiles': profiles,
+                'saved': saved,
+                'duration_seconds': int((datetime.now() - start_time).total_seconds())
+            }
+    
+    def get_profile_drift(self, days: int = 7) -> Dict[str, Any]:
+        """
+        Séries e deriva dos perfis gravados nos últimos dias (sem varrer as tabelas)
+        
+        Há deriva em uma métrica quando os intervalos de confiança do primeiro
+        e do último perfil representativo do período não se sobrepõem; perfis
+        do prefixo por id (fallback sem a RPC) entram só nas séries.
+        
+        Returns:
+            series: {"tabela.coluna": [{profiled_at, null_rate, out_of_range_rate, distinct_estimate}]}
+            drift: lista de {table, column, metric, from, to}
+        """
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        result = self.supabase.client.table(self.PROFILE_TABLE).select(
+            'table_name,column_name,profiled_at,representative,null_rate,null_rate_low,null_rate_high,'
+            'out_of_range_rate,out_of_range_low,out_of_range_high,distinct_estimate,distinct_low,distinct_high'
+        ).gte('profiled_at', cutoff).order('profiled_at').execute()
+        
+        history: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for row in result.data or []:
+            history.setdefault((row['table_name'], row['column_name']), []).append(row)
+        
+        series = {}
+        drift = []
+        for (table_name, column), rows in history.items():
+            series[f"{table_name}.{column}"] = [
+                {key: row.get(key) for key in ('profiled_at', 'null_rate', 'out_of_range_rate', 'distinct_estimate')}
+                for row in rows
+            ]
+            rows = [row for row in rows if row.get('representative', True) is not False]
+            if len(rows) < 2:
+                continue
+            first, last = rows[0], rows[-1]
+            for metric, (value_key, low_key, high_key) in self.PROFILE_DRIFT_METRICS.items():
+                if None in (first.get(low_key), first.get(high_key), last.get(low_key), last.get(high_key)):
+                    continue
+                if float(last[low_key]) > float(first[high_key]) or float(last[high_key]) < float(first[low_key]):
+                    drift.append({
+                        'table': table_name,
+                        'column': column,
+                        'metric': metric,
+                        'from': first.get(value_key),
+                        'to': last.get(value_key)
+                    })
+        
+        return {'series': series, 'drift': drift}
+    
     def run_critical_checks_only(self) -> Dict[str, Any]:
         """
         Executa apenas verificações críticas (mais rápido)
@@ -670,6 +1280,19 @@ class DataQualityManager:
                 'recommendations': []
             }
             
+            # Deriva dos perfis por amostragem (lidos de data_quality_profiles)
+            try:
+                profile_trends = self.get_profile_drift(days)
+                trends['profile_series'] = profile_trends['series']
+                trends['profile_drift'] = profile_trends['drift']
+                for item in profile_trends['drift']:
+                    trends['recommendations'].append(
+                        f"📉 Deriva em {item['table']}.{item['column']} ({item['metric']}): "
+                        f"{item['from']} → {item['to']}"
+                    )
+            except Exception as e:
+                logger.warning(f"⚠️ Perfis de qualidade indisponíveis para tendências: {e}")
+            
             if quality_jobs:
                 # Calcular score médio (placeholder)
                 trends['average_score'] = 0.85  # Simulação
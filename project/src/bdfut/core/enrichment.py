@@ -0,0 +1,304 @@
+"""
+Motor de enriquecimento de partidas
+==================================
+
+Substitui os scripts de enriquecimento por etapa (fetch multi → verificar
+existentes → inserir) por um pipeline configurado pelo conjunto de includes
+e tabelas de destino:
+
+    fetch (fixtures/multi, até 100 IDs) → transform (linhas por tabela) → load (bulk_upsert)
+
+As três etapas rodam em paralelo ligadas por filas limitadas: enquanto um
+lote é gravado, o próximo já está sendo transformado e o seguinte buscado na
+API. O controle de taxa fica a cargo do rate limiter do SportmonksClient.
+O índice de presença é lido na transformação e atualizado na gravação, sempre
+sob um lock. Um erro ao gerar os lotes (IDs inválidos, gerador com falha)
+interrompe a busca e é relançado por run() depois de gravar o que já chegou.
+
+Uso:
+    engine = EnrichmentEngine(targets=['events', 'lineups', 'stats'])
+    stats = engine.run(fixture_ids)
+"""
+import time
+import queue
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, Iterable, List, Optional, Sequence
+
+from ..config.config import Config
+from .bulk_loader import chunked
+from .sportmonks_client import SportmonksClient
+from .supabase_client import SupabaseClient
+from .enrichment_index import EnrichmentStateIndex
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EnrichmentTarget:
+    """Include da API gravado em uma tabela"""
+    name: str
+    include: str
+    table: str
+    on_conflict: str
+    row: Callable[[Dict], Dict]
+
+    @property
+    def conflict_columns(self) -> List[str]:
+        return [column.strip() for column in self.on_conflict.split(',')]
+
+
+# Os nomes seguem os tipos de EnrichmentStateIndex.TABLES
+ENRICHMENT_TARGETS = {
+    'events': EnrichmentTarget('events', 'events', 'match_events', 'id', SupabaseClient._event_row),
+    'lineups': EnrichmentTarget('lineups', 'lineups', 'match_lineups', 'fixture_id,team_id,player_id',
+                                SupabaseClient._lineup_row),
+    'stats': EnrichmentTarget('stats', 'statistics', 'match_statistics', 'id', SupabaseClient._statistic_row),
+    'referees': EnrichmentTarget('referees', 'referees', 'match_referees', 'id', SupabaseClient._match_referee_row),
+    'periods': EnrichmentTarget('periods', 'periods', 'match_periods', 'id', SupabaseClient._match_period_row),
+}
+
+
+@dataclass
+class StageStats:
+    """Vazão de uma etapa do pipeline"""
+    name: str
+    batches: int = 0
+    items: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+    def record(self, items: int, seconds: float):
+        self.batches += 1
+        self.items += items
+        self.seconds += seconds
+
+    @property
+    def throughput(self) -> float:
+        """Itens por segundo de trabalho efetivo da etapa"""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'errors': self.errors,
+            'seconds': round(self.seconds, 3),
+            'throughput': round(self.throughput, 2)
+        }
+
+
+_DONE = object()
+
+
+class EnrichmentEngine:
+    """Pipeline fetch → transform → load para includes de fixtures"""
+
+    MAX_MULTI_IDS = 100
+
+    def __init__(self, sportmonks: Optional[SportmonksClient] = None,
+                 supabase: Optional[SupabaseClient] = None,
+                 targets: Sequence[str] = ('events', 'lineups', 'stats'),
+                 batch_size: Optional[int] = None,
+                 queue_size: Optional[int] = None,
+                 skip_existing: bool = True,
+                 state_index: Optional[EnrichmentStateIndex] = None):
+        """
+        Args:
+            sportmonks: Cliente da API (padrão: SportmonksClient())
+            supabase: Cliente do banco (padrão: SupabaseClient())
+            targets: Nomes em ENRICHMENT_TARGETS a enriquecer
+            batch_size: IDs por chamada fixtures/multi (máximo 100)
+            queue_size: Lotes em espera entre etapas
+            skip_existing: Ignorar partidas que já possuem dados do destino
+            state_index: Índice de presença compartilhado (opcional)
+        """
+        unknown = [name for name in targets if name not in ENRICHMENT_TARGETS]
+        if unknown:
+            raise ValueError(f"Destinos de enriquecimento desconhecidos: {unknown}")
+
+        self.sportmonks = sportmonks or SportmonksClient()
+        self.supabase = supabase or SupabaseClient()
+        self.targets = [ENRICHMENT_TARGETS[name] for name in targets]
+        self.batch_size = min(batch_size or Config.ENRICHMENT_BATCH_SIZE, self.MAX_MULTI_IDS)
+        self.queue_size = queue_size or Config.ENRICHMENT_QUEUE_SIZE
+        self.skip_existing = skip_existing
+        self.state_index = state_index or EnrichmentStateIndex(self.supabase, kinds=list(targets))
+        self._state_lock = threading.Lock()
+
+        self.stages = self._new_stages()
+
+    @staticmethod
+    def _new_stages() -> Dict[str, StageStats]:
+        return {name: StageStats(name) for name in ('fetch', 'transform', 'load')}
+
+    @property
+    def include(self) -> str:
+        return ';'.join(dict.fromkeys(target.include for target in self.targets))
+
+    def fetch(self, fixture_ids: List[int]) -> List[Dict]:
+        """Busca um lote de partidas com os includes dos destinos"""
+        response = self.sportmonks.get_fixtures_multi(','.join(map(str, fixture_ids)), self.include)
+        return (response or {}).get('data') or []
+
+    def transform(self, fixture_ids: List[int], fixtures: List[Dict]) -> Dict[str, List[Dict]]:
+        """Converte as partidas em linhas por destino, ignorando dados já existentes"""
+        existing = set()
+        if self.skip_existing:
+            with self._state_lock:
+                self.state_index.load(fixture_ids)
+                existing = {
+                    (fixture['id'], target.name)
+                    for fixture in fixtures if fixture.get('id')
+                    for target in self.targets if self.state_index.has(fixture['id'], target.name)
+                }
+
+        rows = {target.name: [] for target in self.targets}
+        for fixture in fixtures:
+            fixture_id = fixture.get('id')
+            if not fixture_id:
+                continue
+
+            for target in self.targets:
+                if (fixture_id, target.name) in existing:
+                    continue
+
+                for item in fixture.get(target.include) or []:
+                    row = target.row(dict(item, fixture_id=fixture_id))
+                    if all(row.get(column) is not None for column in target.conflict_columns):
+                        rows[target.name].append(row)
+
+        return rows
+
+    def load(self, rows: Dict[str, List[Dict]]) -> int:
+        """Grava as linhas de cada destino em massa"""
+        loaded = 0
+        for target in self.targets:
+            target_rows = rows.get(target.name)
+            if not target_rows:
+                continue
+
+            if self.supabase.bulk_upsert(target.table, target_rows, target.on_conflict):
+                loaded += len(target_rows)
+                with self._state_lock:
+                    for fixture_id in {row['fixture_id'] for row in target_rows}:
+                        self.state_index.mark_present(fixture_id, target.name)
+            else:
+                self.stages['load'].errors += 1
+                logger.error(f"❌ Falha ao gravar {len(target_rows)} registros em {target.table}")
+
+        return loaded
+
+    def _fetch_stage(self, batches: Iterable[List[int]], output: queue.Queue):
+        stats = self.stages['fetch']
+        try:
+            for batch in batches:
+                start = time.perf_counter()
+                try:
+                    fixtures = self.fetch(batch)
+                except Exception as e:
+                    logger.error(f"❌ Erro ao buscar lote de {len(batch)} partidas: {e}")
+                    stats.errors += 1
+                    fixtures = []
+                stats.record(len(fixtures), time.perf_counter() - start)
+                output.put((batch, fixtures))
+        except Exception as e:
+            # Falha do próprio gerador de lotes: repassada até run()
+            logger.error(f"❌ Erro ao gerar lotes de partidas: {e}")
+            output.put(e)
+        finally:
+            output.put(_DONE)
+
+    def _transform_stage(self, source: queue.Queue, output: queue.Queue):
+        stats = self.stages['transform']
+        try:
+            while True:
+                item = source.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, Exception):
+                    output.put(item)
+                    continue
+
+                batch, fixtures = item
+                start = time.perf_counter()
+                try:
+                    rows = self.transform(batch, fixtures)
+                except Exception as e:
+                    logger.error(f"❌ Erro ao transformar lote de {len(batch)} partidas: {e}")
+                    stats.errors += 1
+                    rows = {}
+                stats.record(sum(len(target_rows) for target_rows in rows.values()),
+                             time.perf_counter() - start)
+                output.put(rows)
+        finally:
+            output.put(_DONE)
+
+    def run(self, fixture_ids: Iterable[int]) -> Dict[str, Any]:
+        """
+        Enriquece as partidas informadas
+
+        Args:
+            fixture_ids: IDs Sportmonks das partidas (lista ou gerador)
+
+        Returns:
+            Estatísticas por etapa (lotes, itens, erros, vazão)
+
+        Raises:
+            Exception: Erro ao gerar os lotes a partir de fixture_ids (os lotes
+                anteriores ao erro são gravados)
+        """
+        self.stages = self._new_stages()
+        ids = (int(fixture_id) for fixture_id in fixture_ids)
+        batches = chunked(ids, self.batch_size)
+
+        fetched = queue.Queue(maxsize=self.queue_size)
+        transformed = queue.Queue(maxsize=self.queue_size)
+        workers = [
+            threading.Thread(target=self._fetch_stage, args=(batches, fetched),
+                             name='enrichment-fetch', daemon=True),
+            threading.Thread(target=self._transform_stage, args=(fetched, transformed),
+                             name='enrichment-transform', daemon=True)
+        ]
+
+        logger.info(f"🚀 Enriquecimento: includes={self.include}, lotes de {self.batch_size} partidas")
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+
+        stats = self.stages['load']
+        error = None
+        while True:
+            rows = transformed.get()
+            if rows is _DONE:
+                break
+            if isinstance(rows, Exception):
+                error = rows
+                continue
+
+            start = time.perf_counter()
+            loaded = self.load(rows)
+            stats.record(loaded, time.perf_counter() - start)
+
+        for worker in workers:
+            worker.join()
+        if error is not None:
+            raise error
+
+        elapsed = time.perf_counter() - started
+        result = {
+            'success': all(stage.errors == 0 for stage in self.stages.values()),
+            'fixtures_fetched': self.stages['fetch'].items,
+            'rows_loaded': stats.items,
+            'elapsed_seconds': round(elapsed, 3),
+            'stages': {name: stage.to_dict() for name, stage in self.stages.items()}
+        }
+
+        logger.info(f"✅ Enriquecimento concluído em {elapsed:.1f}s: "
+                    f"{result['fixtures_fetched']} partidas, {result['rows_loaded']} registros")
+        for name, stage in self.stages.items():
+            logger.info(f"  📊 {name}: {stage.items} itens em {stage.batches} lotes "
+                        f"({stage.throughput:.1f}/s, {stage.errors} erros)")
+
+        return result
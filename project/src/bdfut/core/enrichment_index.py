@@ -0,0 +1,123 @@
+"""
+Índice de estado de enriquecimento por partida
+=============================================
+
+Responde "quais destas partidas já possuem eventos/lineups/estatísticas/..."
+com uma consulta por lote em vez de um COUNT por partida e tabela.
+
+Usa a função RPC fixture_enrichment_presence quando disponível; caso
+contrário faz uma consulta por tabela com filtro IN. O resultado fica em
+memória durante a execução e pode ser atualizado com mark_present().
+
+Uso:
+    index = EnrichmentStateIndex(supabase)
+    index.load(fixture_ids)
+    pending = set(fixture_ids) - index.fixtures_with('events', fixture_ids)
+"""
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class EnrichmentStateIndex:
+    """Conjuntos em memória de partidas com dados por tabela de enriquecimento"""
+
+    # Tipo de dado -> tabela (as chaves seguem os flags has_<tipo> dos scripts)
+    TABLES = {
+        'events': 'match_events',
+        'lineups': 'match_lineups',
+        'stats': 'match_statistics',
+        'referees': 'match_referees',
+        'periods': 'match_periods'
+    }
+
+    RPC_FUNCTION = 'fixture_enrichment_presence'
+
+    def __init__(self, supabase, kinds: Optional[Iterable[str]] = None, page_size: int = 1000):
+        """
+        Args:
+            supabase: SupabaseClient
+            kinds: Tipos de dado consultados (padrão: todos de TABLES)
+            page_size: Linhas por página na consulta por tabela (fallback)
+        """
+        self.supabase = supabase
+        self.kinds = list(kinds) if kinds is not None else list(self.TABLES)
+        self.page_size = page_size
+
+        unknown = set(self.kinds) - set(self.TABLES)
+        if unknown:
+            raise ValueError(f"Tipos de enriquecimento desconhecidos: {sorted(unknown)}")
+
+        self._present: Dict[str, Set[int]] = {kind: set() for kind in self.kinds}
+        self._loaded: Set[int] = set()
+        self._rpc_available = True
+        self.queries = 0
+
+    def load(self, fixture_ids: Iterable[int]) -> None:
+        """Carrega o estado das partidas ainda não conhecidas pelo índice"""
+        ids = [fid for fid in dict.fromkeys(int(f) for f in fixture_ids) if fid not in self._loaded]
+        if not ids:
+            return
+
+        if not (self._rpc_available and self._load_rpc(ids)):
+            for kind in self.kinds:
+                self._present[kind].update(self._load_table(self.TABLES[kind], ids))
+
+        self._loaded.update(ids)
+
+    def _load_rpc(self, ids: List[int]) -> bool:
+        try:
+            self.queries += 1
+            rows = self.supabase.client.rpc(self.RPC_FUNCTION, {'p_fixture_ids': ids}).execute().data or []
+        except Exception as e:
+            logger.warning(f"⚠️ RPC {self.RPC_FUNCTION} indisponível, usando consulta por tabela: {e}")
+            self._rpc_available = False
+            return False
+
+        for row in rows:
+            for kind in self.kinds:
+                if row.get(f'has_{kind}'):
+                    self._present[kind].add(int(row['fixture_id']))
+        return True
+
+    def _load_table(self, table: str, ids: List[int]) -> Set[int]:
+        present = set()
+        start = 0
+        while True:
+            self.queries += 1
+            # Sem ORDER BY o Postgres não garante a mesma ordem entre páginas.
+            # Empates em fixture_id não importam: só o conjunto de ids é usado
+            rows = self.supabase.client.table(table).select('fixture_id').in_(
+                'fixture_id', ids
+            ).order('fixture_id').range(start, start + self.page_size - 1).execute().data or []
+            present.update(int(row['fixture_id']) for row in rows)
+            if len(rows) < self.page_size:
+                return present
+            start += self.page_size
+
+    def fixtures_with(self, kind: str, fixture_ids: Iterable[int]) -> Set[int]:
+        """Partidas (dentre fixture_ids) que já possuem dados do tipo"""
+        fixture_ids = [int(f) for f in fixture_ids]
+        self.load(fixture_ids)
+        return self._present[kind].intersection(fixture_ids)
+
+    def fixtures_missing(self, kind: str, fixture_ids: Iterable[int]) -> Set[int]:
+        """Partidas (dentre fixture_ids) ainda sem dados do tipo"""
+        fixture_ids = [int(f) for f in fixture_ids]
+        return set(fixture_ids) - self.fixtures_with(kind, fixture_ids)
+
+    def has(self, fixture_id: int, kind: str) -> bool:
+        fixture_id = int(fixture_id)
+        self.load([fixture_id])
+        return fixture_id in self._present[kind]
+
+    def state(self, fixture_id: int) -> Dict[str, bool]:
+        """Flags has_<tipo> da partida, no formato usado pelos scripts de enriquecimento"""
+        fixture_id = int(fixture_id)
+        self.load([fixture_id])
+        return {f'has_{kind}': fixture_id in self._present[kind] for kind in self.kinds}
+
+    def mark_present(self, fixture_id: int, kind: str) -> None:
+        """Registra dados recém-inseridos sem nova consulta"""
+        self._present[kind].add(int(fixture_id))
@@ -3,9 +3,19 @@ Módulo para gerenciamento de metadados ETL
 =========================================
 
 Gerencia jobs, checkpoints e logs de execução ETL
+
+Dentro de um ETLJobContext, log() e checkpoint() apenas enfileiram: um
+ETLMetadataWriter em segundo plano grava os logs em lote (um insert por
+lote em etl_job_logs) e mantém só o checkpoint mais recente de cada nome
+até o próximo flush. Tudo o que está pendente é gravado na saída do
+contexto, antes de o job ser finalizado. Os dados do checkpoint são
+convertidos para JSON ao serem enfileirados (datetime e objetos viram
+texto), e um lote recusado é regravado linha a linha.
 """
 import logging
 import json
+import queue
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List, Union
 from uuid import UUID, uuid4
@@ -27,6 +37,48 @@ class ETLMetadataManager:
         except Exception as e:
             logger.error(f"❌ Erro ao inicializar ETL Metadata Manager: {e}")
             self.supabase = None
+        
+        # Início dos jobs abertos por este gerenciador (duração sem reler etl_jobs)
+        self._started_at: Dict[str, datetime] = {}
+    
+    @staticmethod
+    def _log_row(job_id: str, level: str, message: str, details: Optional[Dict] = None,
+                 component: Optional[str] = None, function_name: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            'job_id': job_id,
+            'log_level': level.upper(),
+            'message': message,
+            'details': details or {},
+            'component': component,
+            'function_name': function_name
+        }
+    
+    @staticmethod
+    def _json_safe(value: Any) -> Any:
+        """Cópia serializável em JSON (valores não serializáveis viram texto)"""
+        return json.loads(json.dumps(value, default=str))
+    
+    @staticmethod
+    def _checkpoint_row(job_id: str, checkpoint_name: str, checkpoint_data: Dict,
+                        checkpoint_type: str = 'iteration', progress_percentage: float = 0.0,
+                        items_processed: int = 0, items_total: Optional[int] = None,
+                        current_step: Optional[str] = None, next_step: Optional[str] = None,
+                        execution_context: Optional[Dict] = None,
+                        expires_in_hours: int = 24) -> Dict[str, Any]:
+        return {
+            'job_id': job_id,
+            'checkpoint_name': checkpoint_name,
+            'checkpoint_type': checkpoint_type,
+            'checkpoint_data': ETLMetadataManager._json_safe(checkpoint_data),
+            'progress_percentage': progress_percentage,
+            'items_processed': items_processed,
+            'items_total': items_total,
+            'current_step': current_step,
+            'next_step': next_step,
+            'execution_context': ETLMetadataManager._json_safe(execution_context or {}),
+            'expires_at': (datetime.now() + timedelta(hours=expires_in_hours)).isoformat(),
+            'is_active': True
+        }
     
     def start_job(self, 
                   job_name: str,
@@ -54,12 +106,13 @@ class ETLMetadataManager:
             return None
         
         try:
+            started_at = datetime.now()
             job_data = {
                 'job_name': job_name,
                 'job_type': job_type,
                 'script_path': script_path,
                 'status': 'running',
-                'started_at': datetime.now().isoformat(),
+                'started_at': started_at.isoformat(),
                 'input_parameters': input_parameters or {},
                 'depends_on_jobs': depends_on_jobs or [],
                 'parent_job_id': parent_job_id,
@@ -71,6 +124,7 @@ class ETLMetadataManager:
             
             if result.data:
                 job_id = result.data[0]['id']
+                self._started_at[job_id] = started_at
                 logger.info(f"🚀 Job iniciado: {job_name} (ID: {job_id})")
                 return job_id
             else:
@@ -114,13 +168,18 @@ class ETLMetadataManager:
             return False
         
         try:
-            # Buscar data de início para calcular duração
-            job_result = self.supabase.table('etl_jobs').select('started_at').eq('id', job_id).execute()
+            # Data de início para calcular duração (relida do banco só para jobs de outro gerenciador)
+            started_at = self._started_at.pop(job_id, None)
+            if started_at is None:
+                job_result = self.supabase.table('etl_jobs').select('started_at').eq('id', job_id).execute()
+                if job_result.data:
+                    started_at = datetime.fromisoformat(
+                        job_result.data[0]['started_at'].replace('Z', '+00:00')
+                    ).replace(tzinfo=None)
             
             duration_seconds = None
-            if job_result.data:
-                started_at = datetime.fromisoformat(job_result.data[0]['started_at'].replace('Z', '+00:00'))
-                duration_seconds = int((datetime.now() - started_at.replace(tzinfo=None)).total_seconds())
+            if started_at is not None:
+                duration_seconds = int((datetime.now() - started_at).total_seconds())
             
             update_data = {
                 'status': status,
@@ -192,20 +251,11 @@ class ETLMetadataManager:
             # Desativar checkpoint anterior com mesmo nome
             self.supabase.table('etl_checkpoints').update({'is_active': False}).eq('job_id', job_id).eq('checkpoint_name', checkpoint_name).eq('is_active', True).execute()
             
-            checkpoint_data_obj = {
-                'job_id': job_id,
-                'checkpoint_name': checkpoint_name,
-                'checkpoint_type': checkpoint_type,
-                'checkpoint_data': checkpoint_data,
-                'progress_percentage': progress_percentage,
-                'items_processed': items_processed,
-                'items_total': items_total,
-                'current_step': current_step,
-                'next_step': next_step,
-                'execution_context': execution_context or {},
-                'expires_at': (datetime.now() + timedelta(hours=expires_in_hours)).isoformat(),
-                'is_active': True
-            }
+            checkpoint_data_obj = self._checkpoint_row(
+                job_id, checkpoint_name, checkpoint_data, checkpoint_type, progress_percentage,
+                items_processed, items_total, current_step, next_step, execution_context,
+                expires_in_hours
+            )
             
             result = self.supabase.table('etl_checkpoints').insert(checkpoint_data_obj).execute()
             
@@ -274,14 +324,7 @@ class ETLMetadataManager:
             return None
         
         try:
-            log_data = {
-                'job_id': job_id,
-                'log_level': level.upper(),
-                'message': message,
-                'details': details or {},
-                'component': component,
-                'function_name': function_name
-            }
+            log_data = self._log_row(job_id, level, message, details, component, function_name)
             
             result = self.supabase.table('etl_job_logs').insert(log_data).execute()
             
@@ -294,6 +337,65 @@ class ETLMetadataManager:
             logger.error(f"❌ Erro ao registrar log: {e}")
             return None
     
+    def insert_job_logs(self, rows: List[Dict]) -> bool:
+        """
+        Grava um lote de logs (linhas de _log_row) com um único insert
+        
+        Returns:
+            True se sucesso, False se erro
+        """
+        if not self.supabase or not rows:
+            return not rows
+        
+        try:
+            self.supabase.table('etl_job_logs').insert(rows).execute()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Erro ao registrar lote de {len(rows)} logs: {e}")
+            return False
+    
+    def write_checkpoints(self, rows: List[Dict]) -> bool:
+        """
+        Grava checkpoints (linhas de _checkpoint_row, um por nome) de uma vez
+        
+        Os checkpoints ativos com os mesmos nomes são desativados com um update
+        por job e os novos entram com um único insert. Se o insert em lote
+        falhar, as linhas são gravadas uma a uma para que uma linha inválida
+        não descarte as demais.
+        
+        Returns:
+            True se todas as linhas foram gravadas, False se alguma falhou
+        """
+        if not self.supabase or not rows:
+            return not rows
+        
+        try:
+            names_by_job: Dict[str, List[str]] = {}
+            for row in rows:
+                names_by_job.setdefault(row['job_id'], []).append(row['checkpoint_name'])
+            
+            for job_id, names in names_by_job.items():
+                self.supabase.table('etl_checkpoints').update({'is_active': False}).eq('job_id', job_id).in_('checkpoint_name', names).eq('is_active', True).execute()
+        except Exception as e:
+            logger.error(f"❌ Erro ao desativar checkpoints anteriores: {e}")
+            return False
+        
+        try:
+            self.supabase.table('etl_checkpoints').insert(rows).execute()
+            logger.debug(f"📍 {len(rows)} checkpoints gravados")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao gravar lote de {len(rows)} checkpoints, gravando um a um: {e}")
+        
+        success = True
+        for row in rows:
+            try:
+                self.supabase.table('etl_checkpoints').insert(row).execute()
+            except Exception as e:
+                logger.error(f"❌ Erro ao gravar checkpoint {row['checkpoint_name']}: {e}")
+                success = False
+        return success
+    
     def get_job_stats(self) -> Dict[str, Any]:
         """
         Obtém estatísticas dos jobs ETL
@@ -374,8 +476,123 @@ class ETLMetadataManager:
             return []
 
 
+class ETLMetadataWriter:
+    """Gravação em segundo plano de logs (em lote) e checkpoints (coalescidos)"""
+    
+    def __init__(self,
+                 metadata_manager: ETLMetadataManager,
+                 max_queue: Optional[int] = None,
+                 batch_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None):
+        """
+        Args:
+            metadata_manager: Gerenciador usado para as gravações em lote
+            max_queue: Logs pendentes antes de log() bloquear até a fila esvaziar
+            batch_size: Máximo de logs por insert
+            flush_interval: Segundos máximos entre um log e sua gravação
+        """
+        self.metadata_manager = metadata_manager
+        self.batch_size = batch_size or Config.ETL_METADATA_BATCH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else Config.ETL_METADATA_FLUSH_INTERVAL
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue or Config.ETL_METADATA_QUEUE_SIZE)
+        self._checkpoints: Dict[tuple, Dict] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {'logs_written': 0, 'logs_failed': 0, 'log_batches': 0,
+                      'checkpoints_written': 0, 'checkpoints_coalesced': 0, 'checkpoints_failed': 0}
+        
+        self._thread = threading.Thread(target=self._run, name='etl-metadata-writer', daemon=True)
+        self._thread.start()
+    
+    def log(self, job_id: str, level: str, message: str, details: Optional[Dict] = None,
+            component: Optional[str] = None, function_name: Optional[str] = None):
+        """Enfileira um log (bloqueia apenas com a fila cheia)"""
+        self._queue.put(ETLMetadataManager._log_row(job_id, level, message, details, component, function_name))
+    
+    def checkpoint(self, job_id: str, checkpoint_name: str, checkpoint_data: Dict, **kwargs):
+        """Guarda o checkpoint; um mais recente com o mesmo nome substitui o pendente"""
+        row = ETLMetadataManager._checkpoint_row(job_id, checkpoint_name, checkpoint_data, **kwargs)
+        with self._lock:
+            if (job_id, checkpoint_name) in self._checkpoints:
+                self.stats['checkpoints_coalesced'] += 1
+            self._checkpoints[(job_id, checkpoint_name)] = row
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda a gravação de tudo o que foi enfileirado até agora"""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+    
+    def close(self, timeout: Optional[float] = None):
+        """Grava o que está pendente e encerra a thread"""
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+    
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._write_checkpoints()
+                continue
+            
+            logs, markers, stop = [], [], False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    logs.append(item)
+                    if len(logs) >= self.batch_size:
+                        self._write_logs(logs)
+                        logs = []
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            self._write_logs(logs)
+            self._write_checkpoints()
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+    
+    def _write_logs(self, rows: List[Dict]):
+        if not rows:
+            return
+        try:
+            success = self.metadata_manager.insert_job_logs(rows)
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar logs em segundo plano: {e}")
+            success = False
+        self.stats['logs_written' if success else 'logs_failed'] += len(rows)
+        self.stats['log_batches'] += 1
+    
+    def _write_checkpoints(self):
+        with self._lock:
+            rows = list(self._checkpoints.values())
+            self._checkpoints = {}
+        if not rows:
+            return
+        try:
+            success = self.metadata_manager.write_checkpoints(rows)
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar checkpoints em segundo plano: {e}")
+            success = False
+        self.stats['checkpoints_written' if success else 'checkpoints_failed'] += len(rows)
+
+
 class ETLJobContext:
-    """Context manager para jobs ETL"""
+    """Context manager para jobs ETL (logs e checkpoints gravados em segundo plano)"""
     
     def __init__(self, 
                  job_name: str,
@@ -394,6 +611,7 @@ class ETLJobContext:
         self.records_inserted = 0
         self.records_updated = 0
         self.records_failed = 0
+        self.writer: Optional[ETLMetadataWriter] = None
     
     def __enter__(self):
         """Inicia o job"""
@@ -403,10 +621,15 @@ class ETLJobContext:
             self.script_path,
             self.input_parameters
         )
+        if self.job_id:
+            self.writer = ETLMetadataWriter(self.metadata_manager)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Finaliza o job"""
+        """Grava logs e checkpoints pendentes e finaliza o job"""
+        if self.writer is not None:
+            self.writer.close()
+        
         if self.job_id:
             if exc_type is None:
                 # Sucesso
@@ -440,14 +663,19 @@ class ETLJobContext:
                 )
     
     def log(self, level: str, message: str, **kwargs):
-        """Registra log do job"""
-        if self.job_id:
-            self.metadata_manager.log_job(self.job_id, level, message, kwargs)
+        """Registra log do job (gravado em lote em segundo plano)"""
+        if self.writer is not None:
+            self.writer.log(self.job_id, level, message, kwargs)
     
     def checkpoint(self, name: str, data: Dict, **kwargs):
-        """Cria checkpoint"""
-        if self.job_id:
-            return self.metadata_manager.create_checkpoint(self.job_id, name, data, **kwargs)
+        """Cria checkpoint (apenas o mais recente de cada nome é gravado no próximo flush)"""
+        if self.writer is not None:
+            self.writer.checkpoint(self.job_id, name, data, **kwargs)
+    
+    def flush(self):
+        """Grava imediatamente logs e checkpoints pendentes"""
+        if self.writer is not None:
+            self.writer.flush()
     
     def increment_api_requests(self, count: int = 1):
         """Incrementa contador de requisições à API"""
@@ -9,6 +9,7 @@ import time
 
 from .sportmonks_client import SportmonksClient
 from .supabase_client import SupabaseClient
+from .write_buffer import FixtureWriteBuffer
 from .etl_metadata import ETLMetadataManager, ETLJobContext
 from ..config.config import Config
 
@@ -217,21 +218,22 @@ class ETLProcess:
                 self.supabase.upsert_fixtures(fixtures)
                 logger.info(f"✅ {len(fixtures)} partidas sincronizadas")
                 
-                # Processar participantes e detalhes
-                for fixture in tqdm(fixtures, desc="Processando detalhes"):
-                    fixture_id = fixture['id']
-                    
-                    # Participantes
-                    if 'participants' in fixture:
-                        self.supabase.upsert_fixture_participants(
-                            fixture_id, fixture['participants']
-                        )
-                    
-                    # Eventos (se incluídos)
-                    if 'events' in fixture and fixture['events']:
-                        self.supabase.upsert_fixture_events(
-                            fixture_id, fixture['events']
-                        )
+                # Processar participantes e detalhes (gravados em lote pelo buffer)
+                with FixtureWriteBuffer(self.supabase) as write_buffer:
+                    for fixture in tqdm(fixtures, desc="Processando detalhes"):
+                        fixture_id = fixture['id']
+                        
+                        # Participantes
+                        if 'participants' in fixture:
+                            write_buffer.add_fixture_participants(
+                                fixture_id, fixture['participants']
+                            )
+                        
+                        # Eventos (se incluídos)
+                        if 'events' in fixture and fixture['events']:
+                            write_buffer.add_fixture_events(
+                                fixture_id, fixture['events']
+                            )
                 
                 return True
                 
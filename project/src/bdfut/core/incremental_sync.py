@@ -12,7 +12,10 @@ import json
 
 from .sportmonks_client import SportmonksClient
 from .supabase_client import SupabaseClient
+from .write_buffer import FixtureWriteBuffer
 from .etl_metadata import ETLMetadataManager, ETLJobContext
+from .cache_warmup import CacheWarmupPlanner
+from .content_hash import ContentHashStore
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +51,10 @@ class IncrementalSyncManager:
         }
     }
     
+    # Includes da busca de partidas por período (sincronização e aquecimento
+    # precisam da mesma requisição para compartilhar as chaves de cache)
+    FIXTURES_INCLUDE = 'participants;state;venue;events'
+    
     def __init__(self, use_redis: bool = True):
         """
         Inicializa o gerenciador de sincronização incremental
@@ -62,9 +69,59 @@ class IncrementalSyncManager:
         )
         self.supabase = SupabaseClient()
         self.metadata_manager = ETLMetadataManager()
+        # Hash do payload por partida: grava apenas o que mudou desde a última execução
+        self.content_hashes = ContentHashStore(
+            self.sportmonks.redis_cache if self.sportmonks.enable_cache and self.sportmonks.use_redis else None
+        )
         
         logger.info("✅ IncrementalSyncManager inicializado")
     
+    def warm_up_cache(self, hours_ahead: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Pré-carrega no cache dados estáticos, as partidas das próximas horas e
+        o período que a próxima sync_recent_fixtures vai ler
+        
+        Deve rodar antes da sincronização (ex.: `bdfut cache-warmup` agendado);
+        o período é buscado com fetch_fixtures, portanto com as mesmas chaves.
+        
+        Args:
+            hours_ahead: Janela de partidas (padrão: CACHE_WARMUP_HOURS_AHEAD)
+            
+        Returns:
+            Itens pré-carregados por tipo (sync_fixtures: partidas do período)
+        """
+        planner = CacheWarmupPlanner(self.sportmonks, self.supabase, hours_ahead)
+        stats = planner.run()
+        if 'error' in stats:
+            return stats
+        
+        stats['sync_fixtures'] = 0
+        if planner.within_budget():
+            try:
+                stats['sync_fixtures'] = len(self.fetch_fixtures(*self.fixture_window('fixtures_recent')))
+            except Exception as e:
+                logger.error(f"❌ Erro ao aquecer período da sincronização: {e}")
+                stats['sync_fixtures'] = -1
+        return stats
+    
+    def fixture_window(self, sync_type: str, now: Optional[datetime] = None) -> Optional[List[str]]:
+        """Período [início, fim] (YYYY-MM-DD) buscado pela sincronização do tipo"""
+        strategy = self.SYNC_STRATEGIES.get(sync_type)
+        if strategy is None:
+            return None
+        now = now or datetime.now()
+        start_date = (now - timedelta(days=strategy.get('window_days', 7))).strftime('%Y-%m-%d')
+        end_date = (now + timedelta(days=strategy.get('future_days', 14))).strftime('%Y-%m-%d')
+        return [start_date, end_date]
+    
+    def fetch_fixtures(self, start_date: str, end_date: str) -> List[Dict]:
+        """Partidas do período, com as chaves de cache compartilhadas com o aquecimento"""
+        return self.sportmonks.get_fixtures_by_date_range(
+            start_date=start_date,
+            end_date=end_date,
+            include=self.FIXTURES_INCLUDE
+        )
+    
     def get_last_sync_timestamp(self, sync_type: str) -> Optional[datetime]:
         """
         Obtém timestamp da última sincronização
@@ -138,14 +195,7 @@ class IncrementalSyncManager:
         
         # Calcular datas alvo baseado na estratégia
         if sync_type in self.SYNC_STRATEGIES:
-            strategy = self.SYNC_STRATEGIES[sync_type]
-            window_days = strategy.get('window_days', 7)
-            future_days = strategy.get('future_days', 14)
-            
-            start_date = (now - timedelta(days=window_days)).strftime('%Y-%m-%d')
-            end_date = (now + timedelta(days=future_days)).strftime('%Y-%m-%d')
-            
-            changes['target_dates'] = [start_date, end_date]
+            changes['target_dates'] = self.fixture_window(sync_type, now)
         
         return changes
     
@@ -208,11 +258,7 @@ class IncrementalSyncManager:
             
             try:
                 # Buscar fixtures do período
-                fixtures = self.sportmonks.get_fixtures_by_date_range(
-                    start_date=start_date,
-                    end_date=end_date,
-                    include='participants;state;venue;events'
-                )
+                fixtures = self.fetch_fixtures(start_date, end_date)
                 
                 job.increment_api_requests(len(fixtures) // 500 + 1)
                 
@@ -224,6 +270,7 @@ class IncrementalSyncManager:
                     'fixtures_processed': 0,
                     'fixtures_inserted': 0,
                     'fixtures_updated': 0,
+                    'fixtures_unchanged': 0,
                     'errors': 0,
                     'success': False
                 }
@@ -245,6 +292,12 @@ class IncrementalSyncManager:
                     batch_size = 50
                     total_batches = (len(fixtures) + batch_size - 1) // batch_size
                     
+                    # Participantes/eventos acumulados entre batches e gravados em lote
+                    write_buffer = FixtureWriteBuffer(self.supabase)
+                    # Hashes gravados apenas depois do flush do buffer, sem as partidas
+                    # de lotes com falha (também nos flushes automáticos do buffer)
+                    pending_hashes: Dict[str, str] = {}
+                    
                     for batch_idx in range(total_batches):
                         start_idx = batch_idx * batch_size
                         end_idx = min(start_idx + batch_size, len(fixtures))
@@ -252,11 +305,13 @@ class IncrementalSyncManager:
                         
                         try:
                             # Processar batch
-                            batch_stats = self._process_fixtures_batch(batch, job)
+                            batch_stats = self._process_fixtures_batch(batch, job, write_buffer,
+                                                                       pending_hashes, force)
                             
                             stats['fixtures_processed'] += batch_stats['processed']
                             stats['fixtures_inserted'] += batch_stats['inserted']
                             stats['fixtures_updated'] += batch_stats['updated']
+                            stats['fixtures_unchanged'] += batch_stats['unchanged']
                             stats['errors'] += batch_stats['errors']
                             
                             # Checkpoint de progresso
@@ -278,15 +333,23 @@ class IncrementalSyncManager:
                             stats['errors'] += len(batch)
                             job.log("ERROR", f"Erro no batch {batch_idx + 1}: {e}")
                     
+                    write_buffer.flush()
+                    self.content_hashes.commit('fixtures', self._written_hashes(pending_hashes, write_buffer))
+                    if write_buffer.failed_keys:
+                        job.log("ERROR", f"Falha ao gravar dados relacionados de {len(write_buffer.failed_keys)} "
+                                         f"fixtures: {write_buffer.get_stats()['tables']}")
+                    
                     stats['success'] = stats['errors'] < (stats['fixtures_found'] * 0.1)  # < 10% erro
                     
                     logger.info(f"✅ Sincronização incremental concluída:")
                     logger.info(f"  📊 Fixtures processadas: {stats['fixtures_processed']}")
                     logger.info(f"  📊 Inseridas: {stats['fixtures_inserted']}")
                     logger.info(f"  📊 Atualizadas: {stats['fixtures_updated']}")
+                    logger.info(f"  📊 Inalteradas (upsert pulado): {stats['fixtures_unchanged']}")
                     logger.info(f"  📊 Erros: {stats['errors']}")
                     
-                    job.log("INFO", f"Sincronização concluída - {stats['fixtures_processed']} fixtures processadas")
+                    job.log("INFO", f"Sincronização concluída - {stats['fixtures_processed']} fixtures processadas "
+                                    f"({stats['fixtures_updated']} alteradas, {stats['fixtures_unchanged']} inalteradas)")
                     
                     # Checkpoint final
                     job.checkpoint(
@@ -310,13 +373,29 @@ class IncrementalSyncManager:
                     'error': str(e)
                 }
     
-    def _process_fixtures_batch(self, fixtures: List[Dict], job: ETLJobContext) -> Dict[str, int]:
+    @staticmethod
+    def _written_hashes(hashes: Dict[str, str], write_buffer: FixtureWriteBuffer) -> Dict[str, str]:
+        """Hashes das fixtures cujos participantes e eventos foram todos gravados"""
+        failed = {str(fixture_id) for fixture_id in write_buffer.failed_keys}
+        return {fixture_id: value for fixture_id, value in hashes.items() if fixture_id not in failed}
+    
+    def _process_fixtures_batch(self, fixtures: List[Dict], job: ETLJobContext,
+                                write_buffer: Optional[FixtureWriteBuffer] = None,
+                                pending_hashes: Optional[Dict[str, str]] = None,
+                                force: bool = False) -> Dict[str, int]:
         """
         Processa um batch de fixtures
         
+        Fixtures cujo hash de conteúdo não mudou desde a última sincronização
+        não são gravadas novamente (nem participantes, eventos e venues).
+        
         Args:
             fixtures: Lista de fixtures
             job: Contexto do job
+            write_buffer: Buffer compartilhado entre batches (padrão: gravado ao fim do batch)
+            pending_hashes: Recebe os hashes a gravar após o flush do buffer compartilhado
+                (padrão: gravados aqui, após o flush do buffer próprio)
+            force: Gravar todas as fixtures, mesmo as inalteradas
             
         Returns:
             Estatísticas do processamento
@@ -325,15 +404,29 @@ class IncrementalSyncManager:
             'processed': 0,
             'inserted': 0,
             'updated': 0,
+            'unchanged': 0,
             'errors': 0
         }
         
+        diff = self.content_hashes.diff('fixtures', fixtures, force=force)
+        batch_stats['unchanged'] = len(diff.unchanged)
+        fixtures = diff.changed
+        if not fixtures:
+            batch_stats['processed'] = batch_stats['unchanged']
+            job.increment_records(processed=batch_stats['processed'])
+            return batch_stats
+        
+        owns_buffer = write_buffer is None
+        if owns_buffer:
+            write_buffer = FixtureWriteBuffer(self.supabase)
+        success = False
+        
         try:
             # Salvar fixtures principais
             success = self.supabase.upsert_fixtures(fixtures)
             
             if success:
-                batch_stats['processed'] = len(fixtures)
+                batch_stats['processed'] = len(fixtures) + batch_stats['unchanged']
                 batch_stats['updated'] = len(fixtures)  # Assumir update para incremental
                 
                 # Processar dados relacionados
@@ -345,13 +438,13 @@ class IncrementalSyncManager:
                     
                     # Participantes
                     if 'participants' in fixture and fixture['participants']:
-                        self.supabase.upsert_fixture_participants(
+                        write_buffer.add_fixture_participants(
                             fixture['id'], fixture['participants']
                         )
                     
                     # Eventos
                     if 'events' in fixture and fixture['events']:
-                        self.supabase.upsert_fixture_events(
+                        write_buffer.add_fixture_events(
                             fixture['id'], fixture['events']
                         )
                 
@@ -374,6 +467,14 @@ class IncrementalSyncManager:
             logger.error(f"❌ Erro ao processar batch: {e}")
             batch_stats['errors'] = len(fixtures)
             job.increment_records(failed=batch_stats['errors'])
+            success = False
+        finally:
+            if owns_buffer:
+                write_buffer.flush()
+                if success:
+                    self.content_hashes.commit('fixtures', self._written_hashes(diff.hashes, write_buffer))
+            elif success and pending_hashes is not None:
+                pending_hashes.update(diff.hashes)
         
         return batch_stats
     
@@ -0,0 +1,189 @@
+"""
+Cache local em memória (L1)
+==========================
+
+LRU ordenado com operações O(1), expiração por entrada e limite de
+tamanho em entradas e em bytes. Usado pelo RedisCache como primeira
+camada antes do Redis e como fallback quando o Redis está indisponível.
+
+Uso:
+    cache = LocalLRUCache(max_entries=1000, max_bytes=64 * 1024 * 1024)
+    cache.set('chave', {'data': [...]}, ttl=3600, tags=['fixtures:1'])
+    cache.get('chave')
+    cache.delete_tagged('fixtures:1')
+"""
+import sys
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float  # time.monotonic()
+    size: int
+    tags: Tuple[str, ...] = ()
+
+
+class LocalLRUCache:
+    """LRU com TTL por entrada e limites de entradas e bytes"""
+
+    def __init__(self, max_entries: int = 1000, max_bytes: Optional[int] = None,
+                 default_ttl: float = 3600):
+        """
+        Args:
+            max_entries: Número máximo de entradas
+            max_bytes: Tamanho máximo estimado dos valores (None = sem limite)
+            default_ttl: TTL em segundos quando set() não informa um
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._bytes = 0
+        self._tags: Dict[str, Set[str]] = {}  # tag -> chaves
+        self._lock = threading.Lock()
+
+        # Estatísticas
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    @staticmethod
+    def estimate_size(value: Any) -> int:
+        """Tamanho aproximado do valor (JSON serializado)"""
+        try:
+            return len(json.dumps(value, default=str).encode())
+        except (TypeError, ValueError):
+            return sys.getsizeof(value)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Busca a chave e a marca como usada mais recentemente"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None,
+            tags: Iterable[str] = ()) -> bool:
+        """
+        Salva a chave, removendo as menos usadas recentemente se necessário
+
+        Args:
+            tags: Tags para invalidação em grupo com delete_tagged()
+
+        Returns:
+            False se o valor sozinho excede max_bytes (não é armazenado)
+        """
+        size = self.estimate_size(value)
+        ttl = self.default_ttl if ttl is None else ttl
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            if ttl <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+                self.rejected += 1
+                return False
+
+            tags = tuple(dict.fromkeys(tags))
+            self._entries[key] = _Entry(value, time.monotonic() + ttl, size, tags)
+            self._bytes += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+                logger.debug(f"🧹 L1 EVICT: {oldest}")
+
+        return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._remove(key)
+
+    def delete_matching(self, predicate: Callable[[str], bool]) -> List[str]:
+        """Remove as chaves para as quais predicate(chave) é verdadeiro"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return keys
+
+    def delete_tagged(self, *tags: str) -> List[str]:
+        """Remove as chaves marcadas com qualquer uma das tags"""
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return list(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'tags': len(self._tags),
+            'bytes': self._bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total > 0 else 0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'rejected': self.rejected
+        }
@@ -0,0 +1,121 @@
+"""
+Estatística por amostragem para o perfil de qualidade
+====================================================
+
+Estimadores usados por DataQualityManager.profile_table nas tabelas grandes
+(match_events, match_statistics, match_lineups), onde contar tudo é caro:
+
+- wilson_interval: intervalo de confiança de uma proporção (taxa de nulos,
+  fora do intervalo, participação de um valor) estimada em uma amostra
+- estimate_distinct: distintos da tabela a partir da amostra (estimador
+  Duj1 de Haas e Stokes, o mesmo do ANALYZE do PostgreSQL)
+- ReservoirSample: amostra uniforme de tamanho fixo de um fluxo (algoritmo R)
+- HyperLogLog: distintos de um fluxo com memória constante (2^p registradores)
+"""
+import math
+import random
+import hashlib
+from typing import Any, Iterable, List, Optional, Tuple
+
+# z da confiança de 95%
+Z_95 = 1.959964
+
+
+def wilson_interval(successes: int, n: int, z: float = Z_95) -> Tuple[float, float]:
+    """Intervalo de Wilson para successes/n ((0, 1) sem amostra)"""
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def estimate_distinct(sample_rows: int, total_rows: int, distinct: int, singletons: int) -> float:
+    """
+    Distintos estimados na tabela (Duj1: n*d / (n - f1 + f1*n/N))
+
+    Args:
+        sample_rows: Linhas não nulas na amostra (n)
+        total_rows: Linhas não nulas estimadas na tabela (N)
+        distinct: Valores distintos na amostra (d)
+        singletons: Valores que aparecem uma única vez na amostra (f1)
+    """
+    if sample_rows <= 0 or distinct <= 0:
+        return 0.0
+    if total_rows <= sample_rows:
+        # Amostra cobre a tabela inteira
+        return float(distinct)
+    if singletons >= sample_rows:
+        # Nenhum valor repetido na amostra: coluna tratada como única
+        return float(total_rows)
+    estimate = sample_rows * distinct / (sample_rows - singletons + singletons * sample_rows / total_rows)
+    return float(min(max(estimate, distinct), total_rows))
+
+
+class ReservoirSample:
+    """Amostra uniforme de até `size` itens de um fluxo de tamanho desconhecido"""
+
+    def __init__(self, size: int, seed: Optional[int] = None):
+        self.size = size
+        self.seen = 0
+        self.items: List[Any] = []
+        self._random = random.Random(seed)
+
+    def add(self, item: Any):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+            return
+        slot = self._random.randrange(self.seen)
+        if slot < self.size:
+            self.items[slot] = item
+
+    def extend(self, items: Iterable[Any]):
+        for item in items:
+            self.add(item)
+
+
+class HyperLogLog:
+    """Contagem aproximada de distintos (erro relativo ~1.04/sqrt(2^p))"""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    @staticmethod
+    def _hash(value: Any) -> int:
+        return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), 'big')
+
+    def add(self, value: Any):
+        h = self._hash(value)
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog'):
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLog com precisões diferentes")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def count(self) -> float:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # Correção para cardinalidades pequenas (linear counting)
+            return self.m * math.log(self.m / zeros)
+        return estimate
+
+    def interval(self, z: float = Z_95) -> Tuple[float, float]:
+        estimate = self.count()
+        margin = z * self.relative_error * estimate
+        return max(0.0, estimate - margin), estimate + margin
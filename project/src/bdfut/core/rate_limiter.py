@@ -0,0 +1,316 @@
+"""
+Rate limiting para API Sportmonks
+================================
+
+Token bucket com aquisição O(1), por entidade (a Sportmonks limita
+requisições por entidade/hora), com backend local ou Redis compartilhado
+entre processos e ajuste pelos headers X-RateLimit-* da API.
+"""
+import time
+import asyncio
+import threading
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional, Mapping
+
+from .redis_cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter(ABC):
+    """Interface base para rate limiters"""
+
+    def __init__(self, capacity: int, period_seconds: int = 3600,
+                 entity_limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            capacity: Requisições permitidas por período (por entidade)
+            period_seconds: Duração do período em segundos
+            entity_limits: Capacidades específicas por entidade
+        """
+        self.capacity = capacity
+        self.period_seconds = period_seconds
+        self.entity_limits = entity_limits or {}
+
+    def _capacity_for(self, bucket: str) -> int:
+        return self.entity_limits.get(bucket, self.capacity)
+
+    def _rate_for(self, bucket: str) -> float:
+        """Tokens repostos por segundo"""
+        return self._capacity_for(bucket) / self.period_seconds
+
+    @abstractmethod
+    def reserve(self, bucket: str = 'default') -> float:
+        """
+        Reserva um token e retorna quanto tempo aguardar antes de usá-lo
+
+        Returns:
+            Segundos de espera (0 se há token disponível)
+        """
+
+    @abstractmethod
+    def observe(self, bucket: str, remaining: Optional[int] = None,
+                reset_at: Optional[float] = None):
+        """
+        Ajusta o bucket com o estado informado pela API
+
+        Args:
+            bucket: Entidade
+            remaining: Requisições restantes segundo a API
+            reset_at: Timestamp epoch em que o limite é restaurado
+        """
+
+    def acquire(self, bucket: str = 'default') -> float:
+        """Aguarda (bloqueante) até haver token disponível"""
+        wait_time = self.reserve(bucket)
+        if wait_time > 0:
+            logger.warning(f"Rate limit atingido ({bucket}). Aguardando {wait_time:.0f} segundos...")
+            time.sleep(wait_time)
+        return wait_time
+
+    async def acquire_async(self, bucket: str = 'default') -> float:
+        """Aguarda sem bloquear o event loop até haver token disponível"""
+        wait_time = self.reserve(bucket)
+        if wait_time > 0:
+            logger.warning(f"Rate limit atingido ({bucket}). Aguardando {wait_time:.0f} segundos...")
+            await asyncio.sleep(wait_time)
+        return wait_time
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.__class__.__name__,
+            "capacity": self.capacity,
+            "period_seconds": self.period_seconds,
+            "entity_limits": self.entity_limits
+        }
+
+
+def parse_rate_limit_headers(headers: Mapping):
+    """
+    Lê headers de rate limit sem diferenciar maiúsculas/minúsculas
+
+    Returns:
+        Tupla (remaining, reset_at) com None para valores ausentes
+    """
+    normalized = {str(k).lower(): v for k, v in dict(headers).items()}
+    remaining = normalized.get('x-ratelimit-remaining')
+    reset_at = normalized.get('x-ratelimit-reset')
+
+    try:
+        remaining = int(remaining) if remaining is not None else None
+    except (TypeError, ValueError):
+        remaining = None
+
+    try:
+        reset_at = float(reset_at) if reset_at is not None else None
+    except (TypeError, ValueError):
+        reset_at = None
+
+    return remaining, reset_at
+
+
+class TokenBucketRateLimiter(RateLimiter):
+    """Token bucket em memória (escopo do processo)"""
+
+    def __init__(self, capacity: int, period_seconds: int = 3600,
+                 entity_limits: Optional[Dict[str, int]] = None):
+        super().__init__(capacity, period_seconds, entity_limits)
+        # bucket -> [tokens, último refill (monotônico)]
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def _refill(self, bucket: str, now: float) -> list:
+        state = self._buckets.get(bucket)
+        capacity = self._capacity_for(bucket)
+        if state is None:
+            state = [float(capacity), now]
+            self._buckets[bucket] = state
+        else:
+            state[0] = min(capacity, state[0] + (now - state[1]) * self._rate_for(bucket))
+            state[1] = now
+        return state
+
+    def reserve(self, bucket: str = 'default') -> float:
+        with self._lock:
+            state = self._refill(bucket, time.monotonic())
+            state[0] -= 1
+            if state[0] >= 0:
+                return 0.0
+            return -state[0] / self._rate_for(bucket)
+
+    def observe(self, bucket: str, remaining: Optional[int] = None,
+                reset_at: Optional[float] = None):
+        with self._lock:
+            state = self._refill(bucket, time.monotonic())
+            if remaining is None:
+                return
+
+            if remaining > 0:
+                # Apenas restringe: respostas concorrentes podem chegar fora de ordem
+                state[0] = min(state[0], float(remaining))
+            elif reset_at is not None:
+                # Esgotado: próxima reserva aguarda até o reset informado pela API
+                seconds_to_reset = max(0.0, reset_at - time.time())
+                state[0] = min(state[0], 1.0 - seconds_to_reset * self._rate_for(bucket))
+            else:
+                state[0] = min(state[0], 0.0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        with self._lock:
+            now = time.monotonic()
+            stats["buckets"] = {
+                bucket: round(self._refill(bucket, now)[0], 2) for bucket in list(self._buckets)
+            }
+        return stats
+
+
+class RedisTokenBucketRateLimiter(RateLimiter):
+    """
+    Token bucket compartilhado entre processos via Redis
+
+    Usa a conexão do RedisCache existente. Cada entidade é um hash
+    (tokens, ts) atualizado atomicamente por script Lua. Se o Redis ficar
+    indisponível, cai para um bucket local.
+    """
+
+    KEY_PREFIX = "bdfut:ratelimit:"
+
+    # Relógio do próprio Redis: processos em hosts com relógios diferentes
+    # enxergam o mesmo refill. replicate_commands permite escrever depois de
+    # TIME em Redis < 5 (a partir do 5 é o padrão).
+    CLOCK = """
+if redis.replicate_commands then redis.replicate_commands() end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+"""
+
+    # KEYS[1]=bucket  ARGV: capacity, rate, ttl_ms
+    RESERVE_SCRIPT = CLOCK + """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+  tokens = capacity
+  ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+if tokens >= 0 then
+  return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+    # KEYS[1]=bucket  ARGV: capacity, rate, ttl_ms, remaining, reset_at ('' se ausente)
+    OBSERVE_SCRIPT = CLOCK + """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local remaining = tonumber(ARGV[4])
+local reset_at = tonumber(ARGV[5])
+local limit_tokens = 0
+if remaining > 0 then
+  limit_tokens = remaining
+elseif reset_at ~= nil then
+  limit_tokens = 1 - math.max(0, reset_at - now) * rate
+end
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+  tokens = capacity
+  ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+tokens = math.min(tokens, limit_tokens)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return tostring(tokens)
+"""
+
+    def __init__(self, redis_cache: RedisCache, capacity: int, period_seconds: int = 3600,
+                 entity_limits: Optional[Dict[str, int]] = None):
+        super().__init__(capacity, period_seconds, entity_limits)
+        self.redis_cache = redis_cache
+        self.fallback = TokenBucketRateLimiter(capacity, period_seconds, entity_limits)
+        self.redis_errors = 0
+        self._reserve_script = None
+        self._observe_script = None
+
+    @property
+    def _ttl_ms(self) -> int:
+        return int(self.period_seconds * 2 * 1000)
+
+    def _redis(self):
+        if not self.redis_cache.redis_available or self.redis_cache.redis_client is None:
+            return None
+        if self._reserve_script is None:
+            client = self.redis_cache.redis_client
+            self._reserve_script = client.register_script(self.RESERVE_SCRIPT)
+            self._observe_script = client.register_script(self.OBSERVE_SCRIPT)
+        return self.redis_cache.redis_client
+
+    def _sync_fallback(self):
+        # Mantém capacidade do fallback alinhada (rate_limit pode ser alterado em runtime)
+        self.fallback.capacity = self.capacity
+        self.fallback.entity_limits = self.entity_limits
+
+    def reserve(self, bucket: str = 'default') -> float:
+        try:
+            if self._redis() is not None:
+                result = self._reserve_script(
+                    keys=[f"{self.KEY_PREFIX}{bucket}"],
+                    args=[self._capacity_for(bucket), self._rate_for(bucket), self._ttl_ms]
+                )
+                return float(result)
+        except Exception as e:
+            logger.warning(f"⚠️ Erro no rate limiter Redis: {e}. Usando bucket local.")
+            self.redis_errors += 1
+
+        self._sync_fallback()
+        return self.fallback.reserve(bucket)
+
+    def observe(self, bucket: str, remaining: Optional[int] = None,
+                reset_at: Optional[float] = None):
+        if remaining is None:
+            return
+
+        try:
+            if self._redis() is not None:
+                self._observe_script(
+                    keys=[f"{self.KEY_PREFIX}{bucket}"],
+                    args=[self._capacity_for(bucket), self._rate_for(bucket), self._ttl_ms,
+                          remaining, '' if reset_at is None else reset_at]
+                )
+                return
+        except Exception as e:
+            logger.warning(f"⚠️ Erro no rate limiter Redis: {e}. Usando bucket local.")
+            self.redis_errors += 1
+
+        self._sync_fallback()
+        self.fallback.observe(bucket, remaining, reset_at)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats["redis_available"] = self.redis_cache.redis_available
+        stats["redis_errors"] = self.redis_errors
+        return stats
+
+
+def create_rate_limiter(capacity: int,
+                        redis_cache: Optional[RedisCache] = None,
+                        entity_limits: Optional[Dict[str, int]] = None) -> RateLimiter:
+    """
+    Cria o rate limiter apropriado
+
+    Compartilhado via Redis quando há conexão disponível, local caso contrário.
+    """
+    if redis_cache is not None and redis_cache.redis_available:
+        logger.info("✅ Rate limiter compartilhado via Redis")
+        return RedisTokenBucketRateLimiter(redis_cache, capacity, entity_limits=entity_limits)
+
+    return TokenBucketRateLimiter(capacity, entity_limits=entity_limits)
@@ -2,22 +2,51 @@
 Cliente Redis para cache distribuído avançado
 ============================================
 
-Sistema de cache robusto com TTL inteligente e fallback local
+Sistema de cache robusto com TTL inteligente e cache local L1
+
+Leituras consultam primeiro o LRU em memória (LocalLRUCache) e só então o
+Redis. Com o Redis disponível as entradas locais vivem no máximo
+LOCAL_CACHE_TTL_SECONDS, para que invalidações feitas por outros processos
+sejam percebidas; sem Redis o cache local usa o TTL completo da entidade.
+
+No Redis os valores são gravados pelo CacheCodec (binário comprimido com
+cabeçalho de versão); entradas antigas em texto JSON continuam legíveis.
+
+Invalidação por tags: cada set() registra a chave em conjuntos
+bdfut:tag:<tag> (tipo de entidade, ids, liga, temporada). Invalidar uma
+partida ou temporada é um SMEMBERS + UNLINK em pipeline, sem varrer o
+keyspace.
+
+Stale-while-revalidate: o TTL da entidade é a validade "fresca" da entrada
+(gravada junto do valor); a chave só expira no Redis após TTL x
+CACHE_STALE_TTL_FACTOR. Nesse intervalo get_entry() devolve o valor marcado
+como vencido para que o chamador o sirva e atualize em segundo plano.
 """
+import re
 import json
 import logging
 import hashlib
 import pickle
-from typing import Dict, Any, Optional, Union, List
+import time
+from typing import Callable, Dict, Any, Iterable, NamedTuple, Optional, Union, List, Set
 from datetime import datetime, timedelta
 import redis
 from redis.exceptions import ConnectionError, TimeoutError
 
 from ..config.config import Config
+from .local_cache import LocalLRUCache
+from .cache_codec import CacheCodec
 
 logger = logging.getLogger(__name__)
 
 
+class CacheEntry(NamedTuple):
+    """Valor do cache e se ainda está dentro da validade (soft TTL)"""
+    value: Any
+    fresh: bool
+    validators: Optional[Dict[str, str]] = None  # ETag/Last-Modified da resposta
+
+
 class RedisCache:
     """Cliente Redis com fallback para cache local"""
     
@@ -38,21 +67,57 @@ class RedisCache:
         'default': 4 * 3600              # 4 horas (padrão)
     }
     
+    TAG_PREFIX = 'bdfut:tag:'
+    # Validade mínima dos conjuntos de tags (ver tag_ttl: cobre o hard TTL das chaves)
+    TAG_TTL = max(TTL_MAPPING.values())
+    # Campos de referência nas respostas -> tipo de entidade da tag
+    TAG_REFERENCE_FIELDS = {
+        'league_id': 'leagues',
+        'season_id': 'seasons',
+        'fixture_id': 'fixtures',
+        'team_id': 'teams',
+        'venue_id': 'venues'
+    }
+    SCAN_COUNT = 1000
+    UNLINK_BATCH_SIZE = 500
+    
+    # Envelope {ENVELOPE_KEY: 1, 'fresh_until': epoch, 'value': ...}
+    ENVELOPE_KEY = '__bdfut_cache__'
+    # Marcador de cache negativo (recurso inexistente na API)
+    NOT_FOUND = {'__bdfut_not_found__': True}
+    
     def __init__(self, 
                  redis_url: Optional[str] = None,
                  enable_fallback: bool = True,
-                 max_local_cache_size: int = 1000):
+                 max_local_cache_size: Optional[int] = None,
+                 max_local_cache_bytes: Optional[int] = None,
+                 local_ttl: Optional[int] = None,
+                 codec: Optional[CacheCodec] = None):
         """
         Inicializa cliente Redis com fallback
         
         Args:
             redis_url: URL de conexão Redis
-            enable_fallback: Habilitar cache local como fallback
-            max_local_cache_size: Tamanho máximo do cache local
+            enable_fallback: Habilitar cache local (L1 e fallback)
+            max_local_cache_size: Número máximo de entradas no cache local
+            max_local_cache_bytes: Tamanho máximo do cache local em bytes
+            local_ttl: TTL máximo das entradas locais com o Redis disponível
+            codec: Codec dos valores no Redis (padrão: configurado em Config)
         """
         self.redis_url = redis_url or getattr(Config, 'REDIS_URL', 'redis://localhost:6379')
         self.enable_fallback = enable_fallback
-        self.max_local_cache_size = max_local_cache_size
+        self.max_local_cache_size = max_local_cache_size or Config.LOCAL_CACHE_MAX_ENTRIES
+        self.max_local_cache_bytes = max_local_cache_bytes or Config.LOCAL_CACHE_MAX_BYTES
+        self.local_ttl = local_ttl or Config.LOCAL_CACHE_TTL_SECONDS
+        self.codec = codec or CacheCodec(
+            Config.CACHE_SERIALIZER, Config.CACHE_COMPRESSION,
+            min_compress_bytes=Config.CACHE_COMPRESS_MIN_BYTES
+        )
+        self.stale_ttl_factor = max(Config.CACHE_STALE_TTL_FACTOR, 1.0)
+        self.negative_ttl = Config.CACHE_NEGATIVE_TTL
+        # Conjuntos de tags vivem pelo menos tanto quanto a chave mais longa
+        # (incluindo a janela de vencido e as partidas encerradas)
+        self.tag_ttl = self._hard_ttl(max(self.TAG_TTL, Config.CACHE_FINISHED_FIXTURE_TTL))
         
         # Estatísticas
         self.redis_hits = 0
@@ -60,10 +125,15 @@ class RedisCache:
         self.local_hits = 0
         self.local_misses = 0
         self.redis_errors = 0
+        self.redis_bytes_written = 0
+        self.stale_hits = 0
         
-        # Cache local (fallback)
-        self.local_cache = {} if enable_fallback else None
-        self.local_cache_timestamps = {} if enable_fallback else None
+        # Cache local L1 (também fallback quando o Redis cai)
+        self.local_cache = LocalLRUCache(
+            max_entries=self.max_local_cache_size,
+            max_bytes=self.max_local_cache_bytes,
+            default_ttl=self.TTL_MAPPING['default']
+        ) if enable_fallback else None
         
         # Inicializar Redis
         self._init_redis()
@@ -73,7 +143,7 @@ class RedisCache:
         try:
             self.redis_client = redis.from_url(
                 self.redis_url,
-                decode_responses=True,
+                decode_responses=False,  # Valores binários do CacheCodec
                 socket_timeout=5,
                 socket_connect_timeout=5,
                 retry_on_timeout=True,
@@ -97,7 +167,28 @@ class RedisCache:
     
     def _get_ttl(self, entity_type: str) -> int:
         """Obtém TTL inteligente baseado no tipo de entidade"""
-        return self.TTL_MAPPING.get(entity_type.lower(), self.TTL_MAPPING['default'])
+        return self.TTL_MAPPING.get((entity_type or 'default').lower(), self.TTL_MAPPING['default'])
+    
+    def _get_local_ttl(self, ttl: int) -> int:
+        """TTL da entrada local: limitado enquanto o Redis for a fonte compartilhada"""
+        return min(ttl, self.local_ttl) if self.redis_available else ttl
+    
+    def _set_local(self, key: str, value: Any, ttl: int, tags: Iterable[str] = ()) -> bool:
+        if self.local_cache is None:
+            return False
+        try:
+            return self.local_cache.set(key, value, self._get_local_ttl(ttl), tags)
+        except Exception as e:
+            logger.error(f"❌ Erro ao salvar no cache local: {e}")
+            return False
+    
+    def _fill_local(self, key: str, stored: Any, ttl: int):
+        """Copia para o L1 um valor lido do Redis apenas enquanto ele estiver fresco"""
+        if isinstance(stored, dict) and self.ENVELOPE_KEY in stored:
+            ttl = min(ttl, stored.get('fresh_until', 0) - time.time())
+            if ttl <= 0:
+                return
+        self._set_local(key, stored, ttl)
     
     def _generate_key(self, prefix: str, data: Dict) -> str:
         """Gera chave única para cache"""
@@ -111,6 +202,29 @@ class RedisCache:
         # Gerar hash
         return f"bdfut:{hashlib.md5(sorted_data.encode()).hexdigest()}"
     
+    def _hard_ttl(self, ttl: int) -> int:
+        """Expiração real da chave: TTL da entidade + janela para servir vencido"""
+        return max(int(ttl * self.stale_ttl_factor), ttl)
+    
+    def _wrap(self, value: Any, ttl: int, validators: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        stored = {self.ENVELOPE_KEY: 1, 'fresh_until': time.time() + ttl, 'value': value}
+        if validators:
+            stored['validators'] = validators
+        return stored
+    
+    def _unwrap(self, stored: Any) -> CacheEntry:
+        """Entradas sem envelope (gravadas antes do soft TTL) são consideradas frescas"""
+        if isinstance(stored, dict) and self.ENVELOPE_KEY in stored:
+            fresh = time.time() < stored.get('fresh_until', 0)
+            if not fresh:
+                self.stale_hits += 1
+            return CacheEntry(stored.get('value'), fresh, stored.get('validators'))
+        return CacheEntry(stored, True)
+    
+    @classmethod
+    def is_not_found(cls, value: Any) -> bool:
+        return value == cls.NOT_FOUND
+    
     def get(self, key: str, entity_type: str = 'default') -> Optional[Any]:
         """
         Busca dados no cache
@@ -120,16 +234,38 @@ class RedisCache:
             entity_type: Tipo de entidade para TTL inteligente
             
         Returns:
-            Dados do cache ou None se não encontrado
+            Dados do cache (frescos ou vencidos) ou None se não encontrado
         """
-        # Tentar Redis primeiro
+        entry = self.get_entry(key, entity_type)
+        return entry.value if entry is not None else None
+    
+    def get_entry(self, key: str, entity_type: str = 'default') -> Optional[CacheEntry]:
+        """
+        Busca dados no cache informando se ainda estão frescos
+        
+        Returns:
+            CacheEntry(valor, fresco) ou None se não encontrado
+        """
+        # Cache local L1 primeiro
+        if self.local_cache is not None:
+            stored = self.local_cache.get(key)
+            if stored is not None:
+                self.local_hits += 1
+                logger.debug(f"🎯 Local HIT: {key}")
+                return self._unwrap(stored)
+            
+            self.local_misses += 1
+            logger.debug(f"❌ Local MISS: {key}")
+        
         if self.redis_available:
             try:
                 data = self.redis_client.get(key)
                 if data is not None:
                     self.redis_hits += 1
                     logger.debug(f"🎯 Redis HIT: {key}")
-                    return json.loads(data)
+                    stored = self.codec.decode(data)
+                    self._fill_local(key, stored, self._get_ttl(entity_type))
+                    return self._unwrap(stored)
                 else:
                     self.redis_misses += 1
                     logger.debug(f"❌ Redis MISS: {key}")
@@ -139,28 +275,46 @@ class RedisCache:
                 self.redis_errors += 1
                 self._handle_redis_error()
         
-        # Fallback para cache local
-        if self.enable_fallback and self.local_cache is not None:
-            if key in self.local_cache:
-                # Verificar se não expirou
-                timestamp = self.local_cache_timestamps.get(key)
-                ttl = self._get_ttl(entity_type)
-                
-                if timestamp and (datetime.now() - timestamp).total_seconds() < ttl:
-                    self.local_hits += 1
-                    logger.debug(f"🎯 Local HIT: {key}")
-                    return self.local_cache[key]
-                else:
-                    # Expirado - remover
-                    del self.local_cache[key]
-                    del self.local_cache_timestamps[key]
-            
-            self.local_misses += 1
-            logger.debug(f"❌ Local MISS: {key}")
-        
         return None
     
-    def set(self, key: str, value: Any, entity_type: str = 'default') -> bool:
+    @staticmethod
+    def normalize_entity_type(entity_type: Optional[str]) -> str:
+        """Nome canônico (plural, minúsculo) do tipo de entidade: 'Fixture' -> 'fixtures'"""
+        entity_type = (entity_type or 'default').lower()
+        if f"{entity_type}s" in RedisCache.TTL_MAPPING:
+            return f"{entity_type}s"
+        return entity_type
+    
+    @classmethod
+    def build_tags(cls, entity_type: Optional[str], entity_id: Optional[Any] = None,
+                   **references: Any) -> List[str]:
+        """
+        Tags de uma entrada do cache
+        
+        Args:
+            entity_type: Tipo de entidade (tag 'entity:<tipo>')
+            entity_id: ID da entidade (tag '<tipo>:<id>')
+            references: league_id, season_id, fixture_id, team_id, venue_id
+        
+        Returns:
+            Ex.: build_tags('fixtures', 123, season_id=2024) ->
+            ['entity:fixtures', 'fixtures:123', 'seasons:2024']
+        """
+        entity_type = cls.normalize_entity_type(entity_type)
+        tags = [f"entity:{entity_type}"]
+        if entity_id is not None:
+            tags.append(f"{entity_type}:{entity_id}")
+        for field, value in references.items():
+            if value is not None and field in cls.TAG_REFERENCE_FIELDS:
+                tags.append(f"{cls.TAG_REFERENCE_FIELDS[field]}:{value}")
+        return tags
+    
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.TAG_PREFIX}{tag}"
+    
+    def set(self, key: str, value: Any, entity_type: str = 'default',
+            tags: Optional[Iterable[str]] = None, ttl: Optional[int] = None,
+            validators: Optional[Dict[str, str]] = None) -> bool:
         """
         Salva dados no cache
         
@@ -168,19 +322,27 @@ class RedisCache:
             key: Chave do cache
             value: Dados a serem salvos
             entity_type: Tipo de entidade para TTL inteligente
+            tags: Tags para invalidate_tags() (a tag do tipo de entidade é sempre incluída)
+            ttl: Validade em segundos (padrão: TTL do tipo de entidade)
+            validators: ETag/Last-Modified para requisições condicionais
             
         Returns:
             True se sucesso, False se erro
         """
-        ttl = self._get_ttl(entity_type)
+        ttl = ttl or self._get_ttl(entity_type)
+        tags = list(dict.fromkeys([*self.build_tags(entity_type), *(tags or [])]))
+        stored = self._wrap(value, ttl, validators)
         success = False
         
         # Tentar Redis primeiro
         if self.redis_available:
             try:
-                serialized_data = json.dumps(value)
-                self.redis_client.setex(key, ttl, serialized_data)
-                logger.debug(f"💾 Redis SET: {key} (TTL: {ttl}s)")
+                pipe = self.redis_client.pipeline(transaction=False)
+                serialized_data = self._queue_set(pipe, key, stored, ttl, tags)
+                pipe.execute()
+                self.redis_bytes_written += len(serialized_data)
+                logger.debug(f"💾 Redis SET: {key} (TTL: {ttl}s/{self._hard_ttl(ttl)}s, "
+                             f"{len(serialized_data)} bytes {self.codec.name})")
                 success = True
                 
             except Exception as e:
@@ -188,20 +350,113 @@ class RedisCache:
                 self.redis_errors += 1
                 self._handle_redis_error()
         
-        # Fallback para cache local
-        if self.enable_fallback and self.local_cache is not None:
+        # Cache local L1
+        if self._set_local(key, stored, self._hard_ttl(ttl), tags):
+            logger.debug(f"💾 Local SET: {key}")
+            success = True
+        
+        return success
+    
+    def _queue_set(self, pipe, key: str, stored: Any, ttl: int, tags: List[str]) -> bytes:
+        """Enfileira SETEX (até o hard TTL) + registro nas tags em um pipeline"""
+        serialized_data = self.codec.encode(stored)
+        pipe.setex(key, self._hard_ttl(ttl), serialized_data)
+        tag_ttl = max(self.tag_ttl, self._hard_ttl(ttl))
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), key)
+            pipe.expire(self._tag_key(tag), tag_ttl)
+        return serialized_data
+    
+    def get_many(self, keys: Iterable[str], entity_type: str = 'default') -> Dict[str, Any]:
+        """
+        Busca várias chaves: L1 primeiro e as restantes com um único MGET
+        
+        Args:
+            keys: Chaves do cache
+            entity_type: Tipo de entidade para TTL inteligente
+            
+        Returns:
+            Dicionário chave -> dados (frescos ou vencidos) apenas com as chaves encontradas
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        
+        if self.local_cache is not None:
+            for key in keys:
+                stored = self.local_cache.get(key)
+                if stored is not None:
+                    found[key] = self._unwrap(stored).value
+            self.local_hits += len(found)
+            self.local_misses += len(keys) - len(found)
+        
+        missing = [key for key in keys if key not in found]
+        if missing and self.redis_available:
             try:
-                # Limpar cache local se muito grande
-                if len(self.local_cache) >= self.max_local_cache_size:
-                    self._cleanup_local_cache()
+                ttl = self._get_ttl(entity_type)
+                for key, data in zip(missing, self.redis_client.mget(missing)):
+                    if data is None:
+                        self.redis_misses += 1
+                        continue
+                    self.redis_hits += 1
+                    stored = self.codec.decode(data)
+                    found[key] = self._unwrap(stored).value
+                    self._fill_local(key, stored, ttl)
+                logger.debug(f"🎯 Redis MGET: {len(found)}/{len(keys)} chaves encontradas")
                 
-                self.local_cache[key] = value
-                self.local_cache_timestamps[key] = datetime.now()
-                logger.debug(f"💾 Local SET: {key}")
+            except Exception as e:
+                logger.warning(f"⚠️ Erro no Redis: {e}")
+                self.redis_errors += 1
+                self._handle_redis_error()
+        
+        return found
+    
+    def set_many(self, items: Dict[str, Any], entity_type: str = 'default',
+                 tags: Optional[Dict[str, Iterable[str]]] = None,
+                 ttls: Optional[Dict[str, int]] = None) -> bool:
+        """
+        Salva várias chaves em um único pipeline
+        
+        Args:
+            items: Dicionário chave -> dados
+            entity_type: Tipo de entidade para TTL inteligente
+            tags: Tags por chave (a tag do tipo de entidade é sempre incluída)
+            ttls: Validade por chave (padrão: TTL do tipo de entidade)
+            
+        Returns:
+            True se sucesso, False se erro
+        """
+        if not items:
+            return True
+        
+        default_ttl = self._get_ttl(entity_type)
+        entity_tags = self.build_tags(entity_type)
+        tags = tags or {}
+        ttls = ttls or {}
+        entries = []
+        for key, value in items.items():
+            ttl = ttls.get(key) or default_ttl
+            entries.append((key, self._wrap(value, ttl), ttl,
+                            list(dict.fromkeys([*entity_tags, *tags.get(key, ())]))))
+        success = False
+        
+        if self.redis_available:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                written = sum(len(self._queue_set(pipe, *entry)) for entry in entries)
+                pipe.execute()
+                self.redis_bytes_written += written
+                logger.debug(f"💾 Redis SET: {len(entries)} chaves em pipeline ({written} bytes {self.codec.name})")
                 success = True
                 
             except Exception as e:
-                logger.error(f"❌ Erro ao salvar no cache local: {e}")
+                logger.warning(f"⚠️ Erro ao salvar no Redis: {e}")
+                self.redis_errors += 1
+                self._handle_redis_error()
+        
+        local_saved = [self._set_local(key, stored, self._hard_ttl(ttl), entry_tags)
+                       for key, stored, ttl, entry_tags in entries]
+        if local_saved and all(local_saved):
+            success = True
         
         return success
     
@@ -230,19 +485,64 @@ class RedisCache:
                 self.redis_errors += 1
         
         # Remover do cache local
-        if self.enable_fallback and self.local_cache is not None:
-            if key in self.local_cache:
-                del self.local_cache[key]
-                del self.local_cache_timestamps[key]
-                success = True
-                logger.debug(f"🗑️ Local DELETE: {key}")
+        if self.local_cache is not None and self.local_cache.delete(key):
+            success = True
+            logger.debug(f"🗑️ Local DELETE: {key}")
         
         return success
     
+    def _unlink(self, keys: List) -> int:
+        """UNLINK em pipeline, em lotes (liberação de memória fora da thread do Redis)"""
+        removed = 0
+        for start in range(0, len(keys), self.UNLINK_BATCH_SIZE):
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in keys[start:start + self.UNLINK_BATCH_SIZE]:
+                pipe.unlink(key)
+            removed += sum(pipe.execute())
+        return removed
+    
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Invalida todas as chaves marcadas com qualquer uma das tags
+        
+        Args:
+            tags: Tags (ex: 'fixtures:123', 'seasons:2024', 'entity:teams')
+            
+        Returns:
+            Número de chaves invalidadas
+        """
+        invalidated: Set[str] = set()
+        
+        if self.redis_available and tags:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for tag in tags:
+                    pipe.smembers(self._tag_key(tag))
+                members = set().union(*pipe.execute())
+                
+                removed = self._unlink(list(members) + [self._tag_key(tag) for tag in tags])
+                invalidated.update(m.decode() if isinstance(m, bytes) else m for m in members)
+                logger.debug(f"🗑️ Redis INVALIDATE: {removed} chaves (tags {', '.join(tags)})")
+                
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao invalidar tags no Redis: {e}")
+                self.redis_errors += 1
+        
+        if self.local_cache is not None:
+            local_keys = self.local_cache.delete_tagged(*tags)
+            invalidated.update(local_keys)
+            if local_keys:
+                logger.debug(f"🗑️ Local INVALIDATE: {len(local_keys)} chaves (tags {', '.join(tags)})")
+        
+        return len(invalidated)
+    
     def invalidate_pattern(self, pattern: str) -> int:
         """
         Invalida chaves que correspondem ao padrão
         
+        Usa SCAN incremental (não bloqueia o Redis como KEYS). Para invalidar
+        entidades prefira invalidate_tags(), que não percorre o keyspace.
+        
         Args:
             pattern: Padrão de chaves (ex: 'bdfut:fixtures:*')
             
@@ -254,9 +554,9 @@ class RedisCache:
         # Invalidar no Redis
         if self.redis_available:
             try:
-                keys = self.redis_client.keys(pattern)
+                keys = list(self.redis_client.scan_iter(match=pattern, count=self.SCAN_COUNT))
                 if keys:
-                    invalidated += self.redis_client.delete(*keys)
+                    invalidated += self._unlink(keys)
                     logger.debug(f"🗑️ Redis INVALIDATE: {len(keys)} chaves com padrão {pattern}")
                     
             except Exception as e:
@@ -264,46 +564,54 @@ class RedisCache:
                 self.redis_errors += 1
         
         # Invalidar no cache local
-        if self.enable_fallback and self.local_cache is not None:
+        if self.local_cache is not None:
             # Simular pattern matching para cache local
             import fnmatch
-            keys_to_remove = [k for k in self.local_cache.keys() if fnmatch.fnmatch(k, pattern)]
-            
-            for key in keys_to_remove:
-                del self.local_cache[key]
-                del self.local_cache_timestamps[key]
-                invalidated += 1
+            keys_to_remove = self.local_cache.delete_matching(lambda k: fnmatch.fnmatch(k, pattern))
+            invalidated += len(keys_to_remove)
             
             if keys_to_remove:
                 logger.debug(f"🗑️ Local INVALIDATE: {len(keys_to_remove)} chaves com padrão {pattern}")
         
         return invalidated
     
+    def cleanup_tags(self) -> int:
+        """
+        Remove dos conjuntos de tags as chaves que já expiraram
+        
+        Percorre os conjuntos com SCAN/SSCAN (incremental, sem bloquear o Redis).
+        
+        Returns:
+            Número de referências removidas
+        """
+        if not self.redis_available:
+            return 0
+        
+        removed = 0
+        try:
+            for tag_key in self.redis_client.scan_iter(match=f"{self.TAG_PREFIX}*", count=self.SCAN_COUNT):
+                members = list(self.redis_client.sscan_iter(tag_key, count=self.SCAN_COUNT))
+                for start in range(0, len(members), self.UNLINK_BATCH_SIZE):
+                    batch = members[start:start + self.UNLINK_BATCH_SIZE]
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for member in batch:
+                        pipe.exists(member)
+                    expired = [member for member, exists in zip(batch, pipe.execute()) if not exists]
+                    if expired:
+                        removed += self.redis_client.srem(tag_key, *expired)
+            logger.info(f"🧹 Tags do cache limpas: {removed} referências expiradas removidas")
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao limpar tags no Redis: {e}")
+            self.redis_errors += 1
+        
+        return removed
+    
     def _handle_redis_error(self):
         """Trata erros do Redis"""
         if self.redis_errors > 10:  # Muitos erros
             logger.warning("⚠️ Muitos erros do Redis - tentando reconectar...")
             self._init_redis()
     
-    def _cleanup_local_cache(self):
-        """Limpa cache local removendo entradas mais antigas"""
-        if not self.local_cache or not self.local_cache_timestamps:
-            return
-        
-        # Ordenar por timestamp e remover 25% mais antigos
-        sorted_keys = sorted(
-            self.local_cache_timestamps.keys(),
-            key=lambda k: self.local_cache_timestamps[k]
-        )
-        
-        keys_to_remove = sorted_keys[:len(sorted_keys) // 4]
-        
-        for key in keys_to_remove:
-            del self.local_cache[key]
-            del self.local_cache_timestamps[key]
-        
-        logger.debug(f"🧹 Cache local limpo: {len(keys_to_remove)} entradas removidas")
-    
     def get_stats(self) -> Dict[str, Any]:
         """
         Obtém estatísticas do cache
@@ -326,9 +634,20 @@ class RedisCache:
             "local_hit_rate": self.local_hits / total_local if total_local > 0 else 0,
             "total_hit_rate": (self.redis_hits + self.local_hits) / total_requests if total_requests > 0 else 0,
             "redis_errors": self.redis_errors,
-            "local_cache_size": len(self.local_cache) if self.local_cache else 0
+            "redis_codec": self.codec.name,
+            "redis_bytes_written": self.redis_bytes_written,
+            "stale_hits": self.stale_hits,
+            "local_cache_size": len(self.local_cache) if self.local_cache is not None else 0
         }
         
+        if self.local_cache is not None:
+            local_stats = self.local_cache.get_stats()
+            stats.update({
+                "local_cache_bytes": local_stats['bytes'],
+                "local_evictions": local_stats['evictions'],
+                "local_expirations": local_stats['expirations']
+            })
+        
         # Estatísticas do Redis se disponível
         if self.redis_available:
             try:
@@ -366,7 +685,7 @@ class RedisCache:
                 health["redis_healthy"] = False
         
         # Verificar cache local
-        if self.enable_fallback and self.local_cache is not None:
+        if self.local_cache is not None:
             health["local_cache_healthy"] = True
         
         # Status geral
@@ -393,9 +712,8 @@ class RedisCache:
                 logger.error(f"❌ Erro ao limpar Redis: {e}")
         
         # Limpar cache local
-        if self.enable_fallback and self.local_cache is not None:
+        if self.local_cache is not None:
             self.local_cache.clear()
-            self.local_cache_timestamps.clear()
             logger.info("🧹 Cache local limpo")
             success = True
         
@@ -405,6 +723,13 @@ class RedisCache:
 class SmartCacheManager:
     """Gerenciador inteligente de cache com múltiplas estratégias"""
     
+    # Estados Sportmonks (state_id) de partidas que não mudam mais:
+    # FT, AET, FT_PEN, CANCELLED, WO, AWARDED, DELETED
+    FINISHED_FIXTURE_STATES = frozenset({5, 7, 8, 12, 14, 17, 20})
+    # Em andamento ou prestes a mudar: 1º/2º tempo, intervalo, prorrogação,
+    # pênaltis, atrasada, interrompida, aguardando atualização
+    LIVE_FIXTURE_STATES = frozenset({2, 3, 4, 6, 9, 16, 18, 19, 21, 22, 23, 25})
+    
     def __init__(self, redis_cache: RedisCache):
         self.redis_cache = redis_cache
         
@@ -426,7 +751,8 @@ class SmartCacheManager:
                           endpoint: str, 
                           params: Dict, 
                           response_data: Any,
-                          entity_type: str = 'default') -> bool:
+                          entity_type: str = 'default',
+                          validators: Optional[Dict[str, str]] = None) -> bool:
         """
         Cacheia resposta da API com estratégia inteligente
         
@@ -435,6 +761,7 @@ class SmartCacheManager:
             params: Parâmetros da requisição
             response_data: Dados da resposta
             entity_type: Tipo de entidade
+            validators: ETag/Last-Modified da resposta
             
         Returns:
             True se cacheado com sucesso
@@ -445,19 +772,116 @@ class SmartCacheManager:
         strategy = self.cache_strategies.get(entity_type, {})
         
         # Cache padrão
-        success = self.redis_cache.set(cache_key, response_data, entity_type)
+        tags = self.extract_tags(endpoint, response_data, entity_type)
+        ttl = self.response_ttl(endpoint, response_data, entity_type)
+        success = self.redis_cache.set(cache_key, response_data, entity_type, tags, ttl=ttl,
+                                       validators=validators)
         
         # Cache adicional para entidades que fazem preload
         if strategy.get('preload', False) and isinstance(response_data, dict):
             if 'data' in response_data and isinstance(response_data['data'], list):
-                # Cachear itens individuais para acesso rápido
+                # Cachear itens individuais para acesso rápido (um único pipeline)
+                items = {}
+                item_tags = {}
                 for item in response_data['data']:
                     if 'id' in item:
                         item_key = f"bdfut:{entity_type}:id:{item['id']}"
-                        self.redis_cache.set(item_key, item, entity_type)
+                        items[item_key] = item
+                        item_tags[item_key] = self._item_tags(entity_type, item)
+                self.redis_cache.set_many(items, entity_type, item_tags)
         
         return success
     
+    def cache_not_found(self, endpoint: str, params: Dict, entity_type: str = 'default') -> bool:
+        """Cache negativo: registra por CACHE_NEGATIVE_TTL que o recurso não existe"""
+        cache_key = self.redis_cache._generate_key(endpoint, params)
+        tags = self.extract_tags(endpoint, None, entity_type)
+        return self.redis_cache.set(cache_key, RedisCache.NOT_FOUND, entity_type, tags,
+                                    ttl=self.redis_cache.negative_ttl)
+    
+    @staticmethod
+    def _response_items(response_data: Any) -> List[Dict]:
+        data = response_data.get('data') if isinstance(response_data, dict) else None
+        items = data if isinstance(data, list) else [data] if isinstance(data, dict) else []
+        return [item for item in items if isinstance(item, dict)]
+    
+    @classmethod
+    def fixture_ttl(cls, fixture: Dict) -> Optional[int]:
+        """
+        Validade de uma partida pelo estado
+        
+        Encerradas são praticamente imutáveis; ao vivo mudam a cada poucos
+        segundos; não iniciadas mudam mais perto do início. None quando a
+        resposta não traz o estado (usa o TTL do tipo de entidade).
+        """
+        state_id = fixture.get('state_id')
+        if state_id is None and isinstance(fixture.get('state'), dict):
+            state_id = fixture['state'].get('id')
+        if state_id is None:
+            return None
+        if state_id in cls.FINISHED_FIXTURE_STATES:
+            return Config.CACHE_FINISHED_FIXTURE_TTL
+        if state_id in cls.LIVE_FIXTURE_STATES:
+            return Config.CACHE_LIVE_FIXTURE_TTL
+        
+        starting_at = fixture.get('starting_at_timestamp')
+        if starting_at is not None and float(starting_at) - time.time() < Config.CACHE_UPCOMING_FIXTURE_WINDOW:
+            return Config.CACHE_UPCOMING_FIXTURE_TTL
+        return RedisCache.TTL_MAPPING['fixtures']
+    
+    def response_ttl(self, endpoint: str, response_data: Any, entity_type: str = 'default') -> int:
+        """
+        Validade de uma resposta da API
+        
+        - Sem dados (lista vazia, 'No result(s)'): CACHE_NEGATIVE_TTL
+        - Respostas de /fixtures: a menor validade entre as partidas, pelo estado
+        - Demais: TTL do tipo de entidade
+        """
+        ttl = self.redis_cache._get_ttl(entity_type)
+        if isinstance(response_data, dict) and 'data' in response_data and not response_data['data']:
+            return min(ttl, self.redis_cache.negative_ttl)
+        
+        is_fixture = (RedisCache.normalize_entity_type(entity_type) == 'fixtures'
+                      or endpoint.lstrip('/').startswith('fixtures'))
+        if is_fixture:
+            fixture_ttls = [fixture_ttl for fixture_ttl in map(self.fixture_ttl, self._response_items(response_data))
+                            if fixture_ttl is not None]
+            if fixture_ttls:
+                return min(fixture_ttls)
+        return ttl
+    
+    _ENDPOINT_ID = re.compile(r'^\d+(,\d+)*$')
+    
+    @staticmethod
+    def _item_tags(entity_type: str, item: Dict) -> List[str]:
+        references = {field: item.get(field) for field in RedisCache.TAG_REFERENCE_FIELDS}
+        return RedisCache.build_tags(entity_type, item.get('id'), **references)
+    
+    def extract_tags(self, endpoint: str, response_data: Any, entity_type: str = 'default') -> List[str]:
+        """
+        Tags de uma resposta da API
+        
+        IDs no endpoint ('/fixtures/123', '/fixtures/multi/1,2', '/teams/seasons/2024')
+        e, para cada item da resposta, o próprio id e league_id/season_id/fixture_id/
+        team_id/venue_id.
+        """
+        tags = RedisCache.build_tags(entity_type)
+        
+        segments = [segment for segment in endpoint.split('/') if segment]
+        for position, segment in enumerate(segments):
+            if not self._ENDPOINT_ID.match(segment) or position == 0:
+                continue
+            resource = segments[position - 1]
+            if resource == 'multi' and position >= 2:
+                resource = segments[position - 2]
+            resource = RedisCache.normalize_entity_type(resource)
+            tags.extend(f"{resource}:{entity_id}" for entity_id in segment.split(','))
+        
+        for item in self._response_items(response_data):
+            tags.extend(self._item_tags(entity_type, item))
+        
+        return list(dict.fromkeys(tags))
+    
     def get_cached_api_response(self, 
                                endpoint: str, 
                                params: Dict,
@@ -476,10 +900,19 @@ class SmartCacheManager:
         cache_key = self.redis_cache._generate_key(endpoint, params)
         return self.redis_cache.get(cache_key, entity_type)
     
+    def get_cached_api_entry(self, endpoint: str, params: Dict,
+                             entity_type: str = 'default') -> Optional[CacheEntry]:
+        """Como get_cached_api_response, informando se a resposta ainda está fresca"""
+        cache_key = self.redis_cache._generate_key(endpoint, params)
+        return self.redis_cache.get_entry(cache_key, entity_type)
+    
     def invalidate_entity_cache(self, entity_type: str, entity_id: Optional[int] = None) -> int:
         """
         Invalida cache de uma entidade específica
         
+        Com entity_id remove também as respostas que referenciam a entidade
+        (ex.: 'seasons', 2024 remove as partidas e times da temporada).
+        
         Args:
             entity_type: Tipo de entidade
             entity_id: ID específico (opcional)
@@ -487,38 +920,46 @@ class SmartCacheManager:
         Returns:
             Número de chaves invalidadas
         """
-        if entity_id:
+        entity_type = RedisCache.normalize_entity_type(entity_type)
+        if entity_id is not None:
             # Invalidar entidade específica
-            pattern = f"bdfut:*{entity_type}*{entity_id}*"
+            tag = f"{entity_type}:{entity_id}"
         else:
             # Invalidar todas as entidades do tipo
-            pattern = f"bdfut:*{entity_type}*"
+            tag = f"entity:{entity_type}"
         
-        return self.redis_cache.invalidate_pattern(pattern)
+        return self.redis_cache.invalidate_tags(tag)
     
-    def warm_up_cache(self, entities_to_preload: List[str] = None) -> Dict[str, int]:
+    def warm_up_cache(self, entities_to_preload: List[str] = None,
+                      loaders: Optional[Dict[str, Callable[[], Any]]] = None) -> Dict[str, int]:
         """
         Aquece o cache com dados frequentemente acessados
         
+        Os loaders chamam os getters do cliente da API, que gravam a resposta
+        no cache (respostas já cacheadas não geram requisição).
+        
         Args:
             entities_to_preload: Lista de entidades para preload
+            loaders: Entidade -> função que busca a entidade (ex.: client.get_states)
             
         Returns:
-            Estatísticas do warm-up
+            Itens carregados por entidade (-1 em caso de erro)
         """
         if entities_to_preload is None:
             entities_to_preload = [k for k, v in self.cache_strategies.items() if v.get('preload', False)]
+        loaders = loaders or {}
         
         stats = {}
         
         for entity_type in entities_to_preload:
+            loader = loaders.get(entity_type)
+            if loader is None:
+                logger.debug(f"⏭️ Sem loader para aquecer {entity_type}")
+                continue
             try:
                 logger.info(f"🔥 Aquecendo cache para {entity_type}...")
-                
-                # Implementar lógica específica de preload aqui
-                # Por exemplo, buscar dados mais acessados
-                
-                stats[entity_type] = 0  # Placeholder
+                data = loader()
+                stats[entity_type] = len(data) if isinstance(data, (list, dict)) else int(data is not None)
                 
             except Exception as e:
                 logger.error(f"❌ Erro ao aquecer cache para {entity_type}: {e}")
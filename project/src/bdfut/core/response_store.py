@@ -0,0 +1,196 @@
+"""
+Armazém local de respostas da API
+================================
+
+Guarda em disco, somente por acréscimo, as respostas brutas da Sportmonks
+indexadas por endpoint + parâmetros (sem api_token), para que backfills
+possam ser reprocessados (transformação e carga) sem nenhuma requisição.
+
+Dois arquivos no diretório do armazém:
+
+- responses.dat: registros codificados pelo CacheCodec, um após o outro
+- responses.idx: registros de tamanho fixo (md5 da chave, offset, tamanho)
+
+A leitura usa mmap do arquivo de dados; o índice inteiro é carregado em
+memória na abertura. Gravar de novo a mesma chave apenas acrescenta um
+registro e o índice passa a apontar para o mais recente. O registro de
+dados é gravado antes da entrada do índice, então uma gravação
+interrompida deixa no máximo bytes órfãos no fim de responses.dat.
+
+Um único processo grava por vez; leitores em outros processos enxergam
+apenas o que já estava no índice quando abriram o armazém.
+
+Uso:
+    store = ResponseStore('data/responses')
+    client = SportmonksClient(response_store=store)               # grava e lê
+    client = SportmonksClient(response_store=store, offline=True)  # só reprocessa
+"""
+import os
+import json
+import mmap
+import time
+import struct
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from ..config.config import Config
+from .cache_codec import CacheCodec
+
+logger = logging.getLogger(__name__)
+
+# md5 da chave, offset e tamanho do registro em responses.dat
+INDEX_RECORD = struct.Struct('<16sQI')
+
+
+class ResponseStore:
+    """Armazém de respostas em disco, somente por acréscimo, lido via mmap"""
+
+    DATA_FILE = 'responses.dat'
+    INDEX_FILE = 'responses.idx'
+
+    def __init__(self, path: Optional[str] = None, codec: Optional[CacheCodec] = None):
+        """
+        Args:
+            path: Diretório do armazém (criado se não existir)
+            codec: Codec dos registros (padrão: o mesmo do cache Redis)
+        """
+        self.path = path or Config.RESPONSE_STORE_DIR
+        os.makedirs(self.path, exist_ok=True)
+        self.codec = codec or CacheCodec(
+            Config.CACHE_SERIALIZER, Config.CACHE_COMPRESSION,
+            min_compress_bytes=Config.CACHE_COMPRESS_MIN_BYTES
+        )
+
+        self._lock = threading.Lock()
+        self._data = open(os.path.join(self.path, self.DATA_FILE), 'a+b')
+        self._index_file = open(os.path.join(self.path, self.INDEX_FILE), 'a+b')
+        self._mmap: Optional[mmap.mmap] = None
+        self._index: Dict[bytes, Tuple[int, int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+        self._load_index()
+        logger.info(f"✅ Armazém de respostas aberto: {self.path} ({len(self._index)} respostas)")
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> bytes:
+        """md5 de endpoint + parâmetros ordenados (api_token/api_key ignorados)"""
+        key_data = {k: v for k, v in (params or {}).items() if k not in ('api_token', 'api_key')}
+        key_data['endpoint'] = endpoint
+        return hashlib.md5(json.dumps(key_data, sort_keys=True, default=str).encode()).digest()
+
+    def _load_index(self):
+        """Carrega o índice ignorando entradas que apontam além do fim dos dados"""
+        self._index_file.seek(0)
+        raw = self._index_file.read()
+        data_size = os.fstat(self._data.fileno()).st_size
+
+        valid = len(raw) - len(raw) % INDEX_RECORD.size
+        if valid != len(raw):
+            logger.warning(f"⚠️ Entrada incompleta no fim do índice descartada: {self.path}")
+            self._index_file.truncate(valid)
+
+        for digest, offset, length in INDEX_RECORD.iter_unpack(raw[:valid]):
+            if offset + length <= data_size:
+                self._index[digest] = (offset, length)
+
+    def _read(self, offset: int, length: int) -> bytes:
+        # O mmap é refeito quando o registro está além do trecho mapeado
+        if self._mmap is None or offset + length > len(self._mmap):
+            if self._mmap is not None:
+                self._mmap.close()
+            self._mmap = mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap[offset:offset + length]
+
+    def _get_record(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            location = self._index.get(digest)
+            if location is None:
+                return None
+            data = self._read(*location)
+        return self.codec.decode(data)
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Any]:
+        """Resposta gravada para endpoint + parâmetros (None se ausente)"""
+        try:
+            record = self._get_record(self.make_key(endpoint, params))
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao ler resposta armazenada de {endpoint}: {e}")
+            record = None
+
+        if record is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record['response']
+
+    def put(self, endpoint: str, params: Optional[Dict], response: Any) -> bool:
+        """Acrescenta a resposta ao armazém (a versão anterior da chave deixa de ser lida)"""
+        params = {k: v for k, v in (params or {}).items() if k not in ('api_token', 'api_key')}
+        try:
+            data = self.codec.encode({
+                'endpoint': endpoint, 'params': params,
+                'stored_at': time.time(), 'response': response
+            })
+            digest = self.make_key(endpoint, params)
+            with self._lock:
+                self._data.seek(0, os.SEEK_END)
+                offset = self._data.tell()
+                self._data.write(data)
+                self._data.flush()
+                self._index_file.write(INDEX_RECORD.pack(digest, offset, len(data)))
+                self._index_file.flush()
+                self._index[digest] = (offset, len(data))
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao armazenar resposta de {endpoint}: {e}")
+            return False
+
+    def __contains__(self, item: Tuple[str, Optional[Dict]]) -> bool:
+        endpoint, params = item
+        return self.make_key(endpoint, params) in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def iter_responses(self, endpoint_prefix: str = '') -> Iterator[Tuple[str, Dict, Any]]:
+        """
+        Percorre a versão mais recente de cada resposta, na ordem de gravação
+
+        Yields:
+            (endpoint, params, resposta) dos endpoints que começam com endpoint_prefix
+        """
+        with self._lock:
+            digests = sorted(self._index, key=lambda digest: self._index[digest][0])
+        for digest in digests:
+            record = self._get_record(digest)
+            if record is not None and record['endpoint'].startswith(endpoint_prefix):
+                yield record['endpoint'], record['params'], record['response']
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'path': self.path,
+            'responses': len(self._index),
+            'data_bytes': os.fstat(self._data.fileno()).st_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0,
+            'codec': self.codec.name
+        }
+
+    def close(self):
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            self._data.close()
+            self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
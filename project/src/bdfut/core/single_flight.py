@@ -0,0 +1,281 @@
+"""
+Coalescência de requisições idênticas (single-flight)
+=====================================================
+
+Quando várias threads ou processos pedem o mesmo endpoint/parâmetros ao
+mesmo tempo, apenas um (o líder) chama a API; os demais aguardam o
+resultado em vez de gastar orçamento da Sportmonks com requisições
+duplicadas.
+
+- No processo: um Future por chave; seguidores aguardam o Future do líder.
+- Entre processos: lock curto no Redis (SET NX PX). Quem não obtém o lock
+  aguarda o líder liberá-lo e lê a resposta que ele gravou no cache.
+- do_async: mesma coordenação para corrotinas (AsyncSportmonksClient), com
+  asyncio.Future no processo e comandos Redis fora do event loop.
+
+Uso:
+    flight = SingleFlight(redis_cache)
+    data = flight.do(key, lambda: fetch(), fetch_cached=lambda: cache.get(key))
+"""
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Deduplica chamadas concorrentes com a mesma chave"""
+
+    LOCK_PREFIX = 'bdfut:flight:'
+
+    # Remove o lock apenas se ainda pertence a este líder
+    RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+    def __init__(self, redis_cache=None, lock_ttl: Optional[float] = None,
+                 wait_timeout: Optional[float] = None, poll_interval: float = 0.05):
+        """
+        Args:
+            redis_cache: RedisCache para o lock entre processos (None = só no processo)
+            lock_ttl: Validade do lock no Redis (segundos)
+            wait_timeout: Tempo máximo aguardando outro líder antes de chamar a API
+            poll_interval: Intervalo entre verificações do lock enquanto aguarda
+        """
+        self.redis_cache = redis_cache
+        self.lock_ttl = lock_ttl or Config.SINGLE_FLIGHT_LOCK_TTL
+        self.wait_timeout = wait_timeout or Config.SINGLE_FLIGHT_WAIT_TIMEOUT
+        self.poll_interval = poll_interval
+
+        self._calls: Dict[str, Future] = {}
+        self._async_calls: Dict[tuple, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._release_script = None
+
+        # Estatísticas
+        self.leaders = 0
+        self.followers = 0
+        self.remote_waits = 0
+        self.remote_hits = 0
+        self.timeouts = 0
+
+    def do(self, key: str, fn: Callable[[], Any],
+           fetch_cached: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Executa fn uma única vez por chave entre as chamadas concorrentes
+
+        Args:
+            key: Chave da requisição (RedisCache._generate_key)
+            fn: Chamada à API
+            fetch_cached: Lê o resultado do cache compartilhado; habilita a
+                coordenação entre processos (o líder precisa gravar no cache)
+
+        Returns:
+            Resultado de fn (do líder) ou o valor lido do cache
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if not leader:
+            logger.debug(f"🔗 Aguardando requisição em andamento: {key}")
+            return future.result()
+
+        try:
+            result = self._lead(key, fn, fetch_cached)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]],
+                       fetch_cached: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+        """
+        Versão assíncrona de do(): fn e fetch_cached são funções assíncronas
+
+        Os seguidores no mesmo event loop aguardam o Future do líder; se o
+        líder for cancelado, um deles assume a requisição.
+        """
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+        with self._lock:
+            future = self._async_calls.get(call_key)
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                self._async_calls[call_key] = future
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if not leader:
+            logger.debug(f"🔗 Aguardando requisição em andamento: {key}")
+            # wait() não propaga o cancelamento do seguidor para o Future do líder
+            await asyncio.wait([future])
+            if future.cancelled():
+                # Líder cancelado: um dos seguidores assume a requisição
+                return await self.do_async(key, fn, fetch_cached)
+            return future.result()
+
+        try:
+            result = await self._lead_async(key, fn, fetch_cached)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marca a exceção como lida caso não haja seguidores
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._async_calls.pop(call_key, None)
+
+    async def _lead_async(self, key: str, fn: Callable[[], Awaitable[Any]],
+                          fetch_cached: Optional[Callable[[], Awaitable[Any]]]) -> Any:
+        client = self._redis() if fetch_cached is not None else None
+        if client is None:
+            return await fn()
+
+        loop = asyncio.get_running_loop()
+        lock_key = f"{self.LOCK_PREFIX}{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+        waited = False
+
+        def acquire():
+            return client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+
+        while True:
+            try:
+                acquired = await loop.run_in_executor(None, acquire)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro no lock single-flight: {e}")
+                return await fn()
+
+            if acquired:
+                try:
+                    return await fn()
+                finally:
+                    await loop.run_in_executor(None, self._release, client, lock_key, token)
+
+            if not waited:
+                waited = True
+                self.remote_waits += 1
+                logger.debug(f"🔗 Requisição em andamento em outro processo: {key}")
+
+            # Aguarda o líder liberar o lock e só então lê o cache
+            while True:
+                if time.monotonic() >= deadline:
+                    self.timeouts += 1
+                    logger.warning(f"⚠️ Timeout aguardando requisição de outro processo: {key}")
+                    return await fn()
+                await asyncio.sleep(self.poll_interval)
+                try:
+                    if not await loop.run_in_executor(None, client.exists, lock_key):
+                        break
+                except Exception as e:
+                    logger.warning(f"⚠️ Erro no lock single-flight: {e}")
+                    return await fn()
+
+            cached = await fetch_cached()
+            if cached is not None:
+                self.remote_hits += 1
+                return cached
+            # Líder falhou ou não gravou no cache: tenta assumir a requisição
+
+    def _redis(self):
+        cache = self.redis_cache
+        if cache is None or not cache.redis_available or cache.redis_client is None:
+            return None
+        return cache.redis_client
+
+    def _lead(self, key: str, fn: Callable[[], Any], fetch_cached: Optional[Callable[[], Any]]) -> Any:
+        client = self._redis() if fetch_cached is not None else None
+        if client is None:
+            return fn()
+
+        lock_key = f"{self.LOCK_PREFIX}{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+        waited = False
+
+        while True:
+            try:
+                acquired = client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000))
+            except Exception as e:
+                logger.warning(f"⚠️ Erro no lock single-flight: {e}")
+                return fn()
+
+            if acquired:
+                try:
+                    return fn()
+                finally:
+                    self._release(client, lock_key, token)
+
+            if not waited:
+                waited = True
+                self.remote_waits += 1
+                logger.debug(f"🔗 Requisição em andamento em outro processo: {key}")
+
+            # Aguarda o líder liberar o lock e só então lê o cache
+            while True:
+                if time.monotonic() >= deadline:
+                    self.timeouts += 1
+                    logger.warning(f"⚠️ Timeout aguardando requisição de outro processo: {key}")
+                    return fn()
+                time.sleep(self.poll_interval)
+                try:
+                    if not client.exists(lock_key):
+                        break
+                except Exception as e:
+                    logger.warning(f"⚠️ Erro no lock single-flight: {e}")
+                    return fn()
+
+            cached = fetch_cached()
+            if cached is not None:
+                self.remote_hits += 1
+                return cached
+            # Líder falhou ou não gravou no cache: tenta assumir a requisição
+
+    def _release(self, client, lock_key: str, token: str):
+        try:
+            if self._release_script is None:
+                self._release_script = client.register_script(self.RELEASE_SCRIPT)
+            self._release_script(keys=[lock_key], args=[token])
+        except Exception as e:
+            logger.debug(f"Erro ao liberar lock single-flight: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'leaders': self.leaders,
+            'followers': self.followers,
+            'remote_waits': self.remote_waits,
+            'remote_hits': self.remote_hits,
+            'timeouts': self.timeouts,
+            'in_flight': len(self._calls) + len(self._async_calls)
+        }
@@ -4,18 +4,25 @@
 """
 Módulo de SLIs (Service Level Indicators) e SLOs (Service Level Objectives)
 para o sistema BDFut. Define métricas de qualidade de serviço e objetivos.
+
+As medições de cada SLI vão para uma RollingWindow (streaming_metrics):
+contadores e um DDSketch por balde de tempo, com memória fixa. Calcular um
+SLI, seus quantis (p50/p95/p99) ou a taxa de queima custa O(baldes da
+janela), e o estado pode ser exportado e unido entre processos
+(export_state/merge_state).
 """
 
 import time
 import json
+import functools
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
-from collections import defaultdict, deque
-import statistics
 import threading
 from datetime import datetime, timedelta
 
+from .streaming_metrics import RollingWindow
+
 try:
     from prometheus_client import Counter, Histogram, Gauge, Summary
     PROMETHEUS_AVAILABLE = True
@@ -31,8 +38,8 @@ class SLIType(Enum):
     DATA_FRESHNESS = "data_freshness"
     DATA_COMPLETENESS = "data_completeness"
 
-class SLOStatus(Enum):
-    """Status do SLO."""
+class SLOState(Enum):
+    """Estado do SLO."""
     HEALTHY = "healthy"
     WARNING = "warning"
     BREACHED = "breached"
@@ -47,6 +54,7 @@ class SLI:
     measurement_window: int  # em segundos
     success_criteria: str
     prometheus_query: Optional[str] = None
+    threshold: Optional[float] = None  # latência: medição boa se valor <= threshold
 
 @dataclass
 class SLO:
@@ -69,6 +77,7 @@ class SLIMeasurement:
     total_count: int
     window_start: float
     window_end: float
+    quantiles: Optional[Dict[str, float]] = None  # latência: p50/p95/p99
 
 @dataclass
 class SLOStatus:
@@ -76,7 +85,7 @@ class SLOStatus:
     slo_name: str
     current_percentage: float
     target_percentage: float
-    status: SLOStatus
+    status: SLOState
     measurement_window: int
     burn_rate: float
     last_updated: float
@@ -85,96 +94,113 @@ class SLOStatus:
 class SLICalculator:
     """Calculadora de SLIs."""
     
-    def __init__(self):
-        self.measurements = defaultdict(lambda: deque(maxlen=1000))
+    QUANTILES = {'p50': 0.5, 'p95': 0.95, 'p99': 0.99}
+    
+    def __init__(self, retention_seconds: float = 86400, bucket_seconds: float = 10.0,
+                 relative_accuracy: float = 0.01):
+        """
+        Args:
+            retention_seconds: Maior janela avaliável (padrão: 24h, a janela dos SLOs)
+            bucket_seconds: Resolução das janelas
+            relative_accuracy: Erro relativo dos quantis de latência
+        """
+        self.retention_seconds = retention_seconds
+        self.bucket_seconds = bucket_seconds
+        self.relative_accuracy = relative_accuracy
+        self.windows: Dict[str, RollingWindow] = {}
         self.lock = threading.Lock()
     
-    def record_measurement(self, sli_name: str, success: bool, value: float = None):
+    def _window(self, sli_name: str) -> RollingWindow:
+        window = self.windows.get(sli_name)
+        if window is None:
+            with self.lock:
+                window = self.windows.setdefault(sli_name, RollingWindow(
+                    self.retention_seconds, self.bucket_seconds, self.relative_accuracy
+                ))
+        return window
+    
+    def record_measurement(self, sli_name: str, success: bool, value: float = None,
+                           timestamp: float = None):
         """Registra uma medição de SLI."""
-        with self.lock:
-            measurement = {
-                'timestamp': time.time(),
-                'success': success,
-                'value': value
-            }
-            self.measurements[sli_name].append(measurement)
+        self._window(sli_name).record(success, value, timestamp)
     
-    def calculate_sli(self, sli: SLI) -> SLIMeasurement:
+    def calculate_sli(self, sli: SLI, now: float = None) -> SLIMeasurement:
         """Calcula valor atual do SLI."""
-        with self.lock:
-            measurements = self.measurements[sli.name]
-            
-            if not measurements:
-                return SLIMeasurement(
-                    sli_name=sli.name,
-                    timestamp=time.time(),
-                    value=0.0,
-                    success_count=0,
-                    total_count=0,
-                    window_start=time.time(),
-                    window_end=time.time()
-                )
-            
-            # Filtra medições dentro da janela
-            window_start = time.time() - sli.measurement_window
-            window_measurements = [
-                m for m in measurements 
-                if m['timestamp'] >= window_start
-            ]
-            
-            if not window_measurements:
-                return SLIMeasurement(
-                    sli_name=sli.name,
-                    timestamp=time.time(),
-                    value=0.0,
-                    success_count=0,
-                    total_count=0,
-                    window_start=window_start,
-                    window_end=time.time()
-                )
-            
-            # Calcula SLI baseado no tipo
-            if sli.sli_type == SLIType.AVAILABILITY:
-                success_count = sum(1 for m in window_measurements if m['success'])
-                total_count = len(window_measurements)
-                value = (success_count / total_count * 100) if total_count > 0 else 0.0
-                
-            elif sli.sli_type == SLIType.LATENCY:
-                values = [m['value'] for m in window_measurements if m['value'] is not None]
-                if values:
-                    value = statistics.median(values)  # P50
-                else:
-                    value = 0.0
-                success_count = len(values)
-                total_count = len(window_measurements)
-                
-            elif sli.sli_type == SLIType.THROUGHPUT:
-                # Requisições por segundo
-                time_span = window_measurements[-1]['timestamp'] - window_measurements[0]['timestamp']
-                value = len(window_measurements) / time_span if time_span > 0 else 0.0
-                success_count = len(window_measurements)
-                total_count = len(window_measurements)
-                
-            elif sli.sli_type == SLIType.ERROR_RATE:
-                error_count = sum(1 for m in window_measurements if not m['success'])
-                total_count = len(window_measurements)
-                value = (error_count / total_count * 100) if total_count > 0 else 0.0
-                success_count = total_count - error_count
-                
-            else:
-                value = 0.0
-                success_count = 0
-                total_count = 0
-            
+        now = time.time() if now is None else now
+        window_start = now - sli.measurement_window
+        window = self._window(sli.name)
+        counts = window.counts(sli.measurement_window, now)
+        
+        if counts.total == 0:
             return SLIMeasurement(
                 sli_name=sli.name,
-                timestamp=time.time(),
-                value=value,
-                success_count=success_count,
-                total_count=total_count,
+                timestamp=now,
+                value=0.0,
+                success_count=0,
+                total_count=0,
                 window_start=window_start,
-                window_end=time.time()
+                window_end=now
             )
+        
+        quantiles = None
+        
+        # Calcula SLI baseado no tipo
+        if sli.sli_type == SLIType.AVAILABILITY:
+            success_count = counts.success
+            total_count = counts.total
+            value = success_count / total_count * 100
+            
+        elif sli.sli_type == SLIType.LATENCY:
+            sketch = window.sketch(sli.measurement_window, now)
+            quantiles = dict(zip(self.QUANTILES, sketch.quantiles(self.QUANTILES.values())))
+            value = quantiles['p50']
+            total_count = sketch.count
+            # Medições boas: latência dentro do limite (sem limite, toda medição com valor)
+            success_count = sketch.count_below(sli.threshold) if sli.threshold is not None else sketch.count
+            
+        elif sli.sli_type == SLIType.THROUGHPUT:
+            # Requisições por segundo
+            time_span = counts.last_timestamp - counts.first_timestamp
+            value = counts.total / time_span if time_span > 0 else 0.0
+            success_count = counts.total
+            total_count = counts.total
+            
+        elif sli.sli_type == SLIType.ERROR_RATE:
+            total_count = counts.total
+            success_count = counts.success
+            value = counts.failures / total_count * 100
+            
+        else:
+            value = 0.0
+            success_count = 0
+            total_count = 0
+        
+        return SLIMeasurement(
+            sli_name=sli.name,
+            timestamp=now,
+            value=value,
+            success_count=success_count,
+            total_count=total_count,
+            window_start=window_start,
+            window_end=now,
+            quantiles=quantiles
+        )
+    
+    def get_quantiles(self, sli_name: str, window_seconds: float = None, now: float = None) -> Dict[str, float]:
+        """p50/p95/p99 dos valores do SLI na janela"""
+        sketch = self._window(sli_name).sketch(window_seconds, now)
+        return dict(zip(self.QUANTILES, sketch.quantiles(self.QUANTILES.values())))
+    
+    def export_state(self) -> Dict[str, Any]:
+        """Janelas de todos os SLIs em forma serializável (para unir em outro processo)"""
+        with self.lock:
+            windows = dict(self.windows)
+        return {name: window.to_dict() for name, window in windows.items()}
+    
+    def merge_state(self, state: Dict[str, Any]):
+        """Soma as janelas exportadas por outro processo"""
+        for sli_name, data in state.items():
+            self._window(sli_name).merge(RollingWindow.from_dict(data))
 
 class SLOManager:
     """Gerenciador de SLOs."""
@@ -221,7 +247,8 @@ class SLOManager:
                 sli_type=SLIType.LATENCY,
                 measurement_window=300,  # 5 minutos
                 success_criteria='P95 response time < 2s',
-                prometheus_query='histogram_quantile(0.95, rate(bdfut_api_request_duration_seconds_bucket[5m]))'
+                prometheus_query='histogram_quantile(0.95, rate(bdfut_api_request_duration_seconds_bucket[5m]))',
+                threshold=2.0  # 2 segundos
             ),
             
             'api_throughput': SLI(
@@ -345,7 +372,7 @@ class SLOManager:
             slo_name=slo.name,
             current_percentage=0.0,
             target_percentage=slo.target_percentage,
-            status=SLOStatus.UNKNOWN,
+            status=SLOState.UNKNOWN,
             measurement_window=slo.measurement_window,
             burn_rate=0.0,
             last_updated=time.time()
@@ -381,18 +408,22 @@ class SLOManager:
     
     def _evaluate_slo(self, slo: SLO):
         """Avalia um SLO específico."""
+        slo_name = slo.name
+        
         # Calcula SLI
         sli_measurement = self.sli_calculator.calculate_sli(slo.sli)
         
         # Determina status baseado no tipo de SLI
-        if slo.sli.sli_type in [SLIType.AVAILABILITY, SLIType.ERROR_RATE]:
-            # Para disponibilidade e taxa de erro, valor já é percentual
+        if slo.sli.sli_type == SLIType.AVAILABILITY:
+            # Para disponibilidade, valor já é percentual
             current_percentage = sli_measurement.value
+        elif slo.sli.sli_type == SLIType.ERROR_RATE:
+            # Taxa de erro: o alvo é o percentual de sucesso
+            current_percentage = 100.0 - sli_measurement.value if sli_measurement.total_count > 0 else 0.0
         else:
             # Para latência e throughput, precisa converter
             if slo.sli.sli_type == SLIType.LATENCY:
-                # Latência: sucesso se < threshold
-                threshold = 2.0  # 2 segundos
+                # Latência: sucesso se <= threshold do SLI (contado no sketch)
                 success_rate = (sli_measurement.success_count / sli_measurement.total_count * 100) if sli_measurement.total_count > 0 else 0.0
                 current_percentage = success_rate
             else:
@@ -403,15 +434,15 @@ class SLOManager:
         
         # Determina status
         if current_percentage >= slo.target_percentage:
-            status = SLOStatus.HEALTHY
+            status = SLOState.HEALTHY
             if slo_name in self.breach_start_times:
                 del self.breach_start_times[slo_name]
         elif current_percentage >= slo.warning_threshold:
-            status = SLOStatus.WARNING
+            status = SLOState.WARNING
             if slo_name in self.breach_start_times:
                 del self.breach_start_times[slo_name]
         else:
-            status = SLOStatus.BREACHED
+            status = SLOState.BREACHED
             if slo_name not in self.breach_start_times:
                 self.breach_start_times[slo_name] = time.time()
         
@@ -439,9 +470,10 @@ class SLOManager:
     
     def _calculate_burn_rate(self, slo: SLO, current_percentage: float) -> float:
         """Calcula taxa de queima do SLO."""
-        # Burn rate = (target - current) / target
-        if slo.target_percentage > 0:
-            return (slo.target_percentage - current_percentage) / slo.target_percentage
+        # Burn rate = taxa de falhas observada / orçamento de erro (1.0 = consome o orçamento no prazo)
+        error_budget = 100.0 - slo.target_percentage
+        if error_budget > 0:
+            return max(0.0, 100.0 - current_percentage) / error_budget
         return 0.0
     
     def get_slo_status(self, slo_name: str) -> Optional[SLOStatus]:
@@ -456,14 +488,14 @@ class SLOManager:
         """Retorna SLOs violados."""
         return [
             status for status in self.slo_statuses.values()
-            if status.status == SLOStatus.BREACHED
+            if status.status == SLOState.BREACHED
         ]
     
     def get_warning_slos(self) -> List[SLOStatus]:
         """Retorna SLOs em warning."""
         return [
             status for status in self.slo_statuses.values()
-            if status.status == SLOStatus.WARNING
+            if status.status == SLOState.WARNING
         ]
     
     def generate_slo_report(self) -> Dict[str, Any]:
@@ -471,9 +503,9 @@ class SLOManager:
         self.evaluate_slos()
         
         total_slos = len(self.slos)
-        healthy_slos = len([s for s in self.slo_statuses.values() if s.status == SLOStatus.HEALTHY])
-        warning_slos = len([s for s in self.slo_statuses.values() if s.status == SLOStatus.WARNING])
-        breached_slos = len([s for s in self.slo_statuses.values() if s.status == SLOStatus.BREACHED])
+        healthy_slos = len([s for s in self.slo_statuses.values() if s.status == SLOState.HEALTHY])
+        warning_slos = len([s for s in self.slo_statuses.values() if s.status == SLOState.WARNING])
+        breached_slos = len([s for s in self.slo_statuses.values() if s.status == SLOState.BREACHED])
         
         return {
             "summary": {
@@ -2,38 +2,65 @@
 Cliente para API Sportmonks com tratamento de rate limiting
 """
 import time
+import threading
 import requests
 import hashlib
 import json
-from typing import Dict, Any, Optional, List
-from tenacity import retry, stop_after_attempt, wait_exponential
+from typing import Dict, Any, Optional, List, Iterable, Iterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_exponential
 from datetime import datetime, timedelta
 import logging
 from supabase import create_client
 
 from ..config.config import Config
-from .redis_cache import RedisCache, SmartCacheManager
+from .redis_cache import CacheEntry, RedisCache, SmartCacheManager
+from .rate_limiter import RateLimiter, create_rate_limiter, parse_rate_limit_headers
+from .single_flight import SingleFlight
+from .response_store import ResponseStore
 
 logger = logging.getLogger(__name__)
 
+
+class SportmonksNotFoundError(requests.exceptions.HTTPError):
+    """Recurso inexistente na API (404), possivelmente servido pelo cache negativo"""
+
+
+class SportmonksOfflineError(LookupError):
+    """Resposta ausente do armazém local com o cliente em modo offline"""
+
+
 class SportmonksClient:
     """Cliente para interação com a API Sportmonks"""
     
+    MULTI_MAX_IDS = 100  # Limite de IDs do endpoint fixtures/multi
+    
+    # Endpoints core (countries, states, types) usam outra base URL
+    CORE_BASE_URL = "https://api.sportmonks.com/v3/core"
+    
     def __init__(self, 
                  enable_cache: bool = True, 
                  cache_ttl_hours: int = 24,
                  use_redis: bool = True,
-                 redis_url: Optional[str] = None):
+                 redis_url: Optional[str] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 response_store: Optional[ResponseStore] = None,
+                 offline: bool = False):
+        """
+        Args:
+            response_store: Armazém local de respostas, consultado após o cache e
+                gravado a cada resposta da API
+            offline: Não fazer requisições; respostas ausentes do cache e do
+                armazém levantam SportmonksOfflineError
+        """
         Config.validate()
         self.api_key = Config.SPORTMONKS_API_KEY
         self.base_url = Config.SPORTMONKS_BASE_URL
-        self.rate_limit = Config.RATE_LIMIT_PER_HOUR
         self.max_retries = Config.MAX_RETRIES
         
         # Controle de rate limiting
         self.requests_made = 0
-        self.request_timestamps = []
-        self.rate_limit_remaining = self.rate_limit
+        self.rate_limit_remaining = Config.RATE_LIMIT_PER_HOUR
         self.rate_limit_reset = None
         
         # Sistema de cache
@@ -62,32 +89,74 @@ class SportmonksClient:
                 except Exception as e:
                     logger.warning(f"⚠️ Erro ao inicializar cache: {e}. Continuando sem cache.")
                     self.enable_cache = False
+        
+        # Rate limiter por entidade (compartilhado via Redis quando disponível)
+        if rate_limiter is None:
+            shared_cache = self.redis_cache if self.enable_cache and self.use_redis else None
+            rate_limiter = create_rate_limiter(Config.RATE_LIMIT_PER_HOUR, shared_cache)
+        self.rate_limiter = rate_limiter
+        
+        # Requisições idênticas simultâneas viram uma só (entre processos via lock no Redis)
+        self.single_flight = SingleFlight(self.redis_cache if self.enable_cache and self.use_redis else None)
+        
+        # Atualização em segundo plano de entradas vencidas (stale-while-revalidate)
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+        self.stale_served = 0
+        self.background_refreshes = 0
+        self.not_modified = 0
+        
+        # Armazém local de respostas brutas (reprocessamento sem requisições)
+        self.response_store = response_store
+        self.offline = offline
+        self.store_hits = 0
+    
+    @property
+    def rate_limit(self) -> int:
+        """Requisições permitidas por hora (por entidade)"""
+        return self.rate_limiter.capacity
+    
+    @rate_limit.setter
+    def rate_limit(self, value: int):
+        self.rate_limiter.capacity = value
+    
+    @staticmethod
+    def _rate_limit_bucket(endpoint: str) -> str:
+        """Entidade do endpoint (a Sportmonks limita requisições por entidade)"""
+        return endpoint.strip('/').split('/')[0] or 'default'
     
-    def _check_rate_limit(self):
+    def _check_rate_limit(self, bucket: str = 'default'):
         """Verifica e aguarda se necessário para respeitar o rate limit"""
-        now = datetime.now()
-        
-        # Remove timestamps mais antigos que 1 hora
-        self.request_timestamps = [
-            ts for ts in self.request_timestamps 
-            if now - ts < timedelta(hours=1)
-        ]
-        
-        # Se atingiu o limite, aguarda
-        if len(self.request_timestamps) >= self.rate_limit:
-            oldest_request = min(self.request_timestamps)
-            wait_time = 3600 - (now - oldest_request).total_seconds()
-            if wait_time > 0:
-                logger.warning(f"Rate limit atingido. Aguardando {wait_time:.0f} segundos...")
-                time.sleep(wait_time)
-    
-    def _update_rate_limit_from_headers(self, headers: Dict):
+        self.rate_limiter.acquire(bucket)
+    
+    def _update_rate_limit_from_headers(self, headers: Dict, bucket: str = 'default'):
         """Atualiza informações de rate limit dos headers da resposta"""
-        if 'X-RateLimit-Remaining' in headers:
-            self.rate_limit_remaining = int(headers['X-RateLimit-Remaining'])
+        try:
+            remaining, reset_at = parse_rate_limit_headers(headers)
+        except (TypeError, ValueError):
+            return
+        
+        if remaining is not None:
+            self.rate_limit_remaining = remaining
+        
+        if reset_at is not None:
+            self.rate_limit_reset = datetime.fromtimestamp(reset_at)
         
-        if 'X-RateLimit-Reset' in headers:
-            self.rate_limit_reset = datetime.fromtimestamp(int(headers['X-RateLimit-Reset']))
+        self.rate_limiter.observe(bucket, remaining, reset_at)
+    
+    def _update_rate_limit_from_body(self, response_data: Any, bucket: str = 'default'):
+        """Atualiza rate limit a partir do campo 'rate_limit' do corpo (API v3)"""
+        rate_info = response_data.get('rate_limit') if isinstance(response_data, dict) else None
+        if not isinstance(rate_info, dict) or rate_info.get('remaining') is None:
+            return
+        
+        reset_at = None
+        if rate_info.get('resets_in_seconds') is not None:
+            reset_at = time.time() + float(rate_info['resets_in_seconds'])
+        
+        self.rate_limit_remaining = int(rate_info['remaining'])
+        self.rate_limiter.observe(bucket, self.rate_limit_remaining, reset_at)
     
     def _generate_cache_key(self, endpoint: str, params: Dict) -> str:
         """Gera chave única para o cache baseada no endpoint e parâmetros"""
@@ -103,17 +172,22 @@ class SportmonksClient:
     
     def _get_from_cache(self, endpoint: str, params: Dict, entity_type: str = 'default') -> Optional[Dict]:
         """Busca dados no cache"""
+        entry = self._get_cache_entry(endpoint, params, entity_type)
+        return entry.value if entry is not None else None
+    
+    def _get_cache_entry(self, endpoint: str, params: Dict, entity_type: str = 'default') -> Optional[CacheEntry]:
+        """Busca dados no cache informando se ainda estão frescos (Supabase: sempre frescos)"""
         if not self.enable_cache:
             return None
         
         try:
             if self.use_redis:
                 # Usar Redis cache
-                cached_data = self.smart_cache.get_cached_api_response(endpoint, params, entity_type)
-                if cached_data is not None:
+                entry = self.smart_cache.get_cached_api_entry(endpoint, params, entity_type)
+                if entry is not None:
                     self.cache_hits += 1
-                    logger.debug(f"🎯 Redis Cache HIT para {endpoint}")
-                    return cached_data
+                    logger.debug(f"🎯 Redis Cache HIT para {endpoint}{'' if entry.fresh else ' (vencido)'}")
+                    return entry
                 else:
                     self.cache_misses += 1
                     logger.debug(f"❌ Redis Cache MISS para {endpoint}")
@@ -129,7 +203,7 @@ class SportmonksClient:
                     
                     self.cache_hits += 1
                     logger.debug(f"🎯 Supabase Cache HIT para {endpoint}")
-                    return cache_entry['data']
+                    return CacheEntry(cache_entry['data'], True)
                 
                 self.cache_misses += 1
                 logger.debug(f"❌ Supabase Cache MISS para {endpoint}")
@@ -140,15 +214,17 @@ class SportmonksClient:
             self.cache_misses += 1
             return None
     
-    def _save_to_cache(self, endpoint: str, params: Dict, response_data: Dict, entity_type: str = 'default'):
-        """Salva dados no cache"""
+    def _save_to_cache(self, endpoint: str, params: Dict, response_data: Dict, entity_type: str = 'default',
+                       validators: Optional[Dict[str, str]] = None):
+        """Salva dados no cache (validators: ETag/Last-Modified, apenas no Redis)"""
         if not self.enable_cache:
             return
         
         try:
             if self.use_redis:
                 # Usar Redis cache com TTL inteligente
-                success = self.smart_cache.cache_api_response(endpoint, params, response_data, entity_type)
+                success = self.smart_cache.cache_api_response(endpoint, params, response_data, entity_type,
+                                                              validators)
                 if success:
                     logger.debug(f"💾 Dados salvos no Redis cache para {endpoint}")
                 else:
@@ -181,7 +257,11 @@ class SportmonksClient:
                 "cache_type": "redis" if self.use_redis else "supabase",
                 "client_cache_hits": self.cache_hits,
                 "client_cache_misses": self.cache_misses,
-                "client_hit_rate": self.cache_hits / (self.cache_hits + self.cache_misses) if (self.cache_hits + self.cache_misses) > 0 else 0
+                "client_hit_rate": self.cache_hits / (self.cache_hits + self.cache_misses) if (self.cache_hits + self.cache_misses) > 0 else 0,
+                "client_stale_served": self.stale_served,
+                "client_background_refreshes": self.background_refreshes,
+                "client_not_modified": self.not_modified,
+                "client_store_hits": self.store_hits
             }
             
             if self.use_redis and hasattr(self, 'smart_cache'):
@@ -241,37 +321,158 @@ class SportmonksClient:
             return {"error": "Redis cache não disponível"}
         
         try:
-            return self.smart_cache.warm_up_cache()
+            return self.smart_cache.warm_up_cache(loaders={
+                'countries': self.get_countries,
+                'states': self.get_states,
+                'types': self.get_types
+            })
         except Exception as e:
             logger.error(f"❌ Erro ao aquecer cache: {e}")
             return {"error": str(e)}
     
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=60)
+        wait=wait_exponential(multiplier=1, min=4, max=60),
+        retry=retry_if_not_exception_type((SportmonksNotFoundError, SportmonksOfflineError))
     )
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None, entity_type: str = None) -> Dict[str, Any]:
-        """Faz uma requisição para a API com retry automático e cache"""
+    def _make_request(self, endpoint: str, params: Optional[Dict] = None, entity_type: str = None,
+                      cache: bool = True, base_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Faz uma requisição para a API com retry automático e cache
+        
+        Entradas vencidas (dentro do hard TTL) são servidas na hora enquanto
+        uma atualização roda em segundo plano. Sem entrada no cache, a resposta
+        é lida do armazém local (se configurado) antes de ir à API.
+        
+        Args:
+            base_url: Base da API para este endpoint (padrão: self.base_url)
+        
+        Raises:
+            SportmonksNotFoundError: 404 da API ou do cache negativo
+            SportmonksOfflineError: Resposta ausente em modo offline
+        """
         if params is None:
             params = {}
         
         # Tentar buscar no cache primeiro
-        cached_data = self._get_from_cache(endpoint, params, entity_type)
-        if cached_data is not None:
-            return cached_data
+        entry = self._get_cache_entry(endpoint, params, entity_type) if cache else None
+        if entry is not None:
+            if not entry.fresh:
+                self.stale_served += 1
+                if not self.offline:
+                    self._schedule_refresh(endpoint, params, entity_type, entry, base_url)
+            return self._check_not_found(endpoint, entry.value)
         
-        # Se não encontrou no cache, fazer requisição à API
-        self._check_rate_limit()
+        if self.response_store is not None:
+            stored = self.response_store.get(endpoint, params)
+            if stored is not None:
+                self.store_hits += 1
+                return stored
+        if self.offline:
+            raise SportmonksOfflineError(f"Resposta não armazenada (modo offline): {endpoint} {params}")
         
-        url = f"{self.base_url}{endpoint}"
+        # Se não encontrou no cache, fazer requisição à API (uma só entre chamadas idênticas)
+        shared_cache = cache and self.enable_cache and self.use_redis
+        flight_key = (self.redis_cache._generate_key(endpoint, params) if shared_cache
+                      else self._generate_cache_key(endpoint, params))
+        result = self.single_flight.do(
+            flight_key,
+            lambda: self._fetch(endpoint, params, entity_type, cache, base_url=base_url),
+            fetch_cached=(lambda: self._get_fresh(flight_key, entity_type)) if shared_cache else None
+        )
+        return self._check_not_found(endpoint, result)
+    
+    @staticmethod
+    def _check_not_found(endpoint: str, data: Any) -> Any:
+        if RedisCache.is_not_found(data):
+            logger.debug(f"🚫 Cache negativo para {endpoint}")
+            raise SportmonksNotFoundError(f"Recurso não encontrado: {endpoint}")
+        return data
+    
+    def _get_fresh(self, key: str, entity_type: str = None) -> Optional[Any]:
+        """Valor do cache apenas se ainda estiver fresco (resultado de outro líder)"""
+        entry = self.redis_cache.get_entry(key, entity_type)
+        return entry.value if entry is not None and entry.fresh else None
+    
+    def _schedule_refresh(self, endpoint: str, params: Dict, entity_type: str = None,
+                          entry: Optional[CacheEntry] = None, base_url: Optional[str] = None):
+        """Agenda a atualização de uma entrada vencida (uma por chave por vez)"""
+        key = self.redis_cache._generate_key(endpoint, params)
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=Config.CACHE_REFRESH_WORKERS, thread_name_prefix='cache-refresh'
+                )
+        self._refresh_executor.submit(self._refresh, key, endpoint, dict(params), entity_type, entry, base_url)
+    
+    def _refresh(self, key: str, endpoint: str, params: Dict, entity_type: str = None,
+                 entry: Optional[CacheEntry] = None, base_url: Optional[str] = None):
+        try:
+            self.single_flight.do(
+                key,
+                lambda: self._fetch(endpoint, params, entity_type, revalidate=entry, base_url=base_url),
+                fetch_cached=lambda: self._get_fresh(key, entity_type)
+            )
+            self.background_refreshes += 1
+            logger.debug(f"🔄 Cache atualizado em segundo plano: {endpoint}")
+        except SportmonksNotFoundError:
+            self.background_refreshes += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao atualizar cache de {endpoint}: {e}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(key)
+    
+    @staticmethod
+    def _response_validators(headers) -> Optional[Dict[str, str]]:
+        """ETag/Last-Modified da resposta, quando a API os envia"""
+        try:
+            normalized = {str(k).lower(): v for k, v in dict(headers).items()}
+        except (TypeError, ValueError):
+            return None
+        validators = {name: normalized[header] for name, header in
+                      (('etag', 'etag'), ('last_modified', 'last-modified')) if normalized.get(header)}
+        return validators or None
+    
+    @staticmethod
+    def _conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        validators = (entry.validators if entry is not None else None) or {}
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+    
+    def _fetch(self, endpoint: str, params: Dict, entity_type: str = None, cache: bool = True,
+               revalidate: Optional[CacheEntry] = None, base_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Requisição à API (sem consulta ao cache) com controle de rate limit
+        
+        Args:
+            revalidate: Entrada vencida do cache; se ela tem ETag/Last-Modified a
+                requisição é condicional e um 304 renova a entrada sem baixar o corpo
+            base_url: Base da API para este endpoint (padrão: self.base_url)
+        """
+        bucket = self._rate_limit_bucket(endpoint)
+        self._check_rate_limit(bucket)
+        
+        url = f"{base_url or self.base_url}{endpoint}"
         params['api_token'] = self.api_key
+        headers = self._conditional_headers(revalidate)
         
         try:
-            response = requests.get(url, params=params)
+            if headers:
+                response = requests.get(url, params=params, headers=headers)
+            else:
+                response = requests.get(url, params=params)
             
             # Atualiza controle de rate limit
-            self.request_timestamps.append(datetime.now())
-            self._update_rate_limit_from_headers(response.headers)
+            self.requests_made += 1
+            self._update_rate_limit_from_headers(response.headers, bucket)
             
             # Verifica status 429 (Too Many Requests)
             if response.status_code == 429:
@@ -280,14 +481,35 @@ class SportmonksClient:
                 time.sleep(retry_after)
                 raise Exception("Rate limit exceeded")
             
+            if response.status_code == 404:
+                if cache and self.enable_cache and self.use_redis:
+                    self.smart_cache.cache_not_found(endpoint, params, entity_type)
+                raise SportmonksNotFoundError(f"Recurso não encontrado: {endpoint}", response=response)
+            
+            if response.status_code == 304 and headers:
+                self.not_modified += 1
+                logger.debug(f"♻️ 304 Not Modified: {endpoint}")
+                if cache:
+                    validators = {**revalidate.validators, **(self._response_validators(response.headers) or {})}
+                    self._save_to_cache(endpoint, params, revalidate.value, entity_type, validators)
+                return revalidate.value
+            
             response.raise_for_status()
             response_data = response.json()
+            self._update_rate_limit_from_body(response_data, bucket)
+            
+            if self.response_store is not None:
+                self.response_store.put(endpoint, params, response_data)
             
             # Salvar no cache
-            self._save_to_cache(endpoint, params, response_data, entity_type)
+            if cache:
+                self._save_to_cache(endpoint, params, response_data, entity_type,
+                                    self._response_validators(response.headers))
             
             return response_data
             
+        except SportmonksNotFoundError:
+            raise
         except requests.exceptions.RequestException as e:
             logger.error(f"Erro na requisição para {url}: {str(e)}")
             if hasattr(e, 'response') and e.response is not None:
@@ -298,35 +520,117 @@ class SportmonksClient:
                     logger.error(f"Resposta: {e.response.text}")
             raise
     
-    def get_paginated_data(self, endpoint: str, params: Optional[Dict] = None, 
-                          max_pages: Optional[int] = None, entity_type: str = None) -> List[Dict]:
-        """Obtém dados paginados da API"""
-        if params is None:
-            params = {}
+    @staticmethod
+    def _last_page(pagination: Dict, start_page: int, max_pages: Optional[int]) -> Optional[int]:
+        """Última página a buscar, se conhecida (total informado pela API ou max_pages)"""
+        last_page = pagination.get('total_pages') or pagination.get('last_page')
+        if not last_page and pagination.get('total') and pagination.get('per_page'):
+            last_page = -(-int(pagination['total']) // int(pagination['per_page']))
         
-        all_data = []
-        page = 1
+        if max_pages:
+            limit = start_page + max_pages - 1
+            last_page = min(int(last_page), limit) if last_page else limit
         
-        while True:
-            params['page'] = page
-            response = self._make_request(endpoint, params, entity_type)
-            
-            data = response.get('data', [])
-            all_data.extend(data)
-            
-            # Verifica se há mais páginas
-            pagination = response.get('pagination', {})
-            if not pagination.get('has_more', False):
-                break
-            
-            # Verifica limite de páginas
-            if max_pages and page >= max_pages:
-                break
-            
-            page += 1
+        return int(last_page) if last_page else None
+    
+    def iter_pages(self, endpoint: str, params: Optional[Dict] = None,
+                   max_pages: Optional[int] = None, entity_type: str = None,
+                   max_workers: Optional[int] = None,
+                   base_url: Optional[str] = None) -> Iterator[List[Dict]]:
+        """
+        Itera sobre as páginas de um endpoint paginado, em ordem
+        
+        Com max_workers > 1, após a primeira página as seguintes são buscadas
+        concorrentemente (respeitando o rate limiter), em uma janela de no
+        máximo max_workers páginas em andamento à frente da próxima a entregar.
+        A janela avança conforme as páginas são consumidas e para na última
+        página (total informado pela API ou max_pages) ou na primeira sem has_more.
+        
+        Args:
+            endpoint: Endpoint da API
+            params: Parâmetros da requisição ('page' define a página inicial)
+            max_pages: Número máximo de páginas
+            entity_type: Tipo de entidade para o cache
+            max_workers: Páginas buscadas simultaneamente (padrão: Config.PAGINATION_WORKERS)
+            base_url: Base da API para este endpoint (padrão: self.base_url)
             
-            # Pequena pausa entre páginas
-            time.sleep(0.1)  # Otimizado de 0.5s para 0.1s
+        Yields:
+            Lista de itens ('data') de cada página
+        """
+        params = dict(params or {})
+        start_page = int(params.pop('page', 1))
+        if max_workers is None:
+            max_workers = Config.PAGINATION_WORKERS
+        
+        def fetch(page: int) -> Dict:
+            return self._make_request(endpoint, dict(params, page=page), entity_type, base_url=base_url)
+        
+        response = fetch(start_page)
+        yield response.get('data', [])
+        
+        pagination = response.get('pagination', {})
+        if not pagination.get('has_more', False):
+            return
+        
+        last_page = self._last_page(pagination, start_page, max_pages)
+        
+        if max_workers <= 1:
+            page = start_page + 1
+            while last_page is None or page <= last_page:
+                response = fetch(page)
+                yield response.get('data', [])
+                
+                if not response.get('pagination', {}).get('has_more', False):
+                    break
+                page += 1
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+        try:
+            next_page = start_page + 1
+            page = start_page + 1
+            while True:
+                # Mantém até max_workers páginas em andamento à frente da próxima a entregar
+                while len(pending) < max_workers and (last_page is None or next_page <= last_page):
+                    pending[next_page] = executor.submit(fetch, next_page)
+                    next_page += 1
+                
+                if page not in pending:
+                    break
+                
+                response = pending.pop(page).result()
+                yield response.get('data', [])
+                
+                if not response.get('pagination', {}).get('has_more', False):
+                    break
+                page += 1
+        finally:
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=True)
+    
+    def iter_items(self, endpoint: str, params: Optional[Dict] = None,
+                   max_pages: Optional[int] = None, entity_type: str = None,
+                   max_workers: Optional[int] = None,
+                   base_url: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Itera item a item sobre um endpoint paginado
+        
+        Mantém em memória apenas as páginas em andamento, permitindo
+        processar coleções grandes (transfers, fixtures/between) em streaming.
+        """
+        for page_data in self.iter_pages(endpoint, params, max_pages, entity_type, max_workers, base_url):
+            yield from page_data
+    
+    def get_paginated_data(self, endpoint: str, params: Optional[Dict] = None, 
+                          max_pages: Optional[int] = None, entity_type: str = None,
+                          max_workers: Optional[int] = None,
+                          base_url: Optional[str] = None) -> List[Dict]:
+        """Obtém dados paginados da API"""
+        all_data = []
+        for page_data in self.iter_pages(endpoint, params, max_pages, entity_type, max_workers, base_url):
+            all_data.extend(page_data)
         
         return all_data
     
@@ -339,12 +643,7 @@ class SportmonksClient:
             params['include'] = include
         
         # Countries usa endpoint core ao invés de football
-        original_base = self.base_url
-        self.base_url = "https://api.sportmonks.com/v3/core"
-        try:
-            return self.get_paginated_data('/countries', params)
-        finally:
-            self.base_url = original_base
+        return self.get_paginated_data('/countries', params, base_url=self.CORE_BASE_URL)
     
     def get_leagues(self, include: Optional[str] = None) -> List[Dict]:
         """Obtém lista de ligas"""
@@ -388,14 +687,88 @@ class SportmonksClient:
         
         return self.get_paginated_data(f'/teams/seasons/{season_id}', params)
     
-    def get_fixtures_by_date_range(self, start_date: str, end_date: str, 
-                                   include: Optional[str] = None) -> List[Dict]:
-        """Obtém partidas em um intervalo de datas"""
+    def iter_fixtures_by_date_range(self, start_date: str, end_date: str,
+                                    include: Optional[str] = None) -> Iterator[Dict]:
+        """Itera sobre partidas em um intervalo de datas sem acumular todas as páginas"""
         params = {}
         if include:
             params['include'] = include
         
-        return self.get_paginated_data(f'/fixtures/between/{start_date}/{end_date}', params, entity_type='Fixture')
+        return self.iter_items(f'/fixtures/between/{start_date}/{end_date}', params, entity_type='Fixture')
+    
+    def get_fixtures_by_date_range(self, start_date: str, end_date: str, 
+                                   include: Optional[str] = None) -> List[Dict]:
+        """Obtém partidas em um intervalo de datas"""
+        return list(self.iter_fixtures_by_date_range(start_date, end_date, include))
+    
+    def _get_many_by_id(self, resource: str, ids: Iterable[int], include: Optional[str],
+                        entity_type: str,
+                        fetch_missing: Callable[[List[int], Dict], List[Dict]]) -> Dict[int, Dict]:
+        """
+        Versão em lote dos getters por ID
+        
+        Usa as mesmas chaves de cache do getter individual ('/<resource>/<id>'),
+        lê todas com um MGET e busca na API apenas os IDs ausentes.
+        """
+        params, keys, result, missing = self._get_cached_by_id(resource, ids, include, entity_type)
+        if missing:
+            self._cache_fetched_by_id(resource, keys, result, missing, fetch_missing(missing, params), entity_type)
+        return result
+    
+    def _get_cached_by_id(self, resource: str, ids: Iterable[int], include: Optional[str],
+                          entity_type: str):
+        """
+        Etapa de leitura de _get_many_by_id
+        
+        Returns:
+            Tupla (params, chaves por ID, resultado com os cacheados, IDs ausentes)
+        """
+        ids = list(dict.fromkeys(int(entity_id) for entity_id in ids))
+        params = {'include': include} if include else {}
+        
+        keys = {}
+        result = {}
+        if self._batch_cache_enabled:
+            keys = {entity_id: self.redis_cache._generate_key(f'/{resource}/{entity_id}', params)
+                    for entity_id in ids}
+            try:
+                cached = self.redis_cache.get_many(keys.values(), entity_type)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao buscar cache: {e}")
+                cached = {}
+            for entity_id, key in keys.items():
+                data = (cached.get(key) or {}).get('data')
+                if data:
+                    result[entity_id] = data
+            self.cache_hits += len(result)
+            self.cache_misses += len(ids) - len(result)
+        
+        missing = [entity_id for entity_id in ids if entity_id not in result]
+        if missing:
+            logger.debug(f"🎯 {len(result)}/{len(ids)} {resource} no cache, buscando {len(missing)} na API")
+        return params, keys, result, missing
+    
+    def _cache_fetched_by_id(self, resource: str, keys: Dict[int, str], result: Dict[int, Dict],
+                             missing: List[int], fetched: List[Dict], entity_type: str):
+        """Etapa de gravação de _get_many_by_id: junta ao resultado e grava com um pipeline"""
+        missing_ids = set(missing)
+        fetched = [item for item in fetched if item.get('id') in missing_ids]
+        for item in fetched:
+            result[item['id']] = item
+        
+        if self._batch_cache_enabled and fetched:
+            items = {keys[item['id']]: {'data': item} for item in fetched}
+            tags = {keys[item['id']]: SmartCacheManager._item_tags(entity_type, item) for item in fetched}
+            ttls = {key: self.smart_cache.response_ttl(f'/{resource}', value, entity_type)
+                    for key, value in items.items()}
+            try:
+                self.redis_cache.set_many(items, entity_type, tags, ttls)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao salvar cache: {e}")
+    
+    @property
+    def _batch_cache_enabled(self) -> bool:
+        return self.enable_cache and self.use_redis and hasattr(self, 'redis_cache')
     
     def get_fixture_by_id(self, fixture_id: int, include: Optional[str] = None) -> Dict:
         """Obtém detalhes de uma partida específica"""
@@ -406,6 +779,15 @@ class SportmonksClient:
         response = self._make_request(f'/fixtures/{fixture_id}', params)
         return response.get('data', {})
     
+    def get_team_by_id(self, team_id: int, include: Optional[str] = None) -> Dict:
+        """Obtém detalhes de um time específico"""
+        params = {}
+        if include:
+            params['include'] = include
+        
+        response = self._make_request(f'/teams/{team_id}', params, 'teams')
+        return response.get('data', {}) if response else {}
+    
     def get_venues(self, include: Optional[str] = None) -> List[Dict]:
         """Obtém lista de estádios"""
         params = {}
@@ -441,24 +823,14 @@ class SportmonksClient:
     def get_states(self) -> List[Dict]:
         """Obtém lista de estados (status de partidas)"""
         # States usa endpoint core ao invés de football
-        original_base = self.base_url
-        self.base_url = "https://api.sportmonks.com/v3/core"
-        try:
-            response = self._make_request('/states')
-            return response.get('data', [])
-        finally:
-            self.base_url = original_base
+        response = self._make_request('/states', base_url=self.CORE_BASE_URL)
+        return response.get('data', [])
     
     def get_types(self) -> List[Dict]:
         """Obtém lista de tipos (tipos de eventos, estatísticas, etc)"""
         # Types usa endpoint core ao invés de football
-        original_base = self.base_url
-        self.base_url = "https://api.sportmonks.com/v3/core"
-        try:
-            response = self._make_request('/types')
-            return response.get('data', [])
-        finally:
-            self.base_url = original_base
+        response = self._make_request('/types', base_url=self.CORE_BASE_URL)
+        return response.get('data', [])
     
     def get_player_by_id(self, player_id: int, include: Optional[str] = None) -> Dict:
         """Obtém detalhes de um jogador específico"""
@@ -469,6 +841,27 @@ class SportmonksClient:
         response = self._make_request(f'/players/{player_id}', params)
         return response.get('data', {})
     
+    def get_players_by_ids(self, player_ids: Iterable[int], include: Optional[str] = None) -> Dict[int, Dict]:
+        """
+        Obtém vários jogadores: os cacheados com um MGET, os demais da API
+        
+        Returns:
+            Dicionário player_id -> dados (IDs com erro na API ficam de fora)
+        """
+        def fetch_missing(ids: List[int], params: Dict) -> List[Dict]:
+            players = []
+            for player_id in ids:
+                try:
+                    response = self._make_request(f'/players/{player_id}', dict(params), 'players', cache=False)
+                except Exception as e:
+                    logger.error(f"❌ Erro ao buscar jogador {player_id}: {e}")
+                    continue
+                if response and response.get('data'):
+                    players.append(response['data'])
+            return players
+        
+        return self._get_many_by_id('players', player_ids, include, 'players', fetch_missing)
+    
     def get_coaches_by_team(self, team_id: int, include: Optional[str] = None) -> List[Dict]:
         """Obtém técnicos de um time"""
         params = {}
@@ -564,10 +957,10 @@ class SportmonksClient:
         response = self._make_request(endpoint, params, 'coach')
         return response.get('data', {}) if response else {}
     
-    def get_transfers(self, include: Optional[str] = None, 
-                     per_page: int = 500, 
-                     page: int = 1) -> List[Dict]:
-        """Obtém lista de transferências"""
+    def iter_transfers(self, include: Optional[str] = None,
+                       per_page: int = 500,
+                       page: int = 1) -> Iterator[Dict]:
+        """Itera sobre transferências sem acumular todas as páginas"""
         params = {
             'per_page': per_page,
             'page': page
@@ -575,7 +968,13 @@ class SportmonksClient:
         if include:
             params['include'] = include
         
-        return self.get_paginated_data('/transfers', params)
+        return self.iter_items('/transfers', params)
+    
+    def get_transfers(self, include: Optional[str] = None, 
+                     per_page: int = 500, 
+                     page: int = 1) -> List[Dict]:
+        """Obtém lista de transferências"""
+        return list(self.iter_transfers(include, per_page, page))
     
     def get_transfers_by_player(self, player_id: int, include: Optional[str] = None) -> List[Dict]:
         """Obtém transferências de um jogador específico"""
@@ -593,10 +992,10 @@ class SportmonksClient:
         
         return self.get_paginated_data(f'/transfers/teams/{team_id}', params)
     
-    def get_rounds(self, include: Optional[str] = None, 
-                   per_page: int = 500, 
-                   page: int = 1) -> List[Dict]:
-        """Obtém lista de rounds/rodadas"""
+    def iter_rounds(self, include: Optional[str] = None,
+                    per_page: int = 500,
+                    page: int = 1) -> Iterator[Dict]:
+        """Itera sobre rounds/rodadas sem acumular todas as páginas"""
         params = {
             'per_page': per_page,
             'page': page
@@ -604,7 +1003,13 @@ class SportmonksClient:
         if include:
             params['include'] = include
         
-        return self.get_paginated_data('/rounds', params)
+        return self.iter_items('/rounds', params)
+    
+    def get_rounds(self, include: Optional[str] = None, 
+                   per_page: int = 500, 
+                   page: int = 1) -> List[Dict]:
+        """Obtém lista de rounds/rodadas"""
+        return list(self.iter_rounds(include, per_page, page))
     
     def get_rounds_by_season(self, season_id: int, include: Optional[str] = None) -> List[Dict]:
         """Obtém rounds de uma temporada específica"""
@@ -623,10 +1028,10 @@ class SportmonksClient:
         response = self._make_request(f'/rounds/{round_id}', params, 'round')
         return response.get('data', {}) if response else {}
     
-    def get_stages(self, include: Optional[str] = None, 
-                   per_page: int = 500, 
-                   page: int = 1) -> List[Dict]:
-        """Obtém lista de stages/fases"""
+    def iter_stages(self, include: Optional[str] = None,
+                    per_page: int = 500,
+                    page: int = 1) -> Iterator[Dict]:
+        """Itera sobre stages/fases sem acumular todas as páginas"""
         params = {
             'per_page': per_page,
             'page': page
@@ -634,7 +1039,13 @@ class SportmonksClient:
         if include:
             params['include'] = include
         
-        return self.get_paginated_data('/stages', params)
+        return self.iter_items('/stages', params)
+    
+    def get_stages(self, include: Optional[str] = None, 
+                   per_page: int = 500, 
+                   page: int = 1) -> List[Dict]:
+        """Obtém lista de stages/fases"""
+        return list(self.iter_stages(include, per_page, page))
     
     def get_stages_by_season(self, season_id: int, include: Optional[str] = None) -> List[Dict]:
         """Obtém stages de uma temporada específica"""
@@ -663,6 +1074,30 @@ class SportmonksClient:
         response = self._make_request(endpoint, params, 'fixtures')
         return response if response else {}
     
+    def get_fixtures_by_ids(self, fixture_ids: Iterable[int], include: Optional[str] = None) -> Dict[int, Dict]:
+        """
+        Obtém várias partidas: as cacheadas com um MGET, as demais via fixtures/multi
+        
+        Cada partida é cacheada com a mesma chave de get_fixture_by_id.
+        
+        Returns:
+            Dicionário fixture_id -> dados (IDs com erro na API ficam de fora)
+        """
+        def fetch_missing(ids: List[int], params: Dict) -> List[Dict]:
+            fixtures = []
+            for start in range(0, len(ids), self.MULTI_MAX_IDS):
+                chunk = ids[start:start + self.MULTI_MAX_IDS]
+                try:
+                    response = self._make_request(f"/fixtures/multi/{','.join(map(str, chunk))}",
+                                                  dict(params), 'fixtures', cache=False)
+                except Exception as e:
+                    logger.error(f"❌ Erro ao buscar lote de {len(chunk)} partidas: {e}")
+                    continue
+                fixtures.extend((response or {}).get('data') or [])
+            return fixtures
+        
+        return self._get_many_by_id('fixtures', fixture_ids, include, 'fixtures', fetch_missing)
+    
     def get_fixture_with_includes(self, fixture_id: int, include: Optional[str] = None) -> Dict:
         """Obtém uma fixture específica com includes"""
         endpoint = f'/fixtures/{fixture_id}'
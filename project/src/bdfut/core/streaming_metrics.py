@@ -0,0 +1,286 @@
+"""
+Métricas em fluxo com memória fixa
+=================================
+
+Base dos SLIs (sli_slo.SLICalculator) e do APM (apm.PerformanceProfiler):
+
+- DDSketch: quantis com erro relativo garantido (padrão 1%). Os valores vão
+  para baldes logarítmicos; dois sketches com a mesma precisão se unem
+  somando os baldes, então sketches de processos diferentes podem ser
+  combinados (to_dict/from_dict/merge).
+- RollingWindow: janela deslizante em baldes de tempo (padrão 10s), cada um
+  com contadores (total, sucessos, primeiro/último instante) e um DDSketch.
+  Avaliar uma janela custa O(baldes), não O(medições). Os baldes são
+  indexados pelo instante absoluto (timestamp // bucket_seconds), então
+  janelas de processos diferentes se alinham sem coordenação.
+
+A janela avaliada inclui o balde parcial em que cai o seu início, ou seja,
+pode cobrir até bucket_seconds a mais do que o pedido.
+"""
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class DDSketch:
+    """Sketch de quantis com erro relativo `relative_accuracy` e no máximo `max_bins` baldes"""
+
+    # Valores abaixo disso (inclusive zero e negativos) vão para o balde zero
+    MIN_INDEXABLE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        if value <= self.MIN_INDEXABLE:
+            self.zero_count += count
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self):
+        # Junta os menores baldes: preserva a precisão dos quantis altos (p95/p99)
+        keys = sorted(self.bins)
+        excess = len(keys) - self.max_bins
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.bins[target] += self.bins.pop(key)
+
+    def merge(self, other: 'DDSketch'):
+        """Soma outro sketch (mesma precisão) a este"""
+        if other.gamma != self.gamma:
+            raise ValueError("DDSketch com precisões diferentes")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Vários quantis em uma passada pelos baldes (0.0 sem valores)"""
+        qs = list(qs)
+        if self.count == 0:
+            return [0.0 for _ in qs]
+
+        ranks = sorted((q * (self.count - 1), position) for position, q in enumerate(qs))
+        results = [0.0] * len(qs)
+        keys = iter(sorted(self.bins))
+        cumulative = self.zero_count
+        key = None
+        for rank, position in ranks:
+            if rank < self.zero_count:
+                results[position] = min(max(0.0, self.min), self.max)
+                continue
+            while cumulative <= rank:
+                key = next(keys)
+                cumulative += self.bins[key]
+            results[position] = min(max(self._value(key), self.min), self.max)
+        return results
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def count_below(self, threshold: float) -> int:
+        """Valores <= threshold (com o erro relativo do sketch)"""
+        if threshold <= self.MIN_INDEXABLE:
+            return self.zero_count if threshold >= 0 else 0
+        limit = self._key(threshold)
+        return self.zero_count + sum(count for key, count in self.bins.items() if key <= limit)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Forma serializável (JSON) para unir sketches entre processos"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'bins': {str(key): count for key, count in self.bins.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_bins: int = 2048) -> 'DDSketch':
+        sketch = cls(data['relative_accuracy'], max_bins)
+        sketch.bins = {int(key): count for key, count in data['bins'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.sum = data['sum']
+        if data['count']:
+            sketch.min, sketch.max = data['min'], data['max']
+        return sketch
+
+
+@dataclass
+class WindowCounts:
+    """Contadores somados de uma janela"""
+    total: int = 0
+    success: int = 0
+    first_timestamp: Optional[float] = None
+    last_timestamp: Optional[float] = None
+
+    @property
+    def failures(self) -> int:
+        return self.total - self.success
+
+
+class _Bucket:
+    __slots__ = ('total', 'success', 'first', 'last', 'sketch')
+
+    def __init__(self):
+        self.total = 0
+        self.success = 0
+        self.first = math.inf
+        self.last = -math.inf
+        self.sketch: Optional[DDSketch] = None
+
+
+class RollingWindow:
+    """Contadores e DDSketch por balde de tempo, mantidos por `retention_seconds`"""
+
+    def __init__(self, retention_seconds: float, bucket_seconds: float = 10.0,
+                 relative_accuracy: float = 0.01):
+        self.retention_seconds = retention_seconds
+        self.bucket_seconds = bucket_seconds
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max(1, math.ceil(retention_seconds / bucket_seconds))
+        self.buckets: Dict[int, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _index(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def _prune(self, current_index: int):
+        oldest = current_index - self.max_buckets
+        for index in [index for index in self.buckets if index <= oldest]:
+            del self.buckets[index]
+
+    def record(self, success: bool = True, value: Optional[float] = None,
+               timestamp: Optional[float] = None):
+        """Registra uma medição (value vai para o sketch do balde)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        index = self._index(timestamp)
+        with self._lock:
+            bucket = self.buckets.get(index)
+            if bucket is None:
+                bucket = self.buckets[index] = _Bucket()
+                self._prune(index)
+            bucket.total += 1
+            if success:
+                bucket.success += 1
+            bucket.first = min(bucket.first, timestamp)
+            bucket.last = max(bucket.last, timestamp)
+            if value is not None:
+                if bucket.sketch is None:
+                    bucket.sketch = DDSketch(self.relative_accuracy)
+                bucket.sketch.add(value)
+
+    def _window(self, seconds: Optional[float], now: Optional[float]) -> List[_Bucket]:
+        now = time.time() if now is None else now
+        seconds = self.retention_seconds if seconds is None else min(seconds, self.retention_seconds)
+        start, end = self._index(now - seconds), self._index(now)
+        return [bucket for index, bucket in self.buckets.items() if start <= index <= end]
+
+    def counts(self, seconds: Optional[float] = None, now: Optional[float] = None) -> WindowCounts:
+        """Total, sucessos e primeiro/último instante dos últimos `seconds` (O(baldes))"""
+        result = WindowCounts()
+        with self._lock:
+            for bucket in self._window(seconds, now):
+                result.total += bucket.total
+                result.success += bucket.success
+                if result.first_timestamp is None or bucket.first < result.first_timestamp:
+                    result.first_timestamp = bucket.first
+                if result.last_timestamp is None or bucket.last > result.last_timestamp:
+                    result.last_timestamp = bucket.last
+        return result
+
+    def sketch(self, seconds: Optional[float] = None, now: Optional[float] = None) -> DDSketch:
+        """DDSketch dos valores dos últimos `seconds` (união dos baldes)"""
+        merged = DDSketch(self.relative_accuracy)
+        with self._lock:
+            for bucket in self._window(seconds, now):
+                if bucket.sketch is not None:
+                    merged.merge(bucket.sketch)
+        return merged
+
+    def merge(self, other: 'RollingWindow'):
+        """Soma outra janela (ex.: de outro processo) balde a balde"""
+        if other.bucket_seconds != self.bucket_seconds:
+            raise ValueError("RollingWindow com baldes de tamanhos diferentes")
+        with other._lock:
+            incoming = list(other.buckets.items())
+        with self._lock:
+            for index, source in incoming:
+                bucket = self.buckets.setdefault(index, _Bucket())
+                bucket.total += source.total
+                bucket.success += source.success
+                bucket.first = min(bucket.first, source.first)
+                bucket.last = max(bucket.last, source.last)
+                if source.sketch is not None:
+                    if bucket.sketch is None:
+                        bucket.sketch = DDSketch(self.relative_accuracy)
+                    bucket.sketch.merge(source.sketch)
+            if self.buckets:
+                self._prune(max(self.buckets))
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'retention_seconds': self.retention_seconds,
+                'bucket_seconds': self.bucket_seconds,
+                'relative_accuracy': self.relative_accuracy,
+                'buckets': {
+                    str(index): {
+                        'total': bucket.total,
+                        'success': bucket.success,
+                        'first': bucket.first,
+                        'last': bucket.last,
+                        'sketch': bucket.sketch.to_dict() if bucket.sketch is not None else None
+                    }
+                    for index, bucket in self.buckets.items()
+                }
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RollingWindow':
+        window = cls(data['retention_seconds'], data['bucket_seconds'], data['relative_accuracy'])
+        for index, item in data['buckets'].items():
+            bucket = window.buckets[int(index)] = _Bucket()
+            bucket.total = item['total']
+            bucket.success = item['success']
+            bucket.first = item['first']
+            bucket.last = item['last']
+            if item['sketch'] is not None:
+                bucket.sketch = DDSketch.from_dict(item['sketch'])
+        return window
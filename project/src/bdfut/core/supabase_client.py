@@ -1,23 +1,254 @@
 """
 Cliente para interação com o Supabase
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterable, Callable
 from supabase import create_client, Client
 import logging
 from datetime import datetime
 
 from ..config.config import Config
+from .bulk_loader import PostgresBulkLoader, chunked
 
 logger = logging.getLogger(__name__)
 
 class SupabaseClient:
     """Cliente para interação com o banco de dados Supabase"""
     
-    def __init__(self, use_service_role: bool = False):
+    def __init__(self, use_service_role: bool = False,
+                 bulk_loader: Optional[PostgresBulkLoader] = None):
         Config.validate()
         # Usar service_role_key se solicitado (para operações administrativas)
         key = Config.SUPABASE_SERVICE_KEY if use_service_role and Config.SUPABASE_SERVICE_KEY else Config.SUPABASE_KEY
         self.client: Client = create_client(Config.SUPABASE_URL, key)
+        self._bulk_loader = bulk_loader
+    
+    @property
+    def bulk_loader(self) -> Optional[PostgresBulkLoader]:
+        """Loader COPY via PostgreSQL direto, se DATABASE_URL estiver configurada"""
+        if self._bulk_loader is None and Config.DATABASE_URL:
+            self._bulk_loader = PostgresBulkLoader(Config.DATABASE_URL)
+        return self._bulk_loader
+    
+    @staticmethod
+    def _fixture_row(fixture: Dict) -> Dict:
+        # Mapear apenas campos que existem na tabela fixtures
+        fixture_data = {
+            'sportmonks_id': fixture.get('id'),
+            'league_id': fixture.get('league_id'),
+            'season_id': fixture.get('season_id'),
+            'home_team_id': fixture.get('home_team_id'),
+            'away_team_id': fixture.get('away_team_id'),
+            'match_date': fixture.get('starting_at'),
+            'status': fixture.get('state', {}).get('short_name') if fixture.get('state') else None,
+            'home_score': fixture.get('scores', [{}])[0].get('goals') if fixture.get('scores') else None,
+            'away_score': fixture.get('scores', [{}])[1].get('goals') if len(fixture.get('scores', [])) > 1 else None,
+            'venue': fixture.get('venue', {}).get('name') if fixture.get('venue') else None,
+            'referee': fixture.get('referee', {}).get('name') if fixture.get('referee') else None,
+            'updated_at': datetime.now().isoformat()
+        }
+        
+        # Remover campos None para não sobrescrever dados existentes
+        return {k: v for k, v in fixture_data.items() if v is not None}
+    
+    @staticmethod
+    def _player_row(player: Dict) -> Dict:
+        # Garantir que name não seja null
+        name = player.get('name') or player.get('common_name') or player.get('display_name') or f"Player_{player.get('id', 'Unknown')}"
+        
+        player_data = {
+            'sportmonks_id': player.get('id'),
+            'name': name,
+            'common_name': player.get('common_name'),
+            'firstname': player.get('firstname'),
+            'lastname': player.get('lastname'),
+            'nationality': player.get('nationality'),
+            'position_id': player.get('position_id'),
+            'position_name': player.get('position', {}).get('name') if player.get('position') else None,
+            'date_of_birth': player.get('date_of_birth'),
+            'height': player.get('height'),
+            'weight': player.get('weight'),
+            'image_path': player.get('image_path'),
+            'updated_at': datetime.now().isoformat()
+        }
+        
+        # Remover campos None para não sobrescrever dados existentes
+        return {k: v for k, v in player_data.items() if v is not None}
+    
+    @staticmethod
+    def _lineup_row(lineup: Dict) -> Dict:
+        # Mapear apenas campos que existem na tabela match_lineups
+        lineup_data = {
+            'fixture_id': lineup.get('fixture_id'),
+            'team_id': lineup.get('team_id'),
+            'player_id': lineup.get('player_id'),
+            'player_name': lineup.get('player_name'),
+            'type': lineup.get('type'),
+            'position_id': lineup.get('position_id'),
+            'position_name': lineup.get('position_name'),
+            'jersey_number': lineup.get('jersey_number'),
+            'captain': lineup.get('captain', False),
+            'minutes_played': lineup.get('minutes_played'),
+            'rating': lineup.get('rating')
+        }
+        
+        # Remover campos None para não sobrescrever dados existentes
+        return {k: v for k, v in lineup_data.items() if v is not None}
+    
+    @staticmethod
+    def _event_row(event: Dict) -> Dict:
+        # Colunas de match_events alinhadas com a API
+        event_data = {
+            'id': event.get('id'),
+            'fixture_id': event.get('fixture_id'),
+            'period_id': event.get('period_id'),
+            'participant_id': event.get('participant_id'),
+            'type_id': event.get('type_id'),
+            'sub_type_id': event.get('sub_type_id'),
+            'section': event.get('section'),
+            'player_id': event.get('player_id'),
+            'related_player_id': event.get('related_player_id'),
+            'player_name': event.get('player_name'),
+            'related_player_name': event.get('related_player_name'),
+            'coach_id': event.get('coach_id'),
+            'result': event.get('result'),
+            'info': event.get('info'),
+            'addition': event.get('addition'),
+            'minute': event.get('minute'),
+            'extra_minute': event.get('extra_minute'),
+            'injured': event.get('injured'),
+            'on_bench': event.get('on_bench'),
+            'rescinded': event.get('rescinded'),
+            'detailed_period_id': event.get('detailed_period_id'),
+            'sort_order': event.get('sort_order')
+        }
+        
+        return {k: v for k, v in event_data.items() if v is not None}
+    
+    @staticmethod
+    def _statistic_row(statistic: Dict) -> Dict:
+        # match_statistics guarda uma linha por estatística da API (type_id + data)
+        statistic_data = {
+            'id': statistic.get('id'),
+            'fixture_id': statistic.get('fixture_id'),
+            'participant_id': statistic.get('participant_id'),
+            'type_id': statistic.get('type_id'),
+            'data': statistic.get('data'),
+            'location': statistic.get('location')
+        }
+        
+        return {k: v for k, v in statistic_data.items() if v is not None}
+    
+    @staticmethod
+    def _match_referee_row(referee: Dict) -> Dict:
+        # Árbitro escalado em uma partida (include referees de fixtures)
+        referee_data = {
+            'id': referee.get('id'),
+            'fixture_id': referee.get('fixture_id'),
+            'referee_id': referee.get('referee_id'),
+            'type_id': referee.get('type_id')
+        }
+        
+        return {k: v for k, v in referee_data.items() if v is not None}
+    
+    @staticmethod
+    def _match_period_row(period: Dict) -> Dict:
+        # Período da partida (include periods de fixtures)
+        period_data = {
+            'id': period.get('id'),
+            'fixture_id': period.get('fixture_id'),
+            'type_id': period.get('type_id'),
+            'started': period.get('started'),
+            'ended': period.get('ended'),
+            'counts_from': period.get('counts_from'),
+            'ticking': period.get('ticking'),
+            'sort_order': period.get('sort_order'),
+            'description': period.get('description'),
+            'time_added': period.get('time_added'),
+            'period_length': period.get('period_length'),
+            'minutes': period.get('minutes'),
+            'seconds': period.get('seconds'),
+            'has_timer': period.get('has_timer')
+        }
+        
+        return {k: v for k, v in period_data.items() if v is not None}
+    
+    def bulk_upsert(self, table: str, rows: Iterable[Dict], on_conflict: str) -> bool:
+        """
+        Insere ou atualiza linhas já mapeadas em massa
+        
+        Usa COPY + INSERT ... ON CONFLICT quando DATABASE_URL está configurada;
+        caso contrário faz upserts REST em lotes de Config.BATCH_SIZE.
+        
+        Args:
+            table: Tabela de destino
+            rows: Linhas no formato da tabela (lista ou gerador)
+            on_conflict: Colunas de conflito separadas por vírgula
+        """
+        try:
+            loader = self.bulk_loader
+            if loader is not None:
+                loader.bulk_upsert(table, rows, on_conflict)
+                return True
+            
+            total = 0
+            for chunk in chunked(rows, Config.BATCH_SIZE):
+                self.client.table(table).upsert(chunk, on_conflict=on_conflict).execute()
+                total += len(chunk)
+            
+            logger.info(f"Upserted {total} registros em {table} (REST)")
+            return True
+        except Exception as e:
+            logger.error(f"Erro na carga em massa de {table}: {str(e)}")
+            return False
+    
+    def bulk_upsert_fixtures(self, fixtures: Iterable[Dict]) -> bool:
+        """Carga em massa de partidas"""
+        return self.bulk_upsert('fixtures', (self._fixture_row(f) for f in fixtures), 'sportmonks_id')
+    
+    def bulk_upsert_players(self, players: Iterable[Dict]) -> bool:
+        """Carga em massa de players"""
+        return self.bulk_upsert('players', (self._player_row(p) for p in players), 'sportmonks_id')
+    
+    def bulk_upsert_lineups(self, lineups: Iterable[Dict]) -> bool:
+        """Carga em massa de lineups (ignora lineups sem player_id)"""
+        rows = (self._lineup_row(l) for l in lineups if l.get('player_id'))
+        return self.bulk_upsert('match_lineups', rows, 'fixture_id,team_id,player_id')
+    
+    def bulk_upsert_events(self, events: Iterable[Dict]) -> bool:
+        """Carga em massa de eventos (match_events)"""
+        return self.bulk_upsert('match_events', (self._event_row(e) for e in events if e.get('id')), 'id')
+    
+    def bulk_upsert_statistics(self, statistics: Iterable[Dict]) -> bool:
+        """Carga em massa de estatísticas (match_statistics)"""
+        rows = (self._statistic_row(s) for s in statistics if s.get('id'))
+        return self.bulk_upsert('match_statistics', rows, 'id')
+    
+    def upsert_in_chunks(self, upsert: Callable[[List[Dict]], bool], items: Iterable[Dict],
+                         chunk_size: Optional[int] = None) -> bool:
+        """
+        Consome um iterável (ex.: SportmonksClient.iter_transfers) em lotes de tamanho fixo
+        
+        O pico de memória fica limitado a um lote, independente do tamanho da coleção.
+        
+        Args:
+            upsert: Método upsert_* aplicado a cada lote
+            items: Itens a gravar (lista ou gerador)
+            chunk_size: Itens por lote (padrão: Config.BATCH_SIZE)
+            
+        Returns:
+            True se todos os lotes foram gravados
+        """
+        chunk_size = chunk_size or Config.BATCH_SIZE
+        success = True
+        total = 0
+        
+        for chunk in chunked(items, chunk_size):
+            if not upsert(chunk):
+                success = False
+            total += len(chunk)
+        
+        logger.info(f"Processados {total} registros em lotes de {chunk_size}")
+        return success
     
     def upsert_countries(self, countries: List[Dict]) -> bool:
         """Insere ou atualiza países"""
@@ -209,27 +440,7 @@ class SupabaseClient:
     def upsert_fixtures(self, fixtures: List[Dict]) -> bool:
         """Insere ou atualiza partidas"""
         try:
-            data = []
-            for fixture in fixtures:
-                # Mapear apenas campos que existem na tabela fixtures
-                fixture_data = {
-                    'sportmonks_id': fixture.get('id'),
-                    'league_id': fixture.get('league_id'),
-                    'season_id': fixture.get('season_id'),
-                    'home_team_id': fixture.get('home_team_id'),
-                    'away_team_id': fixture.get('away_team_id'),
-                    'match_date': fixture.get('starting_at'),
-                    'status': fixture.get('state', {}).get('short_name') if fixture.get('state') else None,
-                    'home_score': fixture.get('scores', [{}])[0].get('goals') if fixture.get('scores') else None,
-                    'away_score': fixture.get('scores', [{}])[1].get('goals') if len(fixture.get('scores', [])) > 1 else None,
-                    'venue': fixture.get('venue', {}).get('name') if fixture.get('venue') else None,
-                    'referee': fixture.get('referee', {}).get('name') if fixture.get('referee') else None,
-                    'updated_at': datetime.now().isoformat()
-                }
-                
-                # Remover campos None para não sobrescrever dados existentes
-                fixture_data = {k: v for k, v in fixture_data.items() if v is not None}
-                data.append(fixture_data)
+            data = [self._fixture_row(fixture) for fixture in fixtures]
             
             if data:
                 self.client.table('fixtures').upsert(data, on_conflict='sportmonks_id').execute()
@@ -242,17 +453,54 @@ class SupabaseClient:
             logger.error(f"Erro ao fazer upsert de partidas: {str(e)}")
             return False
     
+    def get_upcoming_fixtures(self, start: datetime, end: datetime, limit: int = 1000) -> List[Dict]:
+        """Partidas com início entre start e end, ordenadas pela data"""
+        try:
+            result = self.client.table('fixtures').select('sportmonks_id, match_date') \
+                .gte('match_date', start.isoformat()).lte('match_date', end.isoformat()) \
+                .order('match_date').limit(limit).execute()
+            return result.data or []
+        except Exception as e:
+            logger.error(f"Erro ao buscar próximas partidas: {str(e)}")
+            return []
+    
+    @staticmethod
+    def _fixture_participant_rows(fixture_id: int, participants: List[Dict]) -> List[Dict]:
+        """Mapeia participantes da API para linhas de fixture_participants"""
+        return [{
+            'fixture_id': fixture_id,
+            'team_id': participant.get('id'),
+            'position': participant.get('meta', {}).get('location', 'home'),
+            'updated_at': datetime.now().isoformat()
+        } for participant in participants]
+
+    @staticmethod
+    def _fixture_event_rows(fixture_id: int, events: List[Dict]) -> List[Dict]:
+        """Mapeia eventos da API para linhas de fixture_events"""
+        return [{
+            'id': event.get('id'),
+            'fixture_id': fixture_id,
+            'period_id': event.get('period_id'),
+            'participant_id': event.get('participant_id'),
+            'type_id': event.get('type_id'),
+            'player_id': event.get('player_id'),
+            'related_player_id': event.get('related_player_id'),
+            'player_name': event.get('player_name'),
+            'related_player_name': event.get('related_player_name'),
+            'result': event.get('result'),
+            'info': event.get('info'),
+            'addition': event.get('addition'),
+            'minute': event.get('minute'),
+            'extra_minute': event.get('extra_minute'),
+            'injured': event.get('injured', False),
+            'on_bench': event.get('on_bench', False),
+            'updated_at': datetime.now().isoformat()
+        } for event in events]
+
     def upsert_fixture_participants(self, fixture_id: int, participants: List[Dict]) -> bool:
         """Insere ou atualiza participantes de uma partida"""
         try:
-            data = []
-            for participant in participants:
-                data.append({
-                    'fixture_id': fixture_id,
-                    'team_id': participant.get('id'),
-                    'position': participant.get('meta', {}).get('location', 'home'),
-                    'updated_at': datetime.now().isoformat()
-                })
+            data = self._fixture_participant_rows(fixture_id, participants)
             
             # Remove participantes existentes antes de inserir novos
             self.client.table('fixture_participants').delete().eq('fixture_id', fixture_id).execute()
@@ -264,30 +512,49 @@ class SupabaseClient:
             logger.error(f"Erro ao fazer upsert de participantes: {str(e)}")
             return False
     
+    def replace_fixture_participants(self, rows: List[Dict]) -> bool:
+        """
+        Substitui participantes de várias partidas em um único lote
+
+        Faz upsert das novas linhas em (fixture_id, team_id) e só depois
+        remove os participantes que não vieram no lote. Se o upsert falhar,
+        os participantes atuais continuam intactos; se a remoção falhar,
+        sobram apenas linhas antigas, nunca faltam linhas.
+        """
+        try:
+            unique = {}
+            for row in rows:
+                # Sem team_id a linha não tem chave de conflito e duplicaria a cada carga
+                if row.get('team_id') is not None:
+                    unique[(row['fixture_id'], row['team_id'])] = row
+            data = list(unique.values())
+            if not data:
+                return True
+
+            teams_by_fixture: Dict[int, List[int]] = {}
+            for row in data:
+                teams_by_fixture.setdefault(row['fixture_id'], []).append(row['team_id'])
+
+            self.client.table('fixture_participants').upsert(data, on_conflict='fixture_id,team_id').execute()
+
+            # Remove equipes que saíram de cada partida (um DELETE por lote de partidas)
+            for fixture_ids in chunked(teams_by_fixture, Config.BATCH_SIZE):
+                stale = ','.join(
+                    f"and(fixture_id.eq.{fixture_id},team_id.not.in.({','.join(map(str, teams_by_fixture[fixture_id]))}))"
+                    for fixture_id in fixture_ids
+                )
+                self.client.table('fixture_participants').delete().or_(stale).execute()
+
+            logger.info(f"Upserted {len(data)} participants for {len(teams_by_fixture)} fixtures")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao substituir participantes em lote: {str(e)}")
+            return False
+    
     def upsert_fixture_events(self, fixture_id: int, events: List[Dict]) -> bool:
         """Insere ou atualiza eventos de uma partida"""
         try:
-            data = []
-            for event in events:
-                data.append({
-                    'id': event.get('id'),
-                    'fixture_id': fixture_id,
-                    'period_id': event.get('period_id'),
-                    'participant_id': event.get('participant_id'),
-                    'type_id': event.get('type_id'),
-                    'player_id': event.get('player_id'),
-                    'related_player_id': event.get('related_player_id'),
-                    'player_name': event.get('player_name'),
-                    'related_player_name': event.get('related_player_name'),
-                    'result': event.get('result'),
-                    'info': event.get('info'),
-                    'addition': event.get('addition'),
-                    'minute': event.get('minute'),
-                    'extra_minute': event.get('extra_minute'),
-                    'injured': event.get('injured', False),
-                    'on_bench': event.get('on_bench', False),
-                    'updated_at': datetime.now().isoformat()
-                })
+            data = self._fixture_event_rows(fixture_id, events)
             
             self.client.table('fixture_events').upsert(data, on_conflict='id').execute()
             logger.info(f"Upserted {len(data)} events for fixture {fixture_id}")
@@ -296,6 +563,12 @@ class SupabaseClient:
             logger.error(f"Erro ao fazer upsert de eventos: {str(e)}")
             return False
     
+    def upsert_fixture_events_batch(self, rows: List[Dict]) -> bool:
+        """Insere ou atualiza eventos já mapeados de várias partidas"""
+        # Um upsert não pode atualizar o mesmo id duas vezes; mantém a última versão
+        unique = {row['id']: row for row in rows}
+        return self.bulk_upsert('fixture_events', list(unique.values()), 'id')
+    
     def upsert_states(self, states: List[Dict]) -> bool:
         """Insere ou atualiza estados"""
         try:
@@ -342,31 +615,7 @@ class SupabaseClient:
     def upsert_players(self, players: List[Dict]) -> bool:
         """Insere ou atualiza players"""
         try:
-            data = []
-            for player in players:
-                # Mapear campos do player
-                # Garantir que name não seja null
-                name = player.get('name') or player.get('common_name') or player.get('display_name') or f"Player_{player.get('id', 'Unknown')}"
-                
-                player_data = {
-                    'sportmonks_id': player.get('id'),
-                    'name': name,
-                    'common_name': player.get('common_name'),
-                    'firstname': player.get('firstname'),
-                    'lastname': player.get('lastname'),
-                    'nationality': player.get('nationality'),
-                    'position_id': player.get('position_id'),
-                    'position_name': player.get('position', {}).get('name') if player.get('position') else None,
-                    'date_of_birth': player.get('date_of_birth'),
-                    'height': player.get('height'),
-                    'weight': player.get('weight'),
-                    'image_path': player.get('image_path'),
-                    'updated_at': datetime.now().isoformat()
-                }
-                
-                # Remover campos None para não sobrescrever dados existentes
-                player_data = {k: v for k, v in player_data.items() if v is not None}
-                data.append(player_data)
+            data = [self._player_row(player) for player in players]
             
             if data:
                 self.client.table('players').upsert(data, on_conflict='sportmonks_id').execute()
@@ -405,30 +654,8 @@ class SupabaseClient:
     def upsert_lineups(self, lineups: List[Dict]) -> bool:
         """Insere ou atualiza lineups"""
         try:
-            data = []
-            for lineup in lineups:
-                # Pular lineups sem player_id (obrigatório)
-                if not lineup.get('player_id'):
-                    continue
-                
-                # Mapear apenas campos que existem na tabela match_lineups
-                lineup_data = {
-                    'fixture_id': lineup.get('fixture_id'),
-                    'team_id': lineup.get('team_id'),
-                    'player_id': lineup.get('player_id'),
-                    'player_name': lineup.get('player_name'),
-                    'type': lineup.get('type'),
-                    'position_id': lineup.get('position_id'),
-                    'position_name': lineup.get('position_name'),
-                    'jersey_number': lineup.get('jersey_number'),
-                    'captain': lineup.get('captain', False),
-                    'minutes_played': lineup.get('minutes_played'),
-                    'rating': lineup.get('rating')
-                }
-                
-                # Remover campos None para não sobrescrever dados existentes
-                lineup_data = {k: v for k, v in lineup_data.items() if v is not None}
-                data.append(lineup_data)
+            # Pular lineups sem player_id (obrigatório)
+            data = [self._lineup_row(lineup) for lineup in lineups if lineup.get('player_id')]
             
             if data:
                 self.client.table('match_lineups').upsert(data, on_conflict='fixture_id,team_id,player_id').execute()
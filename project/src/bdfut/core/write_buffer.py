@@ -0,0 +1,149 @@
+"""
+Buffer write-behind para gravações por partida
+=============================================
+
+Acumula linhas por tabela entre várias partidas e grava em lote quando
+um limite de tamanho ou de idade é atingido, ou no flush explícito ao fim
+do job. Cada tabela é gravada de forma independente: a falha de uma não
+impede as demais. Com key_field, as chaves das linhas de lotes com falha
+(inclusive nos flushes automáticos) ficam em failed_keys.
+
+Uso:
+    with FixtureWriteBuffer(supabase) as buffer:
+        for fixture in fixtures:
+            buffer.add_fixture_participants(fixture['id'], fixture['participants'])
+            buffer.add_fixture_events(fixture['id'], fixture['events'])
+"""
+import time
+import logging
+from typing import Dict, Any, List, Optional, Callable, Set
+
+from ..config.config import Config
+from .supabase_client import SupabaseClient
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Buffer de gravação por tabela com flush por tamanho, idade ou explícito"""
+
+    def __init__(self, writers: Dict[str, Callable[[List[Dict]], bool]],
+                 max_rows: Optional[int] = None,
+                 max_age_seconds: Optional[float] = None,
+                 key_field: Optional[str] = None):
+        """
+        Args:
+            writers: Função de gravação em lote por tabela (retorna True em sucesso)
+            max_rows: Linhas acumuladas que disparam o flush da tabela
+            max_age_seconds: Idade máxima da linha mais antiga antes do flush
+            key_field: Campo que identifica a origem de cada linha (ex.: fixture_id)
+        """
+        self.writers = writers
+        self.key_field = key_field
+        self.failed_keys: Set[Any] = set()
+        self.max_rows = max_rows or Config.WRITE_BUFFER_MAX_ROWS
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else Config.WRITE_BUFFER_MAX_AGE_SECONDS
+
+        self._rows: Dict[str, List[Dict]] = {table: [] for table in writers}
+        self._first_added: Dict[str, Optional[float]] = {table: None for table in writers}
+        self.stats = {
+            table: {'flushes': 0, 'rows_written': 0, 'rows_failed': 0}
+            for table in writers
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
+
+    def add(self, table: str, rows: List[Dict]):
+        """Enfileira linhas de uma tabela, gravando se algum limite for atingido"""
+        if table not in self.writers:
+            raise KeyError(f"Tabela sem writer configurado: {table}")
+        if not rows:
+            return
+
+        if self._first_added[table] is None:
+            self._first_added[table] = time.monotonic()
+        self._rows[table].extend(rows)
+
+        age = time.monotonic() - self._first_added[table]
+        if len(self._rows[table]) >= self.max_rows or age >= self.max_age_seconds:
+            self._flush_table(table)
+
+    def pending(self, table: Optional[str] = None) -> int:
+        """Linhas aguardando gravação"""
+        if table is not None:
+            return len(self._rows[table])
+        return sum(len(rows) for rows in self._rows.values())
+
+    def _flush_table(self, table: str) -> bool:
+        rows = self._rows[table]
+        if not rows:
+            return True
+
+        self._rows[table] = []
+        self._first_added[table] = None
+        self.stats[table]['flushes'] += 1
+
+        try:
+            success = self.writers[table](rows) is not False
+        except Exception as e:
+            logger.error(f"❌ Erro ao gravar lote de {table}: {e}")
+            success = False
+
+        if success:
+            self.stats[table]['rows_written'] += len(rows)
+            logger.debug(f"💾 Flush de {len(rows)} registros em {table}")
+        else:
+            self.stats[table]['rows_failed'] += len(rows)
+            if self.key_field is not None:
+                self.failed_keys.update(row.get(self.key_field) for row in rows)
+            logger.warning(f"⚠️ Falha no flush de {len(rows)} registros em {table}")
+
+        return success
+
+    def flush(self, table: Optional[str] = None) -> bool:
+        """
+        Grava as linhas pendentes
+
+        Args:
+            table: Tabela específica (padrão: todas)
+
+        Returns:
+            True se todas as tabelas foram gravadas com sucesso
+        """
+        tables = [table] if table is not None else list(self.writers)
+        results = [self._flush_table(name) for name in tables]
+        return all(results)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'pending': {table: len(rows) for table, rows in self._rows.items()},
+            'tables': self.stats,
+            'failed_keys': len(self.failed_keys)
+        }
+
+
+class FixtureWriteBuffer(WriteBehindBuffer):
+    """Buffer para participantes e eventos de partidas"""
+
+    def __init__(self, supabase: SupabaseClient,
+                 max_rows: Optional[int] = None,
+                 max_age_seconds: Optional[float] = None):
+        super().__init__(
+            writers={
+                'fixture_participants': supabase.replace_fixture_participants,
+                'fixture_events': supabase.upsert_fixture_events_batch
+            },
+            max_rows=max_rows,
+            max_age_seconds=max_age_seconds,
+            key_field='fixture_id'
+        )
+
+    def add_fixture_participants(self, fixture_id: int, participants: List[Dict]):
+        self.add('fixture_participants', SupabaseClient._fixture_participant_rows(fixture_id, participants))
+
+    def add_fixture_events(self, fixture_id: int, events: List[Dict]):
+        self.add('fixture_events', SupabaseClient._fixture_event_rows(fixture_id, events))
@@ -0,0 +1,30 @@
+-- Presença de dados de enriquecimento por partida (uma consulta por lote)
+-- Usada por bdfut.core.enrichment_index.EnrichmentStateIndex
+CREATE OR REPLACE FUNCTION fixture_enrichment_presence(p_fixture_ids BIGINT[])
+RETURNS TABLE (
+    fixture_id BIGINT,
+    has_events BOOLEAN,
+    has_lineups BOOLEAN,
+    has_stats BOOLEAN,
+    has_referees BOOLEAN,
+    has_periods BOOLEAN
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        ids.fixture_id,
+        EXISTS (SELECT 1 FROM match_events e WHERE e.fixture_id = ids.fixture_id),
+        EXISTS (SELECT 1 FROM match_lineups l WHERE l.fixture_id = ids.fixture_id),
+        EXISTS (SELECT 1 FROM match_statistics s WHERE s.fixture_id = ids.fixture_id),
+        EXISTS (SELECT 1 FROM match_referees r WHERE r.fixture_id = ids.fixture_id),
+        EXISTS (SELECT 1 FROM match_periods p WHERE p.fixture_id = ids.fixture_id)
+    FROM unnest(p_fixture_ids) AS ids(fixture_id);
+$$;
+
+-- Índices usados pelos EXISTS (match_referees/match_periods já possuem)
+CREATE INDEX IF NOT EXISTS idx_match_events_fixture_id ON match_events(fixture_id);
+CREATE INDEX IF NOT EXISTS idx_match_lineups_fixture_id ON match_lineups(fixture_id);
+CREATE INDEX IF NOT EXISTS idx_match_statistics_fixture_id ON match_statistics(fixture_id);
+
+COMMENT ON FUNCTION fixture_enrichment_presence(BIGINT[]) IS 'Indica, para cada partida, quais tabelas de enriquecimento já possuem dados';
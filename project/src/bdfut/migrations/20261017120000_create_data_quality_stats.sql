@@ -0,0 +1,121 @@
+-- Estatísticas de qualidade de dados em uma única chamada RPC
+-- Usada por bdfut.core.data_quality.DataQualityManager.fetch_quality_stats
+--
+-- Para cada tabela as regras (campos obrigatórios, únicos e chaves
+-- estrangeiras) viram um único SELECT: uma varredura conta o total e os
+-- nulos de todos os campos obrigatórios, duplicatas saem de GROUP BY e
+-- órfãos de anti-joins (NOT EXISTS). Colunas ou tabelas inexistentes são
+-- devolvidas em missing_columns/missing_references em vez de falhar.
+
+CREATE OR REPLACE FUNCTION data_quality_table_stats(
+    p_table TEXT,
+    p_required TEXT[] DEFAULT '{}',
+    p_unique TEXT[] DEFAULT '{}',
+    p_references JSONB DEFAULT '[]'::jsonb  -- [{"column": ..., "table": ..., "field": ...}]
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_columns TEXT[];
+    v_missing TEXT[] := '{}';
+    v_missing_refs TEXT[] := '{}';
+    v_nulls TEXT := '';
+    v_duplicates TEXT := '';
+    v_orphans TEXT := '';
+    v_field TEXT;
+    v_ref JSONB;
+    v_result JSONB;
+BEGIN
+    IF to_regclass(format('%I', p_table)) IS NULL THEN
+        RETURN jsonb_build_object('error', format('Tabela %s não existe', p_table));
+    END IF;
+
+    SELECT array_agg(column_name::TEXT) INTO v_columns
+    FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = p_table;
+
+    FOREACH v_field IN ARRAY p_required LOOP
+        IF v_field = ANY(v_columns) THEN
+            v_nulls := v_nulls || format(', %L, count(*) FILTER (WHERE %I IS NULL)', v_field, v_field);
+        ELSE
+            v_missing := array_append(v_missing, v_field);
+        END IF;
+    END LOOP;
+
+    FOREACH v_field IN ARRAY p_unique LOOP
+        IF v_field = ANY(v_columns) THEN
+            v_duplicates := v_duplicates || format(
+                ', %L, (SELECT coalesce(sum(n - 1), 0) FROM (SELECT count(*) AS n FROM %I'
+                ' WHERE %I IS NOT NULL GROUP BY %I HAVING count(*) > 1) d)',
+                v_field, p_table, v_field, v_field
+            );
+        ELSIF NOT v_field = ANY(v_missing) THEN
+            v_missing := array_append(v_missing, v_field);
+        END IF;
+    END LOOP;
+
+    FOR v_ref IN SELECT value FROM jsonb_array_elements(p_references) LOOP
+        v_field := v_ref->>'column';
+        IF v_field = ANY(v_columns)
+           AND EXISTS (
+               SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema()
+                 AND table_name = v_ref->>'table'
+                 AND column_name = v_ref->>'field'
+           ) THEN
+            v_orphans := v_orphans || format(
+                ', %L, (SELECT count(*) FROM %I c WHERE c.%I IS NOT NULL'
+                ' AND NOT EXISTS (SELECT 1 FROM %I r WHERE r.%I = c.%I))',
+                v_field, p_table, v_field, v_ref->>'table', v_ref->>'field', v_field
+            );
+        ELSE
+            v_missing_refs := array_append(v_missing_refs, v_field);
+        END IF;
+    END LOOP;
+
+    EXECUTE format(
+        'SELECT jsonb_build_object(''total'', t.total, ''nulls'', t.nulls,'
+        ' ''duplicates'', jsonb_build_object(%s), ''orphans'', jsonb_build_object(%s))'
+        ' FROM (SELECT count(*) AS total, jsonb_build_object(%s) AS nulls FROM %I) t',
+        ltrim(v_duplicates, ', '), ltrim(v_orphans, ', '), ltrim(v_nulls, ', '), p_table
+    ) INTO v_result;
+
+    RETURN v_result || jsonb_build_object(
+        'missing_columns', to_jsonb(v_missing),
+        'missing_references', to_jsonb(v_missing_refs)
+    );
+END;
+$$;
+
+-- Todas as tabelas de p_rules ({"tabela": {"required_fields": [...], ...}})
+-- em uma chamada; o erro de uma tabela não impede as demais
+CREATE OR REPLACE FUNCTION data_quality_stats(p_rules JSONB)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_table TEXT;
+    v_rule JSONB;
+    v_result JSONB := '{}'::jsonb;
+BEGIN
+    FOR v_table, v_rule IN SELECT key, value FROM jsonb_each(p_rules) LOOP
+        BEGIN
+            v_result := v_result || jsonb_build_object(v_table, data_quality_table_stats(
+                v_table,
+                ARRAY(SELECT jsonb_array_elements_text(coalesce(v_rule->'required_fields', '[]'::jsonb))),
+                ARRAY(SELECT jsonb_array_elements_text(coalesce(v_rule->'unique_fields', '[]'::jsonb))),
+                coalesce(v_rule->'referential_integrity', '[]'::jsonb)
+            ));
+        EXCEPTION WHEN others THEN
+            v_result := v_result || jsonb_build_object(v_table, jsonb_build_object('error', SQLERRM));
+        END;
+    END LOOP;
+    RETURN v_result;
+END;
+$$;
+
+COMMENT ON FUNCTION data_quality_table_stats(TEXT, TEXT[], TEXT[], JSONB) IS 'Total, nulos, duplicatas e órfãos de uma tabela em um único SELECT';
+COMMENT ON FUNCTION data_quality_stats(JSONB) IS 'Estatísticas de qualidade (data_quality_table_stats) de várias tabelas em uma chamada';
@@ -0,0 +1,182 @@
+-- Verificações de qualidade incrementais por marca d'água
+-- Usada por bdfut.core.data_quality.DataQualityManager (incremental=True)
+--
+-- data_quality_table_stats passa a aceitar uma coluna de marca d'água
+-- (ex.: updated_at) e um instante: nulos e órfãos são contados apenas nas
+-- linhas gravadas depois dele, e duplicatas são as linhas alteradas cujo
+-- valor aparece em outra linha da tabela. Sem a coluna a varredura é
+-- completa (incremental = false). max_watermark devolve a maior marca
+-- d'água vista, que vira o ponto de partida da próxima execução.
+--
+-- data_quality_state guarda, por tabela, a marca d'água da última
+-- execução, os totais acumulados por regra (com as falhas em aberto) e a
+-- data da última varredura completa (rebaseline).
+
+DROP FUNCTION IF EXISTS data_quality_table_stats(TEXT, TEXT[], TEXT[], JSONB);
+
+CREATE OR REPLACE FUNCTION data_quality_table_stats(
+    p_table TEXT,
+    p_required TEXT[] DEFAULT '{}',
+    p_unique TEXT[] DEFAULT '{}',
+    p_references JSONB DEFAULT '[]'::jsonb,  -- [{"column": ..., "table": ..., "field": ...}]
+    p_watermark_column TEXT DEFAULT NULL,
+    p_since TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_columns TEXT[];
+    v_missing TEXT[] := '{}';
+    v_missing_refs TEXT[] := '{}';
+    v_nulls TEXT := '';
+    v_duplicates TEXT := '';
+    v_orphans TEXT := '';
+    v_has_watermark BOOLEAN;
+    v_incremental BOOLEAN;
+    v_changed TEXT := '';
+    v_max_watermark TEXT := 'NULL::timestamptz';
+    v_field TEXT;
+    v_ref JSONB;
+    v_result JSONB;
+BEGIN
+    IF to_regclass(format('%I', p_table)) IS NULL THEN
+        RETURN jsonb_build_object('error', format('Tabela %s não existe', p_table));
+    END IF;
+
+    SELECT array_agg(column_name::TEXT) INTO v_columns
+    FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = p_table;
+
+    v_has_watermark := p_watermark_column IS NOT NULL AND p_watermark_column = ANY(v_columns);
+    v_incremental := v_has_watermark AND p_since IS NOT NULL;
+    IF v_has_watermark THEN
+        v_max_watermark := format('max(c.%I)', p_watermark_column);
+    END IF;
+    IF v_incremental THEN
+        v_changed := format(' AND c.%I > %L', p_watermark_column, p_since);
+    END IF;
+
+    FOREACH v_field IN ARRAY p_required LOOP
+        IF v_field = ANY(v_columns) THEN
+            v_nulls := v_nulls || format(', %L, count(*) FILTER (WHERE c.%I IS NULL)', v_field, v_field);
+        ELSE
+            v_missing := array_append(v_missing, v_field);
+        END IF;
+    END LOOP;
+
+    FOREACH v_field IN ARRAY p_unique LOOP
+        IF NOT v_field = ANY(v_columns) THEN
+            IF NOT v_field = ANY(v_missing) THEN
+                v_missing := array_append(v_missing, v_field);
+            END IF;
+        ELSIF v_incremental THEN
+            -- Linhas alteradas cujo valor aparece em outra linha (usa o índice do campo)
+            v_duplicates := v_duplicates || format(
+                ', %L, (SELECT count(*) FROM %I c WHERE c.%I IS NOT NULL%s'
+                ' AND EXISTS (SELECT 1 FROM %I o WHERE o.%I = c.%I AND o.ctid <> c.ctid))',
+                v_field, p_table, v_field, v_changed, p_table, v_field, v_field
+            );
+        ELSE
+            v_duplicates := v_duplicates || format(
+                ', %L, (SELECT coalesce(sum(n - 1), 0) FROM (SELECT count(*) AS n FROM %I'
+                ' WHERE %I IS NOT NULL GROUP BY %I HAVING count(*) > 1) d)',
+                v_field, p_table, v_field, v_field
+            );
+        END IF;
+    END LOOP;
+
+    FOR v_ref IN SELECT value FROM jsonb_array_elements(p_references) LOOP
+        v_field := v_ref->>'column';
+        IF v_field = ANY(v_columns)
+           AND EXISTS (
+               SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema()
+                 AND table_name = v_ref->>'table'
+                 AND column_name = v_ref->>'field'
+           ) THEN
+            v_orphans := v_orphans || format(
+                ', %L, (SELECT count(*) FROM %I c WHERE c.%I IS NOT NULL%s'
+                ' AND NOT EXISTS (SELECT 1 FROM %I r WHERE r.%I = c.%I))',
+                v_field, p_table, v_field, v_changed, v_ref->>'table', v_ref->>'field', v_field
+            );
+        ELSE
+            v_missing_refs := array_append(v_missing_refs, v_field);
+        END IF;
+    END LOOP;
+
+    EXECUTE format(
+        'SELECT jsonb_build_object(''total'', t.total, ''nulls'', t.nulls, ''max_watermark'', t.max_watermark,'
+        ' ''duplicates'', jsonb_build_object(%s), ''orphans'', jsonb_build_object(%s))'
+        ' FROM (SELECT count(*) AS total, jsonb_build_object(%s) AS nulls, %s AS max_watermark'
+        ' FROM %I c WHERE true%s) t',
+        ltrim(v_duplicates, ', '), ltrim(v_orphans, ', '), ltrim(v_nulls, ', '),
+        v_max_watermark, p_table, v_changed
+    ) INTO v_result;
+
+    RETURN v_result || jsonb_build_object(
+        'incremental', v_incremental,
+        'missing_columns', to_jsonb(v_missing),
+        'missing_references', to_jsonb(v_missing_refs)
+    );
+END;
+$$;
+
+-- Regras aceitam watermark_column e since (ISO 8601) para a execução incremental
+CREATE OR REPLACE FUNCTION data_quality_stats(p_rules JSONB)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_table TEXT;
+    v_rule JSONB;
+    v_result JSONB := '{}'::jsonb;
+BEGIN
+    FOR v_table, v_rule IN SELECT key, value FROM jsonb_each(p_rules) LOOP
+        BEGIN
+            v_result := v_result || jsonb_build_object(v_table, data_quality_table_stats(
+                v_table,
+                ARRAY(SELECT jsonb_array_elements_text(coalesce(v_rule->'required_fields', '[]'::jsonb))),
+                ARRAY(SELECT jsonb_array_elements_text(coalesce(v_rule->'unique_fields', '[]'::jsonb))),
+                coalesce(v_rule->'referential_integrity', '[]'::jsonb),
+                v_rule->>'watermark_column',
+                (v_rule->>'since')::timestamptz
+            ));
+        EXCEPTION WHEN others THEN
+            v_result := v_result || jsonb_build_object(v_table, jsonb_build_object('error', SQLERRM));
+        END;
+    END LOOP;
+    RETURN v_result;
+END;
+$$;
+
+CREATE TABLE IF NOT EXISTS data_quality_state (
+    table_name VARCHAR(100) PRIMARY KEY,
+    watermark TIMESTAMP WITH TIME ZONE,          -- Maior marca d'água da última execução
+    -- {"check": {"rows_checked": n, "affected": n, "failing_since": marca d'água|null (só com falha em aberto)}}
+    rule_totals JSONB NOT NULL DEFAULT '{}',
+    last_full_run_at TIMESTAMP WITH TIME ZONE,   -- Última varredura completa (rebaseline)
+    last_job_id UUID REFERENCES etl_jobs(id) ON DELETE SET NULL,  -- Job que avançou a marca d'água
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Índices das marcas d'água usadas pelas verificações incrementais (tabelas que têm updated_at)
+DO $$
+DECLARE
+    v_table TEXT;
+BEGIN
+    FOREACH v_table IN ARRAY ARRAY['fixtures', 'fixture_events', 'fixture_participants'] LOOP
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = v_table AND column_name = 'updated_at'
+        ) THEN
+            EXECUTE format('CREATE INDEX IF NOT EXISTS %I ON %I(updated_at)', 'idx_' || v_table || '_updated_at', v_table);
+        END IF;
+    END LOOP;
+END;
+$$;
+
+COMMENT ON TABLE data_quality_state IS 'Marca d''água e totais acumulados das verificações de qualidade incrementais';
+COMMENT ON FUNCTION data_quality_table_stats(TEXT, TEXT[], TEXT[], JSONB, TEXT, TIMESTAMPTZ) IS 'Total, nulos, duplicatas e órfãos de uma tabela (ou das linhas alteradas desde p_since) em um único SELECT';
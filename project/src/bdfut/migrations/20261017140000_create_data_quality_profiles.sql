@@ -0,0 +1,124 @@
+-- Perfil de qualidade por amostragem das tabelas grandes
+-- Usada por bdfut.core.data_quality.DataQualityManager.profile_table
+--
+-- data_quality_profile lê uma amostra com TABLESAMPLE (BERNOULLI sorteia linha
+-- a linha; SYSTEM lê blocos inteiros e é mais barato, mas as linhas de um bloco
+-- são correlacionadas e os intervalos de Wilson ficam estreitos demais) e devolve,
+-- por coluna, nulos, valores fora do intervalo, distintos e valores únicos
+-- (f1) da amostra e os valores mais frequentes. Intervalos de confiança e a
+-- estimativa de distintos da tabela são calculados no cliente. O total de
+-- linhas vem de pg_class.reltuples (estatística do ANALYZE), sem count(*).
+--
+-- data_quality_profiles guarda um registro por tabela/coluna/execução para
+-- que get_quality_trends acompanhe a deriva sem varrer as tabelas.
+
+CREATE OR REPLACE FUNCTION data_quality_profile(
+    p_table TEXT,
+    p_columns JSONB,                  -- [{"column": ..., "min": ..., "max": ..., "top": n}]
+    p_sample_percent NUMERIC DEFAULT 1,
+    p_method TEXT DEFAULT 'BERNOULLI'
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+VOLATILE
+AS $$
+DECLARE
+    v_columns TEXT[];
+    v_missing TEXT[] := '{}';
+    v_projection TEXT := '';
+    v_select TEXT := '';
+    v_range TEXT;
+    v_method TEXT := CASE WHEN upper(p_method) = 'SYSTEM' THEN 'SYSTEM' ELSE 'BERNOULLI' END;
+    v_percent NUMERIC := least(greatest(coalesce(p_sample_percent, 1), 0.0001), 100);
+    v_reltuples BIGINT;
+    v_col JSONB;
+    v_field TEXT;
+    v_result JSONB;
+BEGIN
+    IF to_regclass(format('%I', p_table)) IS NULL THEN
+        RETURN jsonb_build_object('error', format('Tabela %s não existe', p_table));
+    END IF;
+
+    SELECT array_agg(column_name::TEXT) INTO v_columns
+    FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = p_table;
+
+    FOR v_col IN SELECT value FROM jsonb_array_elements(p_columns) LOOP
+        v_field := v_col->>'column';
+        IF NOT v_field = ANY(v_columns) THEN
+            v_missing := array_append(v_missing, v_field);
+            CONTINUE;
+        END IF;
+
+        -- Fora do intervalo só para colunas com min/max (numéricas)
+        v_range := '0';
+        IF v_col ? 'min' OR v_col ? 'max' THEN
+            v_range := format(
+                '(SELECT count(*) FROM s WHERE %I < %L::numeric OR %I > %L::numeric)',
+                v_field, v_col->>'min', v_field, v_col->>'max'
+            );
+        END IF;
+
+        v_projection := v_projection || format(', %I', v_field);
+        v_select := v_select || format(
+            ', %L, jsonb_build_object('
+            '''nulls'', (SELECT count(*) FROM s WHERE %I IS NULL),'
+            ' ''distinct'', (SELECT count(DISTINCT %I) FROM s),'
+            ' ''singletons'', (SELECT count(*) FROM (SELECT 1 FROM s WHERE %I IS NOT NULL GROUP BY %I HAVING count(*) = 1) u),'
+            ' ''out_of_range'', %s,'
+            ' ''top'', (SELECT coalesce(jsonb_agg(jsonb_build_object(''value'', v, ''count'', n) ORDER BY n DESC), ''[]'')'
+            ' FROM (SELECT %I AS v, count(*) AS n FROM s WHERE %I IS NOT NULL GROUP BY %I ORDER BY count(*) DESC LIMIT %s) t))',
+            v_field, v_field, v_field, v_field, v_field, v_range,
+            v_field, v_field, v_field, coalesce((v_col->>'top')::INT, 0)
+        );
+    END LOOP;
+
+    EXECUTE format(
+        'WITH s AS MATERIALIZED (SELECT 1 AS sampled%s FROM %I TABLESAMPLE %s (%s))'
+        ' SELECT jsonb_build_object(''sample_rows'', (SELECT count(*) FROM s), ''columns'', jsonb_build_object(%s))',
+        v_projection, p_table, v_method, v_percent, ltrim(v_select, ', ')
+    ) INTO v_result;
+
+    -- reltuples é -1 (ou 0) em tabelas nunca analisadas: extrapola pela amostra
+    SELECT reltuples::BIGINT INTO v_reltuples FROM pg_class WHERE oid = to_regclass(format('%I', p_table));
+    IF coalesce(v_reltuples, 0) <= 0 THEN
+        v_reltuples := round((v_result->>'sample_rows')::NUMERIC * 100 / v_percent);
+    END IF;
+
+    RETURN v_result || jsonb_build_object(
+        'method', lower(v_method),
+        'sample_percent', v_percent,
+        'estimated_total', greatest(v_reltuples, (v_result->>'sample_rows')::BIGINT),
+        'missing_columns', to_jsonb(v_missing)
+    );
+END;
+$$;
+
+CREATE TABLE IF NOT EXISTS data_quality_profiles (
+    id BIGSERIAL PRIMARY KEY,
+    table_name VARCHAR(100) NOT NULL,
+    column_name VARCHAR(100) NOT NULL,
+    profiled_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    method VARCHAR(20) NOT NULL,                 -- system, bernoulli ou reservoir
+    representative BOOLEAN NOT NULL DEFAULT TRUE, -- FALSE: prefixo por id, fora da deriva
+    sample_rows BIGINT NOT NULL,
+    estimated_total BIGINT,
+    null_rate NUMERIC,
+    null_rate_low NUMERIC,                       -- Intervalo de confiança de 95% (Wilson)
+    null_rate_high NUMERIC,
+    out_of_range_rate NUMERIC,
+    out_of_range_low NUMERIC,
+    out_of_range_high NUMERIC,
+    distinct_estimate NUMERIC,
+    distinct_low NUMERIC,
+    distinct_high NUMERIC,
+    top_values JSONB DEFAULT '[]',               -- [{"value", "count", "share", "share_interval"}]
+    job_id UUID REFERENCES etl_jobs(id) ON DELETE SET NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_data_quality_profiles_table_column
+    ON data_quality_profiles(table_name, column_name, profiled_at DESC);
+CREATE INDEX IF NOT EXISTS idx_data_quality_profiles_profiled_at ON data_quality_profiles(profiled_at);
+
+COMMENT ON FUNCTION data_quality_profile(TEXT, JSONB, NUMERIC, TEXT) IS 'Nulos, fora do intervalo, distintos e valores mais frequentes de uma amostra TABLESAMPLE';
+COMMENT ON TABLE data_quality_profiles IS 'Histórico dos perfis de qualidade por amostragem (deriva em get_quality_trends)';
@@ -2,12 +2,16 @@
 """
 Script para coletar fixtures das últimas 3 temporadas de cada liga
 Este script busca dados históricos importantes para análise
+
+As respostas da API são gravadas no armazém local (RESPONSE_STORE_DIR);
+com --offline a coleta é reprocessada a partir delas, sem requisições.
 """
 
 import os
 import sys
 import time
 import logging
+import argparse
 import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple
@@ -15,6 +19,10 @@ from tqdm import tqdm
 from supabase import create_client
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..'))
+
+from bdfut.core.response_store import ResponseStore
+
 # Carregar variáveis de ambiente
 load_dotenv()
 
@@ -32,7 +40,7 @@ logger = logging.getLogger(__name__)
 class FixturesCollector:
     """Classe para coletar fixtures das últimas 3 temporadas de cada liga"""
     
-    def __init__(self):
+    def __init__(self, response_store_dir: str = None, offline: bool = False):
         self.api_key = os.getenv("SPORTMONKS_API_KEY")
         self.base_url = "https://api.sportmonks.com/v3/football"
         
@@ -52,12 +60,23 @@ class FixturesCollector:
         self.requests_made = 0
         self.max_requests_per_hour = 3000
         self.start_time = datetime.now()
+        
+        # Armazém local de respostas (reprocessamento sem requisições)
+        self.response_store = ResponseStore(response_store_dir)
+        self.offline = offline
     
     def make_request(self, url: str, params: Dict = None) -> Dict:
         """Fazer requisição para a API com controle de rate limit"""
         if params is None:
             params = {}
         
+        endpoint = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        stored = self.response_store.get(endpoint, params)
+        if stored is not None:
+            return stored
+        if self.offline:
+            raise LookupError(f"Resposta não armazenada (modo offline): {endpoint} {params}")
+        
         params['api_token'] = self.api_key
         
         try:
@@ -75,7 +94,9 @@ class FixturesCollector:
                     time.sleep(60)  # Pausa de 1 minuto
             
             response.raise_for_status()
-            return response.json()
+            response_data = response.json()
+            self.response_store.put(endpoint, params, response_data)
+            return response_data
             
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Erro na requisição para {url}: {str(e)}")
@@ -174,7 +195,8 @@ class FixturesCollector:
                     break
                 
                 page += 1
-                time.sleep(0.5)  # Pausa entre páginas
+                if not self.offline:
+                    time.sleep(0.5)  # Pausa entre páginas
             
             logger.info(f"📊 {len(all_fixtures)} fixtures encontradas na temporada {season_name}")
             
@@ -417,11 +439,18 @@ class FixturesCollector:
 def main():
     """Função principal"""
     
+    parser = argparse.ArgumentParser(description="Coleta de fixtures das últimas 3 temporadas")
+    parser.add_argument('--response-store', default=None,
+                        help="Diretório do armazém de respostas (padrão: RESPONSE_STORE_DIR)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Reprocessar a partir das respostas armazenadas, sem requisições à API")
+    args = parser.parse_args()
+    
     logger.info("🚀 Iniciando coleta de fixtures das últimas 3 temporadas...")
     
     try:
         # Executar coleta
-        collector = FixturesCollector()
+        collector = FixturesCollector(args.response_store, args.offline)
         collector.collect_fixtures_for_all_leagues()
         
     except Exception as e:
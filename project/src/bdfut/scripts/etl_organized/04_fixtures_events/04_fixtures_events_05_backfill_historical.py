@@ -18,12 +18,15 @@ FUNCIONALIDADE:
 - Sistema de metadados ETL para rastreamento
 - Checkpoints para retomada automática
 - Validação de dados integrada
+- Respostas brutas gravadas no armazém local (RESPONSE_STORE_DIR); com
+  --offline o backfill é reprocessado a partir delas, sem requisições à API
 """
 
 import os
 import sys
 import time
 import logging
+import argparse
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple
 from tqdm import tqdm
@@ -34,6 +37,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', '..
 from bdfut.core.sportmonks_client import SportmonksClient
 from bdfut.core.supabase_client import SupabaseClient
 from bdfut.core.etl_metadata import ETLMetadataManager, ETLJobContext
+from bdfut.core.response_store import ResponseStore
 
 # Configurar logging
 logging.basicConfig(
@@ -59,18 +63,24 @@ class HistoricalBackfillManager:
         384: "La Liga"            # Espanha
     }
     
-    def __init__(self, use_redis: bool = True, seasons_per_league: int = 3):
+    def __init__(self, use_redis: bool = True, seasons_per_league: int = 3,
+                 response_store_dir: str = None, offline: bool = False):
         """
         Inicializa o gerenciador de backfill
         
         Args:
             use_redis: Usar cache Redis
             seasons_per_league: Número de temporadas por liga
+            response_store_dir: Diretório do armazém de respostas (padrão: RESPONSE_STORE_DIR)
+            offline: Reprocessar apenas respostas já armazenadas
         """
+        self.response_store = ResponseStore(response_store_dir)
         self.sportmonks = SportmonksClient(
             enable_cache=True,
             use_redis=use_redis,
-            cache_ttl_hours=24
+            cache_ttl_hours=24,
+            response_store=self.response_store,
+            offline=offline
         )
         self.supabase = SupabaseClient()
         self.metadata_manager = ETLMetadataManager()
@@ -86,6 +96,7 @@ class HistoricalBackfillManager:
         logger.info(f"📊 Ligas alvo: {len(self.MAIN_LEAGUES)}")
         logger.info(f"📊 Temporadas por liga: {seasons_per_league}")
         logger.info(f"📊 Cache Redis: {use_redis}")
+        logger.info(f"📊 Modo offline: {offline} ({len(self.response_store)} respostas armazenadas)")
     
     def get_league_seasons(self, league_id: int) -> List[Dict]:
         """
@@ -527,6 +538,13 @@ class HistoricalBackfillManager:
 
 def main():
     """Função principal do backfill"""
+    parser = argparse.ArgumentParser(description="Backfill histórico de fixtures")
+    parser.add_argument('--response-store', default=None,
+                        help="Diretório do armazém de respostas (padrão: RESPONSE_STORE_DIR)")
+    parser.add_argument('--offline', action='store_true',
+                        help="Reprocessar a partir das respostas armazenadas, sem requisições à API")
+    args = parser.parse_args()
+    
     print("🚀 BACKFILL HISTÓRICO DE FIXTURES")
     print("=" * 50)
     
@@ -534,7 +552,9 @@ def main():
         # Inicializar gerenciador
         backfill_manager = HistoricalBackfillManager(
             use_redis=True,
-            seasons_per_league=3
+            seasons_per_league=3,
+            response_store_dir=args.response_store,
+            offline=args.offline
         )
         
         # Executar backfill
@@ -15,6 +15,9 @@ FUNCIONALIDADE:
 - Validações de integridade referencial
 - Detecção de dados duplicados
 - Validação de campos obrigatórios
+- Modo incremental: apenas linhas alteradas desde a última execução (falhas em aberto reavaliadas)
+- Modo profile: perfil por amostragem (nulos, fora do intervalo, distintos)
+  das tabelas grandes, gravado para análise de deriva
 - Relatórios automáticos de qualidade
 - Sistema de alertas para problemas
 """
@@ -42,12 +45,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def run_complete_quality_check(tables: Optional[List[str]] = None) -> bool:
+def run_complete_quality_check(tables: Optional[List[str]] = None, incremental: bool = False) -> bool:
     """
     Executa verificação completa de qualidade
     
     Args:
         tables: Lista de tabelas (None = todas)
+        incremental: Avaliar apenas linhas alteradas desde a última execução
         
     Returns:
         True se verificação foi bem-sucedida
@@ -64,7 +68,7 @@ def run_complete_quality_check(tables: Optional[List[str]] = None) -> bool:
         
         # Executar verificações
         logger.info("🔄 Executando verificações de qualidade...")
-        results = quality_manager.run_all_quality_checks(tables=tables)
+        results = quality_manager.run_all_quality_checks(tables=tables, incremental=incremental)
         
         # Gerar relatório
         logger.info("📊 Gerando relatório de qualidade...")
@@ -162,6 +166,42 @@ def run_critical_checks_only() -> bool:
         logger.error(f"❌ Erro durante verificações críticas: {e}")
         return False
 
+def run_quality_profiling(tables: Optional[List[str]] = None) -> bool:
+    """
+    Executa o perfil por amostragem das tabelas grandes
+    
+    Args:
+        tables: Tabelas específicas (None = todas de PROFILE_RULES)
+        
+    Returns:
+        True se os perfis foram calculados e gravados
+    """
+    logger.info("🔬 PERFIL DE QUALIDADE POR AMOSTRAGEM")
+    logger.info("=" * 50)
+    
+    try:
+        quality_manager = DataQualityManager()
+        results = quality_manager.run_quality_profiling(tables=tables)
+        
+        for table_name, profile in results['profiles'].items():
+            if profile.get('error'):
+                print(f"❌ {table_name}: {profile['error']}")
+                continue
+            print(f"\n📊 {table_name} ({profile['method']}, {profile['sample_rows']} de ~{profile['estimated_total']} linhas)")
+            for column, stats in profile['columns'].items():
+                low, high = stats['null_rate_interval']
+                line = f"  • {column}: nulos {stats['null_rate']:.2%} [{low:.2%}, {high:.2%}]"
+                if 'out_of_range_rate' in stats:
+                    line += f", fora do intervalo ~{stats['out_of_range_estimate']}"
+                line += f", distintos ~{stats['distinct_estimate']:.0f}"
+                print(line)
+        
+        return results['saved'] and not any(profile.get('error') for profile in results['profiles'].values())
+        
+    except Exception as e:
+        logger.error(f"❌ Erro durante perfil de qualidade: {e}")
+        return False
+
 def run_quality_trends_analysis() -> bool:
     """
     Executa análise de tendências de qualidade
@@ -182,6 +222,7 @@ def run_quality_trends_analysis() -> bool:
             print(f"📊 Verificações executadas (7 dias): {trends['quality_checks_run']}")
             print(f"📈 Score médio: {trends['average_score']:.1%}")
             print(f"📊 Tendência: {trends['score_trend']}")
+            print(f"🔬 Derivas nos perfis por amostragem: {len(trends.get('profile_drift', []))}")
             
             if trends['recommendations']:
                 print(f"💡 Recomendações:")
@@ -202,7 +243,7 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Sistema de Verificação de Qualidade de Dados")
-    parser.add_argument('--mode', choices=['complete', 'critical', 'trends'], 
+    parser.add_argument('--mode', choices=['complete', 'incremental', 'critical', 'profile', 'trends'], 
                        default='complete', help='Modo de verificação')
     parser.add_argument('--tables', nargs='*', 
                        help='Tabelas específicas para verificar')
@@ -219,9 +260,15 @@ def main():
         if args.mode == 'complete':
             # Verificação completa
             success = run_complete_quality_check(tables=args.tables)
+        elif args.mode == 'incremental':
+            # Linhas alteradas desde a última execução (rebaseline periódico automático)
+            success = run_complete_quality_check(tables=args.tables, incremental=True)
         elif args.mode == 'critical':
             # Apenas verificações críticas
             success = run_critical_checks_only()
+        elif args.mode == 'profile':
+            # Perfil por amostragem das tabelas grandes (sem varredura completa)
+            success = run_quality_profiling(tables=args.tables)
         elif args.mode == 'trends':
             # Análise de tendências
             success = run_quality_trends_analysis()
@@ -17,6 +17,7 @@ sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent))
 
 from bdfut.core.sportmonks_client import SportmonksClient
 from bdfut.core.supabase_client import SupabaseClient
+from bdfut.core.enrichment_index import EnrichmentStateIndex
 
 # Configurar logging
 logging.basicConfig(
@@ -29,6 +30,7 @@ class FinalMultiEnrichment:
     def __init__(self):
         self.sportmonks = SportmonksClient()
         self.supabase = SupabaseClient()
+        self.enrichment_index = EnrichmentStateIndex(self.supabase, kinds=['events', 'lineups', 'stats'])
         self.batch_size = 10  # Processar 10 fixtures por vez
         self.request_delay = 2  # 2 segundos entre requests
         
@@ -70,20 +72,9 @@ class FinalMultiEnrichment:
             return []
     
     def check_existing_data(self, fixture_id: int):
-        """Verificar se já existem dados para uma fixture"""
+        """Verificar se já existem dados para uma fixture (via índice carregado por lote)"""
         try:
-            events_count = self.supabase.client.table('match_events').select('id', count='exact').eq('fixture_id', fixture_id).execute().count
-            lineups_count = self.supabase.client.table('match_lineups').select('id', count='exact').eq('fixture_id', fixture_id).execute().count
-            stats_count = self.supabase.client.table('match_statistics').select('id', count='exact').eq('fixture_id', fixture_id).execute().count
-            
-            return {
-                'has_events': events_count > 0,
-                'has_lineups': lineups_count > 0,
-                'has_stats': stats_count > 0,
-                'events_count': events_count,
-                'lineups_count': lineups_count,
-                'stats_count': stats_count
-            }
+            return self.enrichment_index.state(fixture_id)
         except Exception as e:
             logger.error(f"Erro ao verificar dados existentes para fixture {fixture_id}: {e}")
             return {'has_events': False, 'has_lineups': False, 'has_stats': False}
@@ -109,6 +100,9 @@ class FinalMultiEnrichment:
             lineups_inserted = 0
             stats_inserted = 0
             
+            # Estado de enriquecimento do lote inteiro (em vez de COUNTs por fixture)
+            self.enrichment_index.load(f['fixture_id'] for f in fixtures_batch)
+            
             # Processar cada fixture da resposta
             for fixture_data in response['data']:
                 fixture_id = fixture_data.get('id')
@@ -5,15 +5,22 @@ Author: Database Optimization Team
 Date: 2025-01-18
 """
 
+import time
 import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from dataclasses import dataclass
 from supabase import create_client
 import pandas as pd
 from ..config.config import Config
 
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,18 +34,87 @@ class ValidationResult:
     message: str
     count: Optional[int] = None
     details: Optional[Dict] = None
+    duration_ms: Optional[float] = None
 
 class DatabaseValidator:
-    """Validador de integridade da base de dados BDFut"""
+    """
+    Validador de integridade da base de dados BDFut
+    
+    As verificações rodam simultaneamente (até DATABASE_VALIDATOR_CONCURRENCY
+    por vez), cada uma com seu próprio tempo limite, e só transferem
+    contagens: COUNT(*) em SQL ou count=exact/head na API, nunca as linhas.
+    Com DATABASE_URL e asyncpg instalado as consultas usam um pool de
+    conexões assíncronas; sem eles, o cliente Supabase (bloqueante) roda no
+    executor de threads padrão do event loop.
+    """
+    
+    # Grupo → (tabela, tipo de validação, método da verificação)
+    CHECKS = {
+        'fixtures_integrity': [
+            ('fixtures', 'orphan_leagues', '_check_orphan_leagues'),
+            ('fixtures', 'missing_teams', '_check_missing_teams'),
+            ('fixtures', 'date_consistency', '_check_date_consistency'),
+            ('fixtures', 'negative_scores', '_check_negative_scores'),
+        ],
+        'referential_integrity': [
+            ('fixtures→leagues', 'foreign_key', '_check_fixtures_leagues'),
+            ('fixtures→teams(home)', 'foreign_key', '_check_fixtures_home_teams'),
+            ('match_events→fixtures', 'foreign_key', '_check_events_fixtures'),
+        ],
+        'data_completeness': [
+            ('fixtures', 'data_completeness', '_check_data_completeness'),
+        ],
+        'api_consistency': [
+            ('fixtures', 'api_consistency', '_check_api_consistency'),
+        ],
+    }
     
-    def __init__(self):
-        """Inicializar validador"""
+    def __init__(self, database_url: Optional[str] = None, concurrency: Optional[int] = None,
+                 check_timeout: Optional[float] = None):
+        """
+        Inicializar validador
+        
+        Args:
+            database_url: DSN do PostgreSQL para o pool asyncpg (padrão: Config.DATABASE_URL)
+            concurrency: Verificações simultâneas (padrão: Config.DATABASE_VALIDATOR_CONCURRENCY)
+            check_timeout: Tempo limite de cada verificação em segundos
+        """
         Config.validate()
         self.supabase = create_client(
             Config.SUPABASE_URL,
             Config.SUPABASE_KEY
         )
         self.results: List[ValidationResult] = []
+        self.database_url = Config.DATABASE_URL if database_url is None else database_url
+        self.concurrency = max(1, concurrency or Config.DATABASE_VALIDATOR_CONCURRENCY)
+        self.check_timeout = check_timeout or Config.DATABASE_VALIDATOR_CHECK_TIMEOUT
+        self._pool = None
+    
+    @property
+    def backend(self) -> str:
+        return 'asyncpg' if self._pool is not None else 'supabase'
+    
+    async def connect(self):
+        """Abrir o pool asyncpg (se DATABASE_URL e asyncpg estiverem disponíveis)"""
+        if self._pool is not None or not self.database_url:
+            return
+        if not ASYNCPG_AVAILABLE:
+            logger.info("ℹ️ asyncpg não instalado (extra bdfut[asyncpg]), validações via cliente Supabase")
+            return
+        try:
+            self._pool = await asyncpg.create_pool(
+                self.database_url, min_size=1, max_size=self.concurrency,
+                command_timeout=self.check_timeout
+            )
+            logger.info(f"✅ Pool asyncpg aberto ({self.concurrency} conexões)")
+        except Exception as e:
+            logger.warning(f"⚠️ Erro ao abrir pool asyncpg, usando cliente Supabase: {e}")
+    
+    async def close(self):
+        """Fechar o pool asyncpg"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
     
     def log_result(self, result: ValidationResult):
         """Registrar resultado de validação"""
@@ -48,152 +124,205 @@ class DatabaseValidator:
             'FAIL': '❌', 
             'WARNING': '⚠️'
         }
-        logger.info(f"{status_emoji.get(result.status, '❓')} {result.table_name}: {result.message}")
+        duration = f" ({result.duration_ms:.0f}ms)" if result.duration_ms is not None else ""
+        logger.info(f"{status_emoji.get(result.status, '❓')} {result.table_name}: {result.message}{duration}")
     
-    async def validate_fixtures_integrity(self) -> List[ValidationResult]:
-        """Validar integridade da tabela fixtures"""
-        logger.info("🔍 Validando integridade da tabela fixtures...")
-        
-        # 1. Verificar registros órfãos (sem liga)
-        response = self.supabase.table('fixtures').select('fixture_id').is_('league_id', 'null').execute()
-        orphan_count = len(response.data)
+    # ------------------------------------------------------------------
+    # Acesso ao banco
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    async def _run_blocking(func: Callable[[], Any]) -> Any:
+        """Executa uma chamada bloqueante no executor padrão (asyncio.to_thread exige Python 3.9)"""
+        return await asyncio.get_running_loop().run_in_executor(None, func)
+    
+    async def _count(self, table: str, where: str, apply_filter: Callable) -> int:
+        """COUNT(*) no servidor: SQL no pool ou count=exact/head na API (sem linhas)"""
+        if self._pool is not None:
+            return await self._pool.fetchval(f"SELECT COUNT(*) FROM {table} WHERE {where}")
+        
+        def count():
+            query = self.supabase.table(table).select('*', count='exact', head=True)
+            return apply_filter(query).execute().count or 0
+        return await self._run_blocking(count)
+    
+    async def _fetch(self, query: str) -> List[Dict[str, Any]]:
+        """Linhas de uma consulta agregada (pool ou RPC execute_sql)"""
+        if self._pool is not None:
+            return [dict(row) for row in await self._pool.fetch(query)]
+        
+        def fetch():
+            return self.supabase.rpc('execute_sql', {'query': query}).execute().data or []
+        return await self._run_blocking(fetch)
+    
+    async def _rpc(self, function: str) -> List[Dict[str, Any]]:
+        """Linhas de uma função do banco sem parâmetros"""
+        if self._pool is not None:
+            return [dict(row) for row in await self._pool.fetch(f"SELECT * FROM {function}()")]
+        
+        def call():
+            return self.supabase.rpc(function).execute().data or []
+        return await self._run_blocking(call)
+    
+    # ------------------------------------------------------------------
+    # Execução das verificações
+    # ------------------------------------------------------------------
+    
+    async def _run_check(self, semaphore: asyncio.Semaphore, table_name: str, validation_type: str,
+                         method: str) -> Optional[ValidationResult]:
+        """
+        Executar uma verificação com tempo limite e medir sua duração
         
+        A espera por uma vaga do semáforo não conta no tempo limite. No
+        caminho Supabase a thread da consulta não é interrompida pelo tempo
+        limite; apenas o resultado deixa de ser aguardado.
+        """
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(getattr(self, method)(), timeout=self.check_timeout)
+            except asyncio.TimeoutError:
+                result = ValidationResult(
+                    table_name, validation_type, 'WARNING',
+                    f'Verificação excedeu o tempo limite de {self.check_timeout:.0f}s',
+                    details={'error': 'timeout'}
+                )
+            except Exception as e:
+                result = ValidationResult(
+                    table_name, validation_type, 'FAIL',
+                    f'Erro ao executar verificação: {e}',
+                    details={'error': str(e)}
+                )
+            if result is not None:
+                result.duration_ms = (time.perf_counter() - start) * 1000
+            return result
+    
+    async def _run_groups(self, groups: List[str]) -> List[ValidationResult]:
+        """Executar simultaneamente as verificações dos grupos, registrando na ordem declarada"""
+        checks = [check for group in groups for check in self.CHECKS[group]]
+        # Criado no loop em execução: no Python 3.8/3.9 o semáforo se prende ao loop da criação
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._run_check(semaphore, *check) for check in checks))
+        for result in results:
+            if result is not None:
+                self.log_result(result)
+        return self.results
+    
+    # ------------------------------------------------------------------
+    # Verificações
+    # ------------------------------------------------------------------
+    
+    async def _check_orphan_leagues(self) -> ValidationResult:
+        # Registros órfãos (sem liga)
+        orphan_count = await self._count(
+            'fixtures', 'league_id IS NULL', lambda q: q.is_('league_id', 'null')
+        )
         if orphan_count == 0:
-            self.log_result(ValidationResult(
+            return ValidationResult(
                 'fixtures', 'orphan_leagues', 'PASS', 
                 'Nenhuma fixture órfã sem liga encontrada'
-            ))
-        else:
-            self.log_result(ValidationResult(
-                'fixtures', 'orphan_leagues', 'FAIL',
-                f'Encontradas {orphan_count} fixtures sem liga associada',
-                count=orphan_count
-            ))
-        
-        # 2. Verificar fixtures sem times
-        response = self.supabase.table('fixtures').select('fixture_id').or_('home_team_id.is.null,away_team_id.is.null').execute()
-        no_teams_count = len(response.data)
-        
+            )
+        return ValidationResult(
+            'fixtures', 'orphan_leagues', 'FAIL',
+            f'Encontradas {orphan_count} fixtures sem liga associada',
+            count=orphan_count
+        )
+    
+    async def _check_missing_teams(self) -> ValidationResult:
+        no_teams_count = await self._count(
+            'fixtures', 'home_team_id IS NULL OR away_team_id IS NULL',
+            lambda q: q.or_('home_team_id.is.null,away_team_id.is.null')
+        )
         if no_teams_count == 0:
-            self.log_result(ValidationResult(
+            return ValidationResult(
                 'fixtures', 'missing_teams', 'PASS',
                 'Todas as fixtures têm times associados'
-            ))
-        else:
-            self.log_result(ValidationResult(
-                'fixtures', 'missing_teams', 'WARNING',
-                f'Encontradas {no_teams_count} fixtures sem times completos',
-                count=no_teams_count
-            ))
-        
-        # 3. Verificar fixtures com datas inconsistentes
-        response = self.supabase.rpc('validate_fixture_dates').execute()
-        if hasattr(response, 'data') and response.data:
-            invalid_dates = response.data[0].get('count', 0)
-            if invalid_dates == 0:
-                self.log_result(ValidationResult(
-                    'fixtures', 'date_consistency', 'PASS',
-                    'Todas as datas de fixtures são consistentes'
-                ))
-            else:
-                self.log_result(ValidationResult(
-                    'fixtures', 'date_consistency', 'WARNING',
-                    f'Encontradas {invalid_dates} fixtures com datas inconsistentes',
-                    count=invalid_dates
-                ))
-        
-        # 4. Verificar placares negativos
-        response = self.supabase.table('fixtures').select('fixture_id').or_('home_score.lt.0,away_score.lt.0').execute()
-        negative_scores = len(response.data)
-        
+            )
+        return ValidationResult(
+            'fixtures', 'missing_teams', 'WARNING',
+            f'Encontradas {no_teams_count} fixtures sem times completos',
+            count=no_teams_count
+        )
+    
+    async def _check_date_consistency(self) -> Optional[ValidationResult]:
+        data = await self._rpc('validate_fixture_dates')
+        if not data:
+            return None
+        invalid_dates = data[0].get('count', 0)
+        if invalid_dates == 0:
+            return ValidationResult(
+                'fixtures', 'date_consistency', 'PASS',
+                'Todas as datas de fixtures são consistentes'
+            )
+        return ValidationResult(
+            'fixtures', 'date_consistency', 'WARNING',
+            f'Encontradas {invalid_dates} fixtures com datas inconsistentes',
+            count=invalid_dates
+        )
+    
+    async def _check_negative_scores(self) -> ValidationResult:
+        negative_scores = await self._count(
+            'fixtures', 'home_score < 0 OR away_score < 0',
+            lambda q: q.or_('home_score.lt.0,away_score.lt.0')
+        )
         if negative_scores == 0:
-            self.log_result(ValidationResult(
+            return ValidationResult(
                 'fixtures', 'negative_scores', 'PASS',
                 'Nenhum placar negativo encontrado'
-            ))
-        else:
-            self.log_result(ValidationResult(
-                'fixtures', 'negative_scores', 'FAIL',
-                f'Encontrados {negative_scores} placares negativos',
-                count=negative_scores
-            ))
-        
-        return self.results
+            )
+        return ValidationResult(
+            'fixtures', 'negative_scores', 'FAIL',
+            f'Encontrados {negative_scores} placares negativos',
+            count=negative_scores
+        )
     
-    async def validate_referential_integrity(self) -> List[ValidationResult]:
-        """Validar integridade referencial entre tabelas"""
-        logger.info("🔗 Validando integridade referencial...")
-        
-        # 1. Fixtures → Leagues
+    async def _foreign_key_check(self, table_name: str, query: str, failure: str, success: str) -> ValidationResult:
+        data = await self._fetch(query)
+        count = data[0]['count'] if data else 0
+        if count > 0:
+            return ValidationResult(table_name, 'foreign_key', 'FAIL', failure.format(count=count), count=count)
+        return ValidationResult(table_name, 'foreign_key', 'PASS', success)
+    
+    async def _check_fixtures_leagues(self) -> ValidationResult:
         query = """
         SELECT COUNT(*) as count
         FROM fixtures f
         LEFT JOIN leagues l ON f.league_id = l.league_id
         WHERE f.league_id IS NOT NULL AND l.league_id IS NULL
         """
-        response = self.supabase.rpc('execute_sql', {'query': query}).execute()
-        
-        if response.data and response.data[0]['count'] > 0:
-            self.log_result(ValidationResult(
-                'fixtures→leagues', 'foreign_key', 'FAIL',
-                f"Encontradas {response.data[0]['count']} fixtures com league_id inválido",
-                count=response.data[0]['count']
-            ))
-        else:
-            self.log_result(ValidationResult(
-                'fixtures→leagues', 'foreign_key', 'PASS',
-                'Integridade referencial fixtures→leagues OK'
-            ))
-        
-        # 2. Fixtures → Teams (Home)
+        return await self._foreign_key_check(
+            'fixtures→leagues', query,
+            'Encontradas {count} fixtures com league_id inválido',
+            'Integridade referencial fixtures→leagues OK'
+        )
+    
+    async def _check_fixtures_home_teams(self) -> ValidationResult:
         query = """
         SELECT COUNT(*) as count
         FROM fixtures f
         LEFT JOIN teams t ON f.home_team_id = t.team_id
         WHERE f.home_team_id IS NOT NULL AND t.team_id IS NULL
         """
-        response = self.supabase.rpc('execute_sql', {'query': query}).execute()
-        
-        if response.data and response.data[0]['count'] > 0:
-            self.log_result(ValidationResult(
-                'fixtures→teams(home)', 'foreign_key', 'FAIL',
-                f"Encontradas {response.data[0]['count']} fixtures com home_team_id inválido",
-                count=response.data[0]['count']
-            ))
-        else:
-            self.log_result(ValidationResult(
-                'fixtures→teams(home)', 'foreign_key', 'PASS',
-                'Integridade referencial fixtures→teams(home) OK'
-            ))
-        
-        # 3. Match Events → Fixtures
+        return await self._foreign_key_check(
+            'fixtures→teams(home)', query,
+            'Encontradas {count} fixtures com home_team_id inválido',
+            'Integridade referencial fixtures→teams(home) OK'
+        )
+    
+    async def _check_events_fixtures(self) -> ValidationResult:
         query = """
         SELECT COUNT(*) as count
         FROM match_events me
         LEFT JOIN fixtures f ON me.fixture_id = f.fixture_id
         WHERE f.fixture_id IS NULL
         """
-        response = self.supabase.rpc('execute_sql', {'query': query}).execute()
-        
-        if response.data and response.data[0]['count'] > 0:
-            self.log_result(ValidationResult(
-                'match_events→fixtures', 'foreign_key', 'FAIL',
-                f"Encontrados {response.data[0]['count']} eventos órfãos sem fixture",
-                count=response.data[0]['count']
-            ))
-        else:
-            self.log_result(ValidationResult(
-                'match_events→fixtures', 'foreign_key', 'PASS',
-                'Integridade referencial match_events→fixtures OK'
-            ))
-        
-        return self.results
+        return await self._foreign_key_check(
+            'match_events→fixtures', query,
+            'Encontrados {count} eventos órfãos sem fixture',
+            'Integridade referencial match_events→fixtures OK'
+        )
     
-    async def validate_data_completeness(self) -> List[ValidationResult]:
-        """Validar completude dos dados principais"""
-        logger.info("📊 Validando completude dos dados...")
-        
-        # 1. Fixtures com dados completos
+    async def _check_data_completeness(self) -> Optional[ValidationResult]:
         query = """
         SELECT 
             COUNT(*) as total_fixtures,
@@ -205,75 +334,92 @@ class DatabaseValidator:
         FROM fixtures 
         WHERE state_id = 5 AND is_deleted = false
         """
-        response = self.supabase.rpc('execute_sql', {'query': query}).execute()
-        
-        if response.data:
-            data = response.data[0]
-            total = data['total_fixtures']
-            
-            # Calcular percentuais de completude
-            name_pct = (data['with_name'] / total * 100) if total > 0 else 0
-            scores_pct = (data['with_scores'] / total * 100) if total > 0 else 0
-            events_pct = (data['with_events'] / total * 100) if total > 0 else 0
-            
-            self.log_result(ValidationResult(
-                'fixtures', 'data_completeness', 'PASS' if name_pct > 90 else 'WARNING',
-                f'Completude dos dados: Names {name_pct:.1f}%, Scores {scores_pct:.1f}%, Events {events_pct:.1f}%',
-                details=data
-            ))
-        
-        return self.results
+        rows = await self._fetch(query)
+        if not rows:
+            return None
+        
+        data = rows[0]
+        total = data['total_fixtures']
+        
+        # Calcular percentuais de completude
+        name_pct = (data['with_name'] / total * 100) if total > 0 else 0
+        scores_pct = (data['with_scores'] / total * 100) if total > 0 else 0
+        events_pct = (data['with_events'] / total * 100) if total > 0 else 0
+        
+        return ValidationResult(
+            'fixtures', 'data_completeness', 'PASS' if name_pct > 90 else 'WARNING',
+            f'Completude dos dados: Names {name_pct:.1f}%, Scores {scores_pct:.1f}%, Events {events_pct:.1f}%',
+            details=data
+        )
     
-    async def validate_api_consistency(self) -> List[ValidationResult]:
-        """Validar consistência com estrutura da API"""
-        logger.info("🔄 Validando consistência com API Sportmonks...")
-        
-        # Verificar se temos todas as colunas essenciais da API
+    async def _check_api_consistency(self) -> Optional[ValidationResult]:
+        # Colunas essenciais da API
         required_fixture_columns = [
             'fixture_id', 'sport_id', 'league_id', 'season_id', 'stage_id',
             'round_id', 'state_id', 'venue_id', 'starting_at', 'starting_at_timestamp',
             'length', 'placeholder', 'has_odds', 'name', 'result_info', 'leg'
         ]
         
-        # Verificar quais colunas existem
         query = """
         SELECT column_name
         FROM information_schema.columns
         WHERE table_name = 'fixtures' AND table_schema = 'public'
         """
-        response = self.supabase.rpc('execute_sql', {'query': query}).execute()
-        
-        if response.data:
-            existing_columns = [row['column_name'] for row in response.data]
-            missing_columns = [col for col in required_fixture_columns if col not in existing_columns]
-            
-            if not missing_columns:
-                self.log_result(ValidationResult(
-                    'fixtures', 'api_consistency', 'PASS',
-                    'Todas as colunas essenciais da API estão presentes'
-                ))
-            else:
-                self.log_result(ValidationResult(
-                    'fixtures', 'api_consistency', 'WARNING',
-                    f'Colunas faltantes da API: {", ".join(missing_columns)}',
-                    details={'missing_columns': missing_columns}
-                ))
-        
-        return self.results
+        rows = await self._fetch(query)
+        if not rows:
+            return None
+        
+        existing_columns = [row['column_name'] for row in rows]
+        missing_columns = [col for col in required_fixture_columns if col not in existing_columns]
+        
+        if not missing_columns:
+            return ValidationResult(
+                'fixtures', 'api_consistency', 'PASS',
+                'Todas as colunas essenciais da API estão presentes'
+            )
+        return ValidationResult(
+            'fixtures', 'api_consistency', 'WARNING',
+            f'Colunas faltantes da API: {", ".join(missing_columns)}',
+            details={'missing_columns': missing_columns}
+        )
+    
+    async def validate_fixtures_integrity(self) -> List[ValidationResult]:
+        """Validar integridade da tabela fixtures"""
+        logger.info("🔍 Validando integridade da tabela fixtures...")
+        return await self._run_groups(['fixtures_integrity'])
+    
+    async def validate_referential_integrity(self) -> List[ValidationResult]:
+        """Validar integridade referencial entre tabelas"""
+        logger.info("🔗 Validando integridade referencial...")
+        return await self._run_groups(['referential_integrity'])
+    
+    async def validate_data_completeness(self) -> List[ValidationResult]:
+        """Validar completude dos dados principais"""
+        logger.info("📊 Validando completude dos dados...")
+        return await self._run_groups(['data_completeness'])
+    
+    async def validate_api_consistency(self) -> List[ValidationResult]:
+        """Validar consistência com estrutura da API"""
+        logger.info("🔄 Validando consistência com API Sportmonks...")
+        return await self._run_groups(['api_consistency'])
     
     async def run_all_validations(self) -> Dict[str, Any]:
-        """Executar todas as validações"""
+        """Executar todas as validações simultaneamente"""
         logger.info("🚀 Iniciando validação completa da base de dados...")
         start_time = datetime.now()
         
         # Limpar resultados anteriores
         self.results = []
         
-        # Executar validações
-        await self.validate_fixtures_integrity()
-        await self.validate_referential_integrity()
-        await self.validate_data_completeness()
-        await self.validate_api_consistency()
+        # Executar validações (pool asyncpg aberto só durante a execução)
+        opened_pool = self._pool is None
+        await self.connect()
+        try:
+            await self._run_groups(list(self.CHECKS))
+            backend = self.backend
+        finally:
+            if opened_pool:
+                await self.close()
         
         # Calcular estatísticas finais
         end_time = datetime.now()
@@ -283,14 +429,20 @@ class DatabaseValidator:
         passed = len([r for r in self.results if r.status == 'PASS'])
         failed = len([r for r in self.results if r.status == 'FAIL'])
         warnings = len([r for r in self.results if r.status == 'WARNING'])
+        timed_out = len([r for r in self.results if (r.details or {}).get('error') == 'timeout'])
         
         summary = {
             'timestamp': end_time.isoformat(),
             'duration_seconds': duration.total_seconds(),
+            'checks_duration_ms': sum(r.duration_ms or 0 for r in self.results),
+            'backend': backend,
+            'concurrency': self.concurrency,
+            'check_timeout_seconds': self.check_timeout,
             'total_validations': total_validations,
             'passed': passed,
             'failed': failed,
             'warnings': warnings,
+            'timed_out': timed_out,
             'success_rate': (passed / total_validations * 100) if total_validations > 0 else 0,
             'results': [
                 {
@@ -299,14 +451,16 @@ class DatabaseValidator:
                     'status': r.status,
                     'message': r.message,
                     'count': r.count,
-                    'details': r.details
+                    'details': r.details,
+                    'duration_ms': r.duration_ms
                 }
                 for r in self.results
             ]
         }
         
         # Log do resumo
-        logger.info(f"✅ Validação concluída em {duration.total_seconds():.2f}s")
+        logger.info(f"✅ Validação concluída em {duration.total_seconds():.2f}s "
+                    f"({summary['checks_duration_ms'] / 1000:.2f}s somando as verificações, via {backend})")
         logger.info(f"📊 Resultados: {passed} PASS, {failed} FAIL, {warnings} WARNING")
         logger.info(f"🎯 Taxa de sucesso: {summary['success_rate']:.1f}%")
         
@@ -355,6 +509,8 @@ class DatabaseValidator:
                         report += f"- Contagem: {result.count}\n"
                     if result.details:
                         report += f"- Detalhes: {result.details}\n"
+                    if result.duration_ms is not None:
+                        report += f"- Duração: {result.duration_ms:.0f}ms\n"
                     report += "\n"
         
         # Recomendações
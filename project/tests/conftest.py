@@ -71,3 +71,64 @@ def setup_test_env():
     # Limpar após os testes
     for key in ["BDFUT_ENV", "SPORTMONKS_API_KEY", "SUPABASE_URL", "SUPABASE_KEY"]:
         os.environ.pop(key, None)
+
+@pytest.fixture
+def sportmonks_stub_server():
+    """
+    Servidor HTTP local que imita a API Sportmonks
+
+    Responde qualquer GET com JSON após um atraso configurável
+    (stub.latency), permitindo medir throughput sem acessar a API real.
+    stub.statuses define o status HTTP por caminho (padrão 200).
+    """
+    import json
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import urlparse, parse_qs
+
+    class StubState:
+        latency = 0.0
+        requests = []
+        responses = {}
+        statuses = {}
+        client_ports = set()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            StubState.requests.append((parsed.path, params))
+            StubState.client_ports.add(self.client_address[1])
+            time.sleep(StubState.latency)
+
+            body = StubState.responses.get(parsed.path, {"data": {"path": parsed.path}})
+            if callable(body):
+                body = body(params)
+            payload = json.dumps(body).encode()
+
+            self.send_response(StubState.statuses.get(parsed.path, 200))
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    class StubServer(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 128
+
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    StubState.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield StubState
+
+    server.shutdown()
+    server.server_close()
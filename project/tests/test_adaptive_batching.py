@@ -0,0 +1,166 @@
+"""
+Testes unitários para o lote adaptativo de fixtures/multi
+========================================================
+
+Testes do AdaptiveBatchSizer e da sua integração com o BatchCollector:
+- Crescimento com requisições rápidas e redução com falhas/lentidão
+- Persistência em intervalo e em close()
+- Apenas timeout/5xx da API reduzem o lote
+"""
+import os
+import sys
+import json
+import pytest
+import requests
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from etl.adaptive_batching import AdaptiveBatchSizer  # noqa: E402
+from etl.batch_collector import BatchCollector, SportmonksBatchAPI  # noqa: E402
+
+INCLUDES = ['statistics', 'events', 'lineups']
+
+
+class TestAdaptiveBatchSizer:
+    """Testes para AdaptiveBatchSizer"""
+
+    def test_grows_after_fast_request(self):
+        """Testa crescimento do lote após requisição rápida"""
+        sizer = AdaptiveBatchSizer(initial_size=10)
+
+        assert sizer.observe(INCLUDES, 10, 1.0, payload_bytes=10 * 50_000) > 10
+
+    def test_shrinks_and_caps_after_error(self):
+        """Testa redução e teto abaixo do lote que falhou"""
+        sizer = AdaptiveBatchSizer(initial_size=40)
+
+        size = sizer.observe(INCLUDES, 40, 30.0, error=True)
+
+        assert size == 20
+        assert sizer.states[sizer.key(INCLUDES)].ceiling == 39
+
+    def test_shrinks_when_latency_above_target(self):
+        """Testa redução quando a latência passa do alvo"""
+        sizer = AdaptiveBatchSizer(initial_size=40, target_latency=10)
+
+        assert sizer.observe(INCLUDES, 40, 12.0) == 30
+
+    def test_payload_limit_caps_size(self):
+        """Testa teto pelo tamanho da resposta"""
+        sizer = AdaptiveBatchSizer(initial_size=40, max_payload_bytes=1_000_000)
+
+        assert sizer.observe(INCLUDES, 40, 1.0, payload_bytes=40 * 100_000) == 10
+
+    def test_key_ignores_include_order(self):
+        """Testa que a ordem dos includes não muda a combinação"""
+        assert AdaptiveBatchSizer.key(INCLUDES) == AdaptiveBatchSizer.key(list(reversed(INCLUDES)))
+        assert AdaptiveBatchSizer.key(None) == '-'
+
+
+class TestAdaptiveBatchPersistence:
+    """Testes de persistência dos tamanhos aprendidos"""
+
+    def test_persists_on_close_not_every_observation(self, temp_dir):
+        """Testa que o arquivo só é gravado no intervalo ou em close()"""
+        state_file = os.path.join(temp_dir, 'adaptive_batch_state.json')
+        sizer = AdaptiveBatchSizer(state_file, initial_size=10, save_interval=3600)
+
+        grown = sizer.observe(INCLUDES, 10, 1.0, payload_bytes=10 * 50_000)
+        shrunk = sizer.observe(INCLUDES, grown, 30.0, error=True)
+        assert not os.path.exists(state_file)
+
+        sizer.close()
+
+        reloaded = AdaptiveBatchSizer(state_file)
+        assert reloaded.batch_size(list(reversed(INCLUDES))) == shrunk
+        with open(state_file) as f:
+            assert json.load(f)[sizer.key(INCLUDES)]['size'] == shrunk
+
+    def test_persists_after_interval(self, temp_dir):
+        """Testa gravação quando o intervalo já passou"""
+        state_file = os.path.join(temp_dir, 'adaptive_batch_state.json')
+        sizer = AdaptiveBatchSizer(state_file, initial_size=10, save_interval=0)
+
+        sizer.observe(INCLUDES, 10, 1.0)
+
+        assert os.path.exists(state_file)
+
+    def test_close_without_changes_does_not_write(self, temp_dir):
+        """Testa que close() sem observações não grava"""
+        state_file = os.path.join(temp_dir, 'adaptive_batch_state.json')
+
+        AdaptiveBatchSizer(state_file).close()
+
+        assert not os.path.exists(state_file)
+
+    def test_invalid_state_file_is_ignored(self, temp_dir):
+        """Testa que estado corrompido é descartado"""
+        state_file = os.path.join(temp_dir, 'adaptive_batch_state.json')
+        with open(state_file, 'w') as f:
+            f.write('{not json')
+
+        assert AdaptiveBatchSizer(state_file, initial_size=7).batch_size(INCLUDES) == 7
+
+
+class TestBatchErrorClassification:
+    """Testes de quais falhas alimentam o lote adaptativo"""
+
+    def make_collector(self, data=None, last_error=None):
+        sizer = AdaptiveBatchSizer(initial_size=40)
+        collector = BatchCollector('token', 'postgresql://test', batch_sizer=sizer)
+        collector.api = Mock(last_error=last_error, last_response_bytes=0)
+        collector.api.get_fixtures_multi.return_value = data
+        return collector, sizer
+
+    @pytest.mark.parametrize('last_error', ['timeout', 'server_error'])
+    def test_timeout_and_5xx_shrink_batch(self, last_error):
+        """Testa que timeout e 5xx reduzem o lote"""
+        collector, sizer = self.make_collector(last_error=last_error)
+
+        result = collector.process_batch(list(range(40)), INCLUDES)
+
+        assert result.failed_fixtures == list(range(40))
+        assert sizer.batch_size(INCLUDES) == 20
+
+    @pytest.mark.parametrize('last_error', ['client_error', 'rate_limited', 'connection'])
+    def test_other_api_failures_keep_batch(self, last_error):
+        """Testa que 4xx, rate limit e conexão não mudam o lote"""
+        collector, sizer = self.make_collector(last_error=last_error)
+
+        collector.process_batch(list(range(40)), INCLUDES)
+
+        assert sizer.batch_size(INCLUDES) == 40
+        assert sizer.states[sizer.key(INCLUDES)].observations == 0
+
+    def test_processing_error_does_not_shrink_batch(self):
+        """Testa que erro ao processar a resposta não reduz o lote"""
+        data = Mock()
+        data.get.side_effect = ValueError("resposta inesperada")
+        collector, sizer = self.make_collector(data=data)
+
+        result = collector.process_batch(list(range(40)), INCLUDES)
+
+        assert result.failed_fixtures == list(range(40))
+        state = sizer.states[sizer.key(INCLUDES)]
+        assert state.error_rate == 0.0
+        assert state.size >= 40
+
+    def test_make_request_classifies_failures(self):
+        """Testa a classificação das falhas da API"""
+        api = SportmonksBatchAPI('token')
+        server_error = Mock(status_code=503, headers={})
+        server_error.raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+
+        with patch('etl.batch_collector.time.sleep'):
+            with patch.object(api.session, 'get', side_effect=requests.exceptions.ReadTimeout("slow")):
+                assert api._make_request('fixtures/multi') is None
+                assert api.last_error == 'timeout'
+
+            with patch.object(api.session, 'get', return_value=server_error):
+                assert api._make_request('fixtures/multi') is None
+                assert api.last_error == 'server_error'
+
+            with patch.object(api.session, 'get', side_effect=requests.exceptions.ConnectionError("reset")):
+                assert api._make_request('fixtures/multi') is None
+                assert api.last_error == 'connection'
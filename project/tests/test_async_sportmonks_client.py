@@ -0,0 +1,340 @@
+"""
+Testes unitários para AsyncSportmonksClient
+==========================================
+
+Testes do cliente assíncrono contra um servidor HTTP local:
+- Concorrência limitada
+- Reuso de conexões
+- Paginação
+- Integração com cache (cache negativo, coalescência, stale-while-revalidate)
+"""
+import time
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from bdfut.core.async_sportmonks_client import AsyncSportmonksClient
+from bdfut.core.redis_cache import RedisCache
+from bdfut.core.sportmonks_client import SportmonksNotFoundError
+
+
+def make_client(stub, **kwargs):
+    """Cria cliente assíncrono apontando para o servidor stub"""
+    client = AsyncSportmonksClient(enable_cache=False, **kwargs)
+    client.base_url = stub.base_url
+    client.CORE_BASE_URL = stub.base_url
+    return client
+
+
+def make_cached_client(stub, **kwargs):
+    """Cliente assíncrono com cache Redis apenas local (Redis indisponível)"""
+    with patch('bdfut.core.redis_cache.redis.from_url', side_effect=Exception("sem Redis")):
+        client = AsyncSportmonksClient(enable_cache=True, rate_limiter=Mock(acquire_async=AsyncMock()), **kwargs)
+    client.base_url = stub.base_url
+    client.CORE_BASE_URL = stub.base_url
+    return client
+
+
+class TestAsyncSportmonksClient:
+    """Testes para AsyncSportmonksClient"""
+
+    def test_get_fixture_by_id(self, mock_config, sportmonks_stub_server):
+        """Testa requisição simples de fixture"""
+        stub = sportmonks_stub_server
+        stub.responses['/fixtures/123'] = {'data': {'id': 123, 'name': 'Fixture 123'}}
+
+        async def run():
+            async with make_client(stub) as client:
+                return await client.get_fixture_by_id(123, include='events')
+
+        fixture = asyncio.run(run())
+
+        assert fixture == {'id': 123, 'name': 'Fixture 123'}
+        path, params = stub.requests[0]
+        assert path == '/fixtures/123'
+        assert params['include'] == 'events'
+        assert 'api_token' in params
+
+    def test_concurrency_is_bounded(self, mock_config, sportmonks_stub_server):
+        """Testa que o número de requisições simultâneas respeita max_concurrency"""
+        stub = sportmonks_stub_server
+        stub.latency = 0.05
+
+        async def run():
+            async with make_client(stub, max_concurrency=3) as client:
+                in_flight = 0
+                peak = 0
+                original = client._acquire_rate_limit
+
+                async def tracking_acquire(*args):
+                    nonlocal in_flight, peak
+                    await original(*args)
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                    await asyncio.sleep(0.05)
+                    in_flight -= 1
+
+                client._acquire_rate_limit = tracking_acquire
+                await asyncio.gather(*[client.get_fixture_by_id(i) for i in range(12)])
+                return peak
+
+        peak = asyncio.run(run())
+
+        assert peak == 3
+        assert len(stub.requests) == 12
+
+    def test_results_preserve_order(self, mock_config, sportmonks_stub_server):
+        """Testa que gather devolve resultados na ordem das chamadas"""
+        stub = sportmonks_stub_server
+
+        async def run():
+            async with make_client(stub, max_concurrency=5) as client:
+                return await asyncio.gather(*[client.get_fixture_by_id(i) for i in range(10)])
+
+        results = asyncio.run(run())
+
+        assert [r['path'] for r in results] == [f'/fixtures/{i}' for i in range(10)]
+
+    def test_keep_alive_connection_reuse(self, mock_config, sportmonks_stub_server):
+        """Testa que requisições sequenciais reutilizam a mesma conexão"""
+        stub = sportmonks_stub_server
+
+        async def run():
+            async with make_client(stub) as client:
+                for i in range(10):
+                    await client.get_fixture_by_id(i)
+
+        asyncio.run(run())
+
+        assert len(stub.requests) == 10
+        assert len(stub.client_ports) == 1
+
+    def test_get_paginated_data(self, mock_config, sportmonks_stub_server):
+        """Testa paginação assíncrona"""
+        stub = sportmonks_stub_server
+
+        def pages(params):
+            page = int(params['page'])
+            return {'data': [{'id': page}], 'pagination': {'has_more': page < 3}}
+
+        stub.responses['/teams/seasons/1'] = pages
+
+        async def run():
+            async with make_client(stub) as client:
+                return await client.get_teams_by_season(1)
+
+        teams = asyncio.run(run())
+
+        assert [t['id'] for t in teams] == [1, 2, 3]
+
+    def test_core_endpoints_do_not_mutate_base_url(self, mock_config, sportmonks_stub_server):
+        """Testa que endpoints core não alteram a base_url compartilhada"""
+        stub = sportmonks_stub_server
+        stub.responses['/states'] = {'data': [{'id': 1}]}
+
+        async def run():
+            async with make_client(stub) as client:
+                states = await client.get_states()
+                return states, client.base_url
+
+        states, base_url = asyncio.run(run())
+
+        assert states == [{'id': 1}]
+        assert base_url == stub.base_url
+
+    def test_cache_hit_skips_http(self, mock_config, sportmonks_stub_server):
+        """Testa que cache hit não faz requisição HTTP"""
+        stub = sportmonks_stub_server
+        mock_supabase = Mock()
+        mock_supabase.table.return_value.select.return_value.eq.return_value.gte.return_value.execute.return_value.data = [
+            {'data': {'data': {'id': 1, 'cached': True}}}
+        ]
+
+        async def run():
+            with patch('bdfut.core.sportmonks_client.create_client', return_value=mock_supabase):
+                client = AsyncSportmonksClient(enable_cache=True, use_redis=False)
+            client.base_url = stub.base_url
+            async with client:
+                return await client.get_fixture_by_id(1), client
+
+        fixture, client = asyncio.run(run())
+
+        assert fixture == {'id': 1, 'cached': True}
+        assert client.cache_hits == 1
+        assert stub.requests == []
+
+    def test_iter_pages_concurrent_in_order(self, mock_config, sportmonks_stub_server):
+        """Testa paginação concorrente entregando páginas em ordem"""
+        stub = sportmonks_stub_server
+        stub.latency = 0.02
+
+        def pages(params):
+            page = int(params['page'])
+            return {'data': [{'id': page}], 'pagination': {'has_more': page < 5}}
+
+        stub.responses['/teams'] = pages
+
+        async def run():
+            async with make_client(stub, max_concurrency=4) as client:
+                return [page async for page in client.iter_pages('/teams', max_workers=4)]
+
+        result = asyncio.run(run())
+
+        assert result == [[{'id': page}] for page in range(1, 6)]
+
+    def test_iter_transfers_async(self, mock_config, sportmonks_stub_server):
+        """Testa iteração assíncrona item a item"""
+        stub = sportmonks_stub_server
+
+        def pages(params):
+            page = int(params['page'])
+            return {'data': [{'id': page}, {'id': -page}], 'pagination': {'has_more': page < 2}}
+
+        stub.responses['/transfers'] = pages
+
+        async def run():
+            async with make_client(stub) as client:
+                return [item['id'] async for item in client.iter_transfers()]
+
+        assert asyncio.run(run()) == [1, -1, 2, -2]
+
+
+class TestAsyncBatchGetters:
+    """Testes dos getters em lote e demais métodos herdados como assíncronos"""
+
+    def test_get_fixtures_by_ids_uses_multi(self, mock_config, sportmonks_stub_server):
+        """Testa busca em lote via fixtures/multi sem cache"""
+        stub = sportmonks_stub_server
+        stub.responses['/fixtures/multi/1,2'] = {'data': [{'id': 1}, {'id': 2}]}
+
+        async def run():
+            async with make_client(stub) as client:
+                return await client.get_fixtures_by_ids([1, 2, 1])
+
+        assert asyncio.run(run()) == {1: {'id': 1}, 2: {'id': 2}}
+        assert [path for path, _ in stub.requests] == ['/fixtures/multi/1,2']
+
+    def test_get_fixtures_by_ids_reads_cached_items(self, mock_config, sportmonks_stub_server):
+        """Testa que partidas já cacheadas não voltam à API"""
+        stub = sportmonks_stub_server
+        stub.responses['/fixtures/multi/1,2'] = {'data': [{'id': 1}, {'id': 2}]}
+        stub.responses['/fixtures/multi/3'] = {'data': [{'id': 3}]}
+
+        async def run():
+            async with make_cached_client(stub) as client:
+                await client.get_fixtures_by_ids([1, 2])
+                return await client.get_fixtures_by_ids([1, 2, 3])
+
+        assert asyncio.run(run()) == {1: {'id': 1}, 2: {'id': 2}, 3: {'id': 3}}
+        assert [path for path, _ in stub.requests] == ['/fixtures/multi/1,2', '/fixtures/multi/3']
+
+    def test_get_fixtures_by_ids_splits_chunks(self, mock_config, sportmonks_stub_server):
+        """Testa divisão em lotes de MULTI_MAX_IDS buscados concorrentemente"""
+        stub = sportmonks_stub_server
+        for path in ('/fixtures/multi/1,2', '/fixtures/multi/3,4', '/fixtures/multi/5'):
+            stub.responses[path] = {'data': []}
+
+        async def run():
+            client = make_client(stub)
+            client.MULTI_MAX_IDS = 2
+            async with client:
+                return await client.get_fixtures_by_ids([1, 2, 3, 4, 5])
+
+        assert asyncio.run(run()) == {}
+        assert sorted(path for path, _ in stub.requests) == [
+            '/fixtures/multi/1,2', '/fixtures/multi/3,4', '/fixtures/multi/5'
+        ]
+
+    def test_get_players_by_ids(self, mock_config, sportmonks_stub_server):
+        """Testa busca concorrente de jogadores ignorando IDs sem dados"""
+        stub = sportmonks_stub_server
+        stub.responses['/players/1'] = {'data': {'id': 1}}
+        stub.responses['/players/2'] = {'data': None}
+
+        async def run():
+            async with make_client(stub) as client:
+                return await client.get_players_by_ids([1, 2])
+
+        assert asyncio.run(run()) == {1: {'id': 1}}
+
+    def test_get_team_by_id(self, mock_config, sportmonks_stub_server):
+        """Testa getter de time assíncrono"""
+        stub = sportmonks_stub_server
+        stub.responses['/teams/7'] = {'data': {'id': 7}}
+
+        async def run():
+            async with make_client(stub) as client:
+                return await client.get_team_by_id(7)
+
+        assert asyncio.run(run()) == {'id': 7}
+
+    def test_warm_up_cache_awaits_loaders(self, mock_config, sportmonks_stub_server):
+        """Testa que o warm-up aguarda os loaders assíncronos"""
+        stub = sportmonks_stub_server
+        stub.responses['/countries'] = {'data': [{'id': 1}, {'id': 2}], 'pagination': {'has_more': False}}
+        stub.responses['/states'] = {'data': [{'id': 1}]}
+        stub.responses['/types'] = {'data': [{'id': 1}, {'id': 2}, {'id': 3}]}
+
+        async def run():
+            async with make_cached_client(stub) as client:
+                return await client.warm_up_cache()
+
+        assert asyncio.run(run()) == {'countries': 2, 'states': 1, 'types': 3}
+
+
+class TestAsyncCacheBehavior:
+    """Testes de cache negativo, coalescência e stale-while-revalidate no cliente assíncrono"""
+
+    def test_not_found_is_not_retried_and_cached(self, mock_config, sportmonks_stub_server):
+        """Testa que 404 levanta SportmonksNotFoundError sem retry e vai para o cache negativo"""
+        stub = sportmonks_stub_server
+        stub.statuses['/fixtures/999'] = 404
+
+        async def run():
+            async with make_cached_client(stub) as client:
+                for _ in range(2):
+                    with pytest.raises(SportmonksNotFoundError):
+                        await client.get_fixture_by_id(999)
+
+        asyncio.run(run())
+
+        assert [path for path, _ in stub.requests] == ['/fixtures/999']
+
+    def test_concurrent_identical_requests_hit_api_once(self, mock_config, sportmonks_stub_server):
+        """Testa que requisições idênticas simultâneas viram uma só chamada à API"""
+        stub = sportmonks_stub_server
+        stub.latency = 0.1
+        stub.responses['/teams/7'] = {'data': {'id': 7}}
+
+        async def run():
+            async with make_cached_client(stub) as client:
+                results = await asyncio.gather(*[client.get_team_by_id(7) for _ in range(5)])
+                return results, client.single_flight.followers
+
+        results, followers = asyncio.run(run())
+
+        assert results == [{'id': 7}] * 5
+        assert followers == 4
+        assert len(stub.requests) == 1
+
+    def test_stale_served_while_refreshing(self, mock_config, sportmonks_stub_server):
+        """Testa que a entrada vencida é devolvida na hora e atualizada em uma task"""
+        stub = sportmonks_stub_server
+        stub.responses['/countries'] = {'data': 'novo'}
+
+        async def run():
+            client = make_cached_client(stub)
+            client.smart_cache.cache_api_response('/countries', {}, {'data': 'antigo'}, 'countries')
+            later = time.time() + RedisCache.TTL_MAPPING['countries'] + 1
+            with patch('bdfut.core.redis_cache.time.time', return_value=later):
+                async with client:
+                    stale = await client._make_request('/countries', {}, 'countries')
+                    await asyncio.gather(*list(client._refresh_tasks))
+                    fresh = await client._make_request('/countries', {}, 'countries')
+            return client, stale, fresh
+
+        client, stale, fresh = asyncio.run(run())
+
+        assert (stale, fresh) == ({'data': 'antigo'}, {'data': 'novo'})
+        assert (client.stale_served, client.background_refreshes) == (1, 1)
+        assert len(stub.requests) == 1
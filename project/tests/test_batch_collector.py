@@ -0,0 +1,176 @@
+"""
+Testes unitários para o pipeline do BatchCollector
+=================================================
+
+Testes da busca na API (thread produtora) em paralelo com a gravação:
+- Backpressure pela fila limitada
+- Erros da busca e da gravação chegam ao chamador
+- Parada graciosa (request_stop / KeyboardInterrupt) grava o que já foi buscado
+- Nenhum lote perdido ou duplicado
+"""
+import os
+import sys
+import threading
+import pytest
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+from etl.adaptive_batching import AdaptiveBatchSizer  # noqa: E402
+from etl.batch_collector import BatchCollector  # noqa: E402
+
+CHUNK = {'league_id': 648, 'season_id': 25184}
+
+
+def make_collector(fixture_ids, batch_size=5, queue_size=2):
+    """BatchCollector com API falsa (lotes de tamanho fixo) e gravação registrada"""
+    sizer = AdaptiveBatchSizer(initial_size=batch_size, min_size=batch_size, max_size=batch_size)
+    collector = BatchCollector('token', 'postgresql://test', batch_sizer=sizer, queue_size=queue_size)
+    collector.get_fixtures_for_batch = Mock(return_value=list(fixture_ids))
+    collector.fetched = []
+    collector.saved = []
+
+    def get_fixtures_multi(ids, includes=None):
+        collector.fetched.append(list(ids))
+        return {'data': [{'id': fixture_id} for fixture_id in ids]}
+
+    collector.api = Mock(last_error=None, last_response_bytes=0)
+    collector.api.get_fixtures_multi.side_effect = get_fixtures_multi
+    collector.save_batch_results = Mock(
+        side_effect=lambda result: collector.saved.append([f['id'] for f in result.successful_fixtures])
+    )
+    return collector
+
+
+def run_in_thread(target):
+    """Executa target em outra thread e devolve (thread, resultado)"""
+    outcome = {}
+
+    def run():
+        try:
+            outcome['value'] = target()
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+class TestBatchPipeline:
+    """Testes do pipeline busca/gravação"""
+
+    def test_no_lost_or_duplicated_batches(self):
+        """Testa que cada lote buscado é gravado uma única vez, em ordem"""
+        fixture_ids = list(range(1, 48))
+        collector = make_collector(fixture_ids)
+
+        stats = collector.process_chunk_batch(CHUNK, batch_size=100)
+
+        assert collector.saved == collector.fetched
+        assert [f for batch in collector.saved for f in batch] == fixture_ids
+        assert stats['processed'] == stats['successful'] == len(fixture_ids)
+        assert stats['api_calls'] == len(collector.fetched) == 10
+
+    def test_backpressure_when_queue_is_full(self):
+        """Testa que a busca não se adianta mais que a fila + um lote em andamento"""
+        collector = make_collector(range(1, 51), queue_size=2)
+        release = threading.Event()
+        save = collector.save_batch_results.side_effect
+
+        def slow_save(result):
+            release.wait(5)
+            save(result)
+
+        collector.save_batch_results.side_effect = slow_save
+        thread, outcome = run_in_thread(lambda: collector.process_chunk_batch(CHUNK, batch_size=100))
+
+        # Gravação bloqueada no 1º lote: 1 em gravação + 2 na fila + 1 aguardando put()
+        thread.join(0.5)
+        assert len(collector.fetched) == 4
+        assert collector.saved == []
+
+        release.set()
+        thread.join(5)
+        assert not thread.is_alive()
+        assert 'error' not in outcome
+        assert collector.saved == collector.fetched
+        assert len(collector.saved) == 10
+
+    def test_producer_error_reaches_consumer(self):
+        """Testa que erro na busca é relançado após gravar os lotes anteriores"""
+        collector = make_collector(range(1, 51))
+        process_batch = collector.process_batch
+
+        def fail_on_third(ids, includes=None):
+            if len(collector.fetched) == 2:
+                raise RuntimeError("API fora do ar")
+            return process_batch(ids, includes)
+
+        collector.process_batch = fail_on_third
+
+        with pytest.raises(RuntimeError, match="API fora do ar"):
+            collector.process_chunk_batch(CHUNK, batch_size=100)
+
+        assert len(collector.fetched) == 2
+        assert collector.saved == collector.fetched
+
+    def test_consumer_error_stops_producer(self):
+        """Testa que erro na gravação para a busca e não trava a thread produtora"""
+        collector = make_collector(range(1, 51), queue_size=1)
+        collector.save_batch_results.side_effect = RuntimeError("banco fora do ar")
+
+        thread, outcome = run_in_thread(lambda: collector.process_chunk_batch(CHUNK, batch_size=100))
+        thread.join(5)
+
+        assert not thread.is_alive()
+        assert isinstance(outcome['error'], RuntimeError)
+        # 1 em gravação + 1 na fila + 1 aguardando put(): a busca parou
+        assert len(collector.fetched) <= 3
+
+    def test_request_stop_drains_fetched_batches(self):
+        """Testa que request_stop encerra a busca e grava o que já foi buscado"""
+        collector = make_collector(range(1, 51), queue_size=2)
+        save = collector.save_batch_results.side_effect
+
+        def save_and_stop(result):
+            save(result)
+            collector.request_stop()
+
+        collector.save_batch_results.side_effect = save_and_stop
+
+        stats = collector.process_chunk_batch(CHUNK, batch_size=100)
+
+        assert 0 < len(collector.fetched) < 10
+        assert collector.saved == collector.fetched
+        assert stats['processed'] == sum(len(batch) for batch in collector.fetched)
+
+    def test_keyboard_interrupt_drains_and_reraises(self):
+        """Testa que a interrupção grava os lotes pendentes e é relançada"""
+        collector = make_collector(range(1, 51), queue_size=2)
+        save = collector.save_batch_results.side_effect
+        calls = []
+
+        def interrupt_first(result):
+            calls.append(result)
+            if len(calls) == 1:
+                raise KeyboardInterrupt
+            save(result)
+
+        collector.save_batch_results.side_effect = interrupt_first
+
+        with pytest.raises(KeyboardInterrupt):
+            collector.process_chunk_batch(CHUNK, batch_size=100)
+
+        # O lote interrompido não é gravado; os demais buscados são, uma vez cada
+        assert collector.saved == collector.fetched[1:]
+        assert len(collector.fetched) < 10
+
+    def test_closes_batch_sizer(self):
+        """Testa que o estado do lote adaptativo é persistido ao fim do chunk"""
+        collector = make_collector(range(1, 11))
+
+        with patch.object(collector.batch_sizer, 'close') as mock_close:
+            collector.process_chunk_batch(CHUNK, batch_size=100)
+
+        mock_close.assert_called_once()
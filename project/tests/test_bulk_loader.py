@@ -0,0 +1,165 @@
+"""
+Testes unitários para PostgresBulkLoader
+=======================================
+
+Testes da carga em massa via COPY:
+- Serialização no formato texto do COPY
+- Deduplicação e colunas do lote
+- Divisão em lotes
+- Integração com SupabaseClient (COPY ou fallback REST)
+"""
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, MagicMock, patch
+
+from bdfut.core.bulk_loader import PostgresBulkLoader, _copy_value, chunked
+from bdfut.core.supabase_client import SupabaseClient
+
+
+class TestCopySerialization:
+    """Testes de serialização para COPY"""
+
+    def test_copy_value_types(self):
+        """Testa conversão de tipos para o formato texto"""
+        assert _copy_value(None) == r'\N'
+        assert _copy_value(True) == 't'
+        assert _copy_value(False) == 'f'
+        assert _copy_value(42) == '42'
+        assert _copy_value(1.5) == '1.5'
+        assert _copy_value({'a': [1, 2]}) == '{"a": [1, 2]}'
+        assert _copy_value(datetime(2025, 1, 15, 20, 0)) == '2025-01-15T20:00:00'
+
+    def test_copy_value_escapes_control_characters(self):
+        """Testa escape de tab, quebra de linha e barra invertida"""
+        assert _copy_value('a\tb\nc\\d\re') == 'a\\tb\\nc\\\\d\\re'
+
+    def test_copy_buffer_fills_missing_columns_with_null(self):
+        """Testa que colunas ausentes em uma linha viram NULL"""
+        loader = PostgresBulkLoader('postgresql://test')
+        rows = [{'id': 1, 'name': 'A'}, {'id': 2}]
+
+        buffer = loader._copy_buffer(rows, loader._columns(rows))
+
+        assert buffer.getvalue() == '1\tA\n2\t\\N\n'
+
+
+class TestPostgresBulkLoader:
+    """Testes para PostgresBulkLoader"""
+
+    def test_requires_dsn(self, mock_config):
+        """Testa erro sem DATABASE_URL"""
+        with patch('bdfut.core.bulk_loader.Config.DATABASE_URL', ''):
+            with pytest.raises(ValueError):
+                PostgresBulkLoader()
+
+    def test_dedupe_keeps_last_occurrence(self):
+        """Testa que chaves de conflito repetidas mantêm a última linha"""
+        rows = [{'id': 1, 'v': 'old'}, {'id': 2, 'v': 'x'}, {'id': 1, 'v': 'new'}]
+
+        result = PostgresBulkLoader._dedupe(rows, ['id'])
+
+        assert result == [{'id': 1, 'v': 'new'}, {'id': 2, 'v': 'x'}]
+
+    def test_columns_union_in_order(self):
+        """Testa união de colunas preservando a ordem"""
+        rows = [{'id': 1, 'a': 1}, {'id': 2, 'b': 2}]
+
+        assert PostgresBulkLoader._columns(rows) == ['id', 'a', 'b']
+
+    def test_merge_overwrites_with_null_like_rest(self):
+        """Testa que NULL no lote limpa a coluna, como no upsert REST"""
+        statement = repr(PostgresBulkLoader._merge_statement(
+            None, 'fixtures', ['id', 'state', 'name'], ['id']
+        ))
+
+        assert 'COALESCE' not in statement
+        assert statement.count("SQL(' = EXCLUDED.')") == 2
+        assert "Identifier('id'), SQL(' = EXCLUDED.')" not in statement
+
+    def test_bulk_upsert_splits_in_chunks(self):
+        """Testa divisão de um gerador em lotes/transações"""
+        loader = PostgresBulkLoader('postgresql://test', chunk_size=3)
+        rows = ({'id': i} for i in range(7))
+
+        with patch.object(loader, '_load_chunk', side_effect=lambda table, chunk, conflict: len(chunk)) as mock_load:
+            total = loader.bulk_upsert('fixtures', rows, 'id')
+
+        assert total == 7
+        assert [len(call.args[1]) for call in mock_load.call_args_list] == [3, 3, 1]
+        assert mock_load.call_args.args[2] == ['id']
+
+    def test_load_chunk_rolls_back_on_error(self):
+        """Testa rollback quando o COPY falha"""
+        connection = MagicMock(closed=False)
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = Exception("boom")
+        loader = PostgresBulkLoader(connection=connection)
+
+        with pytest.raises(Exception, match="boom"):
+            loader._load_chunk('fixtures', [{'id': 1}], ['id'])
+
+        connection.rollback.assert_called_once()
+        connection.commit.assert_not_called()
+
+    def test_chunked(self):
+        """Testa agrupamento de iteráveis"""
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+class TestSupabaseBulkUpsert:
+    """Testes da carga em massa via SupabaseClient"""
+
+    def test_uses_bulk_loader_when_configured(self, mock_config):
+        """Testa que o caminho COPY é usado quando há loader"""
+        loader = Mock()
+        with patch('bdfut.core.supabase_client.create_client') as mock_create:
+            client = SupabaseClient(bulk_loader=loader)
+
+            result = client.bulk_upsert_fixtures([{'id': 10, 'league_id': 8, 'state': None}])
+
+        assert result is True
+        table, rows, conflict = loader.bulk_upsert.call_args.args
+        assert table == 'fixtures'
+        assert conflict == 'sportmonks_id'
+        rows = list(rows)
+        assert rows[0]['sportmonks_id'] == 10
+        assert 'status' not in rows[0]
+        mock_create.return_value.table.assert_not_called()
+
+    def test_rest_fallback_in_batches(self, mock_config):
+        """Testa fallback REST em lotes de Config.BATCH_SIZE sem DATABASE_URL"""
+        with patch('bdfut.core.supabase_client.create_client') as mock_create, \
+             patch('bdfut.core.supabase_client.Config.DATABASE_URL', ''), \
+             patch('bdfut.core.supabase_client.Config.BATCH_SIZE', 2):
+            mock_table = mock_create.return_value.table.return_value
+            client = SupabaseClient()
+
+            result = client.bulk_upsert_players({'id': i, 'name': f'P{i}'} for i in range(5))
+
+        assert result is True
+        assert mock_table.upsert.call_count == 3
+        assert mock_table.upsert.call_args.kwargs['on_conflict'] == 'sportmonks_id'
+
+    def test_lineups_without_player_are_skipped(self, mock_config):
+        """Testa que lineups sem player_id são ignorados"""
+        loader = Mock()
+        with patch('bdfut.core.supabase_client.create_client'):
+            client = SupabaseClient(bulk_loader=loader)
+            client.bulk_upsert_lineups([
+                {'fixture_id': 1, 'team_id': 2, 'player_id': 3},
+                {'fixture_id': 1, 'team_id': 2, 'player_id': None}
+            ])
+
+        table, rows, conflict = loader.bulk_upsert.call_args.args
+        assert table == 'match_lineups'
+        assert conflict == 'fixture_id,team_id,player_id'
+        assert len(list(rows)) == 1
+
+    def test_bulk_upsert_error_returns_false(self, mock_config):
+        """Testa tratamento de erro na carga em massa"""
+        loader = Mock()
+        loader.bulk_upsert.side_effect = Exception("connection refused")
+        with patch('bdfut.core.supabase_client.create_client'):
+            client = SupabaseClient(bulk_loader=loader)
+
+            assert client.bulk_upsert_events([{'id': 1, 'fixture_id': 2}]) is False
@@ -0,0 +1,109 @@
+"""
+Testes unitários para CacheCodec
+===============================
+
+Testes do codec binário dos valores do cache:
+- Ida e volta para todas as combinações instaladas
+- Leitura de entradas antigas em texto JSON
+- Benchmark de bytes e latência
+"""
+import json
+import pytest
+from unittest.mock import Mock, patch
+
+from bdfut.core.cache_codec import (
+    CacheCodec, HEADER_MAGIC, SERIALIZERS, COMPRESSORS, available_codecs, benchmark_codecs
+)
+from bdfut.core.redis_cache import RedisCache
+
+
+def fixture_payload(fixtures=20):
+    """Resposta no formato fixtures/multi com includes"""
+    return {'data': [
+        {'id': fixture_id, 'name': 'Flamengo vs Palmeiras',
+         'events': [{'id': fixture_id * 100 + minute, 'type_id': 14, 'minute': minute,
+                     'player_name': 'Jogador Exemplo'} for minute in range(0, 90, 3)],
+         'statistics': [{'type_id': 45, 'participant_id': 1, 'data': {'value': 55.5}}]}
+        for fixture_id in range(fixtures)
+    ]}
+
+
+class TestCacheCodec:
+    """Testes para CacheCodec"""
+
+    @pytest.mark.parametrize('codec', available_codecs(), ids=lambda codec: codec.name)
+    def test_round_trip(self, codec):
+        """Testa ida e volta em todas as combinações disponíveis"""
+        payload = fixture_payload()
+
+        data = codec.encode(payload)
+
+        assert data[0] == HEADER_MAGIC
+        assert codec.decode(data) == payload
+
+    def test_reads_legacy_json_entries(self):
+        """Testa leitura de valores gravados como texto JSON"""
+        codec = CacheCodec()
+        payload = {'data': [{'id': 1}]}
+
+        assert codec.decode(json.dumps(payload)) == payload
+        assert codec.decode(json.dumps(payload).encode()) == payload
+
+    def test_small_values_are_not_compressed(self):
+        """Testa que valores pequenos não pagam o custo da compressão"""
+        codec = CacheCodec('json', 'zlib', min_compress_bytes=1024)
+
+        assert codec.encode({'id': 1})[1] & 0x0F == COMPRESSORS['none'].id
+        assert codec.encode(fixture_payload())[1] & 0x0F == COMPRESSORS['zlib'].id
+
+    def test_decodes_entries_from_other_codecs(self):
+        """Testa que o cabeçalho define a decodificação, não a configuração atual"""
+        data = CacheCodec('json', 'zlib', min_compress_bytes=0).encode(fixture_payload(2))
+
+        assert CacheCodec('json', 'none').decode(data) == fixture_payload(2)
+
+    def test_invalid_options(self):
+        """Testa erros para codecs desconhecidos ou não instalados"""
+        with pytest.raises(ValueError):
+            CacheCodec(compression='brotli')
+
+        with patch.dict(SERIALIZERS, {'msgpack': SERIALIZERS['msgpack']._replace(available=False)}):
+            with pytest.raises(ValueError):
+                CacheCodec('msgpack')
+
+        with pytest.raises(ValueError):
+            CacheCodec().decode(bytes((HEADER_MAGIC, 0xFF)) + b'x')
+
+    def test_benchmark(self):
+        """Testa o relatório de bytes e latência por codec"""
+        codecs = [CacheCodec('json', 'none'), CacheCodec('json', 'zlib')]
+
+        rows = benchmark_codecs([fixture_payload()], codecs, repeat=1)
+
+        assert rows[0]['codec'] == 'json (texto atual)'
+        by_codec = {row['codec']: row for row in rows}
+        assert by_codec['json+zlib']['bytes'] < by_codec['json+none']['bytes'] < rows[0]['bytes']
+        assert by_codec['json+zlib']['ratio'] < 0.2
+        assert by_codec['json+zlib']['decode_ms'] >= 0
+
+
+class TestRedisCacheCodec:
+    """Testes do codec no RedisCache"""
+
+    def test_set_and_get_use_codec(self, mock_config):
+        """Testa que o Redis recebe bytes do codec e devolve o valor original"""
+        with patch('bdfut.core.redis_cache.redis.from_url') as from_url:
+            client = Mock()
+            from_url.return_value = client
+            cache = RedisCache(enable_fallback=False, codec=CacheCodec('json', 'zlib', min_compress_bytes=0))
+
+        payload = fixture_payload(5)
+        cache.set('bdfut:fixtures', payload, 'fixtures')
+
+        key, ttl, stored = client.pipeline.return_value.setex.call_args.args
+        assert (key, ttl) == ('bdfut:fixtures', cache._hard_ttl(RedisCache.TTL_MAPPING['fixtures']))
+        assert isinstance(stored, bytes) and len(stored) < len(json.dumps(payload))
+        assert cache.get_stats()['redis_bytes_written'] == len(stored)
+
+        client.get.return_value = stored
+        assert cache.get('bdfut:fixtures') == payload
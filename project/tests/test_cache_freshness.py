@@ -0,0 +1,153 @@
+"""
+Testes unitários de validade do cache
+====================================
+
+Testes de:
+- Soft TTL/hard TTL e stale-while-revalidate
+- Cache negativo (404 e respostas vazias)
+- TTL de partidas pelo estado
+"""
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from bdfut.config.config import Config
+from bdfut.core.redis_cache import RedisCache, SmartCacheManager
+from bdfut.core.sportmonks_client import SportmonksClient, SportmonksNotFoundError
+
+
+@pytest.fixture
+def redis_cache(mock_config):
+    """RedisCache com cliente Redis falso"""
+    with patch('bdfut.core.redis_cache.redis.from_url') as from_url:
+        client = Mock()
+        client.get.return_value = None
+        from_url.return_value = client
+        cache = RedisCache(max_local_cache_size=10, local_ttl=60)
+    return cache, client
+
+
+@pytest.fixture
+def local_client(mock_config):
+    """SportmonksClient com cache apenas local (Redis indisponível)"""
+    with patch('bdfut.core.redis_cache.redis.from_url', side_effect=Exception("sem Redis")):
+        return SportmonksClient(enable_cache=True, rate_limiter=Mock())
+
+
+def api_response(data, status_code=200):
+    response = Mock(status_code=status_code, headers={})
+    response.json.return_value = data
+    return response
+
+
+class TestSoftTTL:
+    """Testes do envelope com validade"""
+
+    def test_entry_becomes_stale_but_is_still_served(self, redis_cache):
+        """Testa que após o soft TTL o valor continua disponível, marcado como vencido"""
+        cache, _ = redis_cache
+        cache.redis_available = False
+        cache.set('bdfut:k', {'data': 1}, 'countries', ttl=10)
+
+        assert cache.get_entry('bdfut:k')[:2] == ({'data': 1}, True)
+        with patch('bdfut.core.redis_cache.time.time', return_value=time.time() + 11):
+            assert cache.get_entry('bdfut:k')[:2] == ({'data': 1}, False)
+            assert cache.get('bdfut:k') == {'data': 1}
+        assert cache.get_stats()['stale_hits'] == 2
+
+    def test_redis_key_expires_at_hard_ttl(self, redis_cache):
+        """Testa que a chave no Redis vive TTL x CACHE_STALE_TTL_FACTOR"""
+        cache, client = redis_cache
+        cache.set('bdfut:k', {'data': 1}, 'countries', ttl=100)
+
+        _, ttl, stored = client.pipeline.return_value.setex.call_args.args
+        assert ttl == int(100 * Config.CACHE_STALE_TTL_FACTOR)
+        assert cache.codec.decode(stored)['value'] == {'data': 1}
+
+    def test_legacy_values_are_fresh(self, redis_cache):
+        """Testa que valores gravados sem envelope são lidos como frescos"""
+        cache, client = redis_cache
+        client.get.return_value = cache.codec.encode({'data': 'antigo'})
+
+        assert cache.get_entry('bdfut:old')[:2] == ({'data': 'antigo'}, True)
+
+    def test_stale_redis_value_not_copied_to_local_tier(self, redis_cache):
+        """Testa que o L1 não guarda valores vencidos lidos do Redis"""
+        cache, client = redis_cache
+        client.get.return_value = cache.codec.encode(cache._wrap({'data': 1}, -1))
+
+        assert cache.get_entry('bdfut:k').fresh is False
+        assert 'bdfut:k' not in cache.local_cache
+
+
+class TestFixtureStateTTL:
+    """Testes do TTL de partidas pelo estado"""
+
+    def test_ttl_by_state(self, mock_config):
+        """Testa encerradas, ao vivo, prestes a começar e futuras"""
+        now = time.time()
+        assert SmartCacheManager.fixture_ttl({'state_id': 5}) == Config.CACHE_FINISHED_FIXTURE_TTL
+        assert SmartCacheManager.fixture_ttl({'state': {'id': 22}}) == Config.CACHE_LIVE_FIXTURE_TTL
+        assert SmartCacheManager.fixture_ttl(
+            {'state_id': 1, 'starting_at_timestamp': now + 600}) == Config.CACHE_UPCOMING_FIXTURE_TTL
+        assert SmartCacheManager.fixture_ttl(
+            {'state_id': 1, 'starting_at_timestamp': now + 86400}) == RedisCache.TTL_MAPPING['fixtures']
+        assert SmartCacheManager.fixture_ttl({'id': 1}) is None
+
+    def test_response_ttl(self, redis_cache):
+        """Testa menor validade entre as partidas e cache negativo de respostas vazias"""
+        manager = SmartCacheManager(redis_cache[0])
+        fixtures = {'data': [{'id': 1, 'state_id': 5}, {'id': 2, 'state_id': 2}]}
+
+        assert manager.response_ttl('/fixtures/multi/1,2', fixtures) == Config.CACHE_LIVE_FIXTURE_TTL
+        assert manager.response_ttl('/fixtures/1', {'data': {'id': 1, 'state_id': 5}}) == \
+            Config.CACHE_FINISHED_FIXTURE_TTL
+        assert manager.response_ttl('/teams/1', {'data': {'id': 1}}, 'teams') == RedisCache.TTL_MAPPING['teams']
+        assert manager.response_ttl('/fixtures/date/2025-01-01', {'data': []}) == Config.CACHE_NEGATIVE_TTL
+
+
+class TestSportmonksClientFreshness:
+    """Testes de stale-while-revalidate e cache negativo no SportmonksClient"""
+
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_stale_served_while_refreshing(self, mock_get, local_client):
+        """Testa que a entrada vencida é devolvida na hora e atualizada em segundo plano"""
+        mock_get.return_value = api_response({'data': 'novo'})
+        local_client.smart_cache.cache_api_response('/countries', {}, {'data': 'antigo'}, 'countries')
+
+        later = time.time() + RedisCache.TTL_MAPPING['countries'] + 1
+        with patch('bdfut.core.redis_cache.time.time', return_value=later):
+            assert local_client._make_request('/countries', {}, 'countries') == {'data': 'antigo'}
+            local_client._refresh_executor.shutdown(wait=True)
+
+            assert mock_get.call_count == 1
+            assert local_client.background_refreshes == 1
+            assert local_client._make_request('/countries', {}, 'countries') == {'data': 'novo'}
+        assert mock_get.call_count == 1
+        assert local_client.get_cache_stats()['client_stale_served'] == 1
+
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_core_endpoint_refreshed_on_core_base_url(self, mock_get, local_client):
+        """Testa que a atualização em segundo plano de /states usa a base core"""
+        mock_get.return_value = api_response({'data': ['novo']})
+        local_client.smart_cache.cache_api_response('/states', {}, {'data': ['antigo']})
+
+        later = time.time() + RedisCache.TTL_MAPPING['default'] + 1
+        with patch('bdfut.core.redis_cache.time.time', return_value=later):
+            assert local_client.get_states() == ['antigo']
+            local_client._refresh_executor.shutdown(wait=True)
+
+            assert mock_get.call_args.args[0] == f"{SportmonksClient.CORE_BASE_URL}/states"
+            assert local_client.get_states() == ['novo']
+        assert local_client.base_url == Config.SPORTMONKS_BASE_URL
+
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_not_found_is_cached_without_retry(self, mock_get, local_client):
+        """Testa que o 404 não é repetido e fica em cache negativo"""
+        mock_get.return_value = api_response({'message': 'No result(s) found'}, status_code=404)
+
+        for _ in range(2):
+            with pytest.raises(SportmonksNotFoundError):
+                local_client._make_request('/players/999', {}, 'players')
+
+        assert mock_get.call_count == 1
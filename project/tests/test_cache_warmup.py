@@ -0,0 +1,142 @@
+"""
+Testes unitários para CacheWarmupPlanner
+=======================================
+
+Testes do aquecimento preditivo do cache:
+- Pré-carga de dados estáticos
+- Partidas das próximas horas via fixtures/multi
+- Times e escalações derivados das partidas
+- Limite de requisições
+- Período da sincronização incremental servido pelo cache aquecido
+"""
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+
+from bdfut.core.cache_warmup import CacheWarmupPlanner
+from bdfut.core.incremental_sync import IncrementalSyncManager
+from bdfut.core.redis_cache import SmartCacheManager
+from bdfut.core.sportmonks_client import SportmonksClient
+
+
+@pytest.fixture
+def client(mock_config):
+    """SportmonksClient com cache apenas local (Redis indisponível)"""
+    with patch('bdfut.core.redis_cache.redis.from_url', side_effect=Exception("sem Redis")):
+        return SportmonksClient(enable_cache=True, rate_limiter=Mock())
+
+
+def fixture(fixture_id):
+    return {
+        'id': fixture_id, 'state_id': 1, 'name': f'Partida {fixture_id}',
+        'participants': [{'id': fixture_id * 10, 'name': 'Time', 'meta': {'location': 'home'}}],
+        'lineups': [{'player_id': 1}] if fixture_id % 2 else []
+    }
+
+
+def multi_response(url, params):
+    ids = url.rsplit('/', 1)[-1].split(',')
+    response = Mock(status_code=200, headers={})
+    response.json.return_value = {'data': [fixture(int(fixture_id)) for fixture_id in ids]}
+    return response
+
+
+def page_response(url, params):
+    response = Mock(status_code=200, headers={})
+    response.json.return_value = {'data': [fixture(1)], 'pagination': {'has_more': False}}
+    return response
+
+
+def supabase_with(fixture_ids):
+    supabase = Mock()
+    supabase.get_upcoming_fixtures.return_value = [{'sportmonks_id': i} for i in fixture_ids]
+    return supabase
+
+
+class TestSmartCacheWarmUp:
+    """Testes para SmartCacheManager.warm_up_cache"""
+
+    def test_runs_loaders_for_preload_entities(self, mock_config):
+        """Testa contagem por entidade, erro como -1 e entidades sem loader ignoradas"""
+        manager = SmartCacheManager(Mock())
+        failing = Mock(side_effect=Exception("API fora do ar"))
+
+        stats = manager.warm_up_cache(loaders={'countries': lambda: [1, 2], 'states': failing})
+
+        assert stats == {'countries': 2, 'states': -1}
+
+
+class TestCacheWarmupPlanner:
+    """Testes para CacheWarmupPlanner"""
+
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_prefetch_in_multi_batches(self, mock_get, client):
+        """Testa partidas em lotes de 100 e leituras seguintes servidas pelo cache"""
+        mock_get.side_effect = multi_response
+        planner = CacheWarmupPlanner(client, supabase_with(range(1, 151)), include='participants;lineups')
+
+        stats = planner.prefetch_fixtures(planner.upcoming_fixture_ids())
+
+        assert mock_get.call_count == 2
+        assert all('/fixtures/multi/' in call.args[0] for call in mock_get.call_args_list)
+        assert stats == {'fixtures': 150, 'teams': 150, 'lineups': 75}
+
+        assert client.get_fixture_by_id(7, include='participants;lineups')['id'] == 7
+        assert client.get_team_by_id(70) == {'id': 70, 'name': 'Time'}
+        assert client.get_lineups_by_fixture(7) == [{'player_id': 1}]
+        assert mock_get.call_count == 2
+
+        planner.prefetch_fixtures(list(range(1, 151)))
+        assert mock_get.call_count == 2
+
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_request_limit(self, mock_get, client):
+        """Testa que a janela é cortada em max_requests lotes, das partidas mais próximas"""
+        mock_get.side_effect = multi_response
+        planner = CacheWarmupPlanner(client, supabase_with(range(1, 251)), max_requests=1)
+
+        assert planner.upcoming_fixture_ids() == list(range(1, 251))
+        assert planner.prefetch_fixtures(list(range(1, 251)))['fixtures'] == 100
+        assert mock_get.call_count == 1
+
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_skipped_when_rate_budget_is_low(self, mock_get, client):
+        """Testa que o aquecimento não consome as últimas requisições da hora"""
+        client.rate_limit_remaining = 10
+
+        assert CacheWarmupPlanner(client).prefetch_fixtures([1, 2]) == {'fixtures': 0, 'teams': 0, 'lineups': 0}
+        mock_get.assert_not_called()
+
+    def test_run_requires_redis_cache(self, mock_config):
+        """Testa que sem cache o aquecimento não faz requisições"""
+        client = SportmonksClient(enable_cache=False, rate_limiter=Mock())
+
+        assert 'error' in CacheWarmupPlanner(client, Mock()).run()
+
+
+class TestSyncWarmUp:
+    """Testes do aquecimento do período lido pela sincronização incremental"""
+
+    @patch('bdfut.core.incremental_sync.ETLJobContext', MagicMock())
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_warmed_window_is_read_by_sync(self, mock_get, client):
+        """Testa que sync_recent_fixtures lê do cache o período aquecido"""
+        mock_get.side_effect = page_response
+        manager = IncrementalSyncManager.__new__(IncrementalSyncManager)
+        manager.sportmonks = client
+        manager.supabase = supabase_with([])
+        manager.content_hashes = Mock()
+        manager.metadata_manager = Mock()
+        manager.get_last_sync_timestamp = Mock(return_value=None)
+        manager._process_fixtures_batch = Mock(return_value={
+            'processed': 1, 'inserted': 0, 'updated': 1, 'unchanged': 0, 'errors': 0
+        })
+
+        assert manager.warm_up_cache()['sync_fixtures'] == 1
+        warmed = [call.args[0] for call in mock_get.call_args_list]
+        assert any('/fixtures/between/' in url for url in warmed)
+
+        stats = manager.sync_recent_fixtures()
+
+        assert stats['fixtures_found'] == 1
+        assert mock_get.call_count == len(warmed)
+        assert manager._process_fixtures_batch.call_args.args[0] == [fixture(1)]
@@ -0,0 +1,137 @@
+"""
+Testes unitários para ContentHashStore
+=====================================
+
+Testes da detecção de registros inalterados:
+- Hash do payload normalizado
+- Diff/commit em memória e no Redis
+- Upsert pulado na sincronização incremental
+- Requisições condicionais (ETag/If-None-Match)
+"""
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from bdfut.core.content_hash import ContentHashStore
+from bdfut.core.incremental_sync import IncrementalSyncManager
+from bdfut.core.redis_cache import RedisCache
+from bdfut.core.sportmonks_client import SportmonksClient
+from bdfut.core.write_buffer import FixtureWriteBuffer
+
+
+def fixtures(*scores):
+    return [{'id': i, 'state_id': 5, 'scores': score} for i, score in enumerate(scores, start=1)]
+
+
+class TestContentHashStore:
+    """Testes para ContentHashStore"""
+
+    def test_hash_ignores_key_order(self, mock_config):
+        """Testa que a ordem das chaves não altera o hash"""
+        assert ContentHashStore.content_hash({'a': 1, 'b': [1, 2]}) == \
+            ContentHashStore.content_hash({'b': [1, 2], 'a': 1})
+        assert ContentHashStore.content_hash({'a': 1}) != ContentHashStore.content_hash({'a': 2})
+
+    def test_diff_and_commit(self, mock_config):
+        """Testa novos, alterados e inalterados após o commit"""
+        store = ContentHashStore()
+        first = store.diff('fixtures', fixtures(0, 0))
+        assert (len(first.changed), len(first.unchanged)) == (2, 0)
+        store.commit('fixtures', first.hashes)
+
+        second = store.diff('fixtures', fixtures(0, 1) + [{'name': 'sem id'}])
+        assert [item.get('id') for item in second.changed] == [2, None]
+        assert [item['id'] for item in second.unchanged] == [1]
+        assert list(second.hashes) == ['2']
+
+        assert len(store.diff('fixtures', fixtures(0, 1), force=True).changed) == 2
+
+    def test_redis_backend(self, mock_config):
+        """Testa HMGET na leitura e HSET + EXPIRE em pipeline no commit"""
+        redis_cache = Mock(redis_available=True)
+        client = redis_cache.redis_client
+        stored = ContentHashStore.content_hash(fixtures(0)[0])
+        client.hmget.return_value = [stored.encode(), None]
+        store = ContentHashStore(redis_cache, ttl=60)
+
+        diff = store.diff('fixtures', fixtures(0, 0))
+
+        client.hmget.assert_called_once_with('bdfut:content:fixtures', ['1', '2'])
+        assert [item['id'] for item in diff.unchanged] == [1]
+
+        store.commit('fixtures', diff.hashes)
+        pipe = client.pipeline.return_value
+        pipe.hset.assert_called_once_with('bdfut:content:fixtures', mapping=diff.hashes)
+        pipe.expire.assert_called_once_with('bdfut:content:fixtures', 60)
+
+
+class TestIncrementalSyncSkipsUnchanged:
+    """Testes do upsert pulado para fixtures inalteradas"""
+
+    @pytest.fixture
+    def manager(self, mock_config):
+        manager = IncrementalSyncManager.__new__(IncrementalSyncManager)
+        manager.supabase = Mock()
+        manager.supabase.upsert_fixtures.return_value = True
+        manager.content_hashes = ContentHashStore()
+        return manager
+
+    def test_second_run_skips_unchanged(self, manager):
+        """Testa que apenas a fixture alterada é gravada na segunda execução"""
+        pending = {}
+        stats = manager._process_fixtures_batch(fixtures(0, 0), Mock(), Mock(), pending)
+        assert (stats['updated'], stats['unchanged']) == (2, 0)
+        manager.content_hashes.commit('fixtures', pending)
+
+        stats = manager._process_fixtures_batch(fixtures(0, 3), Mock(), Mock(), {})
+
+        assert (stats['processed'], stats['updated'], stats['unchanged']) == (2, 1, 1)
+        assert manager.supabase.upsert_fixtures.call_args.args[0] == [fixtures(0, 3)[1]]
+
+    def test_hashes_not_committed_when_upsert_fails(self, manager):
+        """Testa que uma gravação com falha é repetida na próxima execução"""
+        manager.supabase.upsert_fixtures.return_value = False
+        manager._process_fixtures_batch(fixtures(0), Mock())
+
+        manager.supabase.upsert_fixtures.return_value = True
+        assert manager._process_fixtures_batch(fixtures(0), Mock())['updated'] == 1
+
+    def test_hashes_skip_fixtures_of_failed_auto_flush(self, manager):
+        """Testa que fixtures de um flush automático com falha não têm o hash gravado"""
+        manager.supabase.replace_fixture_participants.side_effect = [False, True]
+        buffer = FixtureWriteBuffer(manager.supabase, max_rows=2, max_age_seconds=60)
+        participants = [{'id': 10, 'meta': {'location': 'home'}}, {'id': 11, 'meta': {'location': 'away'}}]
+        pending = {}
+
+        manager._process_fixtures_batch([dict(f, participants=participants) for f in fixtures(0, 0)],
+                                        Mock(), buffer, pending)
+
+        assert buffer.flush() is True
+        assert buffer.failed_keys == {1}
+        assert set(pending) == {'1', '2'}
+        assert set(manager._written_hashes(pending, buffer)) == {'2'}
+
+
+class TestConditionalRequests:
+    """Testes de ETag/If-None-Match na revalidação do cache"""
+
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_not_modified_renews_stale_entry(self, mock_get, mock_config):
+        """Testa que a revalidação envia If-None-Match e um 304 reaproveita o corpo"""
+        with patch('bdfut.core.redis_cache.redis.from_url', side_effect=Exception("sem Redis")):
+            client = SportmonksClient(enable_cache=True, rate_limiter=Mock())
+        first = Mock(status_code=200, headers={'ETag': '"v1"'})
+        first.json.return_value = {'data': {'id': 1}}
+        mock_get.side_effect = [first, Mock(status_code=304, headers={})]
+
+        client._make_request('/teams/1', {}, 'teams')
+
+        later = time.time() + RedisCache.TTL_MAPPING['teams'] + 1
+        with patch('bdfut.core.redis_cache.time.time', return_value=later):
+            assert client._make_request('/teams/1', {}, 'teams') == {'data': {'id': 1}}
+            client._refresh_executor.shutdown(wait=True)
+
+            assert mock_get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
+            assert client.not_modified == 1
+            entry = client.smart_cache.get_cached_api_entry('/teams/1', {}, 'teams')
+            assert entry == ({'data': {'id': 1}}, True, {'etag': '"v1"'})
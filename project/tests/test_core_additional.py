@@ -400,8 +400,8 @@ class TestETLProcessAdditional:
             mock_supabase_instance.upsert_venues.return_value = True
             mock_supabase_instance.upsert_referees.return_value = True
             mock_supabase_instance.upsert_fixtures.return_value = True
-            mock_supabase_instance.upsert_fixture_participants.return_value = True
-            mock_supabase_instance.upsert_fixture_events.return_value = True
+            mock_supabase_instance.replace_fixture_participants.return_value = True
+            mock_supabase_instance.upsert_fixture_events_batch.return_value = True
             
             etl = ETLProcess()
             result = etl.sync_fixtures_by_date_range('2025-01-15', '2025-01-15', include_details=True)
@@ -412,8 +412,8 @@ class TestETLProcessAdditional:
             mock_supabase_instance.upsert_venues.assert_called_once()
             mock_supabase_instance.upsert_referees.assert_called_once()
             mock_supabase_instance.upsert_fixtures.assert_called_once()
-            mock_supabase_instance.upsert_fixture_participants.assert_called_once()
-            mock_supabase_instance.upsert_fixture_events.assert_called_once()
+            mock_supabase_instance.replace_fixture_participants.assert_called_once()
+            mock_supabase_instance.upsert_fixture_events_batch.assert_called_once()
 
 
 class TestConfigValidation:
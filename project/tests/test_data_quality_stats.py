@@ -0,0 +1,254 @@
+"""
+Testes unitários para as estatísticas de qualidade do DataQualityManager
+======================================================================
+
+Testes das verificações baseadas na RPC data_quality_stats:
+- Uma chamada para todas as tabelas
+- Nulos, duplicatas e órfãos a partir das estatísticas
+- Colunas inexistentes e fallback sem a função no banco
+- Execução incremental por marca d'água e rebaseline
+- Reavaliação das regras com falha em aberto
+"""
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from bdfut.config.config import Config
+from bdfut.core.data_quality import DataQualityManager, QualityCheckResult, QualityCheckSeverity
+
+
+FIXTURE_STATS = {
+    'total': 1000,
+    'nulls': {'id': 0, 'name': 3, 'starting_at': 0, 'league_id': 0},
+    'duplicates': {'id': 2},
+    'orphans': {'league_id': 0, 'season_id': 7, 'venue_id': 0},
+    'missing_columns': ['season_id'],
+    'missing_references': ['state_id']
+}
+
+
+@pytest.fixture
+def manager(mock_config):
+    manager = DataQualityManager.__new__(DataQualityManager)
+    manager.supabase = Mock()
+    manager.metadata_manager = Mock()
+    manager.metadata_manager.start_job.return_value = None
+    return manager
+
+
+def by_name(result):
+    return {check.check_name: check for check in result['checks']}
+
+
+class TestQualityStats:
+    """Testes para DataQualityManager com data_quality_stats"""
+
+    def test_single_rpc_for_all_tables(self, manager):
+        """Testa que a execução completa faz uma única chamada RPC com as regras"""
+        rpc = manager.supabase.client.rpc
+        rpc.return_value.execute.return_value.data = {
+            'fixtures': FIXTURE_STATS,
+            'fixture_events': {'total': 0, 'nulls': {}, 'duplicates': {}, 'orphans': {}}
+        }
+
+        report = manager.run_all_quality_checks(tables=['fixtures', 'fixture_events'])
+
+        rpc.assert_called_once()
+        name, params = rpc.call_args.args
+        assert name == 'data_quality_stats'
+        assert set(params['p_rules']) == {'fixtures', 'fixture_events'}
+        assert {'column': 'league_id', 'table': 'leagues', 'field': 'id'} in \
+            params['p_rules']['fixtures']['referential_integrity']
+        assert {call.args[0] for call in manager.supabase.client.table.call_args_list} == {'data_quality_state'}
+        assert report['tables_checked'] == 2
+
+    def test_checks_from_stats(self, manager):
+        """Testa nulos, duplicatas, órfãos e colunas inexistentes"""
+        checks = by_name(manager.check_table_quality('fixtures', FIXTURE_STATS))
+
+        assert checks['required_field_id'].passed
+        assert not checks['required_field_name'].passed
+        assert checks['required_field_name'].affected_records == 3
+        assert checks['required_field_name'].total_records == 1000
+        assert checks['required_field_season_id'].details['error'] == 'missing_column'
+        assert checks['unique_field_id'].affected_records == 2
+        assert checks['referential_integrity_league_id'].passed
+        assert checks['referential_integrity_season_id'].affected_records == 7
+        assert checks['referential_integrity_state_id'].details['error'] == 'missing_reference'
+
+    def test_fallback_without_rpc(self, manager):
+        """Testa contagem de nulos pela API (total uma vez) e demais regras não verificadas"""
+        manager.supabase.client.rpc.side_effect = Exception("function data_quality_stats does not exist")
+        table = manager.supabase.client.table.return_value
+        query = table.select.return_value
+        query.limit.return_value.execute.return_value.count = 50
+        query.is_.return_value.limit.return_value.execute.return_value.count = 1
+
+        checks = by_name(manager.check_table_quality('venues'))
+
+        assert query.is_.call_args_list[0].args == ('id', 'null')
+        assert query.limit.call_count == 1
+        assert checks['required_field_name'].affected_records == 1
+        assert checks['required_field_name'].total_records == 50
+        assert checks['unique_field_id'].passed
+        assert checks['unique_field_id'].severity == QualityCheckSeverity.WARNING
+        assert checks['referential_integrity_country_id'].details['status'] == 'not_checked'
+
+    def test_not_checked_excluded_from_score(self, manager):
+        """Testa que regras não executadas não contam como aprovadas no score"""
+        manager.supabase.client.rpc.side_effect = Exception("function data_quality_stats does not exist")
+        query = manager.supabase.client.table.return_value.select.return_value
+        query.limit.return_value.execute.return_value.count = 50
+        query.is_.return_value.limit.return_value.execute.return_value.count = 1
+        manager._run_custom_checks = Mock(return_value=[])
+
+        result = manager.check_table_quality('venues')
+        report = manager.run_all_quality_checks(tables=['venues'])
+
+        assert (result['total_checks'], result['passed_checks'], result['not_checked']) == (2, 0, 2)
+        assert result['score'] == 0.0
+        assert (report['total_checks'], report['passed_checks'], report['not_checked']) == (2, 0, 2)
+        assert report['overall_score'] == 0.0
+
+
+def check(name, passed=True, affected=0, total=10):
+    return QualityCheckResult(name, 'fixtures', QualityCheckSeverity.INFO, passed, '', {},
+                              affected_records=affected, total_records=total)
+
+
+class TestIncrementalQualityChecks:
+    """Testes das verificações incrementais por marca d'água"""
+
+    NOW = datetime(2026, 10, 17, 12, 0)
+
+    def state(self, last_full_days_ago=1, now=NOW):
+        return {
+            'table_name': 'fixtures',
+            'watermark': '2026-10-16T00:00:00+00:00',
+            'rule_totals': {'required_field_id': {'rows_checked': 100, 'affected': 0}},
+            'last_full_run_at': (now - timedelta(days=last_full_days_ago)).isoformat()
+        }
+
+    def test_since_only_for_recent_baselines(self, manager):
+        """Testa marca d'água enviada só para tabelas com rebaseline dentro do prazo"""
+        old = self.state(last_full_days_ago=Config.DATA_QUALITY_REBASELINE_DAYS + 1)
+        since = manager._incremental_since({'fixtures': self.state(), 'seasons': {**old, 'table_name': 'seasons'},
+                                            'venues': {'table_name': 'venues', 'watermark': None}}, self.NOW)
+
+        assert since == {'fixtures': '2026-10-16T00:00:00+00:00'}
+        payload = manager._rules_payload(['fixtures', 'seasons'], since)
+        assert payload['fixtures']['since'] == '2026-10-16T00:00:00+00:00'
+        assert payload['fixtures']['watermark_column'] == 'updated_at'
+        assert payload['seasons']['since'] is None
+
+    def test_passing_increment_advances_and_accumulates(self, manager):
+        """Testa marca d'água avançada e totais somados por regra"""
+        stats = {'incremental': True, 'max_watermark': '2026-10-17T11:00:00+00:00'}
+
+        state = manager._next_quality_state('fixtures', stats, [check('required_field_id', total=5)],
+                                            self.state(), 'job-id', self.NOW)
+
+        assert state['watermark'] == '2026-10-17T11:00:00+00:00'
+        assert state['rule_totals']['required_field_id'] == {'rows_checked': 105, 'affected': 0}
+        assert state['last_full_run_at'] == self.state()['last_full_run_at']
+        assert state['last_job_id'] == 'job-id'
+
+    def test_failing_increment_advances_and_marks_rule(self, manager):
+        """Testa que a marca d'água avança e a regra com falha fica em aberto desde a janela"""
+        stats = {'incremental': True, 'max_watermark': '2026-10-17T11:00:00+00:00'}
+        since = self.state()['watermark']
+
+        state = manager._next_quality_state('fixtures', stats,
+                                            [check('unique_field_id', passed=False, affected=1, total=5)],
+                                            self.state(), 'job-id', self.NOW, since)
+
+        assert state['watermark'] == '2026-10-17T11:00:00+00:00'
+        assert state['rule_totals']['unique_field_id'] == {'rows_checked': 5, 'affected': 1, 'failing_since': since}
+        assert manager._recheck_since({'fixtures': state}, {'fixtures': state['watermark']}) == {'fixtures': since}
+
+    def test_totals_only_for_scoped_executed_rules(self, manager):
+        """Testa que customizadas, não implementadas e não verificadas ficam fora dos totais"""
+        stats = {'incremental': True, 'max_watermark': '2026-10-17T11:00:00+00:00'}
+        not_checked = manager._not_checked('referential_integrity_venue_id', 'fixtures', {})
+        checks = [check('required_field_id', total=5), check('fixtures_have_participants', total=15752),
+                  check('valid_dates'), not_checked]
+
+        state = manager._next_quality_state('fixtures', stats, checks, self.state(), 'job-id', self.NOW)
+
+        assert set(state['rule_totals']) == {'required_field_id'}
+
+    def test_full_run_rebaselines(self, manager):
+        """Testa que a varredura completa recomeça totais e marca d'água (falha reavaliada na tabela inteira)"""
+        stats = {'incremental': False, 'max_watermark': '2026-10-17T11:30:00+00:00'}
+
+        state = manager._next_quality_state('fixtures', stats,
+                                            [check('unique_field_id', passed=False, affected=2, total=1000)],
+                                            self.state(), 'job-id', self.NOW)
+
+        assert state['rule_totals'] == {'unique_field_id': {'rows_checked': 1000, 'affected': 2, 'failing_since': None}}
+        assert state['last_full_run_at'] == self.NOW.isoformat()
+        assert state['watermark'] == '2026-10-17T11:30:00+00:00'
+
+    def test_incremental_run_saves_state(self, manager):
+        """Testa a execução incremental: since no RPC e estado gravado com um upsert"""
+        state_table = manager.supabase.client.table.return_value
+        state_table.select.return_value.in_.return_value.execute.return_value.data = [self.state(now=datetime.now())]
+        stats = {**FIXTURE_STATS, 'nulls': {'id': 0, 'name': 0, 'starting_at': 0, 'league_id': 0, 'season_id': 0},
+                 'duplicates': {'id': 0}, 'orphans': {'league_id': 0, 'season_id': 0, 'venue_id': 0, 'state_id': 0},
+                 'missing_columns': [], 'missing_references': [],
+                 'incremental': True, 'max_watermark': '2026-10-17T11:00:00+00:00', 'total': 20}
+        manager.supabase.client.rpc.return_value.execute.return_value.data = {'fixtures': stats}
+
+        report = manager.run_all_quality_checks(tables=['fixtures'], incremental=True)
+
+        manager.supabase.client.rpc.assert_called_once()
+        rules = manager.supabase.client.rpc.call_args.args[1]['p_rules']
+        assert rules['fixtures']['since'] == '2026-10-16T00:00:00+00:00'
+        assert report['incremental_tables'] == ['fixtures']
+        saved = state_table.upsert.call_args.args[0]
+        assert saved[0]['watermark'] == '2026-10-17T11:00:00+00:00'
+        assert saved[0]['rule_totals']['required_field_id'] == {'rows_checked': 120, 'affected': 0}
+        assert not any(name.startswith(('fixtures_have', 'valid_', 'no_future')) for name in saved[0]['rule_totals'])
+
+    def run_with_open_failure(self, manager, recheck_duplicates):
+        """Execução incremental com unique_field_id em aberto desde 2026-10-15"""
+        previous = self.state(now=datetime.now())
+        previous['rule_totals']['unique_field_id'] = {'rows_checked': 50, 'affected': 1,
+                                                      'failing_since': '2026-10-15T00:00:00+00:00'}
+        state_table = manager.supabase.client.table.return_value
+        state_table.select.return_value.in_.return_value.execute.return_value.data = [previous]
+        base = {'nulls': {'id': 0, 'name': 0, 'starting_at': 0, 'league_id': 0, 'season_id': 0},
+                'orphans': {'league_id': 0, 'season_id': 0, 'venue_id': 0, 'state_id': 0},
+                'incremental': True, 'max_watermark': '2026-10-17T11:00:00+00:00'}
+        window = {**base, 'total': 20, 'duplicates': {'id': 0}}
+        recheck = {**base, 'total': 70, 'duplicates': {'id': recheck_duplicates}}
+        manager.supabase.client.rpc.return_value.execute.side_effect = [
+            Mock(data={'fixtures': window}), Mock(data={'fixtures': recheck})
+        ]
+
+        report = manager.run_all_quality_checks(tables=['fixtures'], incremental=True)
+
+        return report, state_table.upsert.call_args.args[0][0]
+
+    def test_open_failure_rechecked_since_it_failed(self, manager):
+        """Testa reavaliação à parte: falha continua em aberto e aparece no relatório"""
+        report, saved = self.run_with_open_failure(manager, recheck_duplicates=1)
+
+        rpc_calls = manager.supabase.client.rpc.call_args_list
+        assert len(rpc_calls) == 2
+        recheck_rules = rpc_calls[1].args[1]['p_rules']
+        assert set(recheck_rules) == {'fixtures'}
+        assert recheck_rules['fixtures']['since'] == '2026-10-15T00:00:00+00:00'
+        assert saved['watermark'] == '2026-10-17T11:00:00+00:00'
+        assert saved['rule_totals']['unique_field_id'] == {'rows_checked': 70, 'affected': 1,
+                                                           'failing_since': '2026-10-15T00:00:00+00:00'}
+        unique = by_name(report['table_results']['fixtures'])['unique_field_id']
+        assert not unique.passed
+        assert unique.details['recheck_since'] == '2026-10-15T00:00:00+00:00'
+
+    def test_open_failure_closed_when_recheck_passes(self, manager):
+        """Testa que a falha sai de aberto quando a reavaliação passa"""
+        report, saved = self.run_with_open_failure(manager, recheck_duplicates=0)
+
+        assert 'failing_since' not in saved['rule_totals']['unique_field_id']
+        assert by_name(report['table_results']['fixtures'])['unique_field_id'].passed
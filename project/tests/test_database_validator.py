@@ -0,0 +1,126 @@
+"""
+Testes unitários para DatabaseValidator
+======================================
+
+Testes da execução das validações:
+- Contagens no servidor (count=exact/head), sem transferir linhas
+- Verificações simultâneas com tempo limite individual
+- Duração de cada verificação no resumo
+- Execuções em event loops diferentes (asyncio.run repetido)
+"""
+import time
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+
+from bdfut.tools.database_validator import DatabaseValidator, ValidationResult
+
+
+@pytest.fixture
+def validator(mock_config):
+    with patch('bdfut.tools.database_validator.create_client') as create_client:
+        create_client.return_value = Mock()
+        validator = DatabaseValidator(database_url='', concurrency=4, check_timeout=5)
+    return validator
+
+
+def execute_sql(query):
+    if 'information_schema' in query:
+        return [{'column_name': 'fixture_id'}]
+    if 'total_fixtures' in query:
+        return [{'total_fixtures': 10, 'with_name': 10, 'with_scores': 9, 'with_events': 5,
+                 'with_lineups': 5, 'with_statistics': 5}]
+    return [{'count': 0}]
+
+
+def setup_rpc(validator, delay=0.0):
+    def rpc(name, params=None):
+        call = Mock()
+
+        def execute():
+            time.sleep(delay)
+            data = execute_sql(params['query']) if name == 'execute_sql' else [{'count': 0}]
+            return Mock(data=data)
+        call.execute.side_effect = execute
+        return call
+    validator.supabase.rpc.side_effect = rpc
+
+
+class TestDatabaseValidator:
+    """Testes para DatabaseValidator"""
+
+    def test_counts_use_head_requests(self, validator):
+        """Testa que as contagens pedem count=exact/head e leem apenas .count"""
+        query = validator.supabase.table.return_value.select.return_value
+        query.is_.return_value.execute.return_value = Mock(count=3, data=[])
+
+        result = asyncio.run(validator._check_orphan_leagues())
+
+        validator.supabase.table.return_value.select.assert_called_once_with('*', count='exact', head=True)
+        assert result.status == 'FAIL'
+        assert result.count == 3
+
+    def test_checks_run_concurrently_with_timings(self, validator):
+        """Testa que as consultas bloqueantes rodam em paralelo e cada resultado tem duração"""
+        setup_rpc(validator, delay=0.2)
+        query = validator.supabase.table.return_value.select.return_value
+        query.is_.return_value.execute.return_value = Mock(count=0)
+        query.or_.return_value.execute.return_value = Mock(count=0)
+
+        start = time.perf_counter()
+        summary = asyncio.run(validator.run_all_validations())
+        elapsed = time.perf_counter() - start
+
+        # 6 consultas de 0,2s com 4 simultâneas: duas rodadas em vez de seis
+        assert elapsed < 0.8
+        assert summary['backend'] == 'supabase'
+        assert summary['total_validations'] == 9
+        assert summary['failed'] == 0
+        assert all(result['duration_ms'] is not None for result in summary['results'])
+        assert [result['type'] for result in summary['results']][:4] == [
+            'orphan_leagues', 'missing_teams', 'date_consistency', 'negative_scores'
+        ]
+
+    def test_timeout_and_errors_are_reported_per_check(self, validator):
+        """Testa que uma verificação lenta ou com erro não derruba as demais"""
+        validator.check_timeout = 0.05
+
+        async def slow():
+            await asyncio.sleep(1)
+
+        async def broken():
+            raise RuntimeError("function execute_sql does not exist")
+
+        async def ok():
+            return ValidationResult('fixtures', 'api_consistency', 'PASS', 'ok')
+
+        validator._check_data_completeness = slow
+        validator._check_fixtures_leagues = broken
+        validator._check_api_consistency = ok
+        validator.CHECKS = {'test': [
+            ('fixtures', 'data_completeness', '_check_data_completeness'),
+            ('fixtures→leagues', 'foreign_key', '_check_fixtures_leagues'),
+            ('fixtures', 'api_consistency', '_check_api_consistency'),
+        ]}
+
+        results = asyncio.run(validator._run_groups(['test']))
+
+        assert [r.status for r in results] == ['WARNING', 'FAIL', 'PASS']
+        assert results[0].details == {'error': 'timeout'}
+        assert 'execute_sql' in results[1].message
+        assert results[0].duration_ms < 1000
+
+    def test_runs_in_separate_event_loops(self, validator):
+        """Testa que o limite de simultaneidade não fica preso ao loop da primeira execução"""
+        async def ok():
+            await asyncio.sleep(0.01)
+            return ValidationResult('fixtures', 'api_consistency', 'PASS', 'ok')
+
+        validator._check_api_consistency = ok
+        validator.CHECKS = {'test': [('fixtures', 'api_consistency', '_check_api_consistency')] * 6}
+
+        for _ in range(2):
+            asyncio.run(validator._run_groups(['test']))
+
+        # 6 verificações com 4 vagas: há espera pelo semáforo nas duas execuções
+        assert [r.status for r in validator.results] == ['PASS'] * 12
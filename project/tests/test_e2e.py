@@ -178,8 +178,8 @@ class TestE2ECompleteWorkflows:
             mock_supabase_instance.upsert_venues.return_value = True
             mock_supabase_instance.upsert_teams.return_value = True
             mock_supabase_instance.upsert_fixtures.return_value = True
-            mock_supabase_instance.upsert_fixture_participants.return_value = True
-            mock_supabase_instance.upsert_fixture_events.return_value = True
+            mock_supabase_instance.replace_fixture_participants.return_value = True
+            mock_supabase_instance.upsert_fixture_events_batch.return_value = True
             
             # WORKFLOW COMPLETO: Sincronização de liga
             etl = ETLProcess()
@@ -210,8 +210,8 @@ class TestE2ECompleteWorkflows:
             # Verificar sincronização de fixtures
             mock_sportmonks_instance.get_fixtures_by_date_range.assert_called()
             mock_supabase_instance.upsert_fixtures.assert_called()
-            mock_supabase_instance.upsert_fixture_participants.assert_called()
-            mock_supabase_instance.upsert_fixture_events.assert_called()
+            mock_supabase_instance.replace_fixture_participants.assert_called()
+            mock_supabase_instance.upsert_fixture_events_batch.assert_called()
             
             # Validar dados processados
             fixtures_call = mock_supabase_instance.upsert_fixtures.call_args[0][0]
@@ -219,8 +219,9 @@ class TestE2ECompleteWorkflows:
             assert fixtures_call[0]['name'] == 'Palmeiras vs Flamengo'
             assert fixtures_call[1]['name'] == 'São Paulo vs Corinthians'
             
-            events_calls = mock_supabase_instance.upsert_fixture_events.call_args_list
-            assert len(events_calls) == 2  # 2 fixtures
+            # Eventos das 2 fixtures gravados em um único lote
+            events_rows = mock_supabase_instance.upsert_fixture_events_batch.call_args[0][0]
+            assert {e['fixture_id'] for e in events_rows} == {1, 2}
             
             print("✅ Workflow de sincronização de liga completo executado")
     
@@ -287,8 +288,8 @@ class TestE2ECompleteWorkflows:
             # Mock todos os upserts
             mock_supabase_instance.upsert_venues.return_value = True
             mock_supabase_instance.upsert_fixtures.return_value = True
-            mock_supabase_instance.upsert_fixture_participants.return_value = True
-            mock_supabase_instance.upsert_fixture_events.return_value = True
+            mock_supabase_instance.replace_fixture_participants.return_value = True
+            mock_supabase_instance.upsert_fixture_events_batch.return_value = True
             
             # WORKFLOW: Atualização diária automática
             etl = ETLProcess()
@@ -475,7 +476,7 @@ class TestE2EPerformanceScenarios:
             assert total_time < 1.0
             
             # Verificar rate limiting foi respeitado
-            assert len(client.request_timestamps) == 5
+            assert client.requests_made == 5
             
             print(f"✅ 5 operações concorrentes em {total_time:.2f}s")
 
@@ -554,8 +555,8 @@ class TestE2ERealWorldScenarios:
             mock_supabase_instance.upsert_venues.return_value = True
             mock_supabase_instance.upsert_referees.return_value = True
             mock_supabase_instance.upsert_fixtures.return_value = True
-            mock_supabase_instance.upsert_fixture_participants.return_value = True
-            mock_supabase_instance.upsert_fixture_events.return_value = True
+            mock_supabase_instance.replace_fixture_participants.return_value = True
+            mock_supabase_instance.upsert_fixture_events_batch.return_value = True
             
             # WORKFLOW: Processamento de dia de jogos
             etl = ETLProcess()
@@ -586,15 +587,12 @@ class TestE2ERealWorldScenarios:
             assert len(fixtures_call) == 3
             
             # Verificar eventos processados
-            events_calls = mock_supabase_instance.upsert_fixture_events.call_args_list
-            assert len(events_calls) == 3  # 3 fixtures
-            
-            # Contar total de eventos
-            total_events = 0
-            for call in events_calls:
-                events_data = call[0][1]  # segundo argumento (events)
-                total_events += len(events_data)
+            # Eventos das 3 fixtures gravados em um único lote
+            mock_supabase_instance.upsert_fixture_events_batch.assert_called_once()
+            events_rows = mock_supabase_instance.upsert_fixture_events_batch.call_args[0][0]
+            assert len({e['fixture_id'] for e in events_rows}) == 3
             
+            total_events = len(events_rows)
             assert total_events == 9  # 3 + 3 + 3 eventos
             
             print("✅ Dia completo de Premier League processado (3 jogos, 9 eventos)")
@@ -650,8 +648,8 @@ class TestE2ERealWorldScenarios:
             mock_supabase_instance.upsert_venues.return_value = True
             mock_supabase_instance.upsert_referees.return_value = True
             mock_supabase_instance.upsert_fixtures.return_value = True
-            mock_supabase_instance.upsert_fixture_participants.return_value = True
-            mock_supabase_instance.upsert_fixture_events.return_value = True
+            mock_supabase_instance.replace_fixture_participants.return_value = True
+            mock_supabase_instance.upsert_fixture_events_batch.return_value = True
             
             # WORKFLOW: Processamento da final
             etl = ETLProcess()
@@ -681,7 +679,7 @@ class TestE2ERealWorldScenarios:
             assert 'Final Copa Libertadores' in final_fixture['name']
             
             # Verificar eventos detalhados
-            events_call = mock_supabase_instance.upsert_fixture_events.call_args[0][1]
+            events_call = mock_supabase_instance.upsert_fixture_events_batch.call_args[0][0]
             assert len(events_call) == 9
             
             # Verificar tipos de eventos
@@ -805,7 +803,7 @@ class TestE2EDataValidation:
                         assert len(referee['date_of_birth']) == 10  # YYYY-MM-DD
                 return True
             
-            def validate_and_upsert_events(fixture_id, events):
+            def validate_and_upsert_events(events):
                 # Validar eventos
                 for event in events:
                     assert 'id' in event
@@ -823,8 +821,8 @@ class TestE2EDataValidation:
             mock_supabase_instance.upsert_venues.side_effect = validate_and_upsert_venues
             mock_supabase_instance.upsert_referees.side_effect = validate_and_upsert_referees
             mock_supabase_instance.upsert_fixtures.return_value = True
-            mock_supabase_instance.upsert_fixture_participants.return_value = True
-            mock_supabase_instance.upsert_fixture_events.side_effect = validate_and_upsert_events
+            mock_supabase_instance.replace_fixture_participants.return_value = True
+            mock_supabase_instance.upsert_fixture_events_batch.side_effect = validate_and_upsert_events
             
             # WORKFLOW: Processamento com validação
             etl = ETLProcess()
@@ -838,8 +836,8 @@ class TestE2EDataValidation:
             mock_supabase_instance.upsert_venues.assert_called_once()
             mock_supabase_instance.upsert_referees.assert_called_once()
             mock_supabase_instance.upsert_fixtures.assert_called_once()
-            mock_supabase_instance.upsert_fixture_participants.assert_called_once()
-            mock_supabase_instance.upsert_fixture_events.assert_called_once()
+            mock_supabase_instance.replace_fixture_participants.assert_called_once()
+            mock_supabase_instance.upsert_fixture_events_batch.assert_called_once()
             
             # Verificar dados específicos
             venues_call = mock_supabase_instance.upsert_venues.call_args[0][0]
@@ -854,7 +852,7 @@ class TestE2EDataValidation:
             assert referee['country_id'] == 2
             assert referee['date_of_birth'] == '1977-03-12'
             
-            events_call = mock_supabase_instance.upsert_fixture_events.call_args[0][1]
+            events_call = mock_supabase_instance.upsert_fixture_events_batch.call_args[0][0]
             assert len(events_call) == 3
             
             # Verificar consistência dos gols
@@ -0,0 +1,186 @@
+"""
+Testes unitários para EnrichmentEngine
+=====================================
+
+Testes do motor de enriquecimento de partidas:
+- Lotes de até 100 IDs no endpoint fixtures/multi
+- Transformação por destino e filtro de dados existentes
+- Gravação em massa e estatísticas por etapa
+- Acesso serializado ao índice de presença e erros do gerador de lotes
+"""
+import time
+import pytest
+from unittest.mock import Mock
+
+from bdfut.core.enrichment import EnrichmentEngine, StageStats, ENRICHMENT_TARGETS
+
+
+def make_fixture(fixture_id):
+    return {
+        'id': fixture_id,
+        'events': [{'id': fixture_id * 10 + 1, 'type_id': 14, 'minute': 10},
+                   {'id': fixture_id * 10 + 2, 'type_id': 19, 'minute': 55}],
+        'lineups': [{'team_id': 1, 'player_id': 100, 'player_name': 'A'},
+                    {'team_id': 1, 'player_id': None}],
+        'statistics': [{'id': fixture_id * 100, 'participant_id': 1, 'type_id': 45, 'data': {'value': 55}}],
+        'referees': [{'id': fixture_id * 1000, 'referee_id': 7, 'type_id': 6}]
+    }
+
+
+def make_engine(targets=('events', 'lineups', 'stats'), present=None, **kwargs):
+    """Motor com clientes falsos; present = {tipo: {fixture_ids}} já existentes no banco"""
+    sportmonks = Mock()
+    sportmonks.get_fixtures_multi.side_effect = lambda ids, include: {
+        'data': [make_fixture(int(fixture_id)) for fixture_id in ids.split(',')]
+    }
+    supabase = Mock()
+    supabase.bulk_upsert.return_value = True
+
+    state_index = Mock()
+    present = present or {}
+    state_index.has.side_effect = lambda fixture_id, kind: fixture_id in present.get(kind, set())
+
+    engine = EnrichmentEngine(sportmonks, supabase, targets=targets, state_index=state_index, **kwargs)
+    return engine, sportmonks, supabase, state_index
+
+
+class TestEnrichmentEngine:
+    """Testes para EnrichmentEngine"""
+
+    def test_batches_capped_at_multi_limit(self, mock_config):
+        """Testa que lotes nunca excedem 100 IDs por chamada"""
+        engine, sportmonks, _, _ = make_engine(batch_size=500)
+
+        result = engine.run(range(1, 251))
+
+        sizes = [len(call.args[0].split(',')) for call in sportmonks.get_fixtures_multi.call_args_list]
+        assert sizes == [100, 100, 50]
+        assert sportmonks.get_fixtures_multi.call_args.args[1] == 'events;lineups;statistics'
+        assert result['fixtures_fetched'] == 250
+        assert result['success'] is True
+
+    def test_rows_per_target(self, mock_config):
+        """Testa mapeamento dos includes para as tabelas de destino"""
+        engine, _, supabase, state_index = make_engine(
+            targets=['events', 'lineups', 'stats', 'referees'], batch_size=10
+        )
+
+        result = engine.run([1, 2])
+
+        calls = {call.args[0]: call.args for call in supabase.bulk_upsert.call_args_list}
+        table, events, conflict = calls['match_events']
+        assert conflict == 'id'
+        assert [(e['id'], e['fixture_id']) for e in events] == [(11, 1), (12, 1), (21, 2), (22, 2)]
+        # Lineups sem player_id são descartados
+        assert len(calls['match_lineups'][1]) == 2
+        assert calls['match_lineups'][2] == 'fixture_id,team_id,player_id'
+        assert calls['match_statistics'][1][0]['data'] == {'value': 55}
+        assert calls['match_referees'][1][0] == {'id': 1000, 'fixture_id': 1, 'referee_id': 7, 'type_id': 6}
+        assert result['rows_loaded'] == 4 + 2 + 2 + 2
+        state_index.load.assert_called_once_with([1, 2])
+        state_index.mark_present.assert_any_call(2, 'events')
+
+    def test_skips_existing_data(self, mock_config):
+        """Testa que partidas com dados existentes não são regravadas"""
+        engine, _, supabase, _ = make_engine(targets=['events', 'lineups'], present={'events': {1}})
+
+        engine.run([1, 2])
+
+        calls = {call.args[0]: call.args[1] for call in supabase.bulk_upsert.call_args_list}
+        assert {e['fixture_id'] for e in calls['match_events']} == {2}
+        assert {l['fixture_id'] for l in calls['match_lineups']} == {1, 2}
+
+    def test_force_ignores_existing(self, mock_config):
+        """Testa skip_existing=False"""
+        engine, _, supabase, state_index = make_engine(
+            targets=['events'], present={'events': {1}}, skip_existing=False
+        )
+
+        engine.run([1])
+
+        assert len(supabase.bulk_upsert.call_args.args[1]) == 2
+        state_index.load.assert_not_called()
+
+    def test_fetch_error_does_not_stop_pipeline(self, mock_config):
+        """Testa que erro em um lote não interrompe os seguintes"""
+        engine, sportmonks, supabase, _ = make_engine(targets=['events'], batch_size=1)
+        responses = [Exception("timeout"), {'data': [make_fixture(2)]}]
+        sportmonks.get_fixtures_multi.side_effect = responses
+
+        result = engine.run([1, 2])
+
+        assert result['success'] is False
+        assert result['stages']['fetch']['errors'] == 1
+        assert result['fixtures_fetched'] == 1
+        supabase.bulk_upsert.assert_called_once()
+
+    def test_state_index_access_is_serialized(self, mock_config):
+        """Testa que transformação e gravação não usam o índice ao mesmo tempo"""
+        engine, _, _, state_index = make_engine(targets=['events'], batch_size=1)
+        active, overlaps = [], []
+
+        def access(*args):
+            active.append(args)
+            if len(active) > 1:
+                overlaps.append(args)
+            time.sleep(0.002)
+            active.remove(args)
+
+        state_index.load.side_effect = access
+        state_index.mark_present.side_effect = access
+
+        engine.run(range(1, 31))
+
+        assert state_index.mark_present.call_count == 30
+        assert overlaps == []
+
+    def test_batch_generator_error_is_raised(self, mock_config):
+        """Testa que a falha do gerador de IDs interrompe a execução com erro"""
+        engine, _, supabase, _ = make_engine(targets=['events'], batch_size=1)
+
+        def fixture_ids():
+            yield 1
+            raise ConnectionError("cursor de partidas interrompido")
+
+        with pytest.raises(ConnectionError):
+            engine.run(fixture_ids())
+
+        supabase.bulk_upsert.assert_called_once()
+
+    def test_load_failure_is_reported(self, mock_config):
+        """Testa contagem de falhas de gravação"""
+        engine, _, supabase, state_index = make_engine(targets=['events'])
+        supabase.bulk_upsert.return_value = False
+
+        result = engine.run([1])
+
+        assert result['rows_loaded'] == 0
+        assert result['stages']['load']['errors'] == 1
+        state_index.mark_present.assert_not_called()
+
+    def test_unknown_target(self, mock_config):
+        """Testa erro para destino desconhecido"""
+        with pytest.raises(ValueError):
+            EnrichmentEngine(Mock(), Mock(), targets=['odds'])
+
+    def test_targets_match_state_index_kinds(self):
+        """Testa que todo destino pode ser consultado no índice de presença"""
+        from bdfut.core.enrichment_index import EnrichmentStateIndex
+
+        assert set(ENRICHMENT_TARGETS) == set(EnrichmentStateIndex.TABLES)
+        for name, target in ENRICHMENT_TARGETS.items():
+            assert target.table == EnrichmentStateIndex.TABLES[name]
+
+
+class TestStageStats:
+    """Testes para StageStats"""
+
+    def test_throughput(self):
+        """Testa cálculo de vazão"""
+        stats = StageStats('load')
+        stats.record(100, 0.5)
+        stats.record(50, 0.5)
+
+        assert stats.throughput == 150
+        assert stats.to_dict()['batches'] == 2
+        assert StageStats('fetch').throughput == 0.0
@@ -0,0 +1,112 @@
+"""
+Testes unitários para EnrichmentStateIndex
+=========================================
+
+Testes do índice de presença de dados de enriquecimento:
+- Carga por lote via RPC
+- Fallback com consulta por tabela paginada
+- Cache em memória entre lotes
+"""
+import pytest
+from unittest.mock import Mock
+
+from bdfut.core.enrichment_index import EnrichmentStateIndex
+
+
+def make_supabase(rpc_rows=None, rpc_error=None, table_rows=None):
+    """SupabaseClient falso com respostas de rpc() e table().select().in_().order().range()"""
+    supabase = Mock()
+    client = supabase.client
+
+    if rpc_error:
+        client.rpc.return_value.execute.side_effect = rpc_error
+    else:
+        client.rpc.return_value.execute.return_value = Mock(data=rpc_rows or [])
+
+    table_rows = table_rows or {}
+
+    def table(name):
+        rows = table_rows.get(name, [])
+        query = Mock()
+
+        def select_range(start, end):
+            result = Mock()
+            result.execute.return_value = Mock(data=rows[start:end + 1])
+            return result
+
+        ordered = query.select.return_value.in_.return_value.order
+        ordered.return_value.range.side_effect = select_range
+        # Paginar sem ordem estável pode pular ou repetir linhas
+        ordered.side_effect = lambda column: ordered.return_value if column == 'fixture_id' else Mock()
+        return query
+
+    client.table.side_effect = table
+    return supabase
+
+
+class TestEnrichmentStateIndex:
+    """Testes para EnrichmentStateIndex"""
+
+    def test_load_uses_single_rpc_per_batch(self):
+        """Testa que o lote inteiro é resolvido com uma chamada RPC"""
+        supabase = make_supabase(rpc_rows=[
+            {'fixture_id': 1, 'has_events': True, 'has_lineups': False, 'has_stats': True,
+             'has_referees': False, 'has_periods': False},
+            {'fixture_id': 2, 'has_events': False, 'has_lineups': False, 'has_stats': False,
+             'has_referees': True, 'has_periods': True}
+        ])
+        index = EnrichmentStateIndex(supabase)
+
+        index.load([1, 2, 2])
+
+        supabase.client.rpc.assert_called_once_with('fixture_enrichment_presence', {'p_fixture_ids': [1, 2]})
+        assert index.fixtures_with('events', [1, 2]) == {1}
+        assert index.fixtures_missing('periods', [1, 2]) == {1}
+        assert index.state(2) == {
+            'has_events': False, 'has_lineups': False, 'has_stats': False,
+            'has_referees': True, 'has_periods': True
+        }
+        assert index.queries == 1
+
+    def test_known_fixtures_are_not_reloaded(self):
+        """Testa que partidas já carregadas não geram nova consulta"""
+        supabase = make_supabase(rpc_rows=[])
+        index = EnrichmentStateIndex(supabase)
+
+        index.load([1, 2])
+        index.load([2, 1])
+        assert index.has(1, 'events') is False
+
+        assert supabase.client.rpc.call_count == 1
+
+    def test_fallback_per_table_when_rpc_missing(self):
+        """Testa consulta por tabela quando a função RPC não existe"""
+        supabase = make_supabase(
+            rpc_error=Exception("function fixture_enrichment_presence does not exist"),
+            table_rows={'match_events': [{'fixture_id': 1}, {'fixture_id': 1}, {'fixture_id': 3}]}
+        )
+        index = EnrichmentStateIndex(supabase, kinds=['events', 'lineups', 'stats'], page_size=2)
+
+        index.load([1, 2, 3])
+        index.load([4])
+
+        assert index.fixtures_with('events', [1, 2, 3]) == {1, 3}
+        assert index.fixtures_with('lineups', [1, 2, 3]) == set()
+        # RPC não é tentada novamente após falhar
+        assert supabase.client.rpc.call_count == 1
+        # Por lote: match_events paginado (2 páginas) + 1 página para cada outra tabela
+        assert index.queries == 1 + 4 + 4
+
+    def test_mark_present(self):
+        """Testa registro de dados recém-inseridos"""
+        index = EnrichmentStateIndex(make_supabase(rpc_rows=[]))
+        index.load([5])
+
+        index.mark_present(5, 'lineups')
+
+        assert index.has(5, 'lineups') is True
+
+    def test_unknown_kind(self):
+        """Testa erro para tipo de enriquecimento desconhecido"""
+        with pytest.raises(ValueError):
+            EnrichmentStateIndex(Mock(), kinds=['events', 'odds'])
@@ -8,7 +8,7 @@ import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta
 
-from bdfut.core.etl_metadata import ETLMetadataManager, ETLJobContext
+from bdfut.core.etl_metadata import ETLMetadataManager, ETLMetadataWriter, ETLJobContext
 
 
 class TestETLMetadataManager:
@@ -318,9 +318,11 @@ class TestETLJobContext:
         ) as job:
             job.log("INFO", "Test message", component="test")
         
-        mock_manager.log_job.assert_called_once_with(
-            "test-job-id", "INFO", "Test message", {"component": "test"}
-        )
+        mock_manager.log_job.assert_not_called()
+        mock_manager.insert_job_logs.assert_called_once_with([{
+            'job_id': "test-job-id", 'log_level': "INFO", 'message': "Test message",
+            'details': {"component": "test"}, 'component': None, 'function_name': None
+        }])
     
     def test_checkpoint_method(self, mock_config):
         """Testa método de checkpoint"""
@@ -333,12 +335,19 @@ class TestETLJobContext:
             job_type="base_data",
             metadata_manager=mock_manager
         ) as job:
-            checkpoint_id = job.checkpoint("test_checkpoint", {"step": 1}, progress_percentage=50.0)
+            job.checkpoint("test_checkpoint", {"step": 1}, progress_percentage=50.0)
         
-        assert checkpoint_id == "checkpoint-id"
-        mock_manager.create_checkpoint.assert_called_once_with(
-            "test-job-id", "test_checkpoint", {"step": 1}, progress_percentage=50.0
-        )
+        mock_manager.create_checkpoint.assert_not_called()
+        rows = mock_manager.write_checkpoints.call_args.args[0]
+        assert len(rows) == 1
+        assert rows[0]['job_id'] == "test-job-id"
+        assert rows[0]['checkpoint_name'] == "test_checkpoint"
+        assert rows[0]['checkpoint_data'] == {"step": 1}
+        assert rows[0]['progress_percentage'] == 50.0
+        
+        # Checkpoints gravados antes da finalização do job
+        names = [name for name, _, _ in mock_manager.method_calls]
+        assert names.index('write_checkpoints') < names.index('complete_job')
     
     def test_increment_methods(self, mock_config):
         """Testa métodos de incremento"""
@@ -363,3 +372,110 @@ class TestETLJobContext:
             assert job.records_inserted == 8
             assert job.records_updated == 2
             assert job.records_failed == 1
+
+
+class TestETLMetadataWriter:
+    """Testes para ETLMetadataWriter"""
+    
+    def test_logs_written_in_batches(self, mock_config):
+        """Testa que os logs enfileirados são gravados em inserts de até batch_size linhas"""
+        manager = Mock()
+        manager.insert_job_logs.return_value = True
+        writer = ETLMetadataWriter(manager, batch_size=100, flush_interval=60)
+        
+        for i in range(250):
+            writer.log("job-id", "info", f"fixture {i}")
+        writer.close()
+        
+        batches = [call.args[0] for call in manager.insert_job_logs.call_args_list]
+        assert sum(len(batch) for batch in batches) == 250
+        assert max(len(batch) for batch in batches) <= 100
+        assert batches[0][0]['log_level'] == "INFO"
+        assert writer.stats['logs_written'] == 250
+    
+    def test_checkpoints_coalesced_by_name(self, mock_config):
+        """Testa que apenas o checkpoint mais recente de cada nome é gravado"""
+        manager = Mock()
+        manager.write_checkpoints.return_value = True
+        writer = ETLMetadataWriter(manager, flush_interval=60)
+        
+        for i in range(50):
+            writer.checkpoint("job-id", "progress", {"batch": i}, items_processed=i)
+        writer.checkpoint("job-id", "started", {})
+        writer.close()
+        
+        manager.write_checkpoints.assert_called_once()
+        rows = {row['checkpoint_name']: row for row in manager.write_checkpoints.call_args.args[0]}
+        assert rows['progress']['checkpoint_data'] == {"batch": 49}
+        assert set(rows) == {"progress", "started"}
+        assert writer.stats['checkpoints_coalesced'] == 49
+    
+    def test_write_failure_is_counted(self, mock_config):
+        """Testa que erro de gravação não derruba a thread"""
+        manager = Mock()
+        manager.insert_job_logs.side_effect = [Exception("Supabase fora do ar"), True]
+        writer = ETLMetadataWriter(manager, flush_interval=60)
+        
+        writer.log("job-id", "ERROR", "primeiro")
+        assert writer.flush(timeout=5)
+        writer.log("job-id", "INFO", "segundo")
+        writer.close()
+        
+        assert writer.stats['logs_failed'] == 1
+        assert writer.stats['logs_written'] == 1
+
+
+class TestETLMetadataManagerBatchWrites:
+    """Testes das gravações em lote do ETLMetadataManager"""
+    
+    def test_write_checkpoints_two_calls(self, mock_config):
+        """Testa um update de desativação e um insert para vários checkpoints"""
+        with patch('bdfut.core.etl_metadata.create_client') as mock_create:
+            mock_table = mock_create.return_value.table.return_value
+            manager = ETLMetadataManager()
+            rows = [ETLMetadataManager._checkpoint_row("job-id", name, {}) for name in ("a", "b")]
+            
+            assert manager.write_checkpoints(rows) is True
+            
+            mock_table.update.assert_called_once_with({'is_active': False})
+            mock_table.update.return_value.eq.return_value.in_.assert_called_once_with('checkpoint_name', ["a", "b"])
+            mock_table.insert.assert_called_once_with(rows)
+    
+    def test_write_checkpoints_retries_row_by_row(self, mock_config):
+        """Testa que uma linha recusada não descarta os demais checkpoints do lote"""
+        with patch('bdfut.core.etl_metadata.create_client') as mock_create:
+            mock_table = mock_create.return_value.table.return_value
+            manager = ETLMetadataManager()
+            rows = [ETLMetadataManager._checkpoint_row("job-id", name, {}) for name in ("a", "b", "c")]
+            mock_table.insert.return_value.execute.side_effect = [Exception("lote recusado"), None,
+                                                                  Exception("linha inválida"), None]
+            
+            assert manager.write_checkpoints(rows) is False
+            
+            assert mock_table.insert.call_args_list[1:] == [((row,),) for row in rows]
+    
+    def test_checkpoint_row_is_json_safe(self, mock_config):
+        """Testa que datetime e objetos do checkpoint viram texto ao enfileirar"""
+        started = datetime(2026, 10, 17, 12, 0)
+        data = {'start_time': started, 'results': [object()], 'total': 3}
+        
+        row = ETLMetadataManager._checkpoint_row("job-id", "report", data)
+        data['total'] = 4
+        
+        assert row['checkpoint_data']['start_time'] == str(started)
+        assert isinstance(row['checkpoint_data']['results'][0], str)
+        assert row['checkpoint_data']['total'] == 3
+    
+    def test_complete_job_uses_known_start(self, mock_config):
+        """Testa que a duração de um job iniciado pelo gerenciador não relê etl_jobs"""
+        with patch('bdfut.core.etl_metadata.create_client') as mock_create:
+            mock_table = mock_create.return_value.table.return_value
+            mock_table.insert.return_value.execute.return_value.data = [{'id': 'job-id'}]
+            mock_table.update.return_value.eq.return_value.execute.return_value.data = [{'id': 'job-id'}]
+            manager = ETLMetadataManager()
+            
+            manager.start_job("test_job", "base_data")
+            assert manager.complete_job("job-id") is True
+            
+            mock_table.select.assert_not_called()
+            assert mock_table.update.call_args_list[0].args[0]['duration_seconds'] == 0
@@ -163,8 +163,8 @@ class TestETLProcessSimple:
             # Mock dos upserts
             mock_supabase_instance.upsert_venues.return_value = True
             mock_supabase_instance.upsert_fixtures.return_value = True
-            mock_supabase_instance.upsert_fixture_participants.return_value = True
-            mock_supabase_instance.upsert_fixture_events.return_value = True
+            mock_supabase_instance.replace_fixture_participants.return_value = True
+            mock_supabase_instance.upsert_fixture_events_batch.return_value = True
             
             etl = ETLProcess()
             result = etl.sync_fixtures_by_date_range('2025-01-15', '2025-01-15', include_details=True)
@@ -173,8 +173,15 @@ class TestETLProcessSimple:
             mock_sportmonks_instance.get_fixtures_by_date_range.assert_called_once()
             mock_supabase_instance.upsert_venues.assert_called_once()
             mock_supabase_instance.upsert_fixtures.assert_called_once()
-            mock_supabase_instance.upsert_fixture_participants.assert_called_once()
-            mock_supabase_instance.upsert_fixture_events.assert_called_once()
+            # Participantes e eventos gravados em lote pelo buffer write-behind
+            participants_rows = mock_supabase_instance.replace_fixture_participants.call_args[0][0]
+            assert [(r['fixture_id'], r['team_id'], r['position']) for r in participants_rows] == [
+                (1, 1, 'home'), (1, 2, 'away')
+            ]
+            events_rows = mock_supabase_instance.upsert_fixture_events_batch.call_args[0][0]
+            assert [(r['id'], r['fixture_id']) for r in events_rows] == [(1, 1)]
+            mock_supabase_instance.upsert_fixture_participants.assert_not_called()
+            mock_supabase_instance.upsert_fixture_events.assert_not_called()
     
     def test_sync_recent_fixtures_success(self, mock_config):
         """Testa sincronização de partidas recentes com sucesso"""
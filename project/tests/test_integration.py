@@ -200,8 +200,8 @@ class TestETLIntegrationFlows:
             mock_supabase_instance.upsert_venues.return_value = True
             mock_supabase_instance.upsert_referees.return_value = True
             mock_supabase_instance.upsert_fixtures.return_value = True
-            mock_supabase_instance.upsert_fixture_participants.return_value = True
-            mock_supabase_instance.upsert_fixture_events.return_value = True
+            mock_supabase_instance.replace_fixture_participants.return_value = True
+            mock_supabase_instance.upsert_fixture_events_batch.return_value = True
             
             # Executar fluxo completo
             etl = ETLProcess()
@@ -214,15 +214,15 @@ class TestETLIntegrationFlows:
             mock_supabase_instance.upsert_venues.assert_called_once()
             mock_supabase_instance.upsert_referees.assert_called_once()
             mock_supabase_instance.upsert_fixtures.assert_called_once()
-            mock_supabase_instance.upsert_fixture_participants.assert_called_once()
-            mock_supabase_instance.upsert_fixture_events.assert_called_once()
+            mock_supabase_instance.replace_fixture_participants.assert_called_once()
+            mock_supabase_instance.upsert_fixture_events_batch.assert_called_once()
             
             # Verificar dados processados
             venues_call = mock_supabase_instance.upsert_venues.call_args[0][0]
             assert len(venues_call) == 1
             assert venues_call[0]['name'] == 'Allianz Parque'
             
-            events_call = mock_supabase_instance.upsert_fixture_events.call_args[0][1]
+            events_call = mock_supabase_instance.upsert_fixture_events_batch.call_args[0][0]
             assert len(events_call) == 2
             assert events_call[0]['player_name'] == 'Dudu'
             assert events_call[1]['player_name'] == 'Gabigol'
@@ -310,7 +310,7 @@ class TestCacheAndRateLimitingIntegration:
             assert mock_get.call_count == 5
             
             # Verificar que rate limiting foi aplicado
-            assert len(client.request_timestamps) == 5
+            assert client.requests_made == 5
             
             # Verificar que sleep foi chamado para controlar rate limit
             assert mock_sleep.called
@@ -0,0 +1,284 @@
+"""
+Testes unitários para LocalLRUCache e a camada L1 do RedisCache
+==============================================================
+
+Testes do cache local em memória:
+- Ordem LRU e limites de entradas/bytes
+- Expiração por entrada
+- Consulta ao L1 antes do Redis
+- Invalidação por tags
+- Leitura/gravação em lote
+"""
+import json
+import pytest
+from unittest.mock import Mock, patch
+
+from bdfut.core.local_cache import LocalLRUCache
+from bdfut.core.redis_cache import RedisCache, SmartCacheManager
+from bdfut.config.config import Config
+
+
+class TestLocalLRUCache:
+    """Testes para LocalLRUCache"""
+
+    def test_evicts_least_recently_used(self):
+        """Testa remoção da entrada menos usada recentemente"""
+        cache = LocalLRUCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.evictions == 1
+
+    def test_byte_limit(self):
+        """Testa limite em bytes e rejeição de valores maiores que o limite"""
+        value = 'x' * 100
+        size = LocalLRUCache.estimate_size(value)
+        cache = LocalLRUCache(max_entries=100, max_bytes=size * 2)
+
+        for key in ('a', 'b', 'c'):
+            cache.set(key, value)
+
+        assert len(cache) == 2
+        assert cache.size_bytes == size * 2
+        assert 'a' not in cache
+        assert cache.set('big', 'x' * 1000) is False
+        assert cache.get_stats()['rejected'] == 1
+
+    def test_per_entry_ttl(self):
+        """Testa expiração armazenada com cada entrada"""
+        cache = LocalLRUCache()
+        with patch('bdfut.core.local_cache.time.monotonic', return_value=1000.0):
+            cache.set('short', 1, ttl=10)
+            cache.set('long', 2, ttl=100)
+
+        with patch('bdfut.core.local_cache.time.monotonic', return_value=1050.0):
+            assert cache.get('short') is None
+            assert cache.get('long') == 2
+
+        assert cache.expirations == 1
+        assert cache.size_bytes == LocalLRUCache.estimate_size(2)
+
+    def test_overwrite_updates_size(self):
+        """Testa que sobrescrever uma chave não acumula bytes"""
+        cache = LocalLRUCache()
+        cache.set('a', 'x' * 50)
+        cache.set('a', 'y')
+
+        assert len(cache) == 1
+        assert cache.size_bytes == LocalLRUCache.estimate_size('y')
+
+    def test_stats(self):
+        """Testa contadores de hit, miss e eviction"""
+        cache = LocalLRUCache(max_entries=1)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('b')
+        cache.set('b', 2)
+
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 1, 1)
+        assert stats['hit_rate'] == 0.5
+
+
+@pytest.fixture
+def redis_cache(mock_config):
+    """RedisCache com cliente Redis falso"""
+    with patch('bdfut.core.redis_cache.redis.from_url') as from_url:
+        client = Mock()
+        client.get.return_value = None
+        from_url.return_value = client
+        cache = RedisCache(max_local_cache_size=10, local_ttl=60)
+    return cache, client
+
+
+class TestRedisCacheLocalTier:
+    """Testes para a camada L1 do RedisCache"""
+
+    def test_local_tier_checked_before_redis(self, redis_cache):
+        """Testa que um hit local não consulta o Redis"""
+        cache, client = redis_cache
+        cache.set('bdfut:key', {'data': 1}, 'countries')
+
+        assert cache.get('bdfut:key', 'countries') == {'data': 1}
+        client.get.assert_not_called()
+        assert cache.local_hits == 1
+
+    def test_redis_hit_populates_local_tier(self, redis_cache):
+        """Testa que dados vindos do Redis passam a ser servidos localmente"""
+        cache, client = redis_cache
+        client.get.return_value = json.dumps({'data': 2})
+
+        assert cache.get('bdfut:other') == {'data': 2}
+        assert cache.get('bdfut:other') == {'data': 2}
+        assert client.get.call_count == 1
+        assert (cache.redis_hits, cache.local_hits) == (1, 1)
+
+    def test_local_ttl_capped_while_redis_available(self, redis_cache):
+        """Testa TTL local limitado com Redis e completo sem Redis"""
+        cache, client = redis_cache
+        with patch('bdfut.core.local_cache.time.monotonic', return_value=0.0):
+            cache.set('bdfut:a', 1, 'countries')
+            cache.redis_available = False
+            cache.set('bdfut:b', 2, 'countries')
+
+        with patch('bdfut.core.local_cache.time.monotonic', return_value=120.0):
+            assert cache.get('bdfut:a', 'countries') is None
+            assert cache.get('bdfut:b', 'countries') == 2
+
+    def test_invalidate_and_stats(self, redis_cache):
+        """Testa invalidação por tipo de entidade e estatísticas do cache local"""
+        cache, client = redis_cache
+        cache.redis_available = False
+        manager = SmartCacheManager(cache)
+        manager.cache_api_response('/countries', {}, {'data': [{'id': 1}, {'id': 2}]}, 'countries')
+
+        assert manager.invalidate_entity_cache('countries') == 3
+
+        stats = cache.get_stats()
+        assert stats['local_cache_size'] == 0
+        assert 'local_evictions' in stats
+
+
+class TestTaggedInvalidation:
+    """Testes da invalidação por tags"""
+
+    def test_local_delete_tagged(self):
+        """Testa índice de tags do cache local, inclusive após eviction"""
+        cache = LocalLRUCache(max_entries=2)
+        cache.set('a', 1, tags=['seasons:1'])
+        cache.set('b', 2, tags=['seasons:1', 'fixtures:2'])
+        cache.set('c', 3, tags=['fixtures:2'])
+
+        assert cache.get_stats()['tags'] == 2
+        assert sorted(cache.delete_tagged('fixtures:2')) == ['b', 'c']
+        assert len(cache) == 0
+        assert cache.get_stats()['tags'] == 0
+
+    def test_build_tags(self):
+        """Testa tags por tipo, id e referências"""
+        assert RedisCache.build_tags('Fixture', 123, season_id=2024, league_id=None, other=1) == [
+            'entity:fixtures', 'fixtures:123', 'seasons:2024'
+        ]
+
+    def test_extract_tags_from_response(self, redis_cache):
+        """Testa tags extraídas do endpoint e dos itens da resposta"""
+        cache, _ = redis_cache
+        manager = SmartCacheManager(cache)
+
+        tags = manager.extract_tags('/fixtures/multi/1,2', {'data': [
+            {'id': 1, 'season_id': 2024, 'league_id': 8}, {'id': 2, 'season_id': 2024}
+        ]}, 'fixtures')
+
+        assert tags == ['entity:fixtures', 'fixtures:1', 'fixtures:2', 'leagues:8', 'seasons:2024']
+        assert 'seasons:2024' in manager.extract_tags('/teams/seasons/2024', {'data': []}, 'teams')
+
+    def test_set_registers_tags_in_redis(self, redis_cache):
+        """Testa gravação do valor e das tags em um único pipeline"""
+        cache, client = redis_cache
+        pipe = client.pipeline.return_value
+
+        cache.set('bdfut:k', {'data': 1}, 'fixtures', tags=['fixtures:1'])
+
+        pipe.setex.assert_called_once()
+        assert [call.args for call in pipe.sadd.call_args_list] == [
+            ('bdfut:tag:entity:fixtures', 'bdfut:k'), ('bdfut:tag:fixtures:1', 'bdfut:k')
+        ]
+        pipe.expire.assert_any_call('bdfut:tag:fixtures:1', cache.tag_ttl)
+        pipe.execute.assert_called_once()
+
+    def test_tags_outlive_finished_fixture(self, redis_cache):
+        """Testa que as tags de uma partida encerrada vivem até o hard TTL da chave"""
+        cache, client = redis_cache
+        pipe = client.pipeline.return_value
+
+        SmartCacheManager(cache).cache_api_response('/fixtures/1', {}, {'data': {'id': 1, 'state_id': 5}},
+                                                    'fixtures')
+
+        key_ttl = pipe.setex.call_args.args[1]
+        assert key_ttl == cache._hard_ttl(Config.CACHE_FINISHED_FIXTURE_TTL)
+        tag_ttls = {call.args[0]: call.args[1] for call in pipe.expire.call_args_list}
+        assert set(tag_ttls) == {'bdfut:tag:entity:fixtures', 'bdfut:tag:fixtures:1'}
+        assert all(ttl >= key_ttl for ttl in tag_ttls.values())
+
+    def test_explicit_ttl_beyond_configured_extends_tags(self, redis_cache):
+        """Testa que um TTL explícito maior que os configurados estende as tags"""
+        cache, client = redis_cache
+        pipe = client.pipeline.return_value
+        ttl = 2 * cache.tag_ttl
+
+        cache.set('bdfut:k', {'data': 1}, 'fixtures', ttl=ttl)
+
+        pipe.expire.assert_called_once_with('bdfut:tag:entity:fixtures', cache._hard_ttl(ttl))
+
+    def test_invalidate_tags_without_keyspace_scan(self, redis_cache):
+        """Testa invalidação por SMEMBERS + UNLINK, sem KEYS/SCAN"""
+        cache, client = redis_cache
+        pipe = client.pipeline.return_value
+        pipe.execute.side_effect = [[{b'bdfut:a', b'bdfut:b'}], [1, 1, 1]]
+        cache.local_cache.set('bdfut:a', 1, tags=['seasons:2024'])
+
+        assert SmartCacheManager(cache).invalidate_entity_cache('season', 2024) == 2
+
+        pipe.smembers.assert_called_once_with('bdfut:tag:seasons:2024')
+        unlinked = {call.args[0] for call in pipe.unlink.call_args_list}
+        assert unlinked == {b'bdfut:a', b'bdfut:b', 'bdfut:tag:seasons:2024'}
+        client.keys.assert_not_called()
+        client.scan_iter.assert_not_called()
+        assert len(cache.local_cache) == 0
+
+    def test_invalidate_pattern_uses_scan(self, redis_cache):
+        """Testa que invalidação por padrão usa SCAN em vez de KEYS"""
+        cache, client = redis_cache
+        client.scan_iter.return_value = iter([b'bdfut:a'])
+        client.pipeline.return_value.execute.return_value = [1]
+
+        assert cache.invalidate_pattern('bdfut:*') == 1
+        client.keys.assert_not_called()
+
+
+class TestBatchOperations:
+    """Testes para get_many/set_many"""
+
+    def test_get_many_uses_local_tier_then_single_mget(self, redis_cache):
+        """Testa L1 primeiro e um único MGET para as chaves restantes"""
+        cache, client = redis_cache
+        cache.local_cache.set('bdfut:a', 1)
+        client.mget.return_value = [cache.codec.encode(2), None]
+
+        assert cache.get_many(['bdfut:a', 'bdfut:b', 'bdfut:c']) == {'bdfut:a': 1, 'bdfut:b': 2}
+
+        client.mget.assert_called_once_with(['bdfut:b', 'bdfut:c'])
+        assert (cache.local_hits, cache.redis_hits, cache.redis_misses) == (1, 1, 1)
+        assert cache.get('bdfut:b') == 2
+
+    def test_set_many_single_pipeline_with_per_key_ttl(self, redis_cache):
+        """Testa gravação de várias chaves com TTL por chave em um pipeline"""
+        cache, client = redis_cache
+        pipe = client.pipeline.return_value
+
+        assert cache.set_many({'bdfut:a': 1, 'bdfut:b': 2}, 'countries',
+                              tags={'bdfut:a': ['countries:1']}, ttls={'bdfut:b': 60}) is True
+
+        ttls = {call.args[0]: call.args[1] for call in pipe.setex.call_args_list}
+        assert ttls == {'bdfut:a': cache._hard_ttl(RedisCache.TTL_MAPPING['countries']),
+                        'bdfut:b': cache._hard_ttl(60)}
+        pipe.sadd.assert_any_call('bdfut:tag:countries:1', 'bdfut:a')
+        pipe.execute.assert_called_once()
+        assert cache.get('bdfut:b') == 2
+
+    def test_preload_items_written_in_one_pipeline(self, redis_cache):
+        """Testa que itens de preload não geram um round-trip por item"""
+        cache, client = redis_cache
+        pipe = client.pipeline.return_value
+
+        SmartCacheManager(cache).cache_api_response(
+            '/countries', {}, {'data': [{'id': i} for i in range(50)]}, 'countries'
+        )
+
+        assert pipe.execute.call_count == 2  # resposta + itens
+        assert pipe.setex.call_count == 51
@@ -23,7 +23,9 @@ import os
 
 from bdfut.core.etl_process import ETLProcess
 from bdfut.core.sportmonks_client import SportmonksClient
+from bdfut.core.async_sportmonks_client import AsyncSportmonksClient
 from bdfut.core.supabase_client import SupabaseClient
+from bdfut.core.bulk_loader import PostgresBulkLoader
 from bdfut.core.redis_cache import RedisCache
 from bdfut.config.config import Config
 
@@ -142,6 +144,39 @@ class TestAPIPerformance:
             print(f"✅ Rate limiting ativo: {total_time:.3f}s para 3 requisições")
 
 
+class TestAsyncClientPerformance:
+    """Benchmark do cliente assíncrono contra servidor HTTP local"""
+    
+    def test_async_throughput_scales_with_concurrency(self, mock_config, sportmonks_stub_server):
+        """Mede throughput do AsyncSportmonksClient variando a concorrência"""
+        print("⚡ Benchmark: Throughput assíncrono x concorrência")
+        
+        stub = sportmonks_stub_server
+        stub.latency = 0.05  # 50ms por requisição
+        total_requests = 48
+        
+        async def run(concurrency):
+            client = AsyncSportmonksClient(enable_cache=False, max_concurrency=concurrency)
+            client.base_url = stub.base_url
+            async with client:
+                start_time = time.perf_counter()
+                await asyncio.gather(*[
+                    client.get_fixture_by_id(i) for i in range(total_requests)
+                ])
+                return total_requests / (time.perf_counter() - start_time)
+        
+        throughput = {}
+        for concurrency in (1, 4, 16):
+            throughput[concurrency] = asyncio.run(run(concurrency))
+            print(f"  concorrência={concurrency:>2}: {throughput[concurrency]:.1f} req/s")
+        
+        # Throughput deve crescer com a concorrência
+        assert throughput[4] > throughput[1] * 2
+        assert throughput[16] > throughput[4] * 1.5
+        
+        print(f"✅ Speedup 16x1: {throughput[16] / throughput[1]:.1f}x")
+
+
 class TestCachePerformance:
     """Testes de performance do sistema de cache"""
     
@@ -362,6 +397,129 @@ class TestDatabasePerformance:
             print(f"✅ Upserts concorrentes: {total_time:.3f}s para 5 lotes")
 
 
+def _postgrest_emulator(dsn):
+    """
+    Servidor HTTP mínimo que responde como o PostgREST a upserts em lote
+    
+    Executa INSERT ... SELECT FROM json_populate_recordset ... ON CONFLICT,
+    o mesmo comando que o PostgREST gera para POST com merge-duplicates.
+    """
+    import psycopg2
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from urllib.parse import urlparse, parse_qs
+    
+    conn = psycopg2.connect(dsn)
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+        
+        def log_message(self, *args):
+            pass
+        
+        def do_POST(self):
+            url = urlparse(self.path)
+            table = url.path.rsplit('/', 1)[-1]
+            conflict = parse_qs(url.query)['on_conflict'][0]
+            body = self.rfile.read(int(self.headers['Content-Length']))
+            columns = list(json.loads(body)[0])
+            column_list = ', '.join(columns)
+            updates = ', '.join(f"{c} = EXCLUDED.{c}" for c in columns if c != conflict)
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} ({column_list}) SELECT {column_list} "
+                    f"FROM json_populate_recordset(NULL::{table}, %s) "
+                    f"ON CONFLICT ({conflict}) DO UPDATE SET {updates}",
+                    (body.decode(),)
+                )
+            conn.commit()
+            self.send_response(201)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'[]')
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, conn
+
+
+@pytest.mark.skipif(not os.getenv("BENCHMARK_DATABASE_URL"),
+                    reason="BENCHMARK_DATABASE_URL não configurada (PostgreSQL local)")
+class TestBulkLoaderBenchmark:
+    """Benchmark da carga COPY contra o caminho REST atual em PostgreSQL local"""
+    
+    TOTAL_ROWS = 20000
+    
+    def _rows(self, offset=0):
+        return [
+            {
+                'sportmonks_id': i,
+                'league_id': i % 20,
+                'season_id': 2025,
+                'match_date': '2025-01-15T20:00:00',
+                'status': 'FT',
+                'details': {'venue': f'Estadio {i}', 'scores': [i % 5, i % 3]}
+            }
+            for i in range(offset, offset + self.TOTAL_ROWS)
+        ]
+    
+    def test_copy_vs_rest_rows_per_second(self, mock_config):
+        """Compara registros/s do COPY + ON CONFLICT com o upsert REST em lotes"""
+        import psycopg2
+        
+        print("⚡ Benchmark: Carga COPY x upsert REST")
+        
+        dsn = os.environ["BENCHMARK_DATABASE_URL"]
+        setup = psycopg2.connect(dsn)
+        setup.autocommit = True
+        setup.cursor().execute("""
+            DROP TABLE IF EXISTS bdfut_bench_fixtures;
+            CREATE TABLE bdfut_bench_fixtures (
+                id SERIAL PRIMARY KEY,
+                sportmonks_id INTEGER UNIQUE NOT NULL,
+                league_id INTEGER,
+                season_id INTEGER,
+                match_date TIMESTAMP,
+                status VARCHAR(10),
+                details JSONB
+            )
+        """)
+        server, server_conn = _postgrest_emulator(dsn)
+        
+        try:
+            # Caminho REST: SupabaseClient -> HTTP -> PostgREST (emulado) -> PostgreSQL
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with patch.object(Config, 'SUPABASE_URL', url), patch.object(Config, 'DATABASE_URL', ''):
+                client = SupabaseClient()
+                rows = self._rows()
+                start_time = time.perf_counter()
+                assert client.bulk_upsert('bdfut_bench_fixtures', rows, 'sportmonks_id')
+                rest_rate = len(rows) / (time.perf_counter() - start_time)
+            
+            loader = PostgresBulkLoader(dsn)
+            rows = self._rows(offset=self.TOTAL_ROWS)
+            start_time = time.perf_counter()
+            loaded = loader.bulk_upsert('bdfut_bench_fixtures', rows, ['sportmonks_id'])
+            copy_rate = len(rows) / (time.perf_counter() - start_time)
+            loader.close()
+            
+            print(f"  upsert REST (lotes de {Config.BATCH_SIZE}): {rest_rate:.0f} reg/s")
+            print(f"  COPY + ON CONFLICT (lotes de {Config.BULK_LOAD_CHUNK_SIZE}): {copy_rate:.0f} reg/s")
+            
+            assert loaded == self.TOTAL_ROWS
+            assert copy_rate > rest_rate
+            
+            print(f"✅ Speedup COPY: {copy_rate / rest_rate:.1f}x")
+        finally:
+            server.shutdown()
+            server.server_close()
+            server_conn.close()
+            setup.cursor().execute("DROP TABLE IF EXISTS bdfut_bench_fixtures")
+            setup.close()
+
+
 class TestETLPerformance:
     """Testes de performance do processo ETL completo"""
     
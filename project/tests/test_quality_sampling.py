@@ -0,0 +1,196 @@
+"""
+Testes unitários para o perfil de qualidade por amostragem
+=========================================================
+
+Testes dos estimadores e do DataQualityManager.profile_table:
+- Intervalo de Wilson, Duj1, reservatório e HyperLogLog
+- Perfil a partir da RPC data_quality_profile (TABLESAMPLE)
+- Reservatório pela API quando a RPC não existe (prefixo não representativo)
+- Deriva calculada a partir de data_quality_profiles
+"""
+import pytest
+from unittest.mock import Mock, patch
+
+from bdfut.core.data_quality import DataQualityManager
+from bdfut.core.quality_sampling import HyperLogLog, ReservoirSample, estimate_distinct, wilson_interval
+
+
+@pytest.fixture
+def manager(mock_config):
+    manager = DataQualityManager.__new__(DataQualityManager)
+    manager.supabase = Mock()
+    manager.metadata_manager = Mock()
+    return manager
+
+
+class TestEstimators:
+    """Testes dos estimadores de quality_sampling"""
+
+    def test_wilson_interval(self):
+        """Testa que o intervalo contém a proporção e encolhe com a amostra"""
+        low, high = wilson_interval(10, 100)
+        assert low < 0.1 < high
+        assert wilson_interval(0, 100)[0] == 0.0
+        wide = wilson_interval(1, 10)
+        narrow = wilson_interval(100, 1000)
+        assert narrow[1] - narrow[0] < wide[1] - wide[0]
+        assert wilson_interval(0, 0) == (0.0, 1.0)
+
+    def test_estimate_distinct(self):
+        """Testa Duj1: amostra completa, coluna única e valores repetidos"""
+        assert estimate_distinct(100, 100, 40, 10) == 40
+        assert estimate_distinct(100, 10000, 100, 100) == 10000
+        # Poucos valores, todos repetidos: distintos da tabela ≈ distintos da amostra
+        assert estimate_distinct(1000, 100000, 20, 0) == 20
+        assert 20 < estimate_distinct(1000, 100000, 500, 300) <= 100000
+
+    def test_reservoir_keeps_uniform_fixed_size(self):
+        """Testa tamanho fixo e itens de todo o fluxo"""
+        reservoir = ReservoirSample(100, seed=1)
+        reservoir.extend(range(10000))
+        assert len(reservoir.items) == 100
+        assert reservoir.seen == 10000
+        assert max(reservoir.items) > 5000
+
+    def test_hyperloglog_count_and_merge(self):
+        """Testa erro dentro do esperado e união de sketches"""
+        first, second = HyperLogLog(), HyperLogLog()
+        for value in range(20000):
+            first.add(value)
+        for value in range(10000, 30000):
+            second.add(value)
+        assert abs(first.count() - 20000) / 20000 < 4 * first.relative_error
+        first.merge(second)
+        low, high = first.interval()
+        assert abs(first.count() - 30000) / 30000 < 4 * first.relative_error
+        assert low < first.count() < high
+        small = HyperLogLog()
+        for value in [1, 2, 3, 3, 3]:
+            small.add(value)
+        assert round(small.count()) == 3
+
+
+class TestProfileTable:
+    """Testes de DataQualityManager.profile_table"""
+
+    RPC_STATS = {
+        'method': 'system',
+        'sample_rows': 1000,
+        'estimated_total': 1000000,
+        'columns': {
+            'minute': {'nulls': 10, 'distinct': 120, 'singletons': 0, 'out_of_range': 5, 'top': []},
+            'type_id': {'nulls': 0, 'distinct': 3, 'singletons': 0, 'out_of_range': 0,
+                        'top': [{'value': 14, 'count': 600}, {'value': 19, 'count': 400}]}
+        },
+        'missing_columns': ['extra_minute']
+    }
+
+    def test_profile_from_tablesample(self, manager):
+        """Testa taxas, estimativas e intervalos a partir da RPC"""
+        rpc = manager.supabase.client.rpc
+        rpc.return_value.execute.return_value.data = self.RPC_STATS
+
+        profile = manager.profile_table('match_events', sample_percent=0.1)
+
+        name, params = rpc.call_args.args
+        assert name == 'data_quality_profile'
+        assert params['p_sample_percent'] == 0.1
+        assert params['p_method'] == 'BERNOULLI'
+        assert {'column': 'minute', 'min': 0, 'max': 130} in params['p_columns']
+        minute = profile['columns']['minute']
+        assert minute['null_rate'] == 0.01
+        assert minute['null_rate_interval'][0] < 0.01 < minute['null_rate_interval'][1]
+        assert minute['out_of_range_estimate'] == round(5 / 990 * 990000)
+        assert minute['distinct_estimate'] == 120
+        assert 'out_of_range_rate' not in profile['columns']['type_id']
+        assert profile['columns']['type_id']['top_values'][0]['share'] == 0.6
+        assert profile['missing_columns'] == ['extra_minute']
+
+    def test_reservoir_fallback_without_rpc(self, manager):
+        """Testa amostragem pela API com HyperLogLog quando a leitura cobre a tabela"""
+        manager.supabase.client.rpc.side_effect = Exception("function data_quality_profile does not exist")
+        rows = [{'id': i, 'minute': None if i % 10 == 0 else i % 150, 'type_id': 14 + i % 2}
+                for i in range(2500)]
+
+        def page(start, end):
+            return Mock(data=rows[start:end + 1], count=2500)
+        query = manager.supabase.client.table.return_value.select.return_value.order.return_value
+        query.range.side_effect = lambda start, end: Mock(execute=Mock(return_value=page(start, end)))
+
+        with patch('bdfut.config.config.Config.DATA_QUALITY_PROFILE_RESERVOIR_SIZE', 500):
+            profile = manager.profile_table('match_events')
+
+        assert profile['method'] == 'reservoir'
+        assert profile['representative'] is True
+        assert profile['sample_rows'] == 500
+        assert profile['scanned_rows'] == 2500
+        assert profile['estimated_total'] == 2500
+        assert 'extra_minute' in profile['missing_columns']
+        minute = profile['columns']['minute']
+        low, high = minute['null_rate_interval']
+        assert low <= minute['null_rate'] <= high
+        assert abs(minute['null_rate'] - 0.1) < 0.06
+        assert minute['out_of_range_rate'] > 0
+        assert abs(profile['columns']['type_id']['distinct_estimate'] - 2) < 0.5
+
+    def test_save_and_drift(self, manager):
+        """Testa gravação de uma linha por coluna e deriva entre intervalos disjuntos"""
+        manager.supabase.client.rpc.return_value.execute.return_value.data = self.RPC_STATS
+        profile = manager.profile_table('match_events')
+        assert manager.save_quality_profiles([profile, {'table_name': 'match_lineups', 'error': 'x'}], 'job-id')
+        rows = manager.supabase.client.table.return_value.insert.call_args.args[0]
+        assert {row['column_name'] for row in rows} == {'minute', 'type_id'}
+        assert rows[0]['job_id'] == 'job-id'
+
+        history = [
+            {'table_name': 'match_events', 'column_name': 'minute', 'profiled_at': '2026-10-10',
+             'null_rate': 0.01, 'null_rate_low': 0.005, 'null_rate_high': 0.02,
+             'out_of_range_rate': 0.0, 'out_of_range_low': 0.0, 'out_of_range_high': 0.004},
+            {'table_name': 'match_events', 'column_name': 'minute', 'profiled_at': '2026-10-17',
+             'null_rate': 0.012, 'null_rate_low': 0.006, 'null_rate_high': 0.022,
+             'out_of_range_rate': 0.05, 'out_of_range_low': 0.04, 'out_of_range_high': 0.06}
+        ]
+        table = manager.supabase.client.table.return_value
+        table.select.return_value.gte.return_value.order.return_value.execute.return_value.data = history
+        manager.metadata_manager.get_recent_jobs.return_value = []
+
+        trends = manager.get_quality_trends(days=7)
+
+        assert len(trends['profile_series']['match_events.minute']) == 2
+        assert trends['profile_drift'] == [{'table': 'match_events', 'column': 'minute',
+                                            'metric': 'out_of_range_rate', 'from': 0.0, 'to': 0.05}]
+
+    def test_prefix_scan_is_not_representative(self, manager):
+        """Testa que a leitura parcial por id é marcada e fica fora da deriva"""
+        manager.supabase.client.rpc.side_effect = Exception("function data_quality_profile does not exist")
+        rows = [{'id': i, 'minute': i % 90, 'type_id': 14} for i in range(2000)]
+        query = manager.supabase.client.table.return_value.select.return_value.order.return_value
+        query.range.side_effect = lambda start, end: Mock(
+            execute=Mock(return_value=Mock(data=rows[start:end + 1], count=50000))
+        )
+
+        with patch('bdfut.config.config.Config.DATA_QUALITY_PROFILE_SCAN_ROWS', 1000):
+            profile = manager.profile_table('match_events')
+
+        assert profile['representative'] is False
+        assert profile['scanned_rows'] == 1000
+        assert profile['estimated_total'] == 50000
+        manager.save_quality_profiles([profile])
+        rows = manager.supabase.client.table.return_value.insert.call_args.args[0]
+        assert all(row['representative'] is False for row in rows)
+
+        history = [
+            {'table_name': 'match_events', 'column_name': 'minute', 'profiled_at': day,
+             'representative': representative, 'null_rate': rate,
+             'null_rate_low': rate - 0.005, 'null_rate_high': rate + 0.005}
+            for day, representative, rate in [
+                ('2026-10-10', True, 0.01), ('2026-10-14', True, 0.012), ('2026-10-17', False, 0.2)
+            ]
+        ]
+        table = manager.supabase.client.table.return_value
+        table.select.return_value.gte.return_value.order.return_value.execute.return_value.data = history
+
+        drift = manager.get_profile_drift(days=7)
+
+        assert len(drift['series']['match_events.minute']) == 3
+        assert drift['drift'] == []
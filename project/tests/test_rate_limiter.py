@@ -0,0 +1,196 @@
+"""
+Testes unitários para rate limiters
+==================================
+
+Testes do token bucket local e do backend Redis compartilhado:
+- Aquisição e reposição de tokens
+- Limites por entidade
+- Ajuste pelos headers X-RateLimit-*
+- Fallback quando o Redis não está disponível
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import Mock, patch
+
+from bdfut.core.rate_limiter import (
+    RateLimiter,
+    TokenBucketRateLimiter,
+    RedisTokenBucketRateLimiter,
+    create_rate_limiter,
+    parse_rate_limit_headers
+)
+
+
+class TestTokenBucketRateLimiter:
+    """Testes para TokenBucketRateLimiter"""
+
+    def test_base_class_is_abstract(self):
+        """Testa que a interface exige reserve/observe"""
+        with pytest.raises(TypeError):
+            RateLimiter(capacity=10)
+
+    def test_reserve_within_capacity(self):
+        """Testa que reservas dentro da capacidade não aguardam"""
+        limiter = TokenBucketRateLimiter(capacity=3)
+
+        assert [limiter.reserve('fixtures') for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_reserve_beyond_capacity_returns_wait(self):
+        """Testa que reserva além da capacidade retorna tempo de espera"""
+        limiter = TokenBucketRateLimiter(capacity=3600)
+        for _ in range(3600):
+            limiter.reserve('fixtures')
+
+        # 1 token/segundo
+        assert limiter.reserve('fixtures') == pytest.approx(1.0, abs=0.05)
+        assert limiter.reserve('fixtures') == pytest.approx(2.0, abs=0.05)
+
+    def test_refill_over_time(self):
+        """Testa reposição gradual de tokens"""
+        limiter = TokenBucketRateLimiter(capacity=3600)
+        with patch('bdfut.core.rate_limiter.time.monotonic', return_value=1000.0):
+            for _ in range(3600):
+                limiter.reserve('fixtures')
+        with patch('bdfut.core.rate_limiter.time.monotonic', return_value=1010.0):
+            waits = [limiter.reserve('fixtures') for _ in range(10)]
+
+        assert waits == [0.0] * 10
+
+    def test_entity_limits(self):
+        """Testa capacidades distintas por entidade"""
+        limiter = TokenBucketRateLimiter(capacity=100, entity_limits={'players': 1})
+
+        assert limiter.reserve('players') == 0.0
+        assert limiter.reserve('players') > 0
+        assert limiter.reserve('fixtures') == 0.0
+
+    def test_observe_remaining_restricts_bucket(self):
+        """Testa que X-RateLimit-Remaining reduz os tokens disponíveis"""
+        limiter = TokenBucketRateLimiter(capacity=3000)
+        limiter.observe('fixtures', remaining=1)
+
+        assert limiter.reserve('fixtures') == 0.0
+        assert limiter.reserve('fixtures') > 0
+
+    def test_observe_exhausted_waits_until_reset(self):
+        """Testa que remaining=0 bloqueia até o reset informado"""
+        limiter = TokenBucketRateLimiter(capacity=3600)
+        limiter.observe('fixtures', remaining=0, reset_at=time.time() + 120)
+
+        assert limiter.reserve('fixtures') == pytest.approx(120, abs=1)
+
+    def test_acquire_sleeps_when_needed(self):
+        """Testa que acquire bloqueia pelo tempo reservado"""
+        limiter = TokenBucketRateLimiter(capacity=1)
+        with patch('time.sleep') as mock_sleep:
+            limiter.acquire()
+            limiter.acquire()
+
+        mock_sleep.assert_called_once()
+
+    def test_acquire_async(self):
+        """Testa aquisição assíncrona sem bloquear o event loop"""
+        limiter = TokenBucketRateLimiter(capacity=1)
+
+        async def run():
+            with patch('bdfut.core.rate_limiter.asyncio.sleep') as mock_sleep:
+                mock_sleep.return_value = None
+                await limiter.acquire_async()
+                await limiter.acquire_async()
+                return mock_sleep
+
+        mock_sleep = asyncio.run(run())
+        mock_sleep.assert_called_once()
+
+
+class TestRateLimitHeaders:
+    """Testes para leitura dos headers de rate limit"""
+
+    def test_parse_case_insensitive(self):
+        """Testa leitura de headers sem diferenciar caixa"""
+        assert parse_rate_limit_headers({'X-RateLimit-Remaining': '10', 'x-ratelimit-reset': '1700000000'}) == (10, 1700000000.0)
+
+    def test_parse_missing_and_invalid(self):
+        """Testa headers ausentes ou inválidos"""
+        assert parse_rate_limit_headers({}) == (None, None)
+        assert parse_rate_limit_headers({'x-ratelimit-remaining': 'abc'}) == (None, None)
+
+
+class TestRedisTokenBucketRateLimiter:
+    """Testes para RedisTokenBucketRateLimiter"""
+
+    def make_redis_cache(self, available=True):
+        redis_cache = Mock()
+        redis_cache.redis_available = available
+        redis_cache.redis_client = Mock() if available else None
+        return redis_cache
+
+    def test_reserve_uses_shared_script(self):
+        """Testa que a reserva é feita atomicamente via script Redis"""
+        redis_cache = self.make_redis_cache()
+        script = Mock(return_value='0')
+        redis_cache.redis_client.register_script.return_value = script
+
+        limiter = RedisTokenBucketRateLimiter(redis_cache, capacity=3000)
+        wait = limiter.reserve('fixtures')
+
+        assert wait == 0.0
+        kwargs = script.call_args.kwargs
+        assert kwargs['keys'] == ['bdfut:ratelimit:fixtures']
+        assert kwargs['args'][0] == 3000
+
+    def test_reserve_returns_wait_from_redis(self):
+        """Testa que o tempo de espera calculado no Redis é repassado"""
+        redis_cache = self.make_redis_cache()
+        redis_cache.redis_client.register_script.return_value = Mock(return_value='12.5')
+
+        limiter = RedisTokenBucketRateLimiter(redis_cache, capacity=3000)
+
+        assert limiter.reserve('fixtures') == 12.5
+
+    def test_fallback_when_redis_unavailable(self):
+        """Testa fallback para bucket local sem Redis"""
+        limiter = RedisTokenBucketRateLimiter(self.make_redis_cache(available=False), capacity=1)
+
+        assert limiter.reserve('fixtures') == 0.0
+        assert limiter.reserve('fixtures') > 0
+
+    def test_fallback_on_redis_error(self):
+        """Testa fallback para bucket local quando o script falha"""
+        redis_cache = self.make_redis_cache()
+        redis_cache.redis_client.register_script.return_value = Mock(side_effect=ConnectionError("down"))
+
+        limiter = RedisTokenBucketRateLimiter(redis_cache, capacity=5)
+
+        assert limiter.reserve('fixtures') == 0.0
+        assert limiter.redis_errors == 1
+
+    def test_shared_bucket_uses_redis_clock(self):
+        """Testa que hosts com relógios diferentes compartilham o mesmo bucket"""
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        client = fakeredis.FakeStrictRedis()
+        redis_cache = Mock()
+        redis_cache.redis_available = True
+        redis_cache.redis_client = client
+
+        host_a = RedisTokenBucketRateLimiter(redis_cache, capacity=360)
+        host_b = RedisTokenBucketRateLimiter(redis_cache, capacity=360)
+        for _ in range(360):
+            host_a.reserve('fixtures')
+
+        # host_b adiantado 1h: com o relógio local ele reencheria o bucket
+        skewed_clock = Mock(time=Mock(return_value=time.time() + 3600), monotonic=time.monotonic)
+        with patch('bdfut.core.rate_limiter.time', skewed_clock):
+            assert host_b.reserve('fixtures') == pytest.approx(10.0, abs=1)
+
+        host_b.observe('fixtures', remaining=0, reset_at=float(client.time()[0]) + 120)
+        assert host_a.reserve('fixtures') == pytest.approx(120, abs=1)
+        assert host_a.redis_errors == host_b.redis_errors == 0
+
+    def test_create_rate_limiter(self):
+        """Testa escolha do backend"""
+        assert isinstance(create_rate_limiter(10), TokenBucketRateLimiter)
+        assert isinstance(create_rate_limiter(10, self.make_redis_cache(available=False)), TokenBucketRateLimiter)
+        assert isinstance(create_rate_limiter(10, self.make_redis_cache()), RedisTokenBucketRateLimiter)
@@ -0,0 +1,97 @@
+"""
+Testes unitários para ResponseStore
+==================================
+
+Testes do armazém local de respostas da API:
+- Gravação por acréscimo e leitura via mmap
+- Reabertura e índice com gravação interrompida
+- Camada de leitura do SportmonksClient e modo offline
+"""
+import os
+import pytest
+from unittest.mock import Mock, patch
+
+from bdfut.core.response_store import INDEX_RECORD, ResponseStore
+from bdfut.core.sportmonks_client import SportmonksClient, SportmonksOfflineError
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResponseStore(str(tmp_path / 'responses'))
+    yield store
+    store.close()
+
+
+def page_response(page):
+    response = Mock(status_code=200, headers={})
+    response.json.return_value = {'data': [{'id': page}], 'pagination': {'has_more': page < 2}}
+    return response
+
+
+class TestResponseStore:
+    """Testes para ResponseStore"""
+
+    def test_put_and_get(self, store, mock_config):
+        """Testa leitura pela chave endpoint + parâmetros, ignorando api_token"""
+        store.put('/fixtures', {'season_id': 1, 'page': 1, 'api_token': 'segredo'}, {'data': [1]})
+
+        assert store.get('/fixtures', {'page': 1, 'season_id': 1}) == {'data': [1]}
+        assert store.get('/fixtures', {'season_id': 1, 'page': 2}) is None
+        assert ('/fixtures', {'season_id': 1, 'page': 1}) in store
+        assert (store.hits, store.misses) == (1, 1)
+
+    def test_latest_version_wins_and_survives_reopen(self, store, mock_config):
+        """Testa que regravar acrescenta e a reabertura lê a versão mais recente"""
+        store.put('/teams/1', {}, {'data': {'name': 'A'}})
+        store.get('/teams/1', {})
+        store.put('/teams/2', {}, {'data': {'name': 'C'}})
+        store.put('/teams/1', {}, {'data': {'name': 'B'}})
+        assert store.get('/teams/1', {}) == {'data': {'name': 'B'}}
+        store.close()
+
+        reopened = ResponseStore(store.path)
+        assert len(reopened) == 2
+        assert reopened.get('/teams/1', {}) == {'data': {'name': 'B'}}
+        assert [endpoint for endpoint, _, _ in reopened.iter_responses('/teams')] == ['/teams/2', '/teams/1']
+        reopened.close()
+
+    def test_interrupted_write_is_ignored(self, store, mock_config):
+        """Testa que entradas do índice sem dados e registros incompletos são descartados"""
+        store.put('/teams/1', {}, {'data': {'id': 1}})
+        store.close()
+
+        with open(os.path.join(store.path, ResponseStore.INDEX_FILE), 'ab') as index:
+            index.write(INDEX_RECORD.pack(ResponseStore.make_key('/teams/2'), 10 ** 6, 10))
+            index.write(b'\x00' * 5)
+
+        reopened = ResponseStore(store.path)
+        assert len(reopened) == 1
+        assert reopened.get('/teams/1', {}) == {'data': {'id': 1}}
+        assert os.path.getsize(os.path.join(store.path, ResponseStore.INDEX_FILE)) == 2 * INDEX_RECORD.size
+        reopened.close()
+
+
+class TestClientResponseStore:
+    """Testes da camada de armazém no SportmonksClient"""
+
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_second_run_makes_no_requests(self, mock_get, store, mock_config):
+        """Testa que o reprocessamento offline lê todas as páginas do armazém"""
+        mock_get.side_effect = lambda url, params: page_response(params['page'])
+        client = SportmonksClient(enable_cache=False, rate_limiter=Mock(), response_store=store)
+        first = client.get_paginated_data('/fixtures', {'season_id': 1}, entity_type='fixtures')
+        assert mock_get.call_count == 2
+
+        replay = SportmonksClient(enable_cache=False, rate_limiter=Mock(), response_store=store, offline=True)
+        assert replay.get_paginated_data('/fixtures', {'season_id': 1}, entity_type='fixtures') == first
+        assert mock_get.call_count == 2
+        assert replay.store_hits == 2
+
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_offline_miss_raises_without_retry(self, mock_get, store, mock_config):
+        """Testa que a ausência em modo offline falha na hora, sem requisição"""
+        client = SportmonksClient(enable_cache=False, rate_limiter=Mock(), response_store=store, offline=True)
+
+        with pytest.raises(SportmonksOfflineError):
+            client.get_fixture_by_id(1)
+        mock_get.assert_not_called()
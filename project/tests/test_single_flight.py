@@ -0,0 +1,205 @@
+"""
+Testes unitários para SingleFlight
+=================================
+
+Testes da coalescência de requisições idênticas:
+- Seguidores no mesmo processo aguardam o líder
+- Lock no Redis entre processos
+- Versão assíncrona (do_async) e cancelamento do líder
+- Integração com SportmonksClient._make_request
+"""
+import time
+import asyncio
+import threading
+import pytest
+from unittest.mock import Mock, patch
+
+from bdfut.core.single_flight import SingleFlight
+from bdfut.core.sportmonks_client import SportmonksClient
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def make_redis_cache(lock_free_after=0):
+    """RedisCache falso cujo lock já pertence a outro processo"""
+    redis_cache = Mock()
+    redis_cache.redis_available = True
+    client = redis_cache.redis_client
+    client.set.return_value = False
+    client.exists.side_effect = [True] * lock_free_after + [False] * 100
+    return redis_cache, client
+
+
+class TestSingleFlight:
+    """Testes para SingleFlight"""
+
+    def test_concurrent_calls_share_one_execution(self, mock_config):
+        """Testa que chamadas simultâneas com a mesma chave executam fn uma vez"""
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return {'data': 42}
+
+        threads, results, _ = run_concurrently(5, lambda: flight.do('bdfut:key', fetch))
+        while flight.leaders + flight.followers < 5:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{'data': 42}] * 5
+        assert flight.get_stats()['followers'] == 4
+        assert flight.get_stats()['in_flight'] == 0
+
+    def test_leader_error_reaches_followers(self, mock_config):
+        """Testa que o erro do líder é propagado aos seguidores"""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fetch():
+            release.wait(5)
+            raise ValueError("API fora do ar")
+
+        threads, _, errors = run_concurrently(3, lambda: flight.do('bdfut:key', fetch))
+        while flight.leaders + flight.followers < 3:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(error, ValueError) for error in errors)
+
+    def test_different_keys_are_not_coalesced(self, mock_config):
+        """Testa que chaves diferentes executam separadamente"""
+        flight = SingleFlight()
+
+        assert flight.do('a', lambda: 1) == 1
+        assert flight.do('b', lambda: 2) == 2
+        assert flight.leaders == 2
+
+    def test_waits_for_leader_in_other_process(self, mock_config):
+        """Testa leitura do cache após o líder de outro processo liberar o lock"""
+        redis_cache, client = make_redis_cache(lock_free_after=2)
+        flight = SingleFlight(redis_cache, poll_interval=0.001)
+        fetch = Mock()
+
+        result = flight.do('bdfut:key', fetch, fetch_cached=lambda: {'data': 'do cache'})
+
+        assert result == {'data': 'do cache'}
+        fetch.assert_not_called()
+        assert client.exists.call_count == 3
+        assert (flight.remote_waits, flight.remote_hits) == (1, 1)
+
+    def test_acquires_lock_and_releases_it(self, mock_config):
+        """Testa que o líder obtém o lock com NX/PX e o libera ao terminar"""
+        redis_cache, client = make_redis_cache()
+        client.set.return_value = True
+        flight = SingleFlight(redis_cache, lock_ttl=10)
+
+        assert flight.do('bdfut:key', lambda: 'api', fetch_cached=Mock()) == 'api'
+
+        lock_key, token = client.set.call_args.args
+        assert lock_key == 'bdfut:flight:bdfut:key'
+        assert client.set.call_args.kwargs == {'nx': True, 'px': 10000}
+        release = client.register_script.return_value
+        release.assert_called_once_with(keys=[lock_key], args=[token])
+
+    def test_timeout_falls_back_to_api(self, mock_config):
+        """Testa que um líder travado não bloqueia os demais indefinidamente"""
+        redis_cache, client = make_redis_cache(lock_free_after=10 ** 6)
+        flight = SingleFlight(redis_cache, wait_timeout=0.05, poll_interval=0.01)
+
+        assert flight.do('bdfut:key', lambda: 'api', fetch_cached=Mock()) == 'api'
+        assert flight.timeouts == 1
+
+
+class TestSportmonksClientSingleFlight:
+    """Testes da coalescência no SportmonksClient"""
+
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_identical_requests_hit_api_once(self, mock_get, mock_config):
+        """Testa que threads pedindo o mesmo endpoint geram uma única requisição"""
+        release = threading.Event()
+
+        def slow_response(url, params):
+            release.wait(5)
+            response = Mock(status_code=200, headers={})
+            response.json.return_value = {'data': [{'id': 1}]}
+            return response
+
+        mock_get.side_effect = slow_response
+        client = SportmonksClient(enable_cache=False, rate_limiter=Mock())
+
+        threads, results, _ = run_concurrently(
+            4, lambda: client._make_request('/fixtures/date/2025-01-15', {'include': 'events'})
+        )
+        flight = client.single_flight
+        while flight.leaders + flight.followers < 4:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert mock_get.call_count == 1
+        assert results == [{'data': [{'id': 1}]}] * 4
+
+
+class TestSingleFlightAsync:
+    """Testes para SingleFlight.do_async"""
+
+    def test_concurrent_coroutines_share_one_execution(self, mock_config):
+        """Testa que corrotinas simultâneas com a mesma chave executam fn uma vez"""
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {'data': 42}
+
+        async def run():
+            return await asyncio.gather(*[flight.do_async('bdfut:key', fetch) for _ in range(5)])
+
+        assert asyncio.run(run()) == [{'data': 42}] * 5
+        assert len(calls) == 1
+        assert flight.get_stats()['in_flight'] == 0
+
+    def test_follower_takes_over_cancelled_leader(self, mock_config):
+        """Testa que o cancelamento do líder não cancela os seguidores"""
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return 'api'
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do_async('bdfut:key', fetch))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do_async('bdfut:key', fetch))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await follower, leader.cancelled()
+
+        assert asyncio.run(run()) == ('api', True)
+        assert len(calls) == 2
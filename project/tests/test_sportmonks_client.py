@@ -76,8 +76,8 @@ class TestSportmonksClient:
         result = client._make_request('/test', {'param': 'value'})
         
         assert result == {'data': [{'id': 1, 'name': 'Test'}]}
-        # requests_made é incrementado em request_timestamps.append()
-        assert len(client.request_timestamps) == 1
+        # requests_made é incrementado a cada requisição à API
+        assert client.requests_made == 1
         # Verificar se a requisição foi feita
         mock_get.assert_called_once()
     
@@ -218,32 +218,133 @@ class TestSportmonksClient:
         assert data[0]['id'] == 1
         assert data[1]['id'] == 2
         assert mock_get.call_count == 2
-    
+
+    def _paged_responses(self, last_page, delays=None):
+        """Simula _make_request com has_more até last_page"""
+        import time
+        requested = []
+
+        def fake_request(endpoint, params=None, entity_type=None, base_url=None):
+            page = params['page']
+            requested.append(page)
+            time.sleep((delays or {}).get(page, 0))
+            return {'data': [{'id': page}], 'pagination': {'has_more': page < last_page}}
+
+        return fake_request, requested
+
+    def test_iter_pages_parallel_preserves_order(self, mock_config):
+        """Testa que páginas buscadas em paralelo são entregues em ordem"""
+        client = SportmonksClient(enable_cache=False)
+        # Páginas iniciais mais lentas completam depois das seguintes
+        fake_request, requested = self._paged_responses(6, delays={2: 0.05, 3: 0.03})
+
+        with patch.object(client, '_make_request', side_effect=fake_request):
+            pages = list(client.iter_pages('/test', max_workers=4))
+
+        assert pages == [[{'id': page}] for page in range(1, 7)]
+        assert requested[0] == 1
+        assert set(range(1, 7)) <= set(requested)
+
+    def test_iter_pages_stops_at_last_page(self, mock_config):
+        """Testa que a busca especulativa não ultrapassa a janela após has_more=False"""
+        client = SportmonksClient(enable_cache=False)
+        fake_request, requested = self._paged_responses(3)
+
+        with patch.object(client, '_make_request', side_effect=fake_request):
+            data = client.get_paginated_data('/test', max_workers=4)
+
+        assert [item['id'] for item in data] == [1, 2, 3]
+        # No máximo uma janela de páginas além da última
+        assert max(requested) <= 3 + 4
+
+    def test_iter_pages_respects_max_pages_and_start_page(self, mock_config):
+        """Testa max_pages e página inicial informada nos parâmetros"""
+        client = SportmonksClient(enable_cache=False)
+        fake_request, requested = self._paged_responses(100)
+
+        with patch.object(client, '_make_request', side_effect=fake_request):
+            data = client.get_paginated_data('/test', params={'page': 5}, max_pages=3, max_workers=8)
+
+        assert [item['id'] for item in data] == [5, 6, 7]
+        assert sorted(requested) == [5, 6, 7]
+
+    def test_iter_pages_is_lazy(self, mock_config):
+        """Testa que o gerador sequencial só busca páginas consumidas"""
+        client = SportmonksClient(enable_cache=False)
+        fake_request, requested = self._paged_responses(10)
+
+        with patch.object(client, '_make_request', side_effect=fake_request):
+            pages = client.iter_pages('/test', max_workers=1)
+            assert next(pages) == [{'id': 1}]
+            assert next(pages) == [{'id': 2}]
+            pages.close()
+
+        assert requested == [1, 2]
+
+    def test_iter_transfers_streams_items(self, mock_config):
+        """Testa que iter_transfers entrega itens sem acumular todas as páginas"""
+        client = SportmonksClient(enable_cache=False)
+        requested = []
+
+        def fake_request(endpoint, params=None, entity_type=None, base_url=None):
+            page = params['page']
+            requested.append((endpoint, page, params['per_page']))
+            items = [{'id': page * 10 + i} for i in range(2)]
+            return {'data': items, 'pagination': {'has_more': page < 50}}
+
+        with patch.object(client, '_make_request', side_effect=fake_request):
+            transfers = client.iter_transfers(per_page=2)
+            first_three = [next(transfers) for _ in range(3)]
+            transfers.close()
+
+        assert [t['id'] for t in first_three] == [10, 11, 20]
+        assert requested == [('/transfers', 1, 2), ('/transfers', 2, 2)]
+
+    def test_get_stages_matches_iter_stages(self, mock_config):
+        """Testa que get_stages materializa o mesmo conteúdo de iter_stages"""
+        client = SportmonksClient(enable_cache=False)
+        fake_request, _ = self._paged_responses(3)
+
+        with patch.object(client, '_make_request', side_effect=fake_request):
+            assert client.get_stages() == list(client.iter_stages())
+
     def test_check_rate_limit_no_limit(self, mock_config):
         """Testa verificação de rate limit quando não há limite"""
         client = SportmonksClient(enable_cache=False)
         client.rate_limit = 3000
-        client.request_timestamps = []
         
-        # Não deve levantar exceção
-        client._check_rate_limit()
+        # Não deve levantar exceção nem aguardar
+        with patch('time.sleep') as mock_sleep:
+            client._check_rate_limit()
+            mock_sleep.assert_not_called()
     
     def test_check_rate_limit_with_limit(self, mock_config):
         """Testa verificação de rate limit quando há limite"""
         client = SportmonksClient(enable_cache=False)
         client.rate_limit = 2
         
-        # Simular muitas requisições
-        now = datetime.now()
-        client.request_timestamps = [
-            now - timedelta(minutes=30),
-            now - timedelta(minutes=20),
-            now - timedelta(minutes=10)
-        ]
-        
         with patch('time.sleep') as mock_sleep:
+            # Duas requisições cabem no bucket, a terceira deve aguardar
+            client._check_rate_limit()
+            client._check_rate_limit()
+            mock_sleep.assert_not_called()
+            
             client._check_rate_limit()
-            # Deve ter chamado sleep
+            mock_sleep.assert_called_once()
+            # Reposição de 2 tokens/hora: ~30 minutos para o próximo token
+            assert mock_sleep.call_args[0][0] == pytest.approx(1800, rel=0.01)
+    
+    def test_rate_limit_is_per_entity(self, mock_config):
+        """Testa que cada entidade tem seu próprio bucket de rate limit"""
+        client = SportmonksClient(enable_cache=False)
+        client.rate_limit = 1
+        
+        with patch('time.sleep') as mock_sleep:
+            client._check_rate_limit(client._rate_limit_bucket('/fixtures/1'))
+            client._check_rate_limit(client._rate_limit_bucket('/teams/seasons/1'))
+            mock_sleep.assert_not_called()
+            
+            client._check_rate_limit(client._rate_limit_bucket('/fixtures/multi/1,2'))
             mock_sleep.assert_called_once()
     
     def test_update_rate_limit_from_headers(self, mock_config):
@@ -288,6 +389,80 @@ class TestSportmonksClient:
             assert client.cache_misses == 1
 
 
+class TestBatchGetters:
+    """Testes para get_fixtures_by_ids/get_players_by_ids"""
+    
+    def make_client(self, cached=None):
+        """Cliente com Redis falso; cached = {chave: valor já codificado}"""
+        redis_client = Mock()
+        cached = cached or {}
+        redis_client.mget.side_effect = lambda keys: [cached.get(key) for key in keys]
+        with patch('bdfut.core.redis_cache.redis.from_url', return_value=redis_client):
+            client = SportmonksClient(enable_cache=True, rate_limiter=Mock())
+        return client, redis_client
+    
+    def api_response(self, ids):
+        response = Mock()
+        response.status_code = 200
+        response.headers = {}
+        response.json.return_value = {'data': [{'id': i, 'season_id': 2024} for i in ids]}
+        response.raise_for_status.return_value = None
+        return response
+    
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_fixtures_cached_ids_served_from_mget(self, mock_get, mock_config):
+        """Testa que só IDs ausentes do cache vão para fixtures/multi"""
+        client, _ = self.make_client()
+        cache = client.redis_cache
+        key = cache._generate_key('/fixtures/1', {'include': 'events'})
+        client, redis_client = self.make_client({key: cache.codec.encode({'data': {'id': 1, 'cached': True}})})
+        mock_get.return_value = self.api_response([2, 3])
+        
+        result = client.get_fixtures_by_ids([1, 2, 3, 2], include='events')
+        
+        assert result[1] == {'id': 1, 'cached': True}
+        assert set(result) == {1, 2, 3}
+        redis_client.mget.assert_called_once()
+        mock_get.assert_called_once()
+        assert mock_get.call_args.args[0].endswith('/fixtures/multi/2,3')
+        assert (client.cache_hits, client.cache_misses) == (1, 2)
+        
+        # Partidas buscadas são gravadas com a chave do getter individual, em um pipeline
+        pipe = redis_client.pipeline.return_value
+        stored = {call.args[0] for call in pipe.setex.call_args_list}
+        assert stored == {cache._generate_key(f'/fixtures/{i}', {'include': 'events'}) for i in (2, 3)}
+        pipe.sadd.assert_any_call('bdfut:tag:seasons:2024', cache._generate_key('/fixtures/2', {'include': 'events'}))
+        pipe.execute.assert_called_once()
+    
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_fixtures_multi_chunks_of_100(self, mock_get, mock_config):
+        """Testa divisão das partidas ausentes em lotes de 100"""
+        client, _ = self.make_client()
+        mock_get.side_effect = lambda url, params: self.api_response(url.rsplit('/', 1)[1].split(','))
+        
+        client.get_fixtures_by_ids(range(1, 251))
+        
+        sizes = [len(call.args[0].rsplit('/', 1)[1].split(',')) for call in mock_get.call_args_list]
+        assert sizes == [100, 100, 50]
+    
+    @patch('bdfut.core.sportmonks_client.requests.get')
+    def test_players_fetch_only_misses(self, mock_get, mock_config):
+        """Testa jogadores sem endpoint multi: uma requisição por ID ausente"""
+        client, _ = self.make_client()
+        cache = client.redis_cache
+        key = cache._generate_key('/players/7', {})
+        client, _ = self.make_client({key: cache.codec.encode({'data': {'id': 7}})})
+        response = self.api_response([])
+        response.json.return_value = {'data': {'id': 8}}
+        mock_get.return_value = response
+        
+        result = client.get_players_by_ids([7, 8])
+        
+        assert result == {7: {'id': 7}, 8: {'id': 8}}
+        assert mock_get.call_count == 1
+        assert mock_get.call_args.args[0].endswith('/players/8')
+
+
 class TestSportmonksClientIntegration:
     """Testes de integração para SportmonksClient"""
     
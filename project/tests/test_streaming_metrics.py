@@ -0,0 +1,145 @@
+"""
+Testes unitários para métricas em fluxo
+======================================
+
+Testes de streaming_metrics e do seu uso em SLIs/SLOs e no APM:
+- DDSketch: erro relativo dos quantis e união de sketches
+- RollingWindow: expiração de baldes e união entre processos
+- SLICalculator: quantis, latência dentro do limite e taxa de queima
+- PerformanceProfiler: p95 e taxa de erro sem ordenar a janela
+"""
+import json
+import random
+
+from bdfut.core.streaming_metrics import DDSketch, RollingWindow
+from bdfut.core.sli_slo import SLI, SLICalculator, SLIType, SLOState, slo_manager
+from bdfut.core.apm import profiler
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestDDSketch:
+    """Testes para DDSketch"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Testa p50/p95/p99 com erro relativo de até 1%"""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(-1, 1) for _ in range(20000)]
+        sketch = DDSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q, estimate in zip([0.5, 0.95, 0.99], sketch.quantiles([0.5, 0.95, 0.99])):
+            exact = exact_quantile(values, q)
+            assert abs(estimate - exact) / exact <= 0.011
+        assert sketch.count == 20000
+        assert len(sketch.bins) < 1000
+
+    def test_merge_equals_single_sketch(self):
+        """Testa que unir sketches (inclusive via dict) equivale a um só"""
+        first, second, both = DDSketch(), DDSketch(), DDSketch()
+        for value in range(1, 1001):
+            (first if value % 2 else second).add(value / 100)
+            both.add(value / 100)
+        first.merge(DDSketch.from_dict(json.loads(json.dumps(second.to_dict()))))
+
+        assert first.bins == both.bins
+        assert first.quantile(0.95) == both.quantile(0.95)
+        assert first.count_below(5.0) == both.count_below(5.0)
+
+    def test_zero_and_empty(self):
+        """Testa sketch vazio e valores nulos"""
+        sketch = DDSketch()
+        assert sketch.quantile(0.5) == 0.0
+        for value in [0.0, 0.0, 0.0, 1.0]:
+            sketch.add(value)
+        assert sketch.quantile(0.5) == 0.0
+        assert abs(sketch.quantile(1.0) - 1.0) < 0.01
+
+
+class TestRollingWindow:
+    """Testes para RollingWindow"""
+
+    def test_window_counts_and_expiry(self):
+        """Testa contagem por janela e descarte de baldes fora da retenção"""
+        window = RollingWindow(retention_seconds=60, bucket_seconds=10)
+        for second in range(0, 120):
+            window.record(second % 10 != 0, value=second, timestamp=1000 + second)
+
+        assert len(window.buckets) == 6
+        counts = window.counts(30, now=1119)
+        assert counts.total == 40  # 30s pedidos + balde parcial do início
+        assert counts.failures == 4
+        assert window.sketch(30, now=1119).count == 40
+
+    def test_merge_across_processes(self):
+        """Testa união de janelas exportadas por processos diferentes"""
+        first = RollingWindow(300, 10)
+        second = RollingWindow(300, 10)
+        for i in range(100):
+            first.record(True, 0.1, timestamp=1000 + i)
+            second.record(i % 2 == 0, 1.0, timestamp=1000 + i)
+
+        first.merge(RollingWindow.from_dict(json.loads(json.dumps(second.to_dict()))))
+        counts = first.counts(now=1100)
+
+        assert counts.total == 200
+        assert counts.success == 150
+        assert abs(first.sketch(now=1100).quantile(0.75) - 1.0) < 0.02
+
+
+class TestStreamingSLIs:
+    """Testes de SLIs e APM sobre as janelas"""
+
+    def test_latency_sli_quantiles_and_threshold(self):
+        """Testa quantis e medições boas pela latência dentro do limite"""
+        calculator = SLICalculator(retention_seconds=600)
+        sli = SLI('latency', 'Latência', SLIType.LATENCY, 300, 'P95 < 2s', threshold=2.0)
+        for i in range(100):
+            calculator.record_measurement('latency', True, 0.5 if i < 90 else 3.0, timestamp=1000 + i)
+
+        measurement = calculator.calculate_sli(sli, now=1100)
+
+        assert abs(measurement.value - 0.5) < 0.01
+        assert abs(measurement.quantiles['p95'] - 3.0) < 0.03
+        assert (measurement.success_count, measurement.total_count) == (90, 100)
+
+    def test_merge_state_and_burn_rate(self):
+        """Testa união do estado de outro processo e taxa de queima do orçamento de erro"""
+        calculator = SLICalculator()
+        other = SLICalculator()
+        sli = SLI('availability', 'Disponibilidade', SLIType.AVAILABILITY, 300, '2xx')
+        for i in range(50):
+            calculator.record_measurement('availability', True, timestamp=1000 + i)
+            other.record_measurement('availability', i != 0, timestamp=1000 + i)
+
+        calculator.merge_state(other.export_state())
+        measurement = calculator.calculate_sli(sli, now=1060)
+
+        assert measurement.total_count == 100
+        assert measurement.value == 99.0
+        slo = slo_manager.slos['api_availability_slo']
+        assert abs(slo_manager._calculate_burn_rate(slo, measurement.value) - 10.0) < 1e-6
+
+    def test_evaluate_slos(self):
+        """Testa avaliação dos SLOs (taxa de erro como percentual de sucesso)"""
+        for i in range(1000):
+            slo_manager.record_api_request(i % 1000 != 0, 0.2)
+
+        statuses = slo_manager.evaluate_slos()
+
+        assert statuses['api_error_rate_slo'].current_percentage == 99.9
+        assert statuses['api_error_rate_slo'].status == SLOState.HEALTHY
+        assert statuses['api_latency_slo'].status == SLOState.HEALTHY
+
+    def test_profiler_p95_and_error_rate(self):
+        """Testa p95 e taxa de erro do PerformanceProfiler a partir da janela"""
+        for i in range(200):
+            profiler.record_request('/fixtures', 'GET', 0.1 if i < 180 else 1.5, 500 if i % 20 == 0 else 200)
+
+        assert abs(profiler._calculate_p95_response_time() - 1.5) < 0.02
+        assert abs(profiler._calculate_error_rate() - 5.0) < 1e-6
+        assert abs(profiler.get_response_time_quantiles()['p50'] - 0.1) < 0.002
@@ -465,6 +465,47 @@ class TestSupabaseClient:
             assert call_args[0]['id'] == '1'  # Mantém como string
             assert call_args[0]['borders'] == "['ARG', 'BOL']"  # Convertido para string
 
+    def test_upsert_in_chunks_consumes_generator(self, mock_config):
+        """Testa gravação em lotes de tamanho fixo a partir de um gerador"""
+        with patch('bdfut.core.supabase_client.create_client') as mock_create:
+            mock_client = Mock()
+            mock_table = Mock()
+            mock_client.table.return_value = mock_table
+            mock_create.return_value = mock_client
+            
+            client = SupabaseClient()
+            consumed = []
+            
+            def transfers():
+                for i in range(25):
+                    consumed.append(i)
+                    yield {'id': i, 'player_id': i}
+            
+            chunk_sizes = []
+            
+            def upsert(chunk):
+                # Gerador é consumido sob demanda, um lote por vez
+                chunk_sizes.append(len(chunk))
+                assert len(consumed) == sum(chunk_sizes)
+                return client.upsert_transfers(chunk)
+            
+            result = client.upsert_in_chunks(upsert, transfers(), chunk_size=10)
+            
+            assert result is True
+            assert chunk_sizes == [10, 10, 5]
+            assert mock_table.upsert.call_count == 3
+    
+    def test_upsert_in_chunks_reports_failure(self, mock_config):
+        """Testa que falha em um lote é reportada sem interromper os demais"""
+        with patch('bdfut.core.supabase_client.create_client'):
+            client = SupabaseClient()
+            upsert = Mock(side_effect=[True, False, True])
+            
+            result = client.upsert_in_chunks(upsert, iter([{'id': i} for i in range(6)]), chunk_size=2)
+            
+            assert result is False
+            assert upsert.call_count == 3
+
 
 class TestSupabaseClientErrorHandling:
     """Testes de tratamento de erro para SupabaseClient"""
@@ -0,0 +1,186 @@
+"""
+Testes unitários para o buffer write-behind
+==========================================
+
+Testes da gravação em lote de dados por partida:
+- Flush por tamanho, idade e explícito
+- Isolamento de falhas por tabela
+- Mapeamento de participantes/eventos
+- Gravação em lote no SupabaseClient
+"""
+import pytest
+from unittest.mock import Mock, patch
+
+from bdfut.core.write_buffer import WriteBehindBuffer, FixtureWriteBuffer
+from bdfut.core.supabase_client import SupabaseClient
+
+
+class TestWriteBehindBuffer:
+    """Testes para WriteBehindBuffer"""
+
+    def test_flush_on_max_rows(self):
+        """Testa flush automático ao atingir o limite de linhas"""
+        writer = Mock(return_value=True)
+        buffer = WriteBehindBuffer({'events': writer}, max_rows=3, max_age_seconds=60)
+
+        buffer.add('events', [{'id': 1}, {'id': 2}])
+        writer.assert_not_called()
+
+        buffer.add('events', [{'id': 3}])
+
+        writer.assert_called_once_with([{'id': 1}, {'id': 2}, {'id': 3}])
+        assert buffer.pending() == 0
+
+    def test_flush_on_max_age(self):
+        """Testa flush quando a linha mais antiga excede a idade máxima"""
+        writer = Mock(return_value=True)
+        buffer = WriteBehindBuffer({'events': writer}, max_rows=100, max_age_seconds=30)
+
+        with patch('bdfut.core.write_buffer.time.monotonic', return_value=1000.0):
+            buffer.add('events', [{'id': 1}])
+        writer.assert_not_called()
+
+        with patch('bdfut.core.write_buffer.time.monotonic', return_value=1031.0):
+            buffer.add('events', [{'id': 2}])
+
+        writer.assert_called_once_with([{'id': 1}, {'id': 2}])
+
+    def test_explicit_flush_and_context_manager(self):
+        """Testa flush explícito ao sair do contexto"""
+        writer = Mock(return_value=True)
+
+        with WriteBehindBuffer({'events': writer}, max_rows=100, max_age_seconds=60) as buffer:
+            buffer.add('events', [{'id': 1}])
+            buffer.add('events', [])
+            assert buffer.pending('events') == 1
+
+        writer.assert_called_once_with([{'id': 1}])
+        assert buffer.get_stats()['tables']['events']['rows_written'] == 1
+
+    def test_failure_is_isolated_per_table(self):
+        """Testa que a falha de uma tabela não impede as demais"""
+        failing = Mock(side_effect=Exception("timeout"))
+        working = Mock(return_value=True)
+        buffer = WriteBehindBuffer({'participants': failing, 'events': working},
+                                   max_rows=100, max_age_seconds=60)
+        buffer.add('participants', [{'id': 1}])
+        buffer.add('events', [{'id': 2}])
+
+        assert buffer.flush() is False
+
+        working.assert_called_once_with([{'id': 2}])
+        stats = buffer.get_stats()['tables']
+        assert stats['participants']['rows_failed'] == 1
+        assert stats['events']['rows_written'] == 1
+        assert buffer.pending() == 0
+
+    def test_writer_returning_false_counts_as_failure(self):
+        """Testa que retorno False do writer é contabilizado como falha"""
+        buffer = WriteBehindBuffer({'events': Mock(return_value=False)}, max_rows=100, max_age_seconds=60)
+        buffer.add('events', [{'id': 1}])
+
+        assert buffer.flush('events') is False
+        assert buffer.get_stats()['tables']['events']['rows_failed'] == 1
+
+    def test_failed_keys_include_automatic_flushes(self):
+        """Testa que as chaves de um flush automático com falha ficam registradas"""
+        writer = Mock(side_effect=[False, True])
+        buffer = WriteBehindBuffer({'events': writer}, max_rows=2, max_age_seconds=60, key_field='fixture_id')
+
+        buffer.add('events', [{'fixture_id': 1}, {'fixture_id': 1}])
+        buffer.add('events', [{'fixture_id': 2}, {'fixture_id': 2}])
+
+        assert buffer.flush() is True
+        assert buffer.failed_keys == {1}
+        assert buffer.get_stats()['failed_keys'] == 1
+
+    def test_unknown_table(self):
+        """Testa erro para tabela sem writer"""
+        buffer = WriteBehindBuffer({'events': Mock()})
+
+        with pytest.raises(KeyError):
+            buffer.add('lineups', [{'id': 1}])
+
+
+class TestFixtureWriteBuffer:
+    """Testes para FixtureWriteBuffer"""
+
+    def test_maps_rows_across_fixtures(self, mock_config):
+        """Testa que várias partidas são acumuladas em uma gravação por tabela"""
+        supabase = Mock()
+        buffer = FixtureWriteBuffer(supabase, max_rows=100, max_age_seconds=60)
+
+        for fixture_id in (10, 11):
+            buffer.add_fixture_participants(fixture_id, [
+                {'id': 1, 'meta': {'location': 'home'}},
+                {'id': 2, 'meta': {'location': 'away'}}
+            ])
+            buffer.add_fixture_events(fixture_id, [{'id': fixture_id * 100, 'minute': 10}])
+        buffer.flush()
+
+        participants = supabase.replace_fixture_participants.call_args[0][0]
+        assert [(r['fixture_id'], r['team_id'], r['position']) for r in participants] == [
+            (10, 1, 'home'), (10, 2, 'away'), (11, 1, 'home'), (11, 2, 'away')
+        ]
+        events = supabase.upsert_fixture_events_batch.call_args[0][0]
+        assert [(r['id'], r['fixture_id'], r['minute']) for r in events] == [(1000, 10, 10), (1100, 11, 10)]
+
+
+class TestSupabaseBatchWrites:
+    """Testes das gravações em lote do SupabaseClient"""
+
+    def test_replace_fixture_participants_upserts_then_prunes(self, mock_config):
+        """Testa upsert único em (fixture_id, team_id) e remoção só das equipes ausentes"""
+        with patch('bdfut.core.supabase_client.create_client') as mock_create:
+            mock_table = mock_create.return_value.table.return_value
+            calls = Mock()
+            calls.attach_mock(mock_table.upsert, 'upsert')
+            calls.attach_mock(mock_table.delete, 'delete')
+            client = SupabaseClient()
+
+            result = client.replace_fixture_participants([
+                {'fixture_id': 1, 'team_id': 5, 'position': 'home'},
+                {'fixture_id': 2, 'team_id': 6, 'position': 'home'},
+                {'fixture_id': 1, 'team_id': 5, 'position': 'away'},
+                {'fixture_id': 1, 'team_id': 7, 'position': 'home'},
+                {'fixture_id': 2, 'team_id': None}
+            ])
+
+        assert result is True
+        mock_table.upsert.assert_called_once_with([
+            {'fixture_id': 1, 'team_id': 5, 'position': 'away'},
+            {'fixture_id': 2, 'team_id': 6, 'position': 'home'},
+            {'fixture_id': 1, 'team_id': 7, 'position': 'home'}
+        ], on_conflict='fixture_id,team_id')
+        mock_table.delete.return_value.or_.assert_called_once_with(
+            'and(fixture_id.eq.1,team_id.not.in.(5,7)),and(fixture_id.eq.2,team_id.not.in.(6))'
+        )
+        assert [call[0] for call in calls.mock_calls if call[0] in ('upsert', 'delete')] == ['upsert', 'delete']
+
+    def test_replace_fixture_participants_keeps_rows_when_upsert_fails(self, mock_config):
+        """Testa que falha no upsert não remove participantes existentes"""
+        with patch('bdfut.core.supabase_client.create_client') as mock_create:
+            mock_table = mock_create.return_value.table.return_value
+            mock_table.upsert.return_value.execute.side_effect = Exception("timeout")
+            client = SupabaseClient()
+
+            assert client.replace_fixture_participants([{'fixture_id': 1, 'team_id': 5}]) is False
+
+        mock_table.delete.assert_not_called()
+
+    def test_replace_fixture_participants_error(self, mock_config):
+        """Testa tratamento de erro na substituição em lote"""
+        with patch('bdfut.core.supabase_client.create_client') as mock_create:
+            mock_create.return_value.table.side_effect = Exception("down")
+            client = SupabaseClient()
+
+            assert client.replace_fixture_participants([{'fixture_id': 1, 'team_id': 5}]) is False
+
+    def test_upsert_fixture_events_batch_dedupes(self, mock_config):
+        """Testa que eventos repetidos mantêm a última versão"""
+        with patch('bdfut.core.supabase_client.create_client'):
+            client = SupabaseClient(bulk_loader=Mock())
+            with patch.object(client, 'bulk_upsert', return_value=True) as mock_bulk:
+                client.upsert_fixture_events_batch([{'id': 1, 'minute': 10}, {'id': 1, 'minute': 11}])
+
+        mock_bulk.assert_called_once_with('fixture_events', [{'id': 1, 'minute': 11}], 'id')